@@ -15,6 +15,9 @@
 #   EVAL_FIXTURES             Path to canonical fixture file
 #   EVAL_OUTPUT_DIR           Output directory for artifacts (default: eval-results)
 #   EVAL_WITH_SYSTEM_PROMPT   Include system prompt in eval (default: true)
+#   EVAL_CONCURRENCY          Cases scored in parallel (default: 1)
+#   EVAL_RESUME               1 to continue an interrupted run from its checkpoint;
+#                             otherwise a previous checkpoint in EVAL_OUTPUT_DIR is discarded
 set -euo pipefail
 
 REPO_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
@@ -25,6 +28,7 @@ EVAL_CANDIDATE_MODEL="${1:-${EVAL_CANDIDATE_MODEL:-qwen2.5:1.5b}}"
 EVAL_FIXTURES="${2:-${EVAL_FIXTURES:-src/python/ai_scorer/evals/data/canonical/v1.json}}"
 EVAL_OUTPUT_DIR="${EVAL_OUTPUT_DIR:-eval-results}"
 EVAL_WITH_SYSTEM_PROMPT="${EVAL_WITH_SYSTEM_PROMPT:-true}"
+EVAL_RESUME="${EVAL_RESUME:-0}"
 
 echo "[eval-scorer] Candidate model: $EVAL_CANDIDATE_MODEL"
 echo "[eval-scorer] Fixtures       : $EVAL_FIXTURES"
@@ -56,12 +60,20 @@ if [[ ! -f "$EVAL_FIXTURES" ]]; then
     exit 1
 fi
 
+RESUME_ARGS=()
+if [[ "$EVAL_RESUME" == "1" ]]; then
+    RESUME_ARGS=(--resume)
+else
+    rm -f "$EVAL_OUTPUT_DIR/checkpoint.jsonl"
+fi
+
 EVAL_WITH_SYSTEM_PROMPT="$EVAL_WITH_SYSTEM_PROMPT" \
 PYTHONPATH="$REPO_ROOT" python3 -m src.python.ai_scorer.evals.cli eval \
     --ollama-host "$OLLAMA_HOST" \
     --candidate   "$EVAL_CANDIDATE_MODEL" \
     --fixtures    "$EVAL_FIXTURES" \
     --output-dir  "$EVAL_OUTPUT_DIR" \
+    ${RESUME_ARGS[@]+"${RESUME_ARGS[@]}"} \
     --verbose
 
 echo ""
@@ -371,6 +371,9 @@ func GetActivitySummary(c *gin.Context) {
 			Crawler4DayWeek:         queueDepths[queueCrawler4DayWeek],
 			CrawlerEnrichmentAts:    queueDepths[queueCrawlerEnrichmentAts],
 			JobScoring:              queueDepths[queueJobScoring],
+			JobScoringInteractive:   queueDepths[queueJobScoringInteractive],
+			JobScoringNewJob:        queueDepths[queueJobScoringNewJob],
+			JobScoringBulkRescore:   queueDepths[queueJobScoringBulkRescore],
 		},
 	}
 
@@ -974,8 +977,22 @@ const (
 	queueCrawler4DayWeek         = "crawler_4dayweek"
 	queueCrawlerEnrichmentAts    = "crawler_enrichment_ats"
 	queueJobScoring              = "job_scoring"
+	queueJobScoringInteractive   = "job_scoring_interactive"
+	queueJobScoringNewJob        = "job_scoring_new_job"
+	queueJobScoringBulkRescore   = "job_scoring_bulk_rescore"
 )
 
+// jobScoringLanes maps the priority lanes of the job scoring queue (see the
+// ai_scorer SPEC) to their depth keys. The new_job lane's inbox is the base queue.
+var jobScoringLanes = []struct {
+	lane     string
+	depthKey string
+}{
+	{"interactive", queueJobScoringInteractive},
+	{"new_job", queueJobScoringNewJob},
+	{"bulk_rescore", queueJobScoringBulkRescore},
+}
+
 type activityQueueDepth struct {
 	CrawlerTrigger       int64 `json:"crawler_trigger"`
 	CrawlerYCombinator   int64 `json:"crawler_ycombinator"`
@@ -985,6 +1002,9 @@ type activityQueueDepth struct {
 	Crawler4DayWeek         int64 `json:"crawler_4dayweek"`
 	CrawlerEnrichmentAts    int64 `json:"crawler_enrichment_ats"`
 	JobScoring              int64 `json:"job_scoring"`
+	JobScoringInteractive   int64 `json:"job_scoring_interactive"`
+	JobScoringNewJob        int64 `json:"job_scoring_new_job"`
+	JobScoringBulkRescore   int64 `json:"job_scoring_bulk_rescore"`
 }
 
 type activeWorkflowItem struct {
@@ -1041,6 +1061,14 @@ var getQueueDepths = func(queueNames map[string]string) map[string]int64 {
 			depths[key] = 0
 			continue
 		}
+		if key == queueJobScoring {
+			depths[key] = 0
+			for _, lane := range jobScoringLanes {
+				depths[lane.depthKey] = jobScoringLaneDepth(redisClient, queueName, lane.lane)
+				depths[key] += depths[lane.depthKey]
+			}
+			continue
+		}
 		len, err := redisClient.LLen(context.Background(), queueName).Result()
 		if err != nil && err != redis.Nil {
 			log.Printf("failed to get queue depth for %s: %v", queueName, err)
@@ -1053,6 +1081,26 @@ var getQueueDepths = func(queueNames map[string]string) map[string]int64 {
 	return depths
 }
 
+// jobScoringLaneDepth counts a lane's inbox plus the messages the scorer has
+// already routed into its per-user lists but not yet claimed.
+func jobScoringLaneDepth(redisClient *redis.Client, queueName string, lane string) int64 {
+	inbox := queueName
+	if lane != "new_job" {
+		inbox = queueName + ":" + lane
+	}
+	ctx := context.Background()
+	pending, err := redisClient.LLen(ctx, inbox).Result()
+	if err != nil && err != redis.Nil {
+		log.Printf("failed to get queue depth for %s: %v", inbox, err)
+		pending = 0
+	}
+	routed, err := redisClient.Get(ctx, queueName+":lane:"+lane+":routed").Int64()
+	if err != nil && err != redis.Nil {
+		log.Printf("failed to get routed scoring depth for %s lane %s: %v", queueName, lane, err)
+	}
+	return pending + routed
+}
+
 // SetQueueDepthsProvider allows tests to inject a mock queue depths provider
 func SetQueueDepthsProvider(provider func(map[string]string) map[string]int64) {
 	if provider == nil {
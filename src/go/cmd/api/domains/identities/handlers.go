@@ -466,6 +466,8 @@ func UpdateIdentityPreferences(c *gin.Context) {
 	if queueName == "" {
 		queueName = "job_scoring_queue"
 	}
+	// Rescores triggered by a preference edit go to the interactive priority lane.
+	queueName += ":interactive"
 
 	for cursor.Next(context.Background()) {
 		var scoreDoc bson.M
@@ -1205,6 +1205,8 @@ func ScoreJobDescription(c *gin.Context) {
 	if queueName == "" {
 		queueName = "job_scoring_queue"
 	}
+	// A score the user asked for goes to the interactive priority lane, ahead of crawl backlogs.
+	queueName += ":interactive"
 
 	userIDRaw, _ := c.Get("userId")
 	userIDStr, _ := userIDRaw.(string)
@@ -1024,7 +1024,7 @@ func TestScoreJobDescription_QueueOverrideAndFailure(t *testing.T) {
 	c.Params = gin.Params{{Key: "id", Value: primitive.NewObjectID().Hex()}}
 	ScoreJobDescription(c)
 
-	if gotQueue != "custom_score_queue" {
+	if gotQueue != "custom_score_queue:interactive" {
 		t.Fatalf("expected env override queue name, got %q", gotQueue)
 	}
 	if w.Code != http.StatusInternalServerError {
@@ -1064,7 +1064,7 @@ func TestScoreJobDescription_IncludesIdentityIDInQueuedPayload(t *testing.T) {
 	if w.Code != http.StatusOK {
 		t.Fatalf("expected 200, got %d: %s", w.Code, w.Body.String())
 	}
-	if gotQueue != "job_scoring_queue" {
+	if gotQueue != "job_scoring_queue:interactive" {
 		t.Fatalf("expected default queue name, got %q", gotQueue)
 	}
 
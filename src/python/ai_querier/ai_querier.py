@@ -10,6 +10,7 @@ import google.generativeai as genai
 from . import common_pb2
 from google.protobuf.json_format import MessageToDict
 from google.protobuf.timestamp_pb2 import Timestamp
+from src.python.web_crawler.reliable_queue import ReliableQueue
 
 
 def main():
@@ -31,18 +32,32 @@ def main():
     companies_col = global_db["companies"]
 
     r = redis.Redis(host=redis_host, port=redis_port)
+    visibility_timeout_seconds = int(os.environ.get("AI_QUERIER_QUEUE_VISIBILITY_TIMEOUT_SECONDS", 60))
+    max_deliveries = int(os.environ.get("AI_QUERIER_QUEUE_MAX_DELIVERIES", 5))
+    message_deadline_seconds = int(os.environ.get("AI_QUERIER_QUEUE_MESSAGE_DEADLINE_SECONDS", 0))
+    work_queue = None
 
     print(f"Listening for messages on Redis queue '{queue_name}'...")
 
     while True:
         try:
-            msg = r.blpop(queue_name, timeout=0)
+            if work_queue is None:
+                # (Re)creating the queue requeues a message left unacknowledged by a failed iteration.
+                work_queue = ReliableQueue(
+                    r,
+                    queue_name,
+                    visibility_timeout_seconds=visibility_timeout_seconds,
+                    max_deliveries=max_deliveries,
+                    message_deadline_seconds=message_deadline_seconds,
+                )
+            msg = work_queue.claim()
             if msg:
-                _, data = msg
+                data = msg.payload
                 try:
                     payload = json.loads(data.decode('utf-8'))
                 except Exception as e:
                     print(f"error: Invalid JSON in queue message: {e}")
+                    work_queue.ack(msg)
                     continue
                 user_id = str(payload.get("user_id") or "").strip()
                 email = payload.get("recipient")
@@ -50,9 +65,11 @@ def main():
                 followup_prompt = payload.get("prompt")
                 if not user_id:
                     print("error: Missing user_id in queue message.")
+                    work_queue.ack(msg)
                     continue
                 if not email:
                     print("error: No recipient specified in message.")
+                    work_queue.ack(msg)
                     continue
 
                 user_db = client[f"cover_letter_{user_id}"]
@@ -63,14 +80,17 @@ def main():
                 recipient = recipients_col.find_one({"email": email})
                 if not recipient:
                     print(f"error: Recipient '{email}' not found in database.")
+                    work_queue.ack(msg)
                     continue
                 if not conversation_id:
                     generate_initial_cover_letter(recipient, identities_col, cover_letters_col, companies_col, test_mode=test_mode)
                 else:
                     iterate_cover_letter(email, conversation_id, followup_prompt, cover_letters_col, test_mode=test_mode)
+                work_queue.ack(msg)
 
         except Exception as e:
             print(f"error: Error while processing queue: {e}")
+            work_queue = None
             time.sleep(5)
 
 def process_cover_letter(cover_letters_col, recipient_id, cover_letter, prompt, history, conversation_id, is_update=False):
@@ -16,6 +16,9 @@ from google.protobuf.json_format import MessageToDict
 from google.protobuf.timestamp_pb2 import Timestamp
 from pymongo import ASCENDING, MongoClient
 
+from src.python.web_crawler.reliable_queue import ReliableQueue
+from src.python.web_crawler.scoring_lanes import ScoringLaneConsumer, lane_depths, parse_lane_weights
+
 from . import common_pb2
 from .description_normalization import normalize_description_markdown
 from .scoring_prompt import SCORING_SYSTEM_INSTRUCTION
@@ -429,6 +432,20 @@ def safe_json_dump(value):
         return repr(value)
 
 
+# Scoring steps that failed and were skipped or replaced by a fallback, counted
+# per thread; the evals runner uses it to keep degraded scores out of its cache.
+_DEGRADED_STEPS = threading.local()
+
+
+def degraded_step_count():
+    return getattr(_DEGRADED_STEPS, "count", 0)
+
+
+def warn_degraded_step(message):
+    _DEGRADED_STEPS.count = degraded_step_count() + 1
+    print(message)
+
+
 def parse_ollama_response(content):
     if not content:
         return None, None, "empty_content"
@@ -876,6 +893,16 @@ def get_top_snippets(
         return []
 
     requirement_vector = _vector_to_float_list(next(embedding_model.embed([requirement])))
+    return rank_snippets(chunks, cached_vectors, requirement_vector, top_k=top_k)
+
+
+def rank_snippets(
+    chunks: list[str],
+    cached_vectors: list[list[float]],
+    requirement_vector: list[float],
+    top_k: int = SNIPPET_TOP_K,
+) -> list[str]:
+    """Top `top_k` chunks by cosine similarity to an already embedded requirement."""
     similarities = []
     for idx, vector in enumerate(cached_vectors):
         similarities.append((idx, _cosine_similarity(vector, requirement_vector)))
@@ -898,13 +925,11 @@ def retrieve_relevant_snippets(
     model_name = model_name or resolve_embedding_model_name()
     embedding_model = get_embedding_model(model_name)
 
-    chunks = generate_hybrid_chunks(job_description, window_size=SNIPPET_WINDOW_SIZE)
-    if exclude_heading_only:
-        chunks = [chunk for chunk in chunks if not is_heading_only_chunk(chunk)]
-    if not chunks:
-        return []
-
-    cached_vectors = [_vector_to_float_list(vector) for vector in embedding_model.embed(chunks)]
+    chunks, cached_vectors = embed_snippet_chunks(
+        job_description,
+        model_name=model_name,
+        exclude_heading_only=exclude_heading_only,
+    )
     if not cached_vectors:
         return []
 
@@ -917,6 +942,30 @@ def retrieve_relevant_snippets(
     )
 
 
+def embed_snippet_chunks(
+    job_description: str,
+    model_name: str | None = None,
+    exclude_heading_only: bool = False,
+) -> tuple[list[str], list[list[float]]]:
+    """Chunk and embed a description once so several requirements can be ranked against it."""
+    if not job_description:
+        return [], []
+
+    embedding_model = get_embedding_model(model_name or resolve_embedding_model_name())
+    chunks = generate_hybrid_chunks(job_description, window_size=SNIPPET_WINDOW_SIZE)
+    if exclude_heading_only:
+        chunks = [chunk for chunk in chunks if not is_heading_only_chunk(chunk)]
+    if not chunks:
+        return [], []
+    return chunks, [_vector_to_float_list(vector) for vector in embedding_model.embed(chunks)]
+
+
+def embed_requirement(requirement: str, model_name: str | None = None) -> list[float]:
+    """Embedding of one requirement, reusable across every description it is ranked against."""
+    embedding_model = get_embedding_model(model_name or resolve_embedding_model_name())
+    return _vector_to_float_list(next(embedding_model.embed([requirement])))
+
+
 def is_heading_only_chunk(chunk: str) -> bool:
     """Return whether an atomic chunk is formatting-only section metadata."""
     value = str(chunk or "").strip()
@@ -2166,7 +2215,7 @@ def score_preference(
                 ),
             )
         except Exception as exc:
-            print(
+            warn_degraded_step(
                 "warn: Failed to normalize job-title metadata: "
                 + safe_json_dump(
                     {
@@ -2189,7 +2238,7 @@ def score_preference(
                 normalized_location = "fully remote"
             set_field(scoring_job_doc, "location", normalized_location)
         except Exception as exc:
-            print(
+            warn_degraded_step(
                 "warn: Failed to normalize job-location metadata: "
                 + safe_json_dump(
                     {
@@ -2208,7 +2257,7 @@ def score_preference(
             top_k=SNIPPET_TOP_K,
         )
     except Exception as exc:
-        print(
+        warn_degraded_step(
             "warn: Failed to retrieve baseline scoring evidence: "
             + safe_json_dump(
                 {
@@ -2245,7 +2294,7 @@ def score_preference(
             else:
                 setattr(scoring_preference, "guidance", normalized_guidance)
         except Exception as exc:
-            print(
+            warn_degraded_step(
                 "warn: Failed to normalize preference guidance: "
                 + safe_json_dump(
                     {
@@ -2264,7 +2313,7 @@ def score_preference(
                 preference_guidance,
             )
         except Exception as exc:
-            print(
+            warn_degraded_step(
                 "warn: Failed to classify preference evidence scope: "
                 + safe_json_dump(
                     {
@@ -2367,7 +2416,7 @@ def score_preference(
                     top_k=SNIPPET_RERANKED_TOP_K,
                 )
             except Exception as selector_exc:
-                print(
+                warn_degraded_step(
                     "warn: Compact evidence selector failed; using cross-encoder: "
                     + safe_json_dump(
                         {
@@ -2434,7 +2483,7 @@ def score_preference(
                 snippet for snippet in candidates if snippet in selected_snippets
             ][:SNIPPET_RERANKED_TOP_K]
     except Exception as exc:
-        print(
+        warn_degraded_step(
             "warn: Failed to expand or rerank scoring evidence: "
             + safe_json_dump(
                 {
@@ -2889,6 +2938,7 @@ def ensure_score_collection_indexes(job_preference_scores_col):
 def scoring_worker_loop(
     worker_id,
     work_queue,
+    scoring_queue,
     global_db,
     mongo_client,
     redis_client,
@@ -2929,7 +2979,7 @@ def scoring_worker_loop(
                 )
             scoring_run_manager = user_managers[user_id]
 
-        print(f"info: Worker {worker_id} processing job '{job_id}' for user '{user_id}'")
+        print(f"info: Worker {worker_id} processing job '{job_id}' for user '{user_id}' (lane {item['lane']})")
         try:
             process_scoring_job(
                 str(job_id),
@@ -2948,6 +2998,11 @@ def scoring_worker_loop(
         except Exception as exc:
             print(f"error: Worker {worker_id} failed while processing job '{job_id}': {exc}")
         finally:
+            # Failures are already recorded on the score document; only a crash leaves the message for redelivery.
+            try:
+                scoring_queue.ack(item["message"])
+            except Exception as exc:
+                print(f"error: Worker {worker_id} failed to acknowledge job '{job_id}': {exc}")
             work_queue.task_done()
 
 
@@ -2965,6 +3020,11 @@ def main():
     ollama_model = os.environ.get("OLLAMA_MODEL")
     embedding_model_name = str(os.environ.get("EMBEDDING_MODEL", "") or "").strip()
     worker_pool_size = parse_worker_pool_size(os.environ.get("AI_SCORER_OLLAMA_PARALLELISM", "1"))
+    visibility_timeout_seconds = int(os.environ.get("AI_SCORER_QUEUE_VISIBILITY_TIMEOUT_SECONDS", 60))
+    max_deliveries = int(os.environ.get("AI_SCORER_QUEUE_MAX_DELIVERIES", 5))
+    message_deadline_seconds = int(os.environ.get("AI_SCORER_QUEUE_MESSAGE_DEADLINE_SECONDS", 0))
+    lane_weights = parse_lane_weights(os.environ.get("AI_SCORER_LANE_WEIGHTS"))
+    lane_depth_log_interval = float(os.environ.get("AI_SCORER_LANE_DEPTH_LOG_SECONDS", 60))
 
     if not test_mode:
         if not ollama_host:
@@ -2987,6 +3047,14 @@ def main():
     companies_col = global_db["companies"]
 
     redis_client = redis.Redis(host=redis_host, port=redis_port)
+    scoring_queue = ReliableQueue(
+        redis_client,
+        queue_name,
+        visibility_timeout_seconds=visibility_timeout_seconds,
+        max_deliveries=max_deliveries,
+        message_deadline_seconds=message_deadline_seconds,
+    )
+    lane_consumer = ScoringLaneConsumer(redis_client, scoring_queue, weights=lane_weights)
 
     # user_managers maps user_id → ScoringRunManager (created lazily per user).
     user_managers: dict[str, ScoringRunManager] = {}
@@ -3000,6 +3068,7 @@ def main():
             args=(
                 worker_id,
                 work_queue,
+                scoring_queue,
                 global_db,
                 client,
                 redis_client,
@@ -3021,19 +3090,30 @@ def main():
     print(f"info: Test mode = {test_mode}")
     print(f"info: Embedding model = {effective_embedding_model}")
     print(f"info: AI_SCORER_OLLAMA_PARALLELISM (worker pool size) = {worker_pool_size}")
+    print(f"info: Scoring lane weights = {lane_weights}")
 
+    next_depth_log_at = 0.0
     try:
         while True:
             try:
-                msg: Any = redis_client.blpop([queue_name], timeout=0)
-                if not msg:
+                if time.monotonic() >= next_depth_log_at:
+                    print(f"info: Scoring lane depths = {lane_depths(redis_client, queue_name)}")
+                    next_depth_log_at = time.monotonic() + lane_depth_log_interval
+
+                claimed = lane_consumer.claim()
+                if claimed is None:
                     continue
+                lane, message = claimed
 
-                data = msg[1]
                 try:
-                    payload = json.loads(data.decode("utf-8"))
+                    payload = json.loads(message.payload.decode("utf-8"))
                 except Exception as exc:
                     print(f"error: Invalid JSON in queue message: {exc}")
+                    scoring_queue.ack(message)
+                    continue
+                if not isinstance(payload, dict):
+                    print("error: Queue message is not a JSON object.")
+                    scoring_queue.ack(message)
                     continue
 
                 job_id = payload.get("job_id")
@@ -3041,15 +3121,20 @@ def main():
                 identity_id = str(payload.get("identity_id") or "").strip()
                 if not job_id:
                     print("error: Missing required field 'job_id'.")
+                    scoring_queue.ack(message)
                     continue
                 if not user_id:
                     print("error: Missing required field 'user_id'.")
+                    scoring_queue.ack(message)
                     continue
                 if not identity_id:
                     print("error: Missing required field 'identity_id'.")
+                    scoring_queue.ack(message)
                     continue
 
-                work_queue.put({"job_id": str(job_id), "user_id": user_id, "identity_id": identity_id})
+                work_queue.put(
+                    {"job_id": str(job_id), "user_id": user_id, "identity_id": identity_id, "lane": lane, "message": message}
+                )
 
             except Exception as exc:
                 print(f"error: Error while consuming queue: {exc}")
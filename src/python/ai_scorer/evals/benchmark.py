@@ -0,0 +1,708 @@
+"""
+Benchmark: throughput and model-call cost of the scoring pipeline per evidence mode.
+
+Runs `process_scoring_job` over the canonical fixture jobs without a live
+Ollama. Everything except the LLM is the real code path: description
+normalization, chunking, embedding retrieval, reranking, the Mongo reads and
+upserts of the score documents, and scoring-run progress. LLM requests are
+answered by `SimulatedOllamaClient`, which replays responses recorded from a
+real Ollama (`--record` / `--replay`) and synthesizes deterministic,
+well-formed answers for any request it has no recording for. Each request
+sleeps for a configurable simulated latency, so modes that make more or
+longer calls cost proportionally more wall time.
+
+A mode is a set of scorer environment overrides (`EVIDENCE_SELECTION_MODE`,
+`CANDIDATE_RETRIEVAL_MODE`, the pointwise reranking cascade, confidence
+routing, ...). Every mode scores the same jobs into a fresh database with cold
+LLM-result caches and reports:
+
+    jobs_per_s, llm_calls_per_preference, embedding_calls_per_job,
+    rerank_calls_per_job, p50/p95 job latency
+
+Mongo is mongomock when it is installed, otherwise a throwaway database on
+`--mongo-uri` that is dropped afterwards. `--fake-models` swaps the fastembed
+embedding and cross-encoder models for deterministic in-process stand-ins,
+for machines without the model weights.
+
+Usage (from repo root):
+    python -m src.python.ai_scorer.evals.cli benchmark --fake-models \\
+        --llm-latency-ms 150 --modes baseline,compact_llm,pointwise_cascade
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from unittest.mock import patch
+
+import numpy as np
+from bson import ObjectId
+
+from src.python.ai_scorer import ai_scorer
+from src.python.ai_scorer.evals.checkpoint import input_digest
+from src.python.ai_scorer.evals.schema import load_fixtures
+
+# Scorer environment overrides per mode; keys not listed are cleared.
+BENCHMARK_MODES: dict[str, dict[str, str]] = {
+    "baseline": {},
+    "raw_only": {"CANDIDATE_RETRIEVAL_MODE": "raw_only"},
+    "raw_expanded_rrf": {"CANDIDATE_RETRIEVAL_MODE": "raw_expanded_rrf"},
+    "compact_llm": {"EVIDENCE_SELECTION_MODE": "compact_llm"},
+    "pointwise": {"SCORER_POINTWISE_RERANK": "true"},
+    "pointwise_cascade": {"SCORER_POINTWISE_RERANK_CASCADE": "true"},
+    "scope_routing": {"EVIDENCE_SCOPE_ROUTING": "llm"},
+    "confidence_view": {"EVIDENCE_VIEW_ROUTING": "confidence"},
+    "confidence_global": {"EVIDENCE_VIEW_ROUTING": "confidence_global"},
+    "confidence_order": {"FINAL_ORDER_ROUTING": "confidence"},
+}
+
+# Mode switches read by score_preference; cleared before each mode is applied.
+MODE_ENV_KEYS = (
+    "CANDIDATE_RETRIEVAL_MODE",
+    "EVIDENCE_SELECTION_MODE",
+    "EVIDENCE_FUSION_MODE",
+    "EVIDENCE_SCOPE_ROUTING",
+    "EVIDENCE_VIEW_ROUTING",
+    "FINAL_ORDER_ROUTING",
+    "SCORER_POINTWISE_RERANK",
+    "SCORER_POINTWISE_RERANK_CASCADE",
+    "POINTWISE_USE_LOGPROBS",
+    "LATE_INTERACTION_RERANK_MODEL",
+    "PRESERVE_CANDIDATE_ORDER",
+    "RERANK_WITH_JOB_CONTEXT",
+    "NORMALIZE_JOB_TITLE",
+    "NORMALIZE_JOB_LOCATION",
+    "NORMALIZE_PREFERENCE_GUIDANCE",
+)
+
+# Per-process LLM result caches in ai_scorer; cleared so every mode starts cold.
+_LLM_RESULT_CACHES = (
+    "_QUERY_EXPANSION_CACHE",
+    "_LOCATION_NORMALIZATION_CACHE",
+    "_TITLE_NORMALIZATION_CACHE",
+    "_PREFERENCE_NORMALIZATION_CACHE",
+    "_PREFERENCE_FRAGMENT_CACHE",
+    "_PREFERENCE_EVIDENCE_SCOPE_CACHE",
+    "_CONTRASTIVE_QUERY_CACHE",
+)
+
+
+def parse_mode(spec: str) -> tuple[str, dict[str, str]]:
+    """Parse `NAME:KEY=VALUE,KEY=VALUE` (or a bare NAME of a built-in mode)."""
+    name, _, assignments = spec.partition(":")
+    name = name.strip()
+    if not assignments:
+        if name not in BENCHMARK_MODES:
+            raise ValueError(f"unknown benchmark mode {name!r}; known: {', '.join(BENCHMARK_MODES)}")
+        return name, dict(BENCHMARK_MODES[name])
+    env = {}
+    for assignment in assignments.split(","):
+        key, sep, value = assignment.partition("=")
+        if not sep or not key.strip():
+            raise ValueError(f"invalid mode assignment {assignment!r} in {spec!r}")
+        env[key.strip()] = value.strip()
+    return name, env
+
+
+# ---------------------------------------------------------------------------
+# Simulated Ollama
+# ---------------------------------------------------------------------------
+
+def request_key(endpoint: str, model: str, messages: list, fmt: Optional[str]) -> str:
+    return input_digest(endpoint, model, messages, fmt)
+
+
+def _digest_int(text: str) -> int:
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+
+
+def _first_line_value(text: str) -> str:
+    """`X` from a user prompt starting with `Label: X`."""
+    return text.split("\n", 1)[0].partition(": ")[2].strip()
+
+
+def _select_indices(system: str, user: str) -> dict:
+    available = len(re.findall(r"(?m)^\d+: ", user))
+    requested = re.search(r"exactly (\d+)", system + "\n" + user)
+    count = min(int(requested.group(1)) if requested else available, available)
+    return {"selected_indices": list(range(count))}
+
+
+# JSON contracts of the auxiliary LLM calls, keyed by the field their prompt asks for.
+_JSON_RESPONDERS: tuple[tuple[str, Callable[[str, str], dict]], ...] = (
+    ("selected_indices", _select_indices),
+    ("support_query", lambda system, user: {
+        "support_query": f"{_first_line_value(user)} core responsibilities",
+        "conflict_query": f"not {_first_line_value(user)}",
+    }),
+    ("search_query", lambda system, user: {"search_query": f"{_first_line_value(user)} responsibilities"}),
+    ("evidence_view", lambda system, user: {"evidence_view": "focused"}),
+    ("evidence_scope", lambda system, user: {"evidence_scope": "description"}),
+    ("needs_rewrite", lambda system, user: {"needs_rewrite": False}),
+    ("normalized_guidance", lambda system, user: {"normalized_guidance": _first_line_value(user)}),
+    ("normalized_location", lambda system, user: {"normalized_location": _first_line_value(user).lower()}),
+    ("normalized_title", lambda system, user: {"normalized_title": _first_line_value(user)}),
+)
+
+
+def synthesize_content(messages: list, fmt: Optional[str], na_every: int = 7) -> str:
+    """Deterministic, well-formed model output for a request with no recording.
+
+    Score requests get a score derived from the prompt digest (every
+    `na_every`-th prompt is N/A); JSON requests get the field their prompt asks for.
+    """
+    system = "\n".join(m.get("content", "") for m in messages if m.get("role") == "system")
+    user = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+    if fmt == "json":
+        for field_name, respond in _JSON_RESPONDERS:
+            if field_name in system:
+                return json.dumps(respond(system, user))
+        return "{}"
+    digest = _digest_int(user)
+    if na_every > 0 and digest % na_every == 0:
+        return "N/A"
+    return str(digest % 6)
+
+
+def _logprob_payload(content: str) -> dict:
+    digest = _digest_int(content)
+    top = [
+        {"token": str(label), "logprob": -1.0 - ((digest >> label) % 7) / 2.0}
+        for label in range(6)
+    ]
+    first = {"token": content[:1], "logprob": -((digest % 100) / 100.0), "top_logprobs": top}
+    return {"message": {"role": "assistant", "content": content}, "logprobs": [first], "done": True}
+
+
+class _Response:
+    def __init__(self, payload: dict) -> None:
+        self._payload = payload
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def json(self) -> dict:
+        return self._payload
+
+
+class _SimulatedHttp:
+    """Stand-in for `ollama.Client._client` (logprob requests post to /api/chat directly)."""
+
+    def __init__(self, owner: "SimulatedOllamaClient") -> None:
+        self._owner = owner
+
+    def post(self, path: str, json: dict) -> _Response:
+        return _Response(self._owner._answer("post", json.get("model", ""), json.get("messages", []), None))
+
+
+class SimulatedOllamaClient:
+    """Ollama client that replays recordings or synthesizes answers after a simulated delay.
+
+    The delay of a request is `latency_ms + latency_ms_per_1k_chars * prompt
+    characters / 1000`, or the recorded duration with `use_recorded_latency`.
+    Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        recordings: Optional[dict] = None,
+        latency_ms: float = 0.0,
+        latency_ms_per_1k_chars: float = 0.0,
+        use_recorded_latency: bool = False,
+        na_every: int = 7,
+    ) -> None:
+        self.recordings = recordings or {}
+        self.latency_ms = latency_ms
+        self.latency_ms_per_1k_chars = latency_ms_per_1k_chars
+        self.use_recorded_latency = use_recorded_latency
+        self.na_every = na_every
+        self.counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self._client = _SimulatedHttp(self)
+
+    def chat(self, model, messages, options=None, format=None, **kwargs):
+        return self._answer("chat", model, messages, format)
+
+    def _answer(self, endpoint: str, model: str, messages: list, fmt: Optional[str]) -> dict:
+        recorded = self.recordings.get(request_key(endpoint, model, messages, fmt))
+        prompt_chars = sum(len(str(m.get("content", ""))) for m in messages)
+        if recorded is not None:
+            response = recorded["response"]
+        else:
+            content = synthesize_content(messages, fmt, self.na_every)
+            response = _logprob_payload(content) if endpoint == "post" else {"message": {"content": content}}
+
+        if self.use_recorded_latency and recorded is not None:
+            delay_ms = float(recorded.get("elapsed_ms", 0.0))
+        else:
+            delay_ms = self.latency_ms + self.latency_ms_per_1k_chars * prompt_chars / 1000.0
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000.0)
+
+        with self._lock:
+            self.counts["requests"] += 1
+            self.counts[f"requests_{endpoint}"] += 1
+            self.counts["replayed" if recorded is not None else "synthesized"] += 1
+            self.counts["prompt_chars"] += prompt_chars
+        return response
+
+
+def load_recordings(path: str) -> dict:
+    """Recorded responses of a RecordingOllamaClient file, keyed by request."""
+    recordings = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                recordings[record["key"]] = record
+    return recordings
+
+
+class _RecordingHttp:
+    def __init__(self, owner: "RecordingOllamaClient") -> None:
+        self._owner = owner
+
+    def post(self, path: str, json: dict):
+        t0 = time.perf_counter()
+        response = self._owner.inner._client.post(path, json=json)
+        response.raise_for_status()
+        self._owner._record(
+            "post", json.get("model", ""), json.get("messages", []), None, response.json(), t0
+        )
+        return response
+
+
+class RecordingOllamaClient:
+    """Wraps a real Ollama client and appends every request/response to a JSONL file."""
+
+    def __init__(self, inner, path: str) -> None:
+        self.inner = inner
+        self.path = path
+        self._lock = threading.Lock()
+        self._client = _RecordingHttp(self)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def chat(self, model, messages, options=None, format=None, **kwargs):
+        t0 = time.perf_counter()
+        response = self.inner.chat(model=model, messages=messages, options=options, format=format, **kwargs)
+        content = ai_scorer.extract_ollama_content(response)
+        self._record("chat", model, messages, format, {"message": {"content": content}}, t0)
+        return response
+
+    def _record(self, endpoint, model, messages, fmt, response: dict, t0: float) -> None:
+        entry = {
+            "key": request_key(endpoint, model, messages, fmt),
+            "endpoint": endpoint,
+            "model": model,
+            "elapsed_ms": (time.perf_counter() - t0) * 1000.0,
+            "response": response,
+        }
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+# ---------------------------------------------------------------------------
+# Embedding / reranking models
+# ---------------------------------------------------------------------------
+
+class HashedEmbeddingModel:
+    """Deterministic bag-of-words embedding; stands in for fastembed with --fake-models."""
+
+    def __init__(self, dimensions: int = 256) -> None:
+        self.dimensions = dimensions
+
+    def embed(self, texts):
+        for text in texts:
+            vector = np.zeros(self.dimensions)
+            for token in re.findall(r"\w+", text.lower()):
+                vector[_digest_int(token) % self.dimensions] += 1.0
+            yield vector
+
+
+class TokenOverlapReranker:
+    """Deterministic cross-encoder stand-in: token overlap with the query."""
+
+    def rerank(self, query, documents):
+        query_tokens = set(re.findall(r"\w+", query.lower()))
+        for document in documents:
+            tokens = re.findall(r"\w+", document.lower())
+            yield len(query_tokens.intersection(tokens)) / math.sqrt(len(tokens) + 1)
+
+
+class _CountingModel:
+    """Counts calls and texts of an embedding (`embed`) or reranking (`rerank`) model."""
+
+    def __init__(self, inner, counts: Counter, lock: threading.Lock, kind: str) -> None:
+        self._inner = inner
+        self._counts = counts
+        self._lock = lock
+        self._kind = kind
+
+    def embed(self, texts):
+        texts = list(texts)
+        with self._lock:
+            self._counts[f"{self._kind}_calls"] += 1
+            self._counts[f"{self._kind}_texts"] += len(texts)
+        return self._inner.embed(texts)
+
+    def rerank(self, query, documents):
+        documents = list(documents)
+        with self._lock:
+            self._counts[f"{self._kind}_calls"] += 1
+            self._counts[f"{self._kind}_texts"] += len(documents)
+        return self._inner.rerank(query, documents)
+
+
+@contextlib.contextmanager
+def counting_models(counts: Counter, fake_models: bool = False):
+    """Patch ai_scorer's model getters to count every embed/rerank call."""
+    lock = threading.Lock()
+    get_embedding_model = ai_scorer.get_embedding_model
+    get_reranking_model = ai_scorer.get_reranking_model
+    fake_embedder = HashedEmbeddingModel()
+    fake_reranker = TokenOverlapReranker()
+
+    def _embedding(model_name):
+        inner = fake_embedder if fake_models else get_embedding_model(model_name)
+        return _CountingModel(inner, counts, lock, "embedding")
+
+    def _reranking(model_name):
+        inner = fake_reranker if fake_models else get_reranking_model(model_name)
+        return _CountingModel(inner, counts, lock, "rerank")
+
+    with patch.object(ai_scorer, "get_embedding_model", _embedding), \
+            patch.object(ai_scorer, "get_reranking_model", _reranking):
+        yield
+
+
+# ---------------------------------------------------------------------------
+# Corpus and database
+# ---------------------------------------------------------------------------
+
+def build_corpus(cases: list, job_limit: int = 0) -> dict:
+    """Jobs, companies and one identity (every fixture preference) from eval cases.
+
+    Jobs are the distinct fixture descriptions; `job_limit` cycles through
+    them to reach a larger job count.
+    """
+    field_id = ObjectId()
+    company_id = ObjectId()
+    unique_jobs = {}
+    preferences = {}
+    for case in cases:
+        unique_jobs.setdefault(case.job_fingerprint, case)
+        preferences.setdefault(
+            (case.preference_key, case.preference_guidance),
+            {
+                "key": f"{case.preference_key}_{len(preferences)}",
+                "guidance": case.preference_guidance,
+                "weight": 1.0,
+                "enabled": True,
+            },
+        )
+    sources = list(unique_jobs.values())
+    count = job_limit or len(sources)
+    jobs = [
+        {
+            "_id": ObjectId(),
+            "company": company_id,
+            "title": sources[i % len(sources)].title,
+            "description": sources[i % len(sources)].description,
+            "location": sources[i % len(sources)].location,
+            "platform": "benchmark",
+        }
+        for i in range(count if sources else 0)
+    ]
+    return {
+        "jobs": jobs,
+        "companies": [{"_id": company_id, "field": field_id, "name": "Benchmark", "description": ""}],
+        "identity": {
+            "_id": ObjectId(),
+            "field": field_id,
+            "name": "Benchmark",
+            "description": "",
+            "preferences": list(preferences.values()),
+        },
+    }
+
+
+def mongo_database_factory(mongo_uri: str = "") -> Callable[[], tuple]:
+    """Factory of fresh databases: mongomock, or throwaway databases on `mongo_uri`."""
+    if mongo_uri:
+        from pymongo import MongoClient
+
+        client = MongoClient(mongo_uri)
+
+        def _pymongo():
+            name = f"ai_scorer_benchmark_{uuid.uuid4().hex[:12]}"
+            return client[name], lambda: client.drop_database(name)
+
+        return _pymongo
+    try:
+        import mongomock  # type: ignore
+    except ImportError as exc:
+        raise RuntimeError("mongomock is not installed; pass --mongo-uri for a local Mongo") from exc
+
+    def _mongomock():
+        return mongomock.MongoClient()["ai_scorer_benchmark"], lambda: None
+
+    return _mongomock
+
+
+class _NullRedis:
+    def publish(self, channel, payload):
+        return 0
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def _reset_llm_caches() -> None:
+    for name in _LLM_RESULT_CACHES:
+        getattr(ai_scorer, name).clear()
+
+
+def _warm_models() -> None:
+    # Model construction is a one-off startup cost; keep it out of the timings.
+    for warm in (
+        lambda: ai_scorer.get_embedding_model(ai_scorer.resolve_embedding_model_name()),
+        lambda: ai_scorer.get_embedding_model(ai_scorer.resolve_candidate_embedding_model_name()),
+        lambda: ai_scorer.get_reranking_model(ai_scorer.resolve_reranking_model_name()),
+    ):
+        try:
+            warm()
+        except Exception as exc:
+            print(f"[benchmark] warn: model warm-up failed: {exc}")
+
+
+def _percentile(values: list, q: float) -> Optional[float]:
+    return float(np.percentile(values, q)) if values else None
+
+
+def run_mode(
+    name: str,
+    env: dict,
+    corpus: dict,
+    database: tuple,
+    ollama_client,
+    *,
+    model_name: str,
+    workers: int = 1,
+    fake_models: bool = False,
+    verbose: bool = False,
+) -> dict:
+    """Score every corpus job under one mode and return its throughput and cost."""
+    db, cleanup = database
+    jobs_col = db["job-descriptions"]
+    companies_col = db["companies"]
+    identities_col = db["identities"]
+    scores_col = db["job-preference-scores"]
+    for job in corpus["jobs"]:
+        jobs_col.insert_one(dict(job))
+    for company in corpus["companies"]:
+        companies_col.insert_one(dict(company))
+    identities_col.insert_one(dict(corpus["identity"]))
+    identity_id = str(corpus["identity"]["_id"])
+
+    counts: Counter = Counter()
+    client_counts = getattr(ollama_client, "counts", None)
+    client_before = Counter(client_counts) if client_counts is not None else Counter()
+    overrides = {key: "" for key in MODE_ENV_KEYS}
+    overrides.update(env)
+    manager = ai_scorer.ScoringRunManager(jobs_col, companies_col, scores_col)
+    latencies: list[float] = []
+    latency_lock = threading.Lock()
+
+    def _score(job: dict) -> None:
+        t0 = time.perf_counter()
+        ai_scorer.process_scoring_job(
+            str(job["_id"]),
+            jobs_col,
+            companies_col,
+            identities_col,
+            scores_col,
+            _NullRedis(),
+            "scoring_progress_channel",
+            manager,
+            ollama_client,
+            model_name,
+            False,
+            identity_id=identity_id,
+        )
+        with latency_lock:
+            latencies.append((time.perf_counter() - t0) * 1000.0)
+
+    try:
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(patch.dict(os.environ, overrides))
+            stack.enter_context(counting_models(counts, fake_models))
+            _reset_llm_caches()
+            _warm_models()
+            if not verbose:
+                # The scorer logs every request and response; keep them out of the benchmark output.
+                stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+            t0 = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="benchmark") as pool:
+                list(pool.map(_score, corpus["jobs"]))
+            wall_s = time.perf_counter() - t0
+        statuses = Counter(doc.get("scoring_status") for doc in scores_col.find({}))
+    finally:
+        _reset_llm_caches()
+        cleanup()
+
+    if client_counts is not None:
+        counts.update(Counter(client_counts) - client_before)
+    jobs = len(corpus["jobs"])
+    preferences = jobs * len(corpus["identity"]["preferences"])
+    return {
+        "mode": name,
+        "env": env,
+        "jobs": jobs,
+        "preferences": preferences,
+        "scored_jobs": statuses.get("scored", 0),
+        "failed_jobs": statuses.get("failed", 0),
+        "wall_s": wall_s,
+        "jobs_per_s": jobs / wall_s if wall_s > 0 else None,
+        "llm_calls": counts["requests"],
+        "llm_calls_per_preference": counts["requests"] / preferences if preferences else None,
+        "llm_prompt_chars_per_preference": counts["prompt_chars"] / preferences if preferences else None,
+        "replayed_calls": counts["replayed"],
+        "synthesized_calls": counts["synthesized"],
+        "embedding_calls_per_job": counts["embedding_calls"] / jobs if jobs else None,
+        "embedded_texts_per_job": counts["embedding_texts"] / jobs if jobs else None,
+        "rerank_calls_per_job": counts["rerank_calls"] / jobs if jobs else None,
+        "p50_job_ms": _percentile(latencies, 50),
+        "p95_job_ms": _percentile(latencies, 95),
+    }
+
+
+def _fmt(value, spec: str) -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def format_table(results: list) -> str:
+    header = (
+        f"{'mode':<20} {'jobs/s':>8} {'llm/pref':>9} {'emb/job':>8} "
+        f"{'rerank/job':>10} {'p50 ms':>9} {'p95 ms':>9} {'ok':>7}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r['mode']:<20} {_fmt(r['jobs_per_s'], '8.2f')} "
+            f"{_fmt(r['llm_calls_per_preference'], '9.2f')} {_fmt(r['embedding_calls_per_job'], '8.2f')} "
+            f"{_fmt(r['rerank_calls_per_job'], '10.2f')} {_fmt(r['p50_job_ms'], '9.1f')} "
+            f"{_fmt(r['p95_job_ms'], '9.1f')} {r['scored_jobs']:>3}/{r['jobs']:<3}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default="src/python/ai_scorer/evals/data/canonical/v1.json")
+    parser.add_argument(
+        "--modes",
+        default=",".join(BENCHMARK_MODES),
+        help="Comma-separated built-in modes to run (default: all)",
+    )
+    parser.add_argument(
+        "--mode",
+        action="append",
+        default=[],
+        help="Extra mode NAME:KEY=VALUE,KEY=VALUE of scorer env overrides; repeatable",
+    )
+    parser.add_argument("--jobs", type=int, default=0, help="Jobs per mode, cycling the fixture jobs (default: one each)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("AI_SCORER_OLLAMA_PARALLELISM", "1")),
+        help="Jobs scored in parallel (default: AI_SCORER_OLLAMA_PARALLELISM env or 1)",
+    )
+    parser.add_argument("--model", default=os.environ.get("OLLAMA_MODEL", "qwen2.5:1.5b"), help="Scoring model name")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Simulated latency of every LLM request")
+    parser.add_argument(
+        "--llm-latency-ms-per-1k-chars",
+        type=float,
+        default=0.0,
+        help="Additional simulated latency per 1000 prompt characters",
+    )
+    parser.add_argument("--replay", default="", help="JSONL of recorded Ollama responses to replay")
+    parser.add_argument(
+        "--use-recorded-latency",
+        action="store_true",
+        help="Sleep for each replayed response's recorded duration instead of the simulated latency",
+    )
+    parser.add_argument(
+        "--record",
+        default="",
+        help="Run against a live Ollama (--ollama-host) and append its responses to this JSONL",
+    )
+    parser.add_argument("--ollama-host", default=os.environ.get("OLLAMA_HOST", "http://localhost:11434"))
+    parser.add_argument("--fake-models", action="store_true", help="Deterministic stand-ins for fastembed models")
+    parser.add_argument("--mongo-uri", default="", help="Local Mongo for throwaway databases (default: mongomock)")
+    parser.add_argument("--output", default="", help="Write the results as JSON to this path")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Keep the scorer's request logs")
+    args = parser.parse_args(argv)
+
+    try:
+        modes = [parse_mode(name) for name in args.modes.split(",") if name.strip()]
+        modes += [parse_mode(spec) for spec in args.mode]
+        database_factory = mongo_database_factory(args.mongo_uri)
+    except (ValueError, RuntimeError) as exc:
+        print(f"[benchmark] ERROR: {exc}")
+        return 2
+
+    corpus = build_corpus(load_fixtures(args.fixtures), job_limit=args.jobs)
+    if args.record:
+        client = RecordingOllamaClient(ai_scorer.build_ollama_client(args.ollama_host), args.record)
+        source = f"live {args.ollama_host}, recording to {args.record}"
+    else:
+        client = SimulatedOllamaClient(
+            recordings=load_recordings(args.replay) if args.replay else None,
+            latency_ms=args.llm_latency_ms,
+            latency_ms_per_1k_chars=args.llm_latency_ms_per_1k_chars,
+            use_recorded_latency=args.use_recorded_latency,
+        )
+        source = f"replay {args.replay}" if args.replay else "synthesized responses"
+    print(f"[benchmark] {len(corpus['jobs'])} jobs x {len(corpus['identity']['preferences'])} preferences, "
+          f"{args.workers} worker(s), LLM: {source}")
+
+    results = []
+    for name, env in modes:
+        print(f"[benchmark] mode {name} {env or ''}".rstrip())
+        results.append(run_mode(
+            name,
+            env,
+            corpus,
+            database_factory(),
+            client,
+            model_name=args.model,
+            workers=args.workers,
+            fake_models=args.fake_models,
+            verbose=args.verbose,
+        ))
+
+    print()
+    print(format_table(results))
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"corpus_jobs": len(corpus["jobs"]), "workers": args.workers, "results": results}, f, indent=2)
+            f.write("\n")
+        print(f"[benchmark] Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+"""
+Checkpoint: append-only JSONL record of completed cases for resumable runs.
+
+Eval and labeling runs append one line per completed case, keyed by
+`(case_id, model)`, and flush it immediately, so a crashed or interrupted run
+loses at most the calls that were in flight. Reopening the file with
+`resume=True` returns the recorded results instead of calling the model again;
+another process can read the file at any time to build a partial report.
+
+Each record also carries a digest of the inputs that produced it (prompt,
+case text); a record whose digest no longer matches the case is ignored, so a
+resumed run never reuses a result computed for different inputs.
+
+Line format:
+    {"case_id": "...", "model": "...", "input_digest": "...", "result": {...}}
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from typing import Optional
+
+
+def input_digest(*parts) -> str:
+    """Stable digest of the inputs a checkpointed result depends on."""
+    raw = json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def default_checkpoint_path(output_path: str) -> str:
+    return f"{output_path}.checkpoint.jsonl"
+
+
+class RunCheckpoint:
+    """Completed-case store backed by an append-only JSONL file.
+
+    Without `resume`, an existing non-empty checkpoint is refused rather than
+    overwritten, because it may hold results of paid calls. `read_only` opens
+    the file for lookups only, e.g. to report on a run that is still writing it.
+    """
+
+    def __init__(self, path: str, *, resume: bool = False, read_only: bool = False) -> None:
+        self.path = path
+        self._records: dict = {}
+        self._lock = threading.Lock()
+        self._file = None
+        self.skipped_lines = 0
+
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists and not resume:
+            raise FileExistsError(
+                f"checkpoint {path} already exists; pass --resume to continue it or delete it"
+            )
+        if exists:
+            self._load()
+        if read_only:
+            return
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        if exists and not self._ends_with_newline():
+            # The previous run died mid-line; start the next record on its own line.
+            self._file.write("\n")
+            self._file.flush()
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    key = (record["case_id"], record["model"])
+                    record["result"]
+                except (ValueError, KeyError, TypeError):
+                    # Typically the truncated last line of a crashed run.
+                    self.skipped_lines += 1
+                    continue
+                # Later lines win, so a case recorded twice keeps its newest result.
+                self._records[key] = record
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, case_id: str, model: str, digest: Optional[str] = None) -> Optional[dict]:
+        """Recorded result for `(case_id, model)`, or None if missing or made from other inputs."""
+        record = self._records.get((case_id, model))
+        if record is None:
+            return None
+        if digest is not None and record.get("input_digest") != digest:
+            return None
+        return record["result"]
+
+    def record(self, case_id: str, model: str, result: dict, digest: Optional[str] = None) -> None:
+        """Append a completed case and flush it to disk. Safe to call from worker threads."""
+        if self._file is None:
+            raise RuntimeError(f"checkpoint {self.path} is open read-only")
+        entry = {"case_id": case_id, "model": model, "input_digest": digest, "result": result}
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self._records[(case_id, model)] = entry
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "RunCheckpoint":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
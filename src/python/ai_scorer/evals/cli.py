@@ -5,11 +5,13 @@ Subcommands:
   extract   — Extract candidate fixture stubs from MongoDB
   label     — Propose labels using a live Ollama model
   eval      — Run eval: candidate model vs baseline on canonical fixtures
+  benchmark — Scoring-pipeline throughput per evidence mode, without a live Ollama
 
 Usage (from repo root):
     python -m src.python.ai_scorer.evals.cli extract [options]
     python -m src.python.ai_scorer.evals.cli label   [options]
     python -m src.python.ai_scorer.evals.cli eval    [options]
+    python -m src.python.ai_scorer.evals.cli benchmark [options]
 """
 from __future__ import annotations
 
@@ -40,12 +42,17 @@ def _cmd_extract(args: argparse.Namespace) -> int:
 
 def _cmd_label(args: argparse.Namespace) -> int:
     from src.python.ai_scorer.evals.labeler import main as label_main
-    label_main([
+    label_args = [
         "--ollama-host", args.ollama_host,
         "--model", args.model,
         "--input", args.input,
         "--output", args.output,
-    ])
+    ]
+    if args.checkpoint:
+        label_args.extend(["--checkpoint", args.checkpoint])
+    if args.resume:
+        label_args.append("--resume")
+    label_main(label_args)
     return 0
 
 
@@ -54,9 +61,21 @@ def _cmd_label(args: argparse.Namespace) -> int:
 # ---------------------------------------------------------------------------
 
 def _cmd_eval(args: argparse.Namespace) -> int:
-    from src.python.ai_scorer.evals.metrics import EvalMetrics, compute_metrics, check_regression
-    from src.python.ai_scorer.evals.report import write_per_case, write_report, write_summary
-    from src.python.ai_scorer.evals.runner import run_eval
+    from src.python.ai_scorer.evals.metrics import (
+        DEFAULT_BOOTSTRAP_RESAMPLES,
+        EvalMetrics,
+        check_regression,
+        compute_metrics,
+        paired_bootstrap,
+    )
+    from src.python.ai_scorer.evals.report import read_per_case, write_per_case, write_report, write_summary
+    from src.python.ai_scorer.evals.checkpoint import RunCheckpoint
+    from src.python.ai_scorer.evals.result_cache import (
+        EvalResultCache,
+        default_cache_dir,
+        resolve_model_digests,
+    )
+    from src.python.ai_scorer.evals.runner import checkpointed_result, run_eval
     from src.python.ai_scorer.evals.schema import load_fixtures, load_fixture_meta, validate_fixtures
 
     # Load and validate canonical fixtures
@@ -68,6 +87,10 @@ def _cmd_eval(args: argparse.Namespace) -> int:
             print(f"  {e}")
         return 2
 
+    if args.alpha is not None and not args.baseline_per_case:
+        print("[eval] ERROR: --alpha needs --baseline-per-case to test significance against")
+        return 2
+
     # Load fixture metadata (v2 format) to get fixture_model and reference_metrics
     fixture_meta = load_fixture_meta(args.fixtures)
     fixture_model = fixture_meta.fixture_model if fixture_meta else "(unknown)"
@@ -76,19 +99,59 @@ def _cmd_eval(args: argparse.Namespace) -> int:
     print(f"[eval] Loaded {len(cases)} canonical cases from {args.fixtures}")
     print(f"[eval] Fixture model (golden): {fixture_model}")
     print(f"[eval] Candidate model       : {args.candidate}")
-    print(f"[eval] Ollama host           : {args.ollama_host}")
-
-    # --- Candidate run ---
-    print(f"\n[eval] Running candidate ({args.candidate}) against golden set ...")
-    candidate_results = run_eval(
-        cases=cases,
-        ollama_host=args.ollama_host,
-        model_name=args.candidate,
-        verbose=args.verbose,
+    ollama_hosts = args.ollama_host or [os.environ.get("OLLAMA_HOST", "http://localhost:11434")]
+    print(f"[eval] Ollama host(s)        : {', '.join(ollama_hosts)}")
+    print(f"[eval] Concurrency           : {args.concurrency}")
+
+    checkpoint_path = args.checkpoint or os.path.join(args.output_dir, "checkpoint.jsonl")
+    if args.report_only:
+        # Partial report from a (possibly still running) checkpointed run; no model calls.
+        checkpoint = RunCheckpoint(checkpoint_path, resume=True, read_only=True)
+        completed = [
+            (case, checkpointed_result(case, args.candidate, checkpoint)) for case in cases
+        ]
+        completed = [(case, result) for case, result in completed if result is not None]
+        print(f"[eval] Report only: {len(completed)}/{len(cases)} cases completed in {checkpoint_path}")
+        if not completed:
+            return 2
+        cases = [case for case, _ in completed]
+        candidate_results = [result for _, result in completed]
+    else:
+        try:
+            checkpoint = RunCheckpoint(checkpoint_path, resume=args.resume)
+        except FileExistsError as exc:
+            print(f"[eval] ERROR: {exc}")
+            return 2
+        print(f"[eval] Checkpoint            : {checkpoint_path}")
+        cache = None
+        if not args.no_cache:
+            from src.python.ai_scorer.ai_scorer import build_ollama_client
+
+            cache_dir = args.cache_dir or default_cache_dir(args.fixtures)
+            cache = EvalResultCache(
+                cache_dir, model_digests=resolve_model_digests(build_ollama_client(ollama_hosts[0]))
+            )
+            print(f"[eval] Result cache          : {cache_dir}")
+
+        # --- Candidate run ---
+        print(f"\n[eval] Running candidate ({args.candidate}) against golden set ...")
+        with checkpoint:
+            candidate_results = run_eval(
+                cases=cases,
+                ollama_host=ollama_hosts,
+                model_name=args.candidate,
+                verbose=args.verbose,
+                concurrency=args.concurrency,
+                checkpoint=checkpoint,
+                cache=cache,
+            )
+
+    candidate_metrics = compute_metrics(
+        candidate_results,
+        bootstrap_resamples=args.bootstrap_resamples,
+        confidence=args.confidence,
     )
 
-    candidate_metrics = compute_metrics(candidate_results)
-
     # Build reference EvalMetrics from stored fixture metadata (no second model run).
     # Falls back to zero metrics when fixture has no reference (old v1 bare-array format).
     reference_metrics = EvalMetrics(
@@ -106,7 +169,25 @@ def _cmd_eval(args: argparse.Namespace) -> int:
         total_latency_ms=reference_metrics_dict.get("total_latency_ms"),
     )
 
-    regression = check_regression(reference_metrics, candidate_metrics)
+    significance = None
+    if args.baseline_per_case:
+        # Paired test against a previous run on the same cases (its per_case.json).
+        baseline_results = read_per_case(args.baseline_per_case, "baseline")
+        significance = paired_bootstrap(
+            baseline_results,
+            candidate_results,
+            resamples=args.bootstrap_resamples or DEFAULT_BOOTSTRAP_RESAMPLES,
+            confidence=args.confidence,
+        )
+        print(f"[eval] Paired baseline       : {args.baseline_per_case} "
+              f"({significance.get('paired_cases', 0)} shared cases)")
+        if args.alpha is not None and not significance:
+            print("[eval] warn: no cases shared with the paired baseline; "
+                  "gating on the fixture reference without waivers")
+
+    regression = check_regression(
+        reference_metrics, candidate_metrics, significance=significance, alpha=args.alpha
+    )
 
     # --- Artifacts ---
     run_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
@@ -150,10 +231,17 @@ def _cmd_eval(args: argparse.Namespace) -> int:
 
     cm = candidate_metrics
     print("\n[eval] Metrics summary (vs golden set):")
-    print(f"  exact_accuracy : {cm.exact_accuracy:.3f}")
-    print(f"  na_f1          : {cm.na_f1:.3f}")
-    print(f"  mean_abs_error : {cm.mean_abs_error:.3f}")
-
+    for name in ("exact_accuracy", "na_f1", "mean_abs_error"):
+        interval = cm.intervals.get(name)
+        ci = f"  [{interval[0]:.3f}, {interval[1]:.3f}]" if interval else ""
+        line = f"  {name:<15}: {getattr(cm, name):.3f}{ci}"
+        if significance and name in significance:
+            paired = significance[name]
+            line += f"  delta={paired['delta']:+.3f} p={paired['p_value']:.3f}"
+        print(line)
+
+    for reason in regression.waived:
+        print(f"[eval] Waived: {reason}")
     if regression.passed:
         print("\n[eval] Regression gate: PASSED")
         return 0
@@ -164,6 +252,42 @@ def _cmd_eval(args: argparse.Namespace) -> int:
         return 1
 
 
+# ---------------------------------------------------------------------------
+# Subcommand: benchmark
+# ---------------------------------------------------------------------------
+
+def _cmd_benchmark(args: argparse.Namespace) -> int:
+    from src.python.ai_scorer.evals.benchmark import main as benchmark_main
+    benchmark_args = [
+        "--fixtures", args.fixtures,
+        "--jobs", str(args.jobs),
+        "--workers", str(args.workers),
+        "--model", args.model,
+        "--llm-latency-ms", str(args.llm_latency_ms),
+        "--llm-latency-ms-per-1k-chars", str(args.llm_latency_ms_per_1k_chars),
+        "--ollama-host", args.ollama_host,
+    ]
+    for spec in args.mode:
+        benchmark_args.extend(["--mode", spec])
+    for flag, value in [
+        ("--modes", args.modes),
+        ("--replay", args.replay),
+        ("--record", args.record),
+        ("--mongo-uri", args.mongo_uri),
+        ("--output", args.output),
+    ]:
+        if value:
+            benchmark_args.extend([flag, value])
+    for flag, enabled in [
+        ("--use-recorded-latency", args.use_recorded_latency),
+        ("--fake-models", args.fake_models),
+        ("--verbose", args.verbose),
+    ]:
+        if enabled:
+            benchmark_args.append(flag)
+    return benchmark_main(benchmark_args)
+
+
 # ---------------------------------------------------------------------------
 # Argument parser
 # ---------------------------------------------------------------------------
@@ -217,12 +341,29 @@ def build_parser() -> argparse.ArgumentParser:
         "--output",
         default="src/python/ai_scorer/evals/data/proposed/labeled.json",
     )
+    p_label.add_argument(
+        "--checkpoint",
+        default="",
+        help="Checkpoint file of labeled cases (default: <output>.checkpoint.jsonl)",
+    )
+    p_label.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run, skipping cases already in the checkpoint",
+    )
 
     # --- eval ---
     p_eval = sub.add_parser("eval", help="Run eval: candidate model vs golden fixtures")
     p_eval.add_argument(
         "--ollama-host",
-        default=os.environ.get("OLLAMA_HOST", "http://localhost:11434"),
+        action="append",
+        help="Ollama host; repeat for replicas serving the candidate model (default: OLLAMA_HOST env)",
+    )
+    p_eval.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.environ.get("EVAL_CONCURRENCY", "1")),
+        help="Cases scored in parallel across all hosts (default: EVAL_CONCURRENCY env or 1)",
     )
     p_eval.add_argument(
         "--candidate",
@@ -239,12 +380,116 @@ def build_parser() -> argparse.ArgumentParser:
         default="eval-results",
         help="Directory for output artifacts (created if missing)",
     )
+    p_eval.add_argument(
+        "--checkpoint",
+        default="",
+        help="Checkpoint file of scored cases (default: <output-dir>/checkpoint.jsonl)",
+    )
+    p_eval.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run, skipping cases already in the checkpoint",
+    )
+    p_eval.add_argument(
+        "--report-only",
+        action="store_true",
+        help="Write artifacts for the cases completed so far in the checkpoint, without model calls",
+    )
+    p_eval.add_argument(
+        "--cache-dir",
+        default=os.environ.get("EVAL_CACHE_DIR", ""),
+        help="Result cache shared across runs (default: EVAL_CACHE_DIR env or .eval-cache next to --fixtures)",
+    )
+    p_eval.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Score every case and send every request to the model, bypassing the result cache",
+    )
+    p_eval.add_argument(
+        "--bootstrap-resamples",
+        type=int,
+        default=int(os.environ.get("EVAL_BOOTSTRAP_RESAMPLES", "10000")),
+        help="Bootstrap resamples for metric confidence intervals; 0 disables "
+             "(default: EVAL_BOOTSTRAP_RESAMPLES env or 10000)",
+    )
+    p_eval.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="Confidence level of bootstrap intervals (default: 0.95)",
+    )
+    p_eval.add_argument(
+        "--baseline-per-case",
+        default="",
+        help="per_case.json of a previous run; adds a paired significance test against it",
+    )
+    p_eval.add_argument(
+        "--alpha",
+        type=float,
+        default=None,
+        help="Check thresholds against the paired baseline run and waive breaches whose "
+             "one-sided paired p-value exceeds ALPHA "
+             "(needs --baseline-per-case; default: thresholds vs the fixture reference decide)",
+    )
     p_eval.add_argument(
         "--verbose", "-v",
         action="store_true",
         help="Print per-case scoring progress",
     )
 
+    # --- benchmark ---
+    p_bench = sub.add_parser(
+        "benchmark",
+        help="Scoring-pipeline throughput per evidence mode with recorded or simulated Ollama responses",
+    )
+    p_bench.add_argument(
+        "--fixtures",
+        default="src/python/ai_scorer/evals/data/canonical/v1.json",
+        help="Canonical fixture file the benchmark jobs and preferences come from",
+    )
+    p_bench.add_argument(
+        "--modes",
+        default="",
+        help="Comma-separated built-in modes (default: all)",
+    )
+    p_bench.add_argument(
+        "--mode",
+        action="append",
+        default=[],
+        help="Extra mode NAME:KEY=VALUE,KEY=VALUE of scorer env overrides; repeatable",
+    )
+    p_bench.add_argument("--jobs", type=int, default=0, help="Jobs per mode (default: each fixture job once)")
+    p_bench.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("AI_SCORER_OLLAMA_PARALLELISM", "1")),
+        help="Jobs scored in parallel (default: AI_SCORER_OLLAMA_PARALLELISM env or 1)",
+    )
+    p_bench.add_argument("--model", default=os.environ.get("OLLAMA_MODEL", "qwen2.5:1.5b"))
+    p_bench.add_argument("--llm-latency-ms", type=float, default=0.0, help="Simulated latency per LLM request")
+    p_bench.add_argument(
+        "--llm-latency-ms-per-1k-chars",
+        type=float,
+        default=0.0,
+        help="Additional simulated latency per 1000 prompt characters",
+    )
+    p_bench.add_argument("--replay", default="", help="JSONL of recorded Ollama responses to replay")
+    p_bench.add_argument(
+        "--use-recorded-latency",
+        action="store_true",
+        help="Sleep for each replayed response's recorded duration",
+    )
+    p_bench.add_argument(
+        "--record",
+        default="",
+        help="Run against the live --ollama-host and append its responses to this JSONL",
+    )
+    p_bench.add_argument("--ollama-host", default=os.environ.get("OLLAMA_HOST", "http://localhost:11434"))
+    p_bench.add_argument("--fake-models", action="store_true", help="Deterministic stand-ins for fastembed models")
+    p_bench.add_argument("--mongo-uri", default="", help="Local Mongo for throwaway databases (default: mongomock)")
+    p_bench.add_argument("--output", default="", help="Write the results as JSON to this path")
+    p_bench.add_argument("--verbose", "-v", action="store_true", help="Keep the scorer's request logs")
+
     return parser
 
 
@@ -256,6 +501,7 @@ def main(argv: list = None) -> int:
         "extract": _cmd_extract,
         "label": _cmd_label,
         "eval": _cmd_eval,
+        "benchmark": _cmd_benchmark,
     }
     return dispatch[args.cmd](args)
 
@@ -14,12 +14,18 @@ Usage (from repo root):
 
 After running, review the output file and edit/correct any labels before
 promoting to data/canonical/.
+
+Each proposed label is appended to a checkpoint (default
+`<output>.checkpoint.jsonl`) as soon as it is made; `--resume` continues an
+interrupted run without relabeling those cases.  Failed model calls are not
+checkpointed, so a resumed run retries them.
 """
 from __future__ import annotations
 
 import argparse
 import os
 
+from src.python.ai_scorer.evals.checkpoint import RunCheckpoint, default_checkpoint_path, input_digest
 from src.python.ai_scorer.evals.schema import EvalCase, dump_fixtures, load_fixtures
 
 from src.python.ai_scorer.ai_scorer import (
@@ -30,8 +36,33 @@ from src.python.ai_scorer.ai_scorer import (
 )
 
 
-def _label_case(case: EvalCase, ollama_client, model_name: str) -> EvalCase:
-    """Run the model for one case and fill in proposed labels."""
+def _case_digest(case: EvalCase) -> str:
+    return input_digest(
+        case.title, case.description, case.location, case.preference_key, case.preference_guidance
+    )
+
+
+def _with_proposed_label(case: EvalCase, proposed: dict) -> EvalCase:
+    return EvalCase(
+        case_id=case.case_id,
+        job_fingerprint=case.job_fingerprint,
+        fingerprint_basis=case.fingerprint_basis,
+        title=case.title,
+        description=case.description,
+        location=case.location,
+        preference_key=case.preference_key,
+        preference_guidance=case.preference_guidance,
+        expected_score=proposed["expected_score"],
+        expected_score_available=proposed["expected_score_available"],
+        rationale=proposed["rationale"],
+        tags=case.tags,
+        schema_version=case.schema_version,
+        provenance=case.provenance,
+    )
+
+
+def _propose_label(case: EvalCase, ollama_client, model_name: str) -> dict:
+    """Model proposal for one case; `failed` is set when the model call raised."""
     job_doc = {
         "title": case.title,
         "description": case.description,
@@ -57,30 +88,22 @@ def _label_case(case: EvalCase, ollama_client, model_name: str) -> EvalCase:
         proposed_score = result.get("score")
         proposed_available = result.get("score_available", False)
         rationale = f"[model={model_name}] score={proposed_score} available={proposed_available}"
+        failed = False
     except Exception as exc:
         proposed_score = None
         proposed_available = False
         rationale = f"[model={model_name}] ERROR: {exc}"
+        failed = True
 
     # N/A case: score_available=False means expected_score must be None
     expected_score = proposed_score if proposed_available else None
 
-    return EvalCase(
-        case_id=case.case_id,
-        job_fingerprint=case.job_fingerprint,
-        fingerprint_basis=case.fingerprint_basis,
-        title=case.title,
-        description=case.description,
-        location=case.location,
-        preference_key=case.preference_key,
-        preference_guidance=case.preference_guidance,
-        expected_score=expected_score,
-        expected_score_available=proposed_available,
-        rationale=rationale,
-        tags=case.tags,
-        schema_version=case.schema_version,
-        provenance=case.provenance,
-    )
+    return {
+        "expected_score": expected_score,
+        "expected_score_available": proposed_available,
+        "rationale": rationale,
+        "failed": failed,
+    }
 
 
 def label_candidates(
@@ -88,6 +111,8 @@ def label_candidates(
     output_path: str,
     ollama_host: str,
     model_name: str,
+    checkpoint_path: str = "",
+    resume: bool = False,
 ) -> None:
     cases = load_fixtures(input_path)
     unlabeled = [c for c in cases if c.expected_score_available is None]
@@ -100,15 +125,27 @@ def label_candidates(
         print("[labeler] Nothing to label.")
         return
 
+    checkpoint_path = checkpoint_path or default_checkpoint_path(output_path)
     ollama_client = build_ollama_client(ollama_host)
     labeled: list = list(already_labeled)
 
-    for i, case in enumerate(unlabeled, 1):
-        print(f"[labeler] {i}/{len(unlabeled)} {case.case_id} "
-              f"pref={case.preference_key!r} ...", end=" ", flush=True)
-        result = _label_case(case, ollama_client, model_name)
-        labeled.append(result)
-        print(f"score={result.expected_score} available={result.expected_score_available}")
+    with RunCheckpoint(checkpoint_path, resume=resume) as checkpoint:
+        print(f"[labeler] checkpoint {checkpoint_path} ({len(checkpoint)} recorded)")
+        for i, case in enumerate(unlabeled, 1):
+            print(f"[labeler] {i}/{len(unlabeled)} {case.case_id} "
+                  f"pref={case.preference_key!r} ...", end=" ", flush=True)
+            digest = _case_digest(case)
+            proposed = checkpoint.get(case.case_id, model_name, digest)
+            source = "checkpoint"
+            if proposed is None:
+                proposed = _propose_label(case, ollama_client, model_name)
+                source = "model"
+                if not proposed["failed"]:
+                    checkpoint.record(case.case_id, model_name, proposed, digest)
+            result = _with_proposed_label(case, proposed)
+            labeled.append(result)
+            print(f"score={result.expected_score} available={result.expected_score_available} "
+                  f"source={source}")
 
     os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
     dump_fixtures(labeled, output_path)
@@ -140,14 +177,30 @@ def main(argv: list = None) -> None:
         default="src/python/ai_scorer/evals/data/proposed/labeled.json",
         help="Output proposed-label fixture file",
     )
+    parser.add_argument(
+        "--checkpoint",
+        default="",
+        help="Checkpoint file of labeled cases (default: <output>.checkpoint.jsonl)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run, skipping cases already in the checkpoint",
+    )
     args = parser.parse_args(argv)
 
-    label_candidates(
-        input_path=args.input,
-        output_path=args.output,
-        ollama_host=args.ollama_host,
-        model_name=args.model,
-    )
+    try:
+        label_candidates(
+            input_path=args.input,
+            output_path=args.output,
+            ollama_host=args.ollama_host,
+            model_name=args.model,
+            checkpoint_path=args.checkpoint,
+            resume=args.resume,
+        )
+    except FileExistsError as exc:
+        print(f"[labeler] ERROR: {exc}")
+        raise SystemExit(2)
 
 
 if __name__ == "__main__":
@@ -3,12 +3,22 @@ Metric computation for AI scorer eval results.
 
 Each run produces a set of CaseResult objects; this module aggregates them
 into EvalMetrics and performs regression comparisons against a baseline.
+
+Results are read once into per-case NumPy columns and every metric is computed
+from those arrays. Exact accuracy, N/A F1 and MAE are all ratios of per-case
+sums, so a bootstrap resample is just a weight vector over cases: a batch of
+resamples becomes one (resamples x cases) @ (cases x columns) product. That
+gives percentile confidence intervals (`compute_metrics(bootstrap_resamples=N)`)
+and paired candidate-vs-baseline tests on the same resamples
+(`paired_bootstrap`) at 10k resamples of a 1k-case set in well under a second.
 """
 from __future__ import annotations
 
 from dataclasses import dataclass, field
 from typing import Optional
 
+import numpy as np
+
 # ---------------------------------------------------------------------------
 # Result types
 # ---------------------------------------------------------------------------
@@ -23,6 +33,7 @@ class CaseResult:
     actual_score_available: Optional[bool]
     error: Optional[str] = None  # set when model call threw an exception
     latency_ms: Optional[float] = None  # wall-clock time for the model call
+    queue_latency_ms: Optional[float] = None  # time spent waiting for a free runner worker
 
 
 @dataclass
@@ -45,6 +56,12 @@ class EvalMetrics:
     p50_latency_ms: Optional[float] = None
     p95_latency_ms: Optional[float] = None
     total_latency_ms: Optional[float] = None
+    # Mean time cases waited for a free runner worker (ms); excluded from the
+    # latency statistics above so they do not depend on runner concurrency
+    mean_queue_latency_ms: Optional[float] = None
+    # Bootstrap percentile intervals, {"exact_accuracy": [low, high], ...};
+    # empty unless compute_metrics ran with bootstrap_resamples > 0
+    intervals: dict = field(default_factory=dict)
 
 
 @dataclass
@@ -54,6 +71,11 @@ class RegressionResult:
     exact_accuracy_drop: float = 0.0
     na_f1_drop: float = 0.0
     mean_abs_error_increase: float = 0.0
+    # Paired bootstrap comparison per metric (see paired_bootstrap), when run
+    significance: dict = field(default_factory=dict)
+    # Threshold breaches not counted because the paired test found them
+    # indistinguishable from noise (only with a significance level)
+    waived: list = field(default_factory=list)
 
 
 # ---------------------------------------------------------------------------
@@ -63,26 +85,197 @@ EXACT_ACCURACY_DROP_THRESHOLD = 0.03
 NA_F1_DROP_THRESHOLD = 0.05
 MAE_INCREASE_THRESHOLD = 0.20
 
-
-# ---------------------------------------------------------------------------
-# Helpers
-# ---------------------------------------------------------------------------
-
-def _percentile(values: list, p: float) -> float:
-    """Linear-interpolation percentile over a non-empty list of floats."""
-    s = sorted(values)
-    k = (len(s) - 1) * p / 100.0
-    lo = int(k)
-    hi = min(lo + 1, len(s) - 1)
-    return s[lo] + (s[hi] - s[lo]) * (k - lo)
+DEFAULT_BOOTSTRAP_RESAMPLES = 10_000
+DEFAULT_CONFIDENCE = 0.95
+# Metrics with intervals and paired tests, in report order.
+INTERVAL_METRICS = ("exact_accuracy", "na_f1", "mean_abs_error")
+# Direction in which each interval metric regresses.
+_REGRESSES_UPWARD = {"exact_accuracy": False, "na_f1": False, "mean_abs_error": True}
 
 
 # ---------------------------------------------------------------------------
 # Core metric computation
 # ---------------------------------------------------------------------------
 
-def compute_metrics(results: list) -> EvalMetrics:
-    """Compute EvalMetrics from a list of CaseResult."""
+_DIST_BUCKETS = ("0", "1", "2", "3", "4", "5", "na", "error")
+# Per-case columns the bootstrap resamples; every metric is a ratio of their sums.
+_EXACT, _NA_TP, _NA_FP, _NA_FN, _MAE_COUNT, _MAE_SUM = range(6)
+
+
+def _availability(value) -> int:
+    # 1 = available, 0 = N/A, -1 = unknown; mirrors truthiness and == of Optional[bool].
+    return -1 if value is None else int(bool(value))
+
+
+def _columns(results: list) -> dict:
+    """Read every CaseResult once into NumPy columns."""
+    n = len(results)
+    errored = np.zeros(n, dtype=bool)
+    expected_available = np.empty(n, dtype=np.int8)
+    actual_available = np.empty(n, dtype=np.int8)
+    expected_score = np.full(n, np.nan)  # NaN = no score
+    actual_score = np.full(n, np.nan)
+    latency = np.full(n, np.nan)
+    queue_latency = np.full(n, np.nan)
+    for i, r in enumerate(results):
+        errored[i] = r.error is not None
+        expected_available[i] = _availability(r.expected_score_available)
+        actual_available[i] = _availability(r.actual_score_available)
+        if r.expected_score is not None:
+            expected_score[i] = r.expected_score
+        if r.actual_score is not None:
+            actual_score[i] = r.actual_score
+        if r.latency_ms is not None:
+            latency[i] = r.latency_ms
+        if r.queue_latency_ms is not None:
+            queue_latency[i] = r.queue_latency_ms
+    return {
+        "errored": errored,
+        "expected_available": expected_available,
+        "actual_available": actual_available,
+        "expected_score": expected_score,
+        "actual_score": actual_score,
+        "latency": latency,
+        "queue_latency": queue_latency,
+    }
+
+
+def _case_matrix(cols: dict) -> np.ndarray:
+    """(cases x 6) float matrix of the per-case terms behind accuracy, N/A F1 and MAE."""
+    ok = ~cols["errored"]
+    exp_av, act_av = cols["expected_available"], cols["actual_available"]
+    exp_s, act_s = cols["expected_score"], cols["actual_score"]
+
+    both_scored = ~np.isnan(exp_s) & ~np.isnan(act_s)
+    same_score = (act_s == exp_s) | (np.isnan(exp_s) & np.isnan(act_s))
+    exact = ok & (act_av == exp_av) & ((exp_av != 1) | same_score)
+
+    # Positive class = N/A. Model errors count as predicted N/A (conservative);
+    # an unknown expected availability counts as scored.
+    predicted_na = ~ok | (act_av != 1)
+    expected_na = exp_av == 0
+
+    scored = ok & (exp_av == 1) & (act_av == 1) & both_scored
+    abs_error = np.where(scored, np.abs(exp_s - act_s), 0.0)
+
+    matrix = np.empty((len(ok), 6))
+    matrix[:, _EXACT] = exact
+    matrix[:, _NA_TP] = predicted_na & expected_na
+    matrix[:, _NA_FP] = predicted_na & ~expected_na
+    matrix[:, _NA_FN] = ~predicted_na & expected_na
+    matrix[:, _MAE_COUNT] = scored
+    matrix[:, _MAE_SUM] = abs_error
+    return matrix
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """numerator / denominator, 0.0 where the denominator is 0."""
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator, dtype=float), where=denominator > 0)
+
+
+def _metrics_from_sums(sums: np.ndarray, totals: np.ndarray) -> dict:
+    """Interval metrics from (..., 6) column sums over (...) case totals."""
+    tp, fp, fn = sums[..., _NA_TP], sums[..., _NA_FP], sums[..., _NA_FN]
+    return {
+        "exact_accuracy": _ratio(sums[..., _EXACT], totals),
+        # Equals 2PR/(P+R), and 0 whenever precision or recall is undefined.
+        "na_f1": _ratio(2 * tp, 2 * tp + fp + fn),
+        "mean_abs_error": _ratio(sums[..., _MAE_SUM], sums[..., _MAE_COUNT]),
+    }
+
+
+def _resample_weights(n: int, resamples: int, rng: np.random.Generator, chunk: int = 1000):
+    """Yield (chunk x n) case multiplicities of `resamples` bootstrap draws."""
+    for start in range(0, resamples, chunk):
+        rows = min(chunk, resamples - start)
+        picks = rng.integers(0, n, size=(rows, n)) + (np.arange(rows) * n)[:, None]
+        yield np.bincount(picks.ravel(), minlength=rows * n).reshape(rows, n).astype(float)
+
+
+def _bootstrap_distributions(matrices: list, resamples: int, seed: int) -> list:
+    """Resampled interval metrics for each (cases x 6) matrix, all on the same draws."""
+    n = matrices[0].shape[0]
+    rng = np.random.default_rng(seed)
+    totals = np.full(resamples, float(n))
+    sums = [np.empty((resamples, 6)) for _ in matrices]
+    offset = 0
+    for weights in _resample_weights(n, resamples, rng):
+        rows = weights.shape[0]
+        for matrix, out in zip(matrices, sums):
+            out[offset:offset + rows] = weights @ matrix
+        offset += rows
+    return [_metrics_from_sums(s, totals) for s in sums]
+
+
+def _interval(values: np.ndarray, confidence: float) -> list:
+    tail = (1.0 - confidence) / 2.0
+    low, high = np.quantile(values, [tail, 1.0 - tail])
+    return [float(low), float(high)]
+
+
+def bootstrap_intervals(
+    results: list,
+    resamples: int = DEFAULT_BOOTSTRAP_RESAMPLES,
+    confidence: float = DEFAULT_CONFIDENCE,
+    seed: int = 0,
+) -> dict:
+    """Percentile bootstrap intervals of exact accuracy, N/A F1 and MAE."""
+    if not results or resamples <= 0:
+        return {}
+    (distribution,) = _bootstrap_distributions([_case_matrix(_columns(results))], resamples, seed)
+    return {name: _interval(distribution[name], confidence) for name in INTERVAL_METRICS}
+
+
+def paired_bootstrap(
+    baseline_results: list,
+    candidate_results: list,
+    resamples: int = DEFAULT_BOOTSTRAP_RESAMPLES,
+    confidence: float = DEFAULT_CONFIDENCE,
+    seed: int = 0,
+) -> dict:
+    """Paired bootstrap comparison of candidate vs baseline on their shared cases.
+
+    Both runs are resampled with the same case draws, so per-case difficulty
+    cancels out of the differences. For each metric returns the point values,
+    `delta` (candidate - baseline), its percentile interval and a one-sided
+    p-value for "the candidate did not regress": the share of draws in which
+    the delta is zero or points away from a regression (lower accuracy or
+    N/A F1, higher MAE).
+    """
+    baseline_map = {r.case_id: r for r in baseline_results}
+    pairs = [(baseline_map[r.case_id], r) for r in candidate_results if r.case_id in baseline_map]
+    if not pairs or resamples <= 0:
+        return {}
+    matrices = [_case_matrix(_columns([pair[side] for pair in pairs])) for side in (0, 1)]
+    total = np.array(float(len(pairs)))
+    points = [_metrics_from_sums(matrix.sum(axis=0), total) for matrix in matrices]
+    baseline_dist, candidate_dist = _bootstrap_distributions(matrices, resamples, seed)
+
+    comparison = {"paired_cases": len(pairs), "resamples": resamples, "confidence": confidence}
+    for name in INTERVAL_METRICS:
+        deltas = candidate_dist[name] - baseline_dist[name]
+        p_value = float(np.mean(deltas <= 0)) if _REGRESSES_UPWARD[name] else float(np.mean(deltas >= 0))
+        comparison[name] = {
+            "baseline": float(points[0][name]),
+            "candidate": float(points[1][name]),
+            "delta": float(points[1][name] - points[0][name]),
+            "delta_interval": _interval(deltas, confidence),
+            "p_value": p_value,
+        }
+    return comparison
+
+
+def compute_metrics(
+    results: list,
+    bootstrap_resamples: int = 0,
+    confidence: float = DEFAULT_CONFIDENCE,
+    seed: int = 0,
+) -> EvalMetrics:
+    """Compute EvalMetrics from a list of CaseResult.
+
+    With `bootstrap_resamples` > 0, `intervals` holds percentile bootstrap
+    intervals of exact accuracy, N/A F1 and MAE at `confidence`.
+    """
     total = len(results)
     if total == 0:
         return EvalMetrics(
@@ -91,109 +284,56 @@ def compute_metrics(results: list) -> EvalMetrics:
             mean_abs_error=0.0,
         )
 
-    errored = sum(1 for r in results if r.error is not None)
-
-    # --- Exact accuracy ---
-    exact_matches = 0
-    for r in results:
-        if r.error is not None:
-            continue
-        if r.actual_score_available == r.expected_score_available:
-            if not r.expected_score_available:
-                # Both N/A → match
-                exact_matches += 1
-            elif r.actual_score == r.expected_score:
-                exact_matches += 1
-
-    exact_accuracy = exact_matches / total
-
-    # --- N/A precision / recall / F1 ---
-    # Positive class = N/A (score_available=False)
-    true_positives = 0   # predicted N/A, expected N/A
-    false_positives = 0  # predicted N/A, expected scored
-    false_negatives = 0  # predicted scored, expected N/A
-
-    for r in results:
-        if r.error is not None:
-            # Treat model errors as predicted N/A for conservative measurement
-            predicted_na = True
-        else:
-            predicted_na = not r.actual_score_available
-
-        expected_na = not r.expected_score_available if r.expected_score_available is not None else False
-
-        if predicted_na and expected_na:
-            true_positives += 1
-        elif predicted_na and not expected_na:
-            false_positives += 1
-        elif not predicted_na and expected_na:
-            false_negatives += 1
-
-    na_precision = (
-        true_positives / (true_positives + false_positives)
-        if (true_positives + false_positives) > 0 else 0.0
-    )
-    na_recall = (
-        true_positives / (true_positives + false_negatives)
-        if (true_positives + false_negatives) > 0 else 0.0
-    )
+    cols = _columns(results)
+    matrix = _case_matrix(cols)
+    sums = matrix.sum(axis=0)
+    point = _metrics_from_sums(sums, np.array(float(total)))
+    tp, fp, fn = sums[_NA_TP], sums[_NA_FP], sums[_NA_FN]
+    na_precision = float(tp / (tp + fp)) if (tp + fp) > 0 else 0.0
+    na_recall = float(tp / (tp + fn)) if (tp + fn) > 0 else 0.0
     na_f1 = (
         2 * na_precision * na_recall / (na_precision + na_recall)
         if (na_precision + na_recall) > 0 else 0.0
     )
 
-    # --- MAE ---
-    mae_errors = []
-    for r in results:
-        if (
-            r.error is None
-            and r.expected_score_available
-            and r.actual_score_available
-            and r.expected_score is not None
-            and r.actual_score is not None
-        ):
-            mae_errors.append(abs(r.expected_score - r.actual_score))
-
-    mean_abs_error = sum(mae_errors) / len(mae_errors) if mae_errors else 0.0
-
     # --- Score distribution ---
-    dist: dict = {"0": 0, "1": 0, "2": 0, "3": 0, "4": 0, "5": 0, "na": 0, "error": 0}
-    for r in results:
-        if r.error is not None:
-            dist["error"] += 1
-        elif not r.actual_score_available:
-            dist["na"] += 1
-        elif r.actual_score is not None and 0 <= r.actual_score <= 5:
-            dist[str(r.actual_score)] += 1
-        else:
-            dist["error"] += 1
+    ok = ~cols["errored"]
+    scored = ok & (cols["actual_available"] == 1)
+    score = cols["actual_score"]
+    dist = {
+        str(bucket): int(np.count_nonzero(scored & (score == bucket))) for bucket in range(6)
+    }
+    dist["na"] = int(np.count_nonzero(ok & (cols["actual_available"] != 1)))
+    dist["error"] = total - sum(dist.values())
+    dist = {bucket: dist[bucket] for bucket in _DIST_BUCKETS}
 
     # --- Latency stats ---
-    latencies = [
-        r.latency_ms for r in results
-        if r.latency_ms is not None and r.error is None
-    ]
-    if latencies:
-        mean_latency_ms = sum(latencies) / len(latencies)
-        p50_latency_ms = _percentile(latencies, 50)
-        p95_latency_ms = _percentile(latencies, 95)
-        total_latency_ms = sum(latencies)
+    latencies = cols["latency"][ok & ~np.isnan(cols["latency"])]
+    if latencies.size:
+        mean_latency_ms = float(latencies.mean())
+        p50_latency_ms, p95_latency_ms = (float(v) for v in np.percentile(latencies, [50, 95]))
+        total_latency_ms = float(latencies.sum())
     else:
         mean_latency_ms = p50_latency_ms = p95_latency_ms = total_latency_ms = None
 
+    queue_latencies = cols["queue_latency"][~np.isnan(cols["queue_latency"])]
+    mean_queue_latency_ms = float(queue_latencies.mean()) if queue_latencies.size else None
+
     return EvalMetrics(
         total=total,
-        errored=errored,
-        exact_accuracy=exact_accuracy,
+        errored=int(np.count_nonzero(cols["errored"])),
+        exact_accuracy=float(point["exact_accuracy"]),
         na_precision=na_precision,
         na_recall=na_recall,
         na_f1=na_f1,
-        mean_abs_error=mean_abs_error,
+        mean_abs_error=float(point["mean_abs_error"]),
         score_distribution=dist,
         mean_latency_ms=mean_latency_ms,
         p50_latency_ms=p50_latency_ms,
         p95_latency_ms=p95_latency_ms,
         total_latency_ms=total_latency_ms,
+        mean_queue_latency_ms=mean_queue_latency_ms,
+        intervals=bootstrap_intervals(results, bootstrap_resamples, confidence, seed),
     )
 
 
@@ -207,34 +347,65 @@ def check_regression(
     exact_accuracy_drop_threshold: float = EXACT_ACCURACY_DROP_THRESHOLD,
     na_f1_drop_threshold: float = NA_F1_DROP_THRESHOLD,
     mae_increase_threshold: float = MAE_INCREASE_THRESHOLD,
+    significance: Optional[dict] = None,
+    alpha: Optional[float] = None,
 ) -> RegressionResult:
-    """Compare candidate vs baseline metrics and return a RegressionResult."""
-    reasons = []
+    """Compare candidate vs baseline metrics and return a RegressionResult.
+
+    `significance` is a `paired_bootstrap` result of the candidate against a
+    previous run; it is recorded on the result. With `alpha` as well, the
+    thresholds are checked against that paired run instead of `baseline`, so
+    breach and test come from the same cases, and a breach whose one-sided
+    p-value exceeds `alpha` is moved to `waived` instead of failing. Without a
+    paired result, nothing is waived.
+    """
+    paired = alpha is not None and all(metric in (significance or {}) for metric in INTERVAL_METRICS)
+    if paired:
+        label = "paired baseline"
+        before = {metric: significance[metric]["baseline"] for metric in INTERVAL_METRICS}
+        after = {metric: significance[metric]["candidate"] for metric in INTERVAL_METRICS}
+    else:
+        label = "baseline"
+        before = {metric: getattr(baseline, metric) for metric in INTERVAL_METRICS}
+        after = {metric: getattr(candidate, metric) for metric in INTERVAL_METRICS}
 
-    exact_drop = baseline.exact_accuracy - candidate.exact_accuracy
-    na_f1_drop = baseline.na_f1 - candidate.na_f1
-    mae_increase = candidate.mean_abs_error - baseline.mean_abs_error
+    breaches = []
+
+    exact_drop = before["exact_accuracy"] - after["exact_accuracy"]
+    na_f1_drop = before["na_f1"] - after["na_f1"]
+    mae_increase = after["mean_abs_error"] - before["mean_abs_error"]
 
     if exact_drop > exact_accuracy_drop_threshold:
-        reasons.append(
+        breaches.append((
+            "exact_accuracy",
             f"exact_accuracy dropped {exact_drop:.3f} "
             f"(threshold={exact_accuracy_drop_threshold}): "
-            f"baseline={baseline.exact_accuracy:.3f} "
-            f"candidate={candidate.exact_accuracy:.3f}"
-        )
+            f"{label}={before['exact_accuracy']:.3f} "
+            f"candidate={after['exact_accuracy']:.3f}",
+        ))
     if na_f1_drop > na_f1_drop_threshold:
-        reasons.append(
+        breaches.append((
+            "na_f1",
             f"na_f1 dropped {na_f1_drop:.3f} "
             f"(threshold={na_f1_drop_threshold}): "
-            f"baseline={baseline.na_f1:.3f} candidate={candidate.na_f1:.3f}"
-        )
+            f"{label}={before['na_f1']:.3f} candidate={after['na_f1']:.3f}",
+        ))
     if mae_increase > mae_increase_threshold:
-        reasons.append(
+        breaches.append((
+            "mean_abs_error",
             f"mean_abs_error increased {mae_increase:.3f} "
             f"(threshold={mae_increase_threshold}): "
-            f"baseline={baseline.mean_abs_error:.3f} "
-            f"candidate={candidate.mean_abs_error:.3f}"
-        )
+            f"{label}={before['mean_abs_error']:.3f} "
+            f"candidate={after['mean_abs_error']:.3f}",
+        ))
+
+    reasons, waived = [], []
+    for metric, reason in breaches:
+        p_value = significance[metric]["p_value"] if paired else None
+        if p_value is not None and p_value > alpha:
+            waived.append(f"{reason}; not significant (p={p_value:.3f} > alpha={alpha})")
+        else:
+            reasons.append(reason)
 
     return RegressionResult(
         passed=len(reasons) == 0,
@@ -242,4 +413,6 @@ def check_regression(
         exact_accuracy_drop=exact_drop,
         na_f1_drop=na_f1_drop,
         mean_abs_error_increase=mae_increase,
+        significance=dict(significance or {}),
+        waived=waived,
     )
@@ -5,6 +5,9 @@ Produces three files in the output directory:
   summary.json    — fixture metadata, candidate metrics, regression result
   per_case.json   — per-case predictions vs golden expected
   report.md       — human-readable markdown report
+
+`read_per_case` loads a previous run's per_case.json back into CaseResult
+objects, so that run can be the baseline of a paired significance test.
 """
 from __future__ import annotations
 
@@ -22,6 +25,14 @@ def _fmt_pct(v: float) -> str:
     return f"{v * 100:.1f}%"
 
 
+def _fmt_interval(interval, fmt) -> str:
+    return f"{fmt(interval[0])} – {fmt(interval[1])}" if interval else "—"
+
+
+def _fmt_mae(v: float) -> str:
+    return f"{v:.3f}"
+
+
 def _golden_score_distribution(cases) -> dict:
     """Build score distribution from golden fixture cases."""
     dist = {str(i): 0 for i in range(6)}
@@ -64,6 +75,8 @@ def write_summary(
             "p95_ms": round(candidate_metrics.p95_latency_ms, 1),
             "total_ms": round(candidate_metrics.total_latency_ms, 1),
         }
+        if candidate_metrics.mean_queue_latency_ms is not None:
+            timing["candidate"]["mean_queue_ms"] = round(candidate_metrics.mean_queue_latency_ms, 1)
     if reference_metrics_dict:
         baseline_mean = reference_metrics_dict.get("mean_latency_ms")
         if baseline_mean is not None:
@@ -88,6 +101,8 @@ def write_summary(
         "regression": {
             "passed": regression.passed,
             "reasons": regression.reasons,
+            "waived": regression.waived,
+            "significance": regression.significance,
             "exact_accuracy": candidate_metrics.exact_accuracy,
             "na_f1": candidate_metrics.na_f1,
             "mean_abs_error": candidate_metrics.mean_abs_error,
@@ -120,6 +135,8 @@ def write_per_case(
                 "actual_score": c.actual_score if c else None,
                 "actual_score_available": c.actual_score_available if c else None,
                 "error": c.error if c else "missing",
+                "latency_ms": c.latency_ms if c else None,
+                "queue_latency_ms": c.queue_latency_ms if c else None,
             },
         })
 
@@ -129,6 +146,28 @@ def write_per_case(
     return path
 
 
+def read_per_case(path: str, model: str) -> list:
+    """CaseResult list of the candidate in a per_case.json written by write_per_case."""
+    from src.python.ai_scorer.evals.metrics import CaseResult
+
+    with open(path, "r", encoding="utf-8") as f:
+        rows = json.load(f)
+    return [
+        CaseResult(
+            case_id=row["case_id"],
+            model=model,
+            expected_score=row.get("expected_score"),
+            expected_score_available=row.get("expected_score_available"),
+            actual_score=row["candidate"].get("actual_score"),
+            actual_score_available=row["candidate"].get("actual_score_available"),
+            error=row["candidate"].get("error"),
+            latency_ms=row["candidate"].get("latency_ms"),
+            queue_latency_ms=row["candidate"].get("queue_latency_ms"),
+        )
+        for row in rows
+    ]
+
+
 def write_report(
     output_dir: str,
     fixture_source: str,
@@ -163,20 +202,54 @@ def write_report(
         lines.append("**FAILED** — candidate violated one or more thresholds:")
         for reason in regression.reasons:
             lines.append(f"- {reason}")
+    if regression.waived:
+        lines += ["", "Threshold breaches waived as not statistically significant:"]
+        for reason in regression.waived:
+            lines.append(f"- {reason}")
     lines.append("")
 
+    intervals = cm.intervals
     lines += [
         "## Candidate Metrics vs Golden Set",
         "",
-        "| Metric | Value |",
-        "|---|---|",
-        f"| Exact accuracy | {_fmt_pct(cm.exact_accuracy)} |",
-        f"| N/A precision | {_fmt_pct(cm.na_precision)} |",
-        f"| N/A recall | {_fmt_pct(cm.na_recall)} |",
-        f"| N/A F1 | {_fmt_pct(cm.na_f1)} |",
-        f"| MAE (scored only) | {cm.mean_abs_error:.3f} |",
-        f"| Errors | {cm.errored}/{cm.total} |",
+        "| Metric | Value | Bootstrap CI |",
+        "|---|---|---|",
+        f"| Exact accuracy | {_fmt_pct(cm.exact_accuracy)} | "
+        f"{_fmt_interval(intervals.get('exact_accuracy'), _fmt_pct)} |",
+        f"| N/A precision | {_fmt_pct(cm.na_precision)} | — |",
+        f"| N/A recall | {_fmt_pct(cm.na_recall)} | — |",
+        f"| N/A F1 | {_fmt_pct(cm.na_f1)} | {_fmt_interval(intervals.get('na_f1'), _fmt_pct)} |",
+        f"| MAE (scored only) | {cm.mean_abs_error:.3f} | "
+        f"{_fmt_interval(intervals.get('mean_abs_error'), _fmt_mae)} |",
+        f"| Errors | {cm.errored}/{cm.total} | — |",
         "",
+    ]
+
+    significance = regression.significance
+    if significance:
+        lines += [
+            "## Paired Comparison vs Baseline Run",
+            "",
+            f"{significance['paired_cases']} shared cases, {significance['resamples']:,} paired bootstrap "
+            f"resamples, {_fmt_pct(significance['confidence'])} intervals.",
+            "",
+            "| Metric | Baseline | Candidate | Delta | Delta CI | p (one-sided, no regression) |",
+            "|---|---|---|---|---|---|",
+        ]
+        for key, label, fmt in [
+            ("exact_accuracy", "Exact accuracy", _fmt_pct),
+            ("na_f1", "N/A F1", _fmt_pct),
+            ("mean_abs_error", "MAE (scored only)", _fmt_mae),
+        ]:
+            row = significance[key]
+            lines.append(
+                f"| {label} | {fmt(row['baseline'])} | {fmt(row['candidate'])} | "
+                f"{row['delta']:+.3f} | {_fmt_interval(row['delta_interval'], lambda v: f'{v:+.3f}')} | "
+                f"{row['p_value']:.3f} |"
+            )
+        lines.append("")
+
+    lines += [
         "## Score Distribution",
         "",
         "| Score | Candidate | Golden |",
@@ -231,6 +304,12 @@ def write_report(
                 f"| P95   | {_fmt_ms(cm.p95_latency_ms)} |",
                 f"| Total | {_fmt_ms(cm.total_latency_ms)} |",
             ]
+        if cm.mean_queue_latency_ms is not None:
+            lines += [
+                "",
+                "Latencies are model service time; cases additionally waited "
+                f"{_fmt_ms(cm.mean_queue_latency_ms)} on average for a free runner worker.",
+            ]
         lines.append("")
     candidate_map = {r.case_id: r for r in candidate_results}
 
@@ -0,0 +1,241 @@
+"""
+Result cache: content-addressed eval results shared across runs.
+
+Unlike the per-run checkpoint, the cache outlives a run and is keyed by
+everything a scored case depends on, not by where it came from:
+
+    case entry = sha256(case payload digest, model tag, model digest,
+                        scoring environment, scorer code version)
+    call entry = sha256(endpoint, model tag, model digest, request body)
+
+A case entry holds the final result of one case, so rerunning an identical
+configuration scores nothing. A call entry holds the raw response of one
+Ollama request made while scoring. When an experiment changes one stage
+(say EVIDENCE_SELECTION_MODE), the affected cases miss the case cache, but
+their availability pass, query expansion and every other request whose prompt
+is unchanged are answered from the call cache. Only the changed calls reach
+the model.
+
+The scoring environment is every environment variable the scorer reads
+(found by scanning its source), minus deployment settings such as hosts and
+queue names. The scorer code version is a digest of the scorer's source files
+and the fastembed version. Editing the scorer therefore invalidates case
+entries, but not call entries: a call entry depends only on the exact request.
+Scoring requests are decoded at temperature 0 unless SCORING_TEMPERATURE says
+otherwise. With sampling, pass `--no-cache` to draw fresh samples.
+
+Entries are small JSON files under `<root>/{cases,calls}/<key[:2]>/<key>.json`,
+written to a temporary name and renamed into place. Concurrent workers and
+runs can therefore share one cache directory.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import Counter
+from typing import Optional
+
+from src.python.ai_scorer.evals.checkpoint import input_digest
+from src.python.ai_scorer.evals.metrics import CaseResult
+
+_SCORER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Source files whose behaviour determines a case result.
+SCORER_SOURCES = (
+    os.path.join(_SCORER_DIR, "ai_scorer.py"),
+    os.path.join(_SCORER_DIR, "scoring_prompt.py"),
+    os.path.join(_SCORER_DIR, "description_normalization.py"),
+    os.path.join(_SCORER_DIR, "evals", "runner.py"),
+)
+# Deployment settings the scorer reads that cannot change a score.
+_DEPLOYMENT_ENV = re.compile(
+    r"^(AI_SCORER_.*|DB_NAME|JOB_SCORING_QUEUE_NAME|MONGO_HOST|OLLAMA_HOST|OLLAMA_MODEL|REDIS_.*|SCORING_PROGRESS_CHANNEL_NAME)$"
+)
+_ENV_READ = re.compile(r"""os\.(?:environ\.get|getenv)\(\s*["']([A-Z0-9_]+)["']|os\.environ\[\s*["']([A-Z0-9_]+)["']""")
+
+
+def default_cache_dir(fixtures_path: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(fixtures_path)), ".eval-cache")
+
+
+def scoring_environment_names() -> list:
+    """Environment variables the scorer reads that can change a score."""
+    names = set()
+    for path in SCORER_SOURCES:
+        with open(path, "r", encoding="utf-8") as f:
+            for match in _ENV_READ.finditer(f.read()):
+                names.add(match.group(1) or match.group(2))
+    return sorted(name for name in names if not _DEPLOYMENT_ENV.match(name))
+
+
+def scoring_environment() -> dict:
+    """Current value (None when unset) of every scoring environment variable."""
+    return {name: os.environ.get(name) for name in scoring_environment_names()}
+
+
+def scorer_code_version() -> str:
+    digest = hashlib.sha256()
+    for path in SCORER_SOURCES:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+
+        digest.update(f"fastembed=={version('fastembed')}".encode("utf-8"))
+    except PackageNotFoundError:
+        pass
+    return digest.hexdigest()
+
+
+def resolve_model_digests(client) -> dict:
+    """Installed model tag -> digest on an Ollama host ({} when it cannot be listed)."""
+    try:
+        listing = client.list()
+    except Exception as exc:
+        print(f"[eval] warn: could not list Ollama models for cache keys ({exc}); keying on model tags only")
+        return {}
+    models = listing.get("models", []) if isinstance(listing, dict) else getattr(listing, "models", [])
+    digests = {}
+    for model in models or []:
+        entry = model if isinstance(model, dict) else model.model_dump()
+        tag = entry.get("model") or entry.get("name")
+        if tag:
+            digests[tag] = entry.get("digest") or ""
+    return digests
+
+
+class EvalResultCache:
+    """Case results and Ollama responses stored by content key under `root`."""
+
+    def __init__(
+        self,
+        root: str,
+        model_digests: Optional[dict] = None,
+        environment: Optional[dict] = None,
+        code_version: Optional[str] = None,
+    ) -> None:
+        self.root = root
+        self.model_digests = dict(model_digests or {})
+        self.environment = scoring_environment() if environment is None else dict(environment)
+        self.code_version = scorer_code_version() if code_version is None else code_version
+        self.stats: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def _digest_of(self, model: str) -> str:
+        return self.model_digests.get(model) or self.model_digests.get(f"{model}:latest", "")
+
+    def case_key(self, case_digest: str, model: str) -> str:
+        return input_digest(
+            "case", case_digest, model, self._digest_of(model), self.environment, self.code_version
+        )
+
+    def call_key(self, endpoint: str, model: str, request: dict) -> str:
+        return input_digest("call", endpoint, model, self._digest_of(model), request)
+
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self.root, kind, key[:2], f"{key}.json")
+
+    def _read(self, kind: str, key: str) -> Optional[dict]:
+        try:
+            with open(self._path(kind, key), "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            value = None
+        with self._lock:
+            self.stats[f"{kind}_{'hits' if value is not None else 'misses'}"] += 1
+        return value
+
+    def _write(self, kind: str, key: str, value: dict) -> None:
+        path = self._path(kind, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, staging = tempfile.mkstemp(prefix=".entry-", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(staging, path)
+        except BaseException:
+            if os.path.exists(staging):
+                os.unlink(staging)
+            raise
+
+    def get_case(self, case, case_digest: str, model: str) -> Optional[CaseResult]:
+        """Cached CaseResult of `case`, or None when it still needs scoring."""
+        recorded = self._read("cases", self.case_key(case_digest, model))
+        if recorded is None:
+            return None
+        return CaseResult(
+            case_id=case.case_id,
+            model=model,
+            expected_score=case.expected_score,
+            expected_score_available=case.expected_score_available,
+            actual_score=recorded.get("actual_score"),
+            actual_score_available=recorded.get("actual_score_available"),
+            latency_ms=recorded.get("latency_ms"),
+        )
+
+    def put_case(self, case_digest: str, model: str, result: CaseResult) -> None:
+        self._write("cases", self.case_key(case_digest, model), {
+            "actual_score": result.actual_score,
+            "actual_score_available": result.actual_score_available,
+            "latency_ms": result.latency_ms,
+        })
+
+    def get_call(self, key: str) -> Optional[dict]:
+        return self._read("calls", key)
+
+    def put_call(self, key: str, response: dict) -> None:
+        self._write("calls", key, response)
+
+
+class _Response:
+    def __init__(self, payload: dict) -> None:
+        self._payload = payload
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def json(self) -> dict:
+        return self._payload
+
+
+class _CachedHttp:
+    """Caches the raw /api/chat posts the scorer makes for logprob requests."""
+
+    def __init__(self, owner: "CachedOllamaClient") -> None:
+        self._owner = owner
+
+    def post(self, path: str, json: dict):
+        cache = self._owner.cache
+        key = cache.call_key(f"post:{path}", json.get("model", ""), json)
+        cached = cache.get_call(key)
+        if cached is not None:
+            return _Response(cached)
+        response = self._owner.inner._client.post(path, json=json)
+        response.raise_for_status()
+        cache.put_call(key, response.json())
+        return response
+
+
+class CachedOllamaClient:
+    """Ollama client that answers repeated requests from an EvalResultCache."""
+
+    def __init__(self, inner, cache: EvalResultCache) -> None:
+        self.inner = inner
+        self.cache = cache
+        self._client = _CachedHttp(self)
+
+    def chat(self, model, messages, options=None, format=None, **kwargs):
+        request = {"messages": messages, "options": options, "format": format, **kwargs}
+        key = self.cache.call_key("chat", model, request)
+        cached = self.cache.get_call(key)
+        if cached is not None:
+            return cached
+        response = self.inner.chat(model=model, messages=messages, options=options, format=format, **kwargs)
+        # Only the content is read back (extract_ollama_content), so only it is stored.
+        from src.python.ai_scorer.ai_scorer import extract_ollama_content
+
+        self.cache.put_call(key, {"message": {"content": extract_ollama_content(response)}})
+        return response
@@ -1,83 +1,224 @@
 """
 Runner: execute eval cases against a live Ollama model and return CaseResult list.
+
+Cases are scored by a pool of `concurrency` worker threads. With several
+Ollama hosts (replicas serving the same model) the workers are spread over
+the hosts round-robin and pull cases from one shared queue, so a slow replica
+does not hold back the others. Results keep the order of `cases`.
+
+`latency_ms` is the service time of the model call only; the time a case
+waited for a free worker is reported separately as `queue_latency_ms`, so
+per-case latency metrics do not grow with the pool size.
+
+With a `checkpoint`, every successfully scored case is appended to it as soon
+as it completes, and cases already recorded for the same model and inputs are
+taken from it instead of being scored again. Errored cases are not recorded,
+so a resumed run retries them.
+
+With a `cache` (see result_cache.py), cases whose payload, model, scoring
+environment and scorer code match an earlier run are taken from it, and the
+Ollama requests of the remaining cases are answered from its call cache when
+an identical request was made before. Cache hits are recorded in the
+checkpoint like scored cases. A case whose scoring hit a soft failure (a
+normalization or evidence step that failed and fell back, see
+`warn_degraded_step`) is returned as scored but not cached, so the next run
+scores it again.
 """
 from __future__ import annotations
 
+import itertools
+import os
+import threading
 import time
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Sequence, Union
 
+from src.python.ai_scorer.evals.checkpoint import RunCheckpoint, input_digest
 from src.python.ai_scorer.evals.metrics import CaseResult
+from src.python.ai_scorer.evals.result_cache import CachedOllamaClient, EvalResultCache
 from src.python.ai_scorer.evals.schema import EvalCase
 
-from src.python.ai_scorer.ai_scorer import build_ollama_client, score_preference
+from src.python.ai_scorer.ai_scorer import build_ollama_client, degraded_step_count, score_preference
+from src.python.ai_scorer.scoring_prompt import SCORING_SYSTEM_INSTRUCTION
+
+
+def _case_digest(case: EvalCase) -> str:
+    return input_digest(
+        case.title,
+        case.description,
+        case.location,
+        case.preference_key,
+        case.preference_guidance,
+        SCORING_SYSTEM_INSTRUCTION,
+        os.environ.get("EVAL_WITH_SYSTEM_PROMPT", "true").lower(),
+    )
+
+
+def checkpointed_result(
+    case: EvalCase, model_name: str, checkpoint: RunCheckpoint
+) -> Optional[CaseResult]:
+    """CaseResult recorded in `checkpoint` for `case`, or None when it still needs scoring."""
+    recorded = checkpoint.get(case.case_id, model_name, _case_digest(case))
+    if recorded is None:
+        return None
+    return CaseResult(
+        case_id=case.case_id,
+        model=model_name,
+        expected_score=case.expected_score,
+        expected_score_available=case.expected_score_available,
+        actual_score=recorded.get("actual_score"),
+        actual_score_available=recorded.get("actual_score_available"),
+        latency_ms=recorded.get("latency_ms"),
+        queue_latency_ms=recorded.get("queue_latency_ms"),
+    )
+
+
+def _score_case(client, case: EvalCase, model_name: str, submitted_at: float) -> CaseResult:
+    job_doc = {
+        "title": case.title,
+        "description": case.description,
+        "location": case.location,
+    }
+    preference = {
+        "key": case.preference_key,
+        "guidance": case.preference_guidance,
+        "weight": 1.0,
+        "enabled": True,
+    }
+
+    actual_score: Optional[int] = None
+    actual_available: Optional[bool] = None
+    error: Optional[str] = None
+
+    t0 = time.perf_counter()
+    try:
+        result = score_preference(
+            ollama_client=client,
+            model_name=model_name,
+            test_mode=False,
+            job_id=case.case_id,
+            preference=preference,
+            job_doc=job_doc,
+            company_doc={},
+            identity_doc={},
+        )
+        actual_score = result.get("score")
+        actual_available = result.get("score_available", False)
+    except Exception as exc:
+        error = str(exc)
+    latency_ms = (time.perf_counter() - t0) * 1000.0
+
+    return CaseResult(
+        case_id=case.case_id,
+        model=model_name,
+        expected_score=case.expected_score,
+        expected_score_available=case.expected_score_available,
+        actual_score=actual_score,
+        actual_score_available=actual_available,
+        error=error,
+        latency_ms=latency_ms,
+        queue_latency_ms=(t0 - submitted_at) * 1000.0,
+    )
 
 
 def run_eval(
     cases: list,
-    ollama_host: str,
+    ollama_host: Union[str, Sequence[str]],
     model_name: str,
     verbose: bool = False,
+    concurrency: int = 1,
+    checkpoint: Optional[RunCheckpoint] = None,
+    cache: Optional[EvalResultCache] = None,
 ) -> list:
-    """Score every EvalCase against `model_name` and return a list of CaseResult."""
-    client = build_ollama_client(ollama_host)
-    results: list = []
+    """Score every EvalCase against `model_name` and return a list of CaseResult.
+
+    `ollama_host` is one host or a list of replica hosts; `concurrency` is the
+    total number of in-flight model calls across all hosts.
+    """
+    hosts = [ollama_host] if isinstance(ollama_host, str) else list(ollama_host)
+    if not hosts:
+        raise ValueError("run_eval needs at least one Ollama host")
+    clients = [build_ollama_client(host) for host in hosts]
+    if cache is not None:
+        clients = [CachedOllamaClient(client, cache) for client in clients]
+    concurrency = max(1, int(concurrency))
+
+    # Each worker thread is bound to one host for its whole life.
+    next_client = itertools.count()
+    worker = threading.local()
+
+    def _bind_worker() -> None:
+        worker.client = clients[next(next_client) % len(clients)]
 
-    for i, case in enumerate(cases, 1):
+    lock = threading.Lock()
+    done = itertools.count(1)
+
+    def _record(case: EvalCase, result: CaseResult) -> None:
+        checkpoint.record(
+            case.case_id,
+            model_name,
+            {
+                "actual_score": result.actual_score,
+                "actual_score_available": result.actual_score_available,
+                "latency_ms": result.latency_ms,
+                "queue_latency_ms": result.queue_latency_ms,
+            },
+            _case_digest(case),
+        )
+
+    def _run(case: EvalCase, submitted_at: float) -> CaseResult:
+        # Soft failures are counted per thread, so the difference belongs to this case.
+        degraded_before = degraded_step_count()
+        result = _score_case(worker.client, case, model_name, submitted_at)
+        degraded = degraded_step_count() != degraded_before
+        if result.error is None:
+            if checkpoint is not None:
+                _record(case, result)
+            if cache is not None and not degraded:
+                cache.put_case(_case_digest(case), model_name, result)
         if verbose:
-            print(f"[runner] {i}/{len(cases)} {case.case_id} "
-                  f"pref={case.preference_key!r} ...", end=" ", flush=True)
-
-        job_doc = {
-            "title": case.title,
-            "description": case.description,
-            "location": case.location,
-        }
-        preference = {
-            "key": case.preference_key,
-            "guidance": case.preference_guidance,
-            "weight": 1.0,
-            "enabled": True,
-        }
-
-        actual_score: Optional[int] = None
-        actual_available: Optional[bool] = None
-        error: Optional[str] = None
-
-        t0 = time.perf_counter()
-        try:
-            result = score_preference(
-                ollama_client=client,
-                model_name=model_name,
-                test_mode=False,
-                job_id=case.case_id,
-                preference=preference,
-                job_doc=job_doc,
-                company_doc={},
-                identity_doc={},
+            outcome = (
+                f"ERROR: {result.error}" if result.error
+                else f"score={result.actual_score} available={result.actual_score_available}"
+                + (" degraded" if degraded else "")
             )
-            actual_score = result.get("score")
-            actual_available = result.get("score_available", False)
-        except Exception as exc:
-            error = str(exc)
-        latency_ms = (time.perf_counter() - t0) * 1000.0
+            with lock:
+                print(f"[runner] {next(done)}/{len(cases)} {case.case_id} "
+                      f"pref={case.preference_key!r} {outcome} "
+                      f"({result.latency_ms:.0f} ms)", flush=True)
+        return result
 
+    resumed = [
+        checkpointed_result(case, model_name, checkpoint) if checkpoint is not None else None
+        for case in cases
+    ]
+    if verbose and any(resumed):
+        print(f"[runner] resuming: {sum(r is not None for r in resumed)}/{len(cases)} "
+              f"cases already in {checkpoint.path}")
+    if cache is not None:
+        for i, case in enumerate(cases):
+            if resumed[i] is None:
+                resumed[i] = cache.get_case(case, _case_digest(case), model_name)
+                if resumed[i] is not None and checkpoint is not None:
+                    _record(case, resumed[i])
         if verbose:
-            if error:
-                print(f"ERROR: {error}")
-            else:
-                print(f"score={actual_score} available={actual_available}")
-
-        results.append(
-            CaseResult(
-                case_id=case.case_id,
-                model=model_name,
-                expected_score=case.expected_score,
-                expected_score_available=case.expected_score_available,
-                actual_score=actual_score,
-                actual_score_available=actual_available,
-                error=error,
-                latency_ms=latency_ms,
-            )
-        )
+            print(f"[runner] result cache: {cache.stats['cases_hits']}/{len(cases)} cases from {cache.root}")
 
+    with ThreadPoolExecutor(
+        max_workers=concurrency,
+        thread_name_prefix="eval-runner",
+        initializer=_bind_worker,
+    ) as pool:
+        submitted_at = time.perf_counter()
+        futures = [
+            None if cached is not None else pool.submit(_run, case, submitted_at)
+            for case, cached in zip(cases, resumed)
+        ]
+        results = [
+            cached if future is None else future.result()
+            for cached, future in zip(resumed, futures)
+        ]
+    if cache is not None and verbose:
+        print(f"[runner] result cache: {cache.stats['calls_hits']} Ollama requests answered from cache, "
+              f"{cache.stats['calls_misses']} sent to the model")
     return results
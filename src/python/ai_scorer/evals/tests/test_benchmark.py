@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from src.python.ai_scorer import ai_scorer
+from src.python.ai_scorer.evals.benchmark import (
+    RecordingOllamaClient,
+    SimulatedOllamaClient,
+    build_corpus,
+    load_recordings,
+    parse_mode,
+    run_mode,
+)
+from src.python.ai_scorer.evals.schema import EvalCase
+
+
+class _Collection:
+    """Just enough of a pymongo collection for the scoring path."""
+
+    def __init__(self):
+        self.docs = []
+
+    @classmethod
+    def _matches(cls, doc, filter_doc):
+        for key, value in filter_doc.items():
+            if key == "$or":
+                if not any(cls._matches(doc, branch) for branch in value):
+                    return False
+            elif isinstance(value, dict) and "$in" in value:
+                if doc.get(key) not in value["$in"]:
+                    return False
+            elif doc.get(key) != value:
+                return False
+        return True
+
+    def insert_one(self, doc):
+        self.docs.append(doc)
+
+    def find_one(self, filter_doc):
+        return next((doc for doc in self.docs if self._matches(doc, filter_doc)), None)
+
+    def find(self, filter_doc=None, projection=None):
+        return [doc for doc in self.docs if self._matches(doc, filter_doc or {})]
+
+    def update_one(self, filter_doc, update_doc, upsert=False):
+        existing = self.find_one(filter_doc)
+        if existing is None:
+            if not upsert:
+                return
+            existing = dict(filter_doc)
+            self.docs.append(existing)
+        existing.update(update_doc.get("$set", {}))
+
+    def count_documents(self, filter_doc):
+        return len(self.find(filter_doc))
+
+
+class _Database(dict):
+    def __missing__(self, name):
+        self[name] = _Collection()
+        return self[name]
+
+
+def _cases() -> list:
+    descriptions = [
+        "We build payment APIs.\n\n- Write Go and Python services\n- Own the Postgres schema\n- Fully remote team",
+        "Design marketing pages.\n\n- Figma and CSS\n- On-site in Berlin five days a week",
+    ]
+    guidance = ["Prefers backend engineering work", "Prefers fully remote roles"]
+    return [
+        EvalCase(
+            case_id=f"{i}-{j}",
+            job_fingerprint=f"fp-{i}",
+            fingerprint_basis="description",
+            title="Engineer",
+            description=description,
+            location="Remote",
+            preference_key=f"pref{j}",
+            preference_guidance=text,
+            expected_score_available=True,
+            expected_score=3,
+            rationale="",
+            tags=[],
+        )
+        for i, description in enumerate(descriptions)
+        for j, text in enumerate(guidance)
+    ]
+
+
+class _FixedClient:
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    def chat(self, model, messages, options=None, format=None):
+        self.calls += 1
+        return {"message": {"content": self.content}}
+
+
+class SimulatedOllamaClientTests(unittest.TestCase):
+    def test_synthesized_answers_satisfy_the_scorer_contracts(self):
+        client = SimulatedOllamaClient()
+        snippets = ["Write Go services", "Fully remote team", "Figma and CSS"]
+
+        query = ai_scorer.expand_retrieval_query(client, "Prefers remote roles")
+        selected = ai_scorer.select_scoring_snippets_with_compact_llm(
+            client, "Prefers remote roles", snippets, top_k=2
+        )
+        result, confidence = ai_scorer.request_preference_score_with_confidence(
+            client, "m", {"key": "k", "guidance": "g"}, {"title": "t"}, {}, {}, snippets
+        )
+
+        self.assertIn("Prefers remote roles", query)
+        self.assertEqual(len(selected), 2)
+        self.assertIn("score_available", result)
+        self.assertLess(confidence, 0.0)
+        self.assertEqual(client.counts["requests"], 3)
+        self.assertEqual(client.counts["requests_post"], 1)
+
+    def test_recorded_responses_are_replayed(self):
+        path = os.path.join(tempfile.mkdtemp(), "recorded.jsonl")
+        messages = [{"role": "user", "content": "Score this job"}]
+        live = _FixedClient("4")
+        recorder = RecordingOllamaClient(live, path)
+
+        recorder.chat(model="m", messages=messages, options={})
+        replay = SimulatedOllamaClient(recordings=load_recordings(path))
+        response = replay.chat(model="m", messages=messages, options={})
+        replay.chat(model="m", messages=[{"role": "user", "content": "Another job"}], options={})
+
+        self.assertEqual(live.calls, 1)
+        self.assertEqual(response["message"]["content"], "4")
+        self.assertEqual(replay.counts["replayed"], 1)
+        self.assertEqual(replay.counts["synthesized"], 1)
+
+
+class RunModeTests(unittest.TestCase):
+    def _run(self, mode: str) -> dict:
+        corpus = build_corpus(_cases(), job_limit=3)
+        name, env = parse_mode(mode)
+        return run_mode(
+            name,
+            env,
+            corpus,
+            (_Database(), lambda: None),
+            SimulatedOllamaClient(na_every=0),
+            model_name="m",
+            workers=2,
+            fake_models=True,
+        )
+
+    def test_modes_report_throughput_and_model_call_costs(self):
+        baseline = self._run("baseline")
+        compact = self._run("compact_llm")
+
+        self.assertEqual((baseline["jobs"], baseline["preferences"]), (3, 6))
+        self.assertEqual(baseline["scored_jobs"], 3)
+        self.assertEqual(compact["scored_jobs"], 3)
+        # Availability pass + final score, plus one cached query expansion per guidance.
+        self.assertAlmostEqual(baseline["llm_calls_per_preference"], (6 * 2 + 2) / 6)
+        self.assertAlmostEqual(compact["llm_calls_per_preference"] - baseline["llm_calls_per_preference"], 1.0)
+        self.assertGreater(baseline["embedding_calls_per_job"], 0)
+        self.assertGreater(baseline["rerank_calls_per_job"], 0)
+        self.assertEqual(compact["rerank_calls_per_job"], 0)
+        self.assertLessEqual(baseline["p50_job_ms"], baseline["p95_job_ms"])
+
+    def test_custom_modes_and_unknown_modes(self):
+        self.assertEqual(parse_mode("mine:FINAL_ORDER_ROUTING=confidence"), ("mine", {"FINAL_ORDER_ROUTING": "confidence"}))
+        with self.assertRaises(ValueError):
+            parse_mode("no_such_mode")
+
+    def test_llm_result_caches_start_cold_in_every_mode(self):
+        ai_scorer._QUERY_EXPANSION_CACHE[("m", "", "Prefers fully remote roles")] = "stale"
+
+        self._run("baseline")
+
+        self.assertNotIn("stale", ai_scorer._QUERY_EXPANSION_CACHE.values())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.python.ai_scorer.evals import runner
+from src.python.ai_scorer.evals.checkpoint import RunCheckpoint, input_digest
+from src.python.ai_scorer.evals.schema import EvalCase
+
+
+def _case(case_id: str, description: str = "Build services.") -> EvalCase:
+    return EvalCase(
+        case_id=case_id,
+        job_fingerprint="fp",
+        fingerprint_basis="description",
+        title="Backend Engineer",
+        description=description,
+        location="Remote",
+        preference_key="remote",
+        preference_guidance="Prefers remote roles",
+        expected_score_available=True,
+        expected_score=3,
+        rationale="",
+        tags=[],
+    )
+
+
+class RunCheckpointTests(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "run", "checkpoint.jsonl")
+
+    def test_records_survive_reopen_with_resume(self):
+        with RunCheckpoint(self.path) as checkpoint:
+            checkpoint.record("a", "m", {"score": 3}, input_digest("x"))
+
+        with RunCheckpoint(self.path, resume=True) as checkpoint:
+            self.assertEqual(checkpoint.get("a", "m", input_digest("x")), {"score": 3})
+            self.assertIsNone(checkpoint.get("a", "other-model"))
+            self.assertIsNone(checkpoint.get("a", "m", input_digest("changed")))
+
+    def test_existing_checkpoint_is_not_overwritten_without_resume(self):
+        with RunCheckpoint(self.path) as checkpoint:
+            checkpoint.record("a", "m", {"score": 3})
+
+        with self.assertRaises(FileExistsError):
+            RunCheckpoint(self.path)
+
+    def test_truncated_last_line_is_skipped_and_appends_start_a_new_line(self):
+        with RunCheckpoint(self.path) as checkpoint:
+            checkpoint.record("a", "m", {"score": 3})
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"case_id": "b", "mod')
+
+        with RunCheckpoint(self.path, resume=True) as checkpoint:
+            self.assertEqual(checkpoint.skipped_lines, 1)
+            checkpoint.record("c", "m", {"score": 1})
+
+        reopened = RunCheckpoint(self.path, resume=True, read_only=True)
+        self.assertEqual(len(reopened), 2)
+        self.assertEqual(reopened.get("c", "m"), {"score": 1})
+
+    def test_read_only_checkpoint_rejects_records(self):
+        with RunCheckpoint(self.path) as checkpoint:
+            checkpoint.record("a", "m", {"score": 3})
+
+        reader = RunCheckpoint(self.path, resume=True, read_only=True)
+
+        with self.assertRaises(RuntimeError):
+            reader.record("b", "m", {})
+
+
+class RunEvalResumeTests(unittest.TestCase):
+    def _run(self, cases, score_fn, checkpoint):
+        with patch.object(runner, "build_ollama_client", side_effect=lambda host: host), \
+                patch.object(runner, "score_preference", side_effect=score_fn) as score:
+            results = runner.run_eval(cases, "h", "m", concurrency=2, checkpoint=checkpoint)
+        return results, score
+
+    def test_resume_skips_completed_cases_and_retries_errors(self):
+        path = os.path.join(tempfile.mkdtemp(), "checkpoint.jsonl")
+        cases = [_case("a"), _case("b"), _case("c")]
+
+        def flaky(**kwargs):
+            if kwargs["job_id"] == "b":
+                raise RuntimeError("ollama restarted")
+            return {"score": 4, "score_available": True}
+
+        with RunCheckpoint(path) as checkpoint:
+            first, _ = self._run(cases, flaky, checkpoint)
+        self.assertEqual(first[1].error, "ollama restarted")
+
+        changed = [cases[0], cases[1], _case("c", description="Edited description.")]
+        with RunCheckpoint(path, resume=True) as checkpoint:
+            resumed, score = self._run(changed, lambda **kwargs: {"score": 2, "score_available": True}, checkpoint)
+
+        self.assertEqual(sorted(call.kwargs["job_id"] for call in score.call_args_list), ["b", "c"])
+        self.assertEqual([r.case_id for r in resumed], ["a", "b", "c"])
+        self.assertEqual([r.actual_score for r in resumed], [4, 2, 2])
+        self.assertIsNotNone(resumed[0].latency_ms)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import random
 import unittest
 
 from src.python.ai_scorer.evals.metrics import (
@@ -8,8 +9,10 @@ from src.python.ai_scorer.evals.metrics import (
     NA_F1_DROP_THRESHOLD,
     CaseResult,
     EvalMetrics,
+    bootstrap_intervals,
     check_regression,
     compute_metrics,
+    paired_bootstrap,
 )
 
 
@@ -203,6 +206,123 @@ class TestCheckRegression(unittest.TestCase):
         self.assertAlmostEqual(result.na_f1_drop, 0.02)
         self.assertAlmostEqual(result.mean_abs_error_increase, 0.05)
 
+    def test_significance_is_recorded_and_alpha_waives_noisy_breaches(self):
+        b = self._make_metrics(0.80, 0.70, 0.50)
+        c = self._make_metrics(0.70, 0.60, 0.50)
+        significance = {
+            "exact_accuracy": {"baseline": 0.80, "candidate": 0.70, "p_value": 0.40},
+            "na_f1": {"baseline": 0.70, "candidate": 0.60, "p_value": 0.01},
+            "mean_abs_error": {"baseline": 0.50, "candidate": 0.50, "p_value": 1.0},
+        }
+
+        informational = check_regression(b, c, significance=significance)
+        gated = check_regression(b, c, significance=significance, alpha=0.05)
+
+        self.assertEqual(len(informational.reasons), 2)
+        self.assertEqual(informational.significance, significance)
+        self.assertFalse(gated.passed)
+        self.assertEqual([r.split()[0] for r in gated.reasons], ["na_f1"])
+        self.assertEqual(len(gated.waived), 1)
+        self.assertIn("exact_accuracy", gated.waived[0])
+
+    def test_alpha_checks_thresholds_against_the_paired_baseline(self):
+        reference = self._make_metrics(0.90, 0.70, 0.50)
+        candidate = self._make_metrics(0.80, 0.70, 0.50)
+        # The paired baseline run scored like the candidate, so there is no breach to waive.
+        significance = {
+            "exact_accuracy": {"baseline": 0.81, "candidate": 0.80, "p_value": 0.30},
+            "na_f1": {"baseline": 0.70, "candidate": 0.70, "p_value": 1.0},
+            "mean_abs_error": {"baseline": 0.50, "candidate": 0.50, "p_value": 1.0},
+        }
+
+        result = check_regression(reference, candidate, significance=significance, alpha=0.05)
+
+        self.assertTrue(result.passed)
+        self.assertEqual(result.waived, [])
+        self.assertAlmostEqual(result.exact_accuracy_drop, 0.01)
+
+    def test_alpha_without_a_paired_result_waives_nothing(self):
+        b = self._make_metrics(0.80, 0.70, 0.50)
+        c = self._make_metrics(0.70, 0.70, 0.50)
+
+        result = check_regression(b, c, significance={}, alpha=0.05)
+
+        self.assertFalse(result.passed)
+        self.assertEqual(result.waived, [])
+
+
+def _random_results(rng, count, model="m"):
+    results = []
+    for i in range(count):
+        expected_available = rng.random() < 0.7
+        actual_available = rng.random() < 0.7
+        results.append(CaseResult(
+            case_id=f"case-{i}",
+            model=model,
+            expected_score=rng.randint(0, 5) if expected_available else None,
+            expected_score_available=expected_available,
+            actual_score=rng.randint(0, 5) if actual_available else None,
+            actual_score_available=actual_available,
+            error="timeout" if rng.random() < 0.05 else None,
+        ))
+    return results
+
+
+class TestBootstrap(unittest.TestCase):
+    def test_intervals_contain_point_estimates_and_are_seeded(self):
+        results = _random_results(random.Random(1), 300)
+
+        m = compute_metrics(results, bootstrap_resamples=2000, seed=5)
+
+        self.assertEqual(set(m.intervals), {"exact_accuracy", "na_f1", "mean_abs_error"})
+        for name, (low, high) in m.intervals.items():
+            self.assertLessEqual(low, getattr(m, name))
+            self.assertGreaterEqual(high, getattr(m, name))
+            self.assertLess(low, high)
+        self.assertEqual(bootstrap_intervals(results, 2000, seed=5), m.intervals)
+        self.assertEqual(compute_metrics(results).intervals, {})
+
+    def test_identical_runs_are_not_significantly_different(self):
+        results = _random_results(random.Random(2), 200)
+
+        comparison = paired_bootstrap(results, results, resamples=1000)
+
+        self.assertEqual(comparison["paired_cases"], 200)
+        for name in ("exact_accuracy", "na_f1", "mean_abs_error"):
+            self.assertEqual(comparison[name]["delta"], 0.0)
+            self.assertEqual(comparison[name]["delta_interval"], [0.0, 0.0])
+            self.assertEqual(comparison[name]["p_value"], 1.0)
+
+    def test_paired_test_detects_a_real_regression_on_shared_cases(self):
+        baseline = [_scored(f"case-{i}", i % 6, i % 6) for i in range(400)]
+        # Every fourth case is now off by two; a few unmatched cases are ignored.
+        candidate = [
+            _scored(f"case-{i}", i % 6, (i % 6 + 2) % 6 if i % 4 == 0 else i % 6) for i in range(400)
+        ] + [_scored("extra", 1, 1)]
+
+        comparison = paired_bootstrap(baseline, candidate, resamples=2000)
+
+        self.assertEqual(comparison["paired_cases"], 400)
+        accuracy = comparison["exact_accuracy"]
+        self.assertAlmostEqual(accuracy["delta"], -0.25)
+        self.assertLess(accuracy["delta_interval"][1], 0.0)
+        self.assertLess(accuracy["p_value"], 0.01)
+        self.assertGreater(comparison["mean_abs_error"]["delta"], 0.0)
+        self.assertLess(comparison["mean_abs_error"]["p_value"], 0.01)
+
+    def test_paired_p_value_is_one_sided_in_the_regression_direction(self):
+        baseline = [_scored(f"case-{i}", i % 6, (i % 6 + 2) % 6 if i % 4 == 0 else i % 6) for i in range(400)]
+        candidate = [_scored(f"case-{i}", i % 6, i % 6) for i in range(400)]
+
+        comparison = paired_bootstrap(baseline, candidate, resamples=2000)
+
+        # A clear improvement is no evidence of a regression.
+        self.assertGreater(comparison["exact_accuracy"]["p_value"], 0.99)
+        self.assertGreater(comparison["mean_abs_error"]["p_value"], 0.99)
+
+    def test_no_shared_cases_gives_no_comparison(self):
+        self.assertEqual(paired_bootstrap([_scored("a", 1, 1)], [_scored("b", 1, 1)]), {})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.python.ai_scorer import ai_scorer
+from src.python.ai_scorer.evals import runner
+from src.python.ai_scorer.evals.result_cache import (
+    CachedOllamaClient,
+    EvalResultCache,
+    resolve_model_digests,
+    scoring_environment_names,
+)
+from src.python.ai_scorer.evals.schema import EvalCase
+
+
+def _case(case_id: str, description: str = "Build services.") -> EvalCase:
+    return EvalCase(
+        case_id=case_id,
+        job_fingerprint="fp",
+        fingerprint_basis="description",
+        title="Backend Engineer",
+        description=description,
+        location="Remote",
+        preference_key="remote",
+        preference_guidance="Prefers remote roles",
+        expected_score_available=True,
+        expected_score=3,
+        rationale="",
+        tags=[],
+    )
+
+
+class _Response:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        return None
+
+    def json(self):
+        return self.payload
+
+
+class _Http:
+    def __init__(self):
+        self.posts = 0
+
+    def post(self, path, json):
+        self.posts += 1
+        return _Response({"message": {"content": "4"}, "logprobs": [{"logprob": -0.1}]})
+
+
+class _Client:
+    def __init__(self):
+        self.chats = 0
+        self._client = _Http()
+
+    def chat(self, model, messages, options=None, format=None):
+        self.chats += 1
+        return {"message": {"content": f"answer {self.chats}"}}
+
+    def list(self):
+        return {"models": [{"model": "m:latest", "digest": "sha-1"}]}
+
+
+class ScoringEnvironmentTests(unittest.TestCase):
+    def test_scoring_settings_are_keyed_and_deployment_settings_are_not(self):
+        names = scoring_environment_names()
+
+        self.assertIn("EVIDENCE_SELECTION_MODE", names)
+        self.assertIn("SCORING_TEMPERATURE", names)
+        self.assertNotIn("OLLAMA_HOST", names)
+        self.assertNotIn("REDIS_HOST", names)
+
+    def test_model_digests_are_read_from_the_host(self):
+        self.assertEqual(resolve_model_digests(_Client()), {"m:latest": "sha-1"})
+
+
+class CachedOllamaClientTests(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def test_identical_requests_are_answered_from_the_cache(self):
+        inner = _Client()
+        client = CachedOllamaClient(inner, EvalResultCache(self.root, environment={}, code_version="v1"))
+        messages = [{"role": "user", "content": "Score this job"}]
+
+        first = client.chat(model="m", messages=messages, options={"temperature": 0})
+        again = client.chat(model="m", messages=messages, options={"temperature": 0})
+        client.chat(model="m", messages=[{"role": "user", "content": "Another job"}], options={"temperature": 0})
+        posted = client._client.post("/api/chat", json={"model": "m", "messages": messages})
+        reposted = client._client.post("/api/chat", json={"model": "m", "messages": messages})
+
+        self.assertEqual(inner.chats, 2)
+        self.assertEqual(inner._client.posts, 1)
+        self.assertEqual(again["message"]["content"], first["message"]["content"])
+        self.assertEqual(reposted.json(), posted.json())
+
+    def test_a_new_model_digest_misses_the_call_cache(self):
+        inner = _Client()
+        messages = [{"role": "user", "content": "Score this job"}]
+        for digest in ("sha-1", "sha-2"):
+            cache = EvalResultCache(self.root, model_digests={"m": digest}, environment={}, code_version="v1")
+            CachedOllamaClient(inner, cache).chat(model="m", messages=messages)
+
+        self.assertEqual(inner.chats, 2)
+
+
+class RunEvalCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def _run(self, cases, cache):
+        with patch.object(runner, "build_ollama_client", side_effect=lambda host: _Client()), \
+                patch.object(runner, "score_preference", return_value={"score": 4, "score_available": True}) as score:
+            results = runner.run_eval(cases, "h", "m", concurrency=2, cache=cache)
+        return results, score
+
+    def test_repeated_run_scores_only_cases_whose_inputs_changed(self):
+        cases = [_case("a"), _case("b")]
+        self._run(cases, EvalResultCache(self.root, environment={}, code_version="v1"))
+
+        changed = [cases[0], _case("b", description="Edited description.")]
+        results, score = self._run(changed, EvalResultCache(self.root, environment={}, code_version="v1"))
+
+        self.assertEqual([call.kwargs["job_id"] for call in score.call_args_list], ["b"])
+        self.assertEqual([r.actual_score for r in results], [4, 4])
+        self.assertIsNotNone(results[0].latency_ms)
+
+    def test_scoring_environment_and_code_version_are_part_of_the_key(self):
+        cases = [_case("a")]
+        self._run(cases, EvalResultCache(self.root, environment={"EVIDENCE_SELECTION_MODE": None}, code_version="v1"))
+
+        _, by_env = self._run(
+            cases, EvalResultCache(self.root, environment={"EVIDENCE_SELECTION_MODE": "compact_llm"}, code_version="v1")
+        )
+        _, by_code = self._run(
+            cases, EvalResultCache(self.root, environment={"EVIDENCE_SELECTION_MODE": None}, code_version="v2")
+        )
+
+        self.assertEqual(by_env.call_count, 1)
+        self.assertEqual(by_code.call_count, 1)
+
+    def test_errored_cases_are_not_cached(self):
+        cases = [_case("a")]
+        with patch.object(runner, "build_ollama_client", side_effect=lambda host: _Client()), \
+                patch.object(runner, "score_preference", side_effect=RuntimeError("ollama down")):
+            runner.run_eval(cases, "h", "m", cache=EvalResultCache(self.root, environment={}, code_version="v1"))
+
+        _, score = self._run(cases, EvalResultCache(self.root, environment={}, code_version="v1"))
+
+        self.assertEqual(score.call_count, 1)
+
+    def test_cases_scored_after_a_soft_failure_are_not_cached(self):
+        cases = [_case("a"), _case("b", description="Run the data platform.")]
+
+        def degraded_for_a(*args, **kwargs):
+            if kwargs["job_id"] == "a":
+                ai_scorer.warn_degraded_step("warn: Failed to retrieve baseline scoring evidence: {}")
+            return {"score": 4, "score_available": True}
+
+        with patch.object(runner, "build_ollama_client", side_effect=lambda host: _Client()), \
+                patch.object(runner, "score_preference", side_effect=degraded_for_a), \
+                patch("builtins.print"):
+            results = runner.run_eval(cases, "h", "m", cache=EvalResultCache(self.root, environment={}, code_version="v1"))
+
+        _, score = self._run(cases, EvalResultCache(self.root, environment={}, code_version="v1"))
+
+        self.assertEqual([r.actual_score for r in results], [4, 4])
+        self.assertEqual([call.kwargs["job_id"] for call in score.call_args_list], ["a"])
+
+    def test_cache_summary_is_printed_only_when_verbose(self):
+        cache = EvalResultCache(self.root, environment={}, code_version="v1")
+        with patch("builtins.print") as quiet:
+            self._run([_case("a")], cache)
+        with patch.object(runner, "build_ollama_client", side_effect=lambda host: _Client()), \
+                patch.object(runner, "score_preference", return_value={"score": 4, "score_available": True}), \
+                patch("builtins.print") as verbose:
+            runner.run_eval([_case("a")], "h", "m", verbose=True, cache=cache)
+
+        self.assertFalse(any("result cache" in str(call) for call in quiet.call_args_list))
+        self.assertTrue(any("result cache" in str(call) for call in verbose.call_args_list))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.python.ai_scorer.evals import runner
+from src.python.ai_scorer.evals.metrics import compute_metrics
+from src.python.ai_scorer.evals.schema import EvalCase
+
+
+def _case(case_id: str, expected_score: int = 3) -> EvalCase:
+    return EvalCase(
+        case_id=case_id,
+        job_fingerprint="fp",
+        fingerprint_basis="description",
+        title="Backend Engineer",
+        description="Build services.",
+        location="Remote",
+        preference_key="remote",
+        preference_guidance="Prefers remote roles",
+        expected_score_available=True,
+        expected_score=expected_score,
+        rationale="",
+        tags=[],
+    )
+
+
+class RunEvalTests(unittest.TestCase):
+    def _run(self, cases, score_fn, **kwargs):
+        with patch.object(runner, "build_ollama_client", side_effect=lambda host: host), \
+                patch.object(runner, "score_preference", side_effect=score_fn):
+            return runner.run_eval(cases, model_name="m", **kwargs)
+
+    def test_results_keep_case_order_under_concurrency(self):
+        cases = [_case(f"c{i}", expected_score=i % 6) for i in range(12)]
+
+        def score(**kwargs):
+            # Later cases finish first.
+            time.sleep(0.002 * (12 - int(kwargs["job_id"][1:])))
+            return {"score": int(kwargs["job_id"][1:]) % 6, "score_available": True}
+
+        results = self._run(cases, score, ollama_host="h", concurrency=4)
+
+        self.assertEqual([r.case_id for r in results], [c.case_id for c in cases])
+        self.assertEqual(compute_metrics(results).exact_accuracy, 1.0)
+
+    def test_concurrency_bounds_in_flight_calls(self):
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def score(**kwargs):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            return {"score": 3, "score_available": True}
+
+        self._run([_case(f"c{i}") for i in range(9)], score, ollama_host="h", concurrency=3)
+
+        self.assertEqual(peak, 3)
+
+    def test_workers_are_spread_over_hosts(self):
+        used_hosts = set()
+        lock = threading.Lock()
+
+        def score(**kwargs):
+            with lock:
+                used_hosts.add(kwargs["ollama_client"])
+            time.sleep(0.01)
+            return {"score": 3, "score_available": True}
+
+        self._run([_case(f"c{i}") for i in range(8)], score, ollama_host=["h1", "h2"], concurrency=2)
+
+        self.assertEqual(used_hosts, {"h1", "h2"})
+
+    def test_queue_wait_is_reported_apart_from_service_latency(self):
+        def score(**kwargs):
+            time.sleep(0.02)
+            return {"score": 3, "score_available": True}
+
+        first, second = self._run([_case("a"), _case("b")], score, ollama_host="h", concurrency=1)
+
+        self.assertGreaterEqual(first.latency_ms, 20)
+        self.assertLess(first.queue_latency_ms, 20)
+        self.assertLess(second.latency_ms, first.latency_ms + 20)
+        self.assertGreaterEqual(second.queue_latency_ms, 20)
+        self.assertIsNotNone(compute_metrics([first, second]).mean_queue_latency_ms)
+
+    def test_model_errors_are_recorded_per_case(self):
+        def score(**kwargs):
+            if kwargs["job_id"] == "bad":
+                raise RuntimeError("connection refused")
+            return {"score": 3, "score_available": True}
+
+        results = self._run([_case("ok"), _case("bad")], score, ollama_host="h", concurrency=2)
+
+        self.assertIsNone(results[0].error)
+        self.assertEqual(results[1].error, "connection refused")
+
+
+if __name__ == "__main__":
+    unittest.main()
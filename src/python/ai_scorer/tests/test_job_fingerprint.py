@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import os
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import patch
 
+from src.python.ai_scorer.evals.checkpoint import RunCheckpoint
 from src.python.ai_scorer.evals.schema import load_fixtures, validate_fixtures
 from src.python.ai_scorer.job_fingerprint import (
     DESCRIPTION_BASIS,
@@ -288,6 +291,51 @@ class JobFingerprintTests(unittest.TestCase):
         self.assertEqual(result[0].label_score, 2)
         self.assertTrue(result[0].label_available)
 
+    def test_checkpointed_gemini_labels_are_not_paid_again_on_resume(self):
+        fingerprint, basis = description_fingerprint("Job description")
+        first = TrainingCase(
+            case_id="first",
+            job_fingerprint=fingerprint,
+            fingerprint_basis=basis,
+            title="Engineer",
+            location="Remote",
+            preference_key="coding",
+            preference_guidance="Coding",
+            relevant_snippets=["Code"],
+            system_prompt="System",
+            user_prompt="First user prompt",
+            label_score=None,
+            label_available=None,
+        )
+        second = TrainingCase(**{**first.__dict__, "case_id": "second", "user_prompt": "Second user prompt"})
+        path = os.path.join(tempfile.mkdtemp(), "labeled.json.checkpoint.jsonl")
+
+        with (
+            patch("src.python.ai_scorer.training.labeler._build_gemini_model"),
+            patch(
+                "src.python.ai_scorer.training.labeler._label_case",
+                side_effect=[(4, True), RuntimeError("quota exhausted")],
+            ),
+            RunCheckpoint(path) as checkpoint,
+        ):
+            with self.assertRaises(RuntimeError):
+                label_cases([first, second], "test-model", allow_paid_calls=True, checkpoint=checkpoint)
+
+        with RunCheckpoint(path, resume=True) as checkpoint:
+            with self.assertRaisesRegex(RuntimeError, "1 cases require Gemini"):
+                label_cases([first, second], "test-model", allow_paid_calls=False, checkpoint=checkpoint)
+            with (
+                patch("src.python.ai_scorer.training.labeler._build_gemini_model"),
+                patch(
+                    "src.python.ai_scorer.training.labeler._label_case",
+                    return_value=(None, False),
+                ) as paid_label,
+            ):
+                result = label_cases([first, second], "test-model", allow_paid_calls=True, checkpoint=checkpoint)
+
+        paid_label.assert_called_once_with("test-model", second)
+        self.assertEqual([(case.label_score, case.label_available) for case in result], [(4, True), (None, False)])
+
     def test_future_extraction_excludes_and_splits_before_expansion(self):
         golden, _ = description_fingerprint("Golden description")
         docs = [
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import sys
+import tempfile
 import unittest
 from types import SimpleNamespace
 from unittest.mock import patch
@@ -16,6 +17,12 @@ from src.python.ai_scorer.training.fine_tune_train import (
     _encode_chat_full,
     _encode_response_only,
     _encode_training_example,
+    _source_row_indices,
+)
+from src.python.ai_scorer.training.tokenization_cache import (
+    load_or_encode_split,
+    tokenization_cache_key,
+    tokenizer_fingerprint,
 )
 from src.python.ai_scorer.training.training_balance import BALANCED_MODE, SAMPLING_MODES
 from src.python.ai_scorer.training.cli import _cmd_label, _cmd_train, build_parser
@@ -291,5 +298,62 @@ class TrainingLossModeEncodingTests(unittest.TestCase):
         self.assertEqual(configured["torch_interop_threads"], 1)
 
 
+class TokenizationCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tokenizer = _FakeQwenTokenizer()
+        self.cache_root = tempfile.mkdtemp()
+        self.rows = [{"messages": _messages(user_content="job " * index)} for index in range(1, 6)]
+
+    def _encode(self, row):
+        return _encode_training_example(row["messages"], self.tokenizer, 40, "response-only")
+
+    def test_cached_split_matches_direct_encoding_and_is_reused(self):
+        key = tokenization_cache_key(tokenizer_fingerprint(self.tokenizer), 40, "response-only", "tree")
+
+        first, first_hit = load_or_encode_split(self.cache_root, key, "train", self.rows, self._encode)
+        with patch.object(self.tokenizer, "apply_chat_template", side_effect=AssertionError("re-encoded")):
+            second, second_hit = load_or_encode_split(self.cache_root, key, "train", self.rows, self._encode)
+
+        self.assertFalse(first_hit)
+        self.assertTrue(second_hit)
+        self.assertEqual([second[i] for i in range(len(second))], [self._encode(row) for row in self.rows])
+        self.assertEqual(sorted(os.listdir(os.path.join(self.cache_root, key))), ["train"])
+
+    def test_key_changes_with_every_encoding_input(self):
+        fingerprint = tokenizer_fingerprint(self.tokenizer)
+        base = tokenization_cache_key(fingerprint, 40, "response-only", "tree")
+        other_template = _FakeQwenTokenizer()
+        other_template.chat_template = "{{ messages }}"
+
+        self.assertEqual(base, tokenization_cache_key(fingerprint, 40, "response-only", "tree"))
+        self.assertNotEqual(base, tokenization_cache_key(fingerprint, 41, "response-only", "tree"))
+        self.assertNotEqual(base, tokenization_cache_key(fingerprint, 40, "chat-full", "tree"))
+        self.assertNotEqual(base, tokenization_cache_key(fingerprint, 40, "response-only", "other"))
+        self.assertNotEqual(fingerprint, tokenizer_fingerprint(other_template))
+
+    def test_row_count_mismatch_is_rejected(self):
+        load_or_encode_split(self.cache_root, "k", "val", self.rows, self._encode)
+
+        with self.assertRaises(ValueError):
+            load_or_encode_split(self.cache_root, "k", "val", self.rows[:2], self._encode)
+
+    def test_balanced_rows_map_to_source_positions(self):
+        selected = [self.rows[3], self.rows[0]]
+
+        self.assertEqual(_source_row_indices(self.rows, selected), [3, 0])
+
+    def test_cli_forwards_tokenization_cache_options(self):
+        args = build_parser().parse_args(
+            ["train", "--tokenization-cache-dir", "/tmp/cache", "--no-tokenization-cache"]
+        )
+
+        with patch("src.python.ai_scorer.training.fine_tune_train.main", return_value=0) as train_main:
+            self.assertEqual(_cmd_train(args), 0)
+
+        forwarded = train_main.call_args.args[0]
+        self.assertEqual(forwarded[forwarded.index("--tokenization-cache-dir") + 1], "/tmp/cache")
+        self.assertIn("--no-tokenization-cache", forwarded)
+
+
 if __name__ == "__main__":
     unittest.main()
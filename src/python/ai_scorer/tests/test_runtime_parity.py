@@ -1,15 +1,22 @@
 from __future__ import annotations
 
 import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
+from src.python.ai_scorer.training import runtime_parity
 from src.python.ai_scorer.training.runtime_parity import (
+    _length_sorted_batches,
     _messages_for_profile,
     _pair_summary,
     _parsed_prediction,
     _read_modelfile_system,
+    _run_ollama,
     _summarize,
+    _write_report,
 )
 
 
@@ -75,6 +82,81 @@ class RuntimeParityTest(unittest.TestCase):
         self.assertEqual(pair["matches"], 1)
         self.assertEqual(pair["mismatch_indexes"], [1])
 
+    def test_length_sorted_batches_cover_rows_once_within_limits(self) -> None:
+        lengths = [5, 40, 12, 38, 6, 100, 11]
+
+        batches = _length_sorted_batches(lengths, max_rows=3, max_tokens=90)
+
+        self.assertEqual(sorted(index for batch in batches for index in batch), list(range(len(lengths))))
+        self.assertEqual(batches[0], [5])
+        self.assertEqual(batches[1], [1, 3])
+        for batch in batches:
+            self.assertLessEqual(len(batch), 3)
+            widths = [lengths[index] for index in batch]
+            self.assertEqual(widths, sorted(widths, reverse=True))
+            if len(batch) > 1:
+                self.assertLessEqual(widths[0] * len(batch), 90)
+
+    def test_ollama_requests_run_concurrently_and_keep_row_order(self) -> None:
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        class _Client:
+            def chat(self, model, messages, options):
+                nonlocal in_flight, peak
+                with lock:
+                    in_flight += 1
+                    peak = max(peak, in_flight)
+                score = messages[-1]["content"][-1]
+                time.sleep(0.002 * (6 - int(score)))
+                with lock:
+                    in_flight -= 1
+                return {"message": {"content": score}, "prompt_eval_count": 10, "eval_count": 2}
+
+        rows = [{"messages": [{"role": "user", "content": f"job {score}"}]} for score in "012345"]
+        with patch.object(runtime_parity, "build_ollama_client", return_value=_Client()):
+            predictions, throughput = _run_ollama(rows, "h", "m", "request-system", "", concurrency=3)
+
+        self.assertEqual([prediction["score"] for prediction in predictions], [0, 1, 2, 3, 4, 5])
+        self.assertEqual(peak, 3)
+        self.assertEqual(throughput["prompt_tokens"], 60)
+        self.assertEqual(throughput["generated_tokens"], 12)
+        self.assertEqual(throughput["concurrency"], 3)
+        self.assertGreater(throughput["rows_per_second"], 0)
+
+    def test_report_includes_per_backend_throughput(self) -> None:
+        summary = {"exact": 1, "total": 1, "exact_accuracy": 1.0, "mean_abs_error": 0.0, "distribution": {"3": 1}}
+        pair = {"matches": 1, "total": 1, "agreement": 1.0}
+        keys = ("hf/request-system", "ollama/request-system", "hf/package-default", "ollama/package-default")
+        stats = {
+            "rows_per_second": 2.0,
+            "tokens_per_second": 100.0,
+            "generated_tokens_per_second": 4.0,
+            "wall_seconds": 0.5,
+        }
+        result = {
+            "case_count": 1,
+            "merged_dir": "merged",
+            "ollama_model": "m",
+            "runtime_agreement": {"request-system": pair, "package-default": pair},
+            "prompt_agreement": {"hf": pair, "ollama": pair},
+            "summaries": {key: summary for key in keys},
+            "throughput": {
+                key: {**stats, **({"batches": 2} if key.startswith("hf") else {"concurrency": 4})}
+                for key in keys
+            },
+        }
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "runtime-parity.md"
+            _write_report(str(path), result)
+            report = path.read_text(encoding="utf-8")
+
+        self.assertIn("## Throughput", report)
+        self.assertIn("| hf/request-system | 2.00 | 100.00 | 4.00 | 0.5s | 2 length-sorted batches |", report)
+        self.assertIn("| ollama/package-default | 2.00 | 100.00 | 4.00 | 0.5s | 4 in flight |", report)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
 import json
+import random
 import unittest
+from collections import Counter
 from pathlib import Path
 
 from src.python.ai_scorer.training.training_balance import (
     JOB_PREFERENCE_BALANCED_MODE,
     LABEL_BALANCED_MODE,
+    LengthBucketedSampler,
     RotatingGroupSampler,
     audit_training_balance,
     build_balanced_training_plan,
+    padding_efficiency,
+    shuffled_epoch_indices,
 )
 
 
@@ -234,5 +239,58 @@ class TrainingBalanceTests(unittest.TestCase):
         self.assertTrue(report["full_rotation_coverage_verified"])
 
 
+class LengthBucketedSamplerTests(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(3)
+        self.rows = [
+            _row(f"case-{index}", f"job-{index}", f"preference-{index % 3}", f"input-{index}", str(index % 6))
+            for index in range(120)
+        ]
+        self.lengths = [rng.choice([200, 400, 3000, 6000]) + rng.randint(0, 50) for _ in self.rows]
+        self.plan = build_balanced_training_plan(self.rows, seed=7, samples_per_label=12)
+
+    def test_epochs_keep_plan_examples_and_quotas(self):
+        sampler = LengthBucketedSampler(
+            self.plan.epoch_indices, self.lengths, batch_size=4, seed=7, window_batches=4
+        )
+
+        for epoch in range(3):
+            order = sampler.epoch_order(epoch)
+            self.assertEqual(Counter(order), Counter(self.plan.epoch_indices(epoch)))
+            labels = Counter(self.plan.rows[index]["messages"][-1]["content"] for index in order)
+            preferences = Counter(self.plan.rows[index]["meta"]["preference_key"] for index in order)
+            expected_labels = self.plan.epoch_label_distribution(epoch)
+            self.assertEqual(dict(labels), {label: n for label, n in expected_labels.items() if n})
+            self.assertEqual(dict(preferences), self.plan.epoch_preference_distribution(epoch))
+        self.assertEqual(len(sampler), len(RotatingGroupSampler(self.plan)))
+
+    def test_bucketing_reduces_padding_and_reports_it(self):
+        sampler = LengthBucketedSampler(
+            self.plan.epoch_indices, self.lengths, batch_size=4, seed=7, window_batches=8
+        )
+
+        report = sampler.padding_report(0)
+
+        self.assertGreater(report["padding_efficiency"], report["unbucketed_padding_efficiency"])
+        self.assertEqual(
+            report["padded_tokens"],
+            padding_efficiency(sampler.epoch_order(0), self.lengths, 4)["padded_tokens"],
+        )
+
+    def test_partial_batch_stays_last_and_order_is_deterministic(self):
+        epoch_indices = shuffled_epoch_indices(10, seed=1)
+        lengths = [100] * 9 + [1]
+        sampler = LengthBucketedSampler(epoch_indices, lengths, batch_size=4, seed=1, window_batches=1)
+
+        order = sampler.epoch_order(0)
+
+        self.assertEqual(order, sampler.epoch_order(0))
+        self.assertEqual(sorted(order), list(range(10)))
+        self.assertEqual(list(iter(sampler)), order)
+        self.assertEqual(sampler.epoch, 1)
+        tail_window = epoch_indices(0)[8:]
+        self.assertEqual(sorted(order[8:]), sorted(tail_window))
+
+
 if __name__ == "__main__":
     unittest.main()
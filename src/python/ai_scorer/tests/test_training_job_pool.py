@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+import unittest
+from collections import Counter
+from unittest.mock import patch
+
+from src.python.ai_scorer import ai_scorer
+from src.python.ai_scorer.job_fingerprint import description_fingerprint
+from src.python.ai_scorer.training import extractor
+from src.python.ai_scorer.training.extractor import prepare_job_pool, write_job_pool
+
+
+def _random_docs(rng: random.Random) -> list[dict]:
+    # Lengths around the 300/3000 bucket boundaries; whitespace variants share a
+    # fingerprint but can land in a different bucket.
+    pool = [
+        "".join(rng.choice("abc ") for _ in range(rng.choice([0, 5, 298, 299, 300, 2999, 3001, 4000])))
+        for _ in range(rng.randint(1, 60))
+    ]
+    docs = []
+    for _ in range(rng.randint(1, 200)):
+        description = rng.choice(pool) + rng.choice(["", "", " ", "  x", "\n"])
+        docs.append(
+            {
+                "title": rng.choice(["Engineer", "engineer", "Analyst"]),
+                "location": rng.choice(["Remote", "remote", ""]),
+                "description": description,
+            }
+        )
+    return docs
+
+
+class _CountingEmbeddingModel:
+    def __init__(self):
+        self.embedded = Counter()
+
+    def embed(self, texts):
+        for text in texts:
+            self.embedded[text] += 1
+            yield [float(text.count(letter)) + 0.1 for letter in "aeiourst"]
+
+
+def _write(jobs: list[dict], stats: dict) -> bytes:
+    path = os.path.join(tempfile.mkdtemp(), "job-pool.json")
+    write_job_pool(
+        jobs,
+        path,
+        global_db_name="db",
+        limit=10,
+        promotion_fixture_path="fixtures.json",
+        promotion_case_count=0,
+        promotion_fingerprint_count=0,
+        stats=stats,
+    )
+    with open(path, "rb") as handle:
+        return handle.read()
+
+
+class StreamingJobPoolTests(unittest.TestCase):
+    def test_streaming_pool_matches_in_memory_pool_byte_for_byte(self):
+        rng = random.Random(7)
+        for trial in range(60):
+            docs = _random_docs(rng)
+            limit = rng.randint(1, 12)
+            golden = {extractor._normalize_document(docs[0])["job_fingerprint"]} if trial % 2 else set()
+
+            expected = extractor._prepare_job_pool_in_memory(docs, limit=limit, promotion_fingerprints=golden)
+            with patch.object(extractor, "_prepare_job_pool_in_memory") as in_memory:
+                streamed = prepare_job_pool(iter(docs), limit=limit, promotion_fingerprints=golden)
+
+            in_memory.assert_not_called()
+            self.assertEqual(_write(*streamed), _write(*expected), f"trial {trial}")
+
+    def test_streaming_pool_keeps_bounded_number_of_documents(self):
+        docs = [{"title": f"Job {i}", "location": "", "description": f"Description {i} " * 20} for i in range(500)]
+        pool = extractor._StreamingJobPool(5, set())
+
+        for doc in docs:
+            pool.add(doc)
+
+        for kept in pool.kept.values():
+            self.assertLessEqual(len(kept), pool.capacity)
+        self.assertEqual(pool.result()[1]["unique_eligible_fingerprint_count"], 500)
+
+    def test_straddling_fingerprint_falls_back_to_in_memory_pass(self):
+        # Same canonical description, 299 vs 300 normalized characters.
+        short = "x" * 297 + " y"
+        medium = "x" * 297 + "  y"
+        straddling, _ = description_fingerprint(short)
+        fillers = []
+        index = 0
+        while len(fillers) < 4:
+            candidate = f"short filler {index}"
+            if description_fingerprint(candidate)[0] < straddling:
+                fillers.append(candidate)
+            index += 1
+        docs = (
+            [{"title": "B", "location": "", "description": medium}]
+            + [{"title": "F", "location": "", "description": filler} for filler in fillers]
+            # The representative (smallest title) is dropped from the full short bucket.
+            + [{"title": "A", "location": "", "description": short}]
+        )
+
+        pool = extractor._StreamingJobPool(1, set())
+        for doc in docs:
+            pool.add(doc)
+        self.assertIsNone(pool.result())
+
+        jobs, _ = prepare_job_pool(docs, limit=1, promotion_fingerprints=set())
+        expected, _ = extractor._prepare_job_pool_in_memory(docs, limit=1, promotion_fingerprints=set())
+        self.assertEqual(jobs, expected)
+        with self.assertRaises(RuntimeError):
+            prepare_job_pool(iter(docs), limit=1, promotion_fingerprints=set())
+
+    def test_process_pool_normalization_matches_in_process_pool(self):
+        docs = _random_docs(random.Random(11))
+        docs += [{"title": f"Job {i}", "description": f"See https://example.com/{i} for {i}"} for i in range(40)]
+
+        serial = prepare_job_pool(docs, limit=8, promotion_fingerprints=set())
+        with patch.object(extractor, "FETCH_BATCH_SIZE", 7):
+            parallel = prepare_job_pool(iter(docs), limit=8, promotion_fingerprints=set(), workers=3)
+            normalized = list(extractor._normalize_documents(docs, workers=3))
+
+        self.assertEqual(_write(*parallel), _write(*serial))
+        self.assertEqual(normalized, [extractor._normalize_document(doc) for doc in docs])
+
+    def test_limit_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            prepare_job_pool([], limit=0, promotion_fingerprints=set())
+
+    def test_stats_count_every_fetched_document(self):
+        golden, _ = description_fingerprint("Golden description")
+        docs = [
+            {"title": "Golden", "description": "Golden description", "location": "Remote"},
+            {"title": "A", "description": "Same description", "location": "Remote"},
+            {"title": "B", "description": "Same description", "location": "Remote"},
+        ]
+
+        jobs, stats = prepare_job_pool(docs, limit=5, promotion_fingerprints={golden})
+
+        self.assertEqual([job["title"] for job in jobs], ["A"])
+        self.assertEqual(stats["fetched_document_count"], 3)
+        self.assertEqual(stats["promotion_excluded_document_count"], 1)
+        self.assertEqual(stats["duplicate_eligible_document_count"], 1)
+
+
+class SnippetRetrieverTests(unittest.TestCase):
+    def test_matches_per_preference_retrieval_and_embeds_each_text_once(self):
+        descriptions = [
+            "We build distributed systems.\n\n- Rust services\n- Remote first team\n- Travel rarely",
+            "Short role",
+            "",
+        ]
+        preferences = [{"guidance": "Prefers remote roles"}, {"guidance": ""}, {"guidance": "Rust or Go"}]
+        model = _CountingEmbeddingModel()
+
+        with patch.object(ai_scorer, "get_embedding_model", return_value=model):
+            expected = [
+                [ai_scorer.retrieve_relevant_snippets(description, pref["guidance"]) for pref in preferences]
+                for description in descriptions
+            ]
+            model.embedded.clear()
+            retriever = extractor._SnippetRetriever(preferences)
+            actual = [retriever(description) for description in descriptions]
+
+        self.assertEqual(actual, expected)
+        self.assertTrue(any(expected[0]))
+        self.assertEqual(max(model.embedded.values()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -38,6 +38,7 @@ from src.python.ai_scorer.training.dataset_split import (
 from src.python.ai_scorer.training.fine_tune_train import LOSS_MODES
 from src.python.ai_scorer.training.training_balance import (
     BALANCED_MODE,
+    DEFAULT_LENGTH_WINDOW_BATCHES,
     DEFAULT_NA_SHARE,
     SAMPLING_MODES,
 )
@@ -95,6 +96,8 @@ def _cmd_extract(args: argparse.Namespace) -> int:
         args.promotion_fixtures,
         "--split-manifest",
         args.split_manifest,
+        "--workers",
+        str(args.workers),
     ]
     if args.jobs_only:
         extract_args.extend(["--jobs-only", "--job-pool-output", args.job_pool_output])
@@ -148,6 +151,10 @@ def _cmd_label(args: argparse.Namespace) -> int:
         label_args.append("--allow-paid-calls")
     if args.overwrite_labels:
         label_args.append("--overwrite-labels")
+    if args.checkpoint:
+        label_args.extend(["--checkpoint", args.checkpoint])
+    if args.resume:
+        label_args.append("--resume")
     label_main(label_args)
     return 0
 
@@ -354,6 +361,8 @@ def _cmd_train(args: argparse.Namespace) -> int:
         str(args.na_share),
         "--cpu-interop-threads",
         str(args.cpu_interop_threads),
+        "--length-window-batches",
+        str(args.length_window_batches),
     ]
     if args.cpu_threads:
         train_args.extend(["--cpu-threads", str(args.cpu_threads)])
@@ -361,6 +370,10 @@ def _cmd_train(args: argparse.Namespace) -> int:
         train_args.extend(["--run-id", args.run_id])
     if args.resume_from_checkpoint:
         train_args.extend(["--resume-from-checkpoint", args.resume_from_checkpoint])
+    if args.tokenization_cache_dir:
+        train_args.extend(["--tokenization-cache-dir", args.tokenization_cache_dir])
+    if args.no_tokenization_cache:
+        train_args.append("--no-tokenization-cache")
     if args.smoke_run:
         train_args.append("--smoke-run")
     return train_main(train_args)
@@ -456,6 +469,12 @@ def build_parser() -> argparse.ArgumentParser:
     p_extract.add_argument("--val-ratio", type=float, default=0.1)
     p_extract.add_argument("--promotion-fixtures", default=DEFAULT_PROMOTION_FIXTURES)
     p_extract.add_argument("--split-manifest", default=DEFAULT_SPLIT_MANIFEST)
+    p_extract.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes used to normalize and fingerprint job descriptions (1 runs in-process)",
+    )
     p_extract.add_argument(
         "--jobs-only",
         action="store_true",
@@ -507,6 +526,16 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Relabel every input case, ignoring input and reusable labels",
     )
+    p_label.add_argument(
+        "--checkpoint",
+        default="",
+        help="Checkpoint file of Gemini labels (default: <output>.checkpoint.jsonl)",
+    )
+    p_label.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run without paying again for labels in the checkpoint",
+    )
 
     p_merge_expansion = sub.add_parser(
         "merge-labeled-expansion",
@@ -699,6 +728,22 @@ def build_parser() -> argparse.ArgumentParser:
         help="PyTorch inter-op threads when --cpu-threads is set",
     )
     p_train.add_argument("--resume-from-checkpoint", default="")
+    p_train.add_argument(
+        "--tokenization-cache-dir",
+        default="",
+        help="Shared pre-tokenized split cache; defaults to <output-root>/tokenization-cache",
+    )
+    p_train.add_argument(
+        "--no-tokenization-cache",
+        action="store_true",
+        help="Encode the splits in memory for this run only",
+    )
+    p_train.add_argument(
+        "--length-window-batches",
+        type=int,
+        default=DEFAULT_LENGTH_WINDOW_BATCHES,
+        help="Batches per length-sorting window of the train sampler; 0 keeps plan order",
+    )
     p_train.add_argument("--smoke-run", action="store_true")
 
     p_merge = sub.add_parser("merge", help="Merge LoRA adapters into full HF weights")
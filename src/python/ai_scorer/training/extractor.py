@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import argparse
+import bisect
+import itertools
 import json
 import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 
 from src.python.ai_scorer.description_normalization import normalize_description_markdown
 from src.python.ai_scorer.job_fingerprint import (
@@ -25,6 +29,31 @@ from src.python.ai_scorer.training.preferences import (
 from src.python.ai_scorer.training.schema import TrainingCase, dump_cases, new_case_id
 
 
+# Description-length buckets of `_sample_diverse`, in selection order.
+_DESCRIPTION_BUCKETS = ("empty", "short", "medium", "rich")
+# Documents fetched per MongoDB round trip while streaming `job-descriptions`.
+FETCH_BATCH_SIZE = 500
+
+
+def _description_bucket(description: object) -> str:
+    length = len(str(description or "").strip())
+    if length == 0:
+        return "empty"
+    if length < 300:
+        return "short"
+    if length <= 3000:
+        return "medium"
+    return "rich"
+
+
+def _bucket_allocations(limit: int) -> dict[str, int]:
+    alloc_empty = max(1, int(limit * 0.05))
+    alloc_short = max(1, int(limit * 0.15))
+    alloc_rich = max(1, int(limit * 0.40))
+    alloc_medium = max(1, limit - alloc_empty - alloc_short - alloc_rich)
+    return {"empty": alloc_empty, "short": alloc_short, "medium": alloc_medium, "rich": alloc_rich}
+
+
 def _sample_diverse(docs: list[dict], limit: int) -> list[dict]:
     if limit <= 0:
         raise ValueError("limit must be greater than zero")
@@ -32,17 +61,12 @@ def _sample_diverse(docs: list[dict], limit: int) -> list[dict]:
     # MongoDB natural order is not portable across servers. Fingerprint order
     # makes the selected pool reproducible for the same set of descriptions.
     docs = sorted(docs, key=lambda doc: str(doc.get("job_fingerprint", "")))
-    empty = [d for d in docs if not str(d.get("description", "") or "").strip()]
-    short = [d for d in docs if 0 < len(str(d.get("description", "") or "").strip()) < 300]
-    medium = [d for d in docs if 300 <= len(str(d.get("description", "") or "").strip()) <= 3000]
-    rich = [d for d in docs if len(str(d.get("description", "") or "").strip()) > 3000]
+    by_bucket: dict[str, list[dict]] = {bucket: [] for bucket in _DESCRIPTION_BUCKETS}
+    for doc in docs:
+        by_bucket[_description_bucket(doc.get("description", ""))].append(doc)
 
-    alloc_empty = max(1, int(limit * 0.05))
-    alloc_short = max(1, int(limit * 0.15))
-    alloc_rich = max(1, int(limit * 0.40))
-    alloc_medium = max(1, limit - alloc_empty - alloc_short - alloc_rich)
-
-    selected = empty[:alloc_empty] + short[:alloc_short] + medium[:alloc_medium] + rich[:alloc_rich]
+    allocations = _bucket_allocations(limit)
+    selected = [doc for bucket in _DESCRIPTION_BUCKETS for doc in by_bucket[bucket][: allocations[bucket]]]
     selected_fingerprints = {str(doc.get("job_fingerprint")) for doc in selected}
     if len(selected) < limit:
         extras = [doc for doc in docs if str(doc.get("job_fingerprint")) not in selected_fingerprints]
@@ -51,82 +75,287 @@ def _sample_diverse(docs: list[dict], limit: int) -> list[dict]:
     return selected[:limit]
 
 
-def prepare_job_pool(
-    all_docs: list[dict],
+def _normalize_document(doc: dict) -> dict:
+    description = normalize_description_markdown(doc.get("description", "") or "")
+    fingerprint, basis = description_fingerprint(
+        description,
+        title=doc.get("title", ""),
+        location=doc.get("location", ""),
+    )
+    return {
+        "job_fingerprint": fingerprint,
+        "fingerprint_basis": basis,
+        "title": str(doc.get("title", "") or ""),
+        "location": str(doc.get("location", "") or ""),
+        "description": description,
+    }
+
+
+def _normalize_documents(all_docs: Iterable[dict], workers: int = 1) -> Iterator[dict]:
+    """`_normalize_document` over `all_docs`, in input order, on `workers` processes.
+
+    Documents are handed to the pool one fetch batch per worker at a time, and
+    the next slice is read while the previous one is still being normalized,
+    so at most two slices are held in memory.
+    """
+    if workers <= 1:
+        for doc in all_docs:
+            yield _normalize_document(doc)
+        return
+
+    docs = iter(all_docs)
+    slice_size = FETCH_BATCH_SIZE * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = None
+        while True:
+            batch = list(itertools.islice(docs, slice_size))
+            submitted = None
+            if batch:
+                chunksize = max(1, len(batch) // (4 * workers))
+                submitted = pool.map(_normalize_document, batch, chunksize=chunksize)
+            if pending is not None:
+                yield from pending
+            if submitted is None:
+                return
+            pending = submitted
+
+
+def _representative_key(doc: dict) -> tuple[str, str, str]:
+    # A fingerprint can occur in several MongoDB documents. The smallest key
+    # picks the same representative regardless of MongoDB insertion order;
+    # ties keep the first document seen.
+    return (
+        str(doc["title"]).casefold(),
+        str(doc["location"]).casefold(),
+        str(doc["description"]),
+    )
+
+
+def _pool_stats(
+    sampled: list[dict],
+    *,
+    fetched: int,
+    excluded_documents: int,
+    excluded_fingerprints: int,
+    eligible: int,
+    unique_eligible: int,
+) -> dict:
+    return {
+        "fetched_document_count": fetched,
+        "promotion_excluded_document_count": excluded_documents,
+        "promotion_excluded_fingerprint_count": excluded_fingerprints,
+        "eligible_document_count": eligible,
+        "unique_eligible_fingerprint_count": unique_eligible,
+        "duplicate_eligible_document_count": eligible - unique_eligible,
+        "sampled_job_count": len(sampled),
+        "sampled_description_buckets": {
+            bucket: sum(_description_bucket(job["description"]) == bucket for job in sampled)
+            for bucket in _DESCRIPTION_BUCKETS
+        },
+    }
+
+
+class _StreamingJobPool:
+    """Single-pass equivalent of normalizing, deduplicating and sampling every document.
+
+    `_sample_diverse` only reads the first `allocation + limit` fingerprints of
+    each description bucket, so per bucket only the smallest fingerprints and
+    their current representatives are kept. Every other fingerprint costs one
+    dict entry (a bitmask of the buckets its documents fell into), which the
+    unique-fingerprint stats need anyway.
+
+    Documents of one fingerprint share a canonical description but can differ
+    in whitespace or redacted URLs, so in rare cases they straddle a bucket
+    boundary and a discarded document may have been the representative.
+    `result()` returns None when that could change the sample; callers then
+    fall back to the in-memory path.
+    """
+
+    _DROPPED = 1 << len(_DESCRIPTION_BUCKETS)
+
+    def __init__(self, limit: int, promotion_fingerprints: set[str]) -> None:
+        if limit <= 0:
+            raise ValueError("limit must be greater than zero")
+        self.limit = limit
+        self.promotion_fingerprints = promotion_fingerprints
+        # Each allocation is at most `limit`; the slack absorbs fingerprints
+        # whose representative turns out to live in another bucket.
+        self.capacity = 4 * limit
+        self.kept: dict[str, dict[str, dict]] = {bucket: {} for bucket in _DESCRIPTION_BUCKETS}
+        self.kept_order: dict[str, list[str]] = {bucket: [] for bucket in _DESCRIPTION_BUCKETS}
+        self.min_dropped: dict[str, str | None] = {bucket: None for bucket in _DESCRIPTION_BUCKETS}
+        self.fingerprint_buckets: dict[str, int] = {}
+        self.fetched = 0
+        self.eligible = 0
+        self.excluded_documents = 0
+        self.excluded_fingerprints: set[str] = set()
+
+    def add(self, raw_doc: dict) -> None:
+        self.add_normalized(_normalize_document(raw_doc))
+
+    def add_normalized(self, doc: dict) -> None:
+        self.fetched += 1
+        fingerprint = str(doc["job_fingerprint"])
+        if fingerprint in self.promotion_fingerprints:
+            self.excluded_fingerprints.add(fingerprint)
+            self.excluded_documents += 1
+            return
+        self.eligible += 1
+
+        bucket = _description_bucket(doc["description"])
+        index = _DESCRIPTION_BUCKETS.index(bucket)
+        self.fingerprint_buckets[fingerprint] = self.fingerprint_buckets.get(fingerprint, 0) | (1 << index)
+
+        kept = self.kept[bucket]
+        current = kept.get(fingerprint)
+        if current is not None:
+            if _representative_key(doc) < _representative_key(current):
+                kept[fingerprint] = doc
+            return
+
+        order = self.kept_order[bucket]
+        if len(order) >= self.capacity and fingerprint > order[-1]:
+            self._drop(bucket, fingerprint)
+            return
+        bisect.insort(order, fingerprint)
+        kept[fingerprint] = doc
+        if len(order) > self.capacity:
+            evicted = order.pop()
+            del kept[evicted]
+            self._drop(bucket, evicted)
+
+    def _drop(self, bucket: str, fingerprint: str) -> None:
+        self.fingerprint_buckets[fingerprint] |= self._DROPPED
+        smallest = self.min_dropped[bucket]
+        if smallest is None or fingerprint < smallest:
+            self.min_dropped[bucket] = fingerprint
+
+    def result(self) -> tuple[list[dict], dict] | None:
+        # Resolve each kept fingerprint's representative across the buckets it was kept in.
+        representatives: dict[str, dict] = {}
+        for bucket in _DESCRIPTION_BUCKETS:
+            for fingerprint, doc in self.kept[bucket].items():
+                mask = self.fingerprint_buckets[fingerprint]
+                if mask & self._DROPPED and bin(mask & (self._DROPPED - 1)).count("1") > 1:
+                    # A document of this fingerprint was discarded in another bucket.
+                    return None
+                current = representatives.get(fingerprint)
+                if current is None or _representative_key(doc) < _representative_key(current):
+                    representatives[fingerprint] = doc
+
+        # Keep per bucket only the prefix that is known to be complete, and make
+        # sure it is long enough for everything `_sample_diverse` reads.
+        allocations = _bucket_allocations(self.limit)
+        candidates: list[dict] = []
+        for bucket in _DESCRIPTION_BUCKETS:
+            bound = self.min_dropped[bucket]
+            prefix = [
+                doc for fingerprint, doc in representatives.items()
+                if _description_bucket(doc["description"]) == bucket and (bound is None or fingerprint < bound)
+            ]
+            if bound is not None and len(prefix) < allocations[bucket] + self.limit:
+                return None
+            candidates.extend(prefix)
+
+        sampled = _sample_diverse(candidates, self.limit)
+        stats = _pool_stats(
+            sampled,
+            fetched=self.fetched,
+            excluded_documents=self.excluded_documents,
+            excluded_fingerprints=len(self.excluded_fingerprints),
+            eligible=self.eligible,
+            unique_eligible=len(self.fingerprint_buckets),
+        )
+        return sampled, stats
+
+
+def _prepare_job_pool_in_memory(
+    all_docs: Iterable[dict],
     *,
     limit: int,
     promotion_fingerprints: set[str],
+    workers: int = 1,
 ) -> tuple[list[dict], dict]:
+    fetched = 0
     normalized_docs: list[dict] = []
     excluded_fingerprints: set[str] = set()
     excluded_document_count = 0
 
-    for doc in all_docs:
-        description = normalize_description_markdown(doc.get("description", "") or "")
-        fingerprint, basis = description_fingerprint(
-            description,
-            title=doc.get("title", ""),
-            location=doc.get("location", ""),
-        )
-        if fingerprint in promotion_fingerprints:
-            excluded_fingerprints.add(fingerprint)
+    for doc in _normalize_documents(all_docs, workers):
+        fetched += 1
+        if doc["job_fingerprint"] in promotion_fingerprints:
+            excluded_fingerprints.add(doc["job_fingerprint"])
             excluded_document_count += 1
             continue
-        normalized_docs.append(
-            {
-                "job_fingerprint": fingerprint,
-                "fingerprint_basis": basis,
-                "title": str(doc.get("title", "") or ""),
-                "location": str(doc.get("location", "") or ""),
-                "description": description,
-            }
-        )
+        normalized_docs.append(doc)
 
-    # A fingerprint can occur in several MongoDB documents. Pick the same
-    # representative regardless of MongoDB insertion order.
-    normalized_docs.sort(
-        key=lambda doc: (
-            str(doc["job_fingerprint"]),
-            str(doc["title"]).casefold(),
-            str(doc["location"]).casefold(),
-            str(doc["description"]),
-        )
-    )
+    normalized_docs.sort(key=lambda doc: (str(doc["job_fingerprint"]), *_representative_key(doc)))
     jobs_by_fingerprint: dict[str, dict] = {}
     for doc in normalized_docs:
         jobs_by_fingerprint.setdefault(str(doc["job_fingerprint"]), doc)
 
     sampled = _sample_diverse(list(jobs_by_fingerprint.values()), limit)
-    stats = {
-        "fetched_document_count": len(all_docs),
-        "promotion_excluded_document_count": excluded_document_count,
-        "promotion_excluded_fingerprint_count": len(excluded_fingerprints),
-        "eligible_document_count": len(normalized_docs),
-        "unique_eligible_fingerprint_count": len(jobs_by_fingerprint),
-        "duplicate_eligible_document_count": len(normalized_docs) - len(jobs_by_fingerprint),
-        "sampled_job_count": len(sampled),
-        "sampled_description_buckets": {
-            "empty": sum(not str(job["description"]).strip() for job in sampled),
-            "short": sum(0 < len(str(job["description"]).strip()) < 300 for job in sampled),
-            "medium": sum(300 <= len(str(job["description"]).strip()) <= 3000 for job in sampled),
-            "rich": sum(len(str(job["description"]).strip()) > 3000 for job in sampled),
-        },
-    }
+    stats = _pool_stats(
+        sampled,
+        fetched=fetched,
+        excluded_documents=excluded_document_count,
+        excluded_fingerprints=len(excluded_fingerprints),
+        eligible=len(normalized_docs),
+        unique_eligible=len(jobs_by_fingerprint),
+    )
     return sampled, stats
 
 
+def prepare_job_pool(
+    all_docs: Iterable[dict],
+    *,
+    limit: int,
+    promotion_fingerprints: set[str],
+    workers: int = 1,
+) -> tuple[list[dict], dict]:
+    """Deduplicate, exclude golden fingerprints and sample `limit` jobs in one streaming pass.
+
+    Memory is bounded by `limit` documents plus one small entry per distinct
+    fingerprint. If the bounded pass cannot prove its sample exact, `all_docs`
+    is iterated a second time in memory, so it must be re-iterable (a list or
+    a `TrainingDocumentSource`).
+
+    With `workers > 1`, normalization, redaction and fingerprinting run on a
+    process pool; results are consumed in input order, so the pool and its
+    stats do not depend on the worker count.
+    """
+    pool = _StreamingJobPool(limit, promotion_fingerprints)
+    for doc in _normalize_documents(all_docs, workers):
+        pool.add_normalized(doc)
+    result = pool.result()
+    if result is not None:
+        return result
+
+    if iter(all_docs) is all_docs:
+        raise RuntimeError("job pool sampling needs a second pass, but the documents can only be read once")
+    print("[training.extract] fingerprints straddle description buckets; resampling in memory")
+    return _prepare_job_pool_in_memory(
+        all_docs,
+        limit=limit,
+        promotion_fingerprints=promotion_fingerprints,
+        workers=workers,
+    )
+
+
 def prepare_training_jobs(
-    all_docs: list[dict],
+    all_docs: Iterable[dict],
     *,
     limit: int,
     promotion_fingerprints: set[str],
     split_seed: int,
     val_ratio: float,
+    workers: int = 1,
 ) -> tuple[list[dict], list[str], list[str]]:
     sampled, _ = prepare_job_pool(
         all_docs,
         limit=limit,
         promotion_fingerprints=promotion_fingerprints,
+        workers=workers,
     )
     train_fingerprints, val_fingerprints = partition_fingerprints(
         [doc["job_fingerprint"] for doc in sampled],
@@ -136,22 +365,37 @@ def prepare_training_jobs(
     return sampled, train_fingerprints, val_fingerprints
 
 
-def fetch_training_documents(mongo_uri: str, global_db_name: str) -> list[dict]:
-    from pymongo import MongoClient
+class TrainingDocumentSource:
+    """Re-iterable stream of `job-descriptions`; every iteration runs a fresh batched cursor."""
 
-    client = MongoClient(mongo_uri)
-    try:
-        db = client[global_db_name]
-        cursor = db["job-descriptions"].find(
-            {},
-            {"_id": 0, "title": 1, "description": 1, "location": 1},
-        )
-        all_docs = list(cursor)
-    finally:
-        client.close()
+    def __init__(self, mongo_uri: str, global_db_name: str, *, batch_size: int = FETCH_BATCH_SIZE) -> None:
+        self.mongo_uri = mongo_uri
+        self.global_db_name = global_db_name
+        self.batch_size = batch_size
+
+    def __iter__(self) -> Iterator[dict]:
+        from pymongo import MongoClient
 
-    print(f"[training.extract] fetched={len(all_docs)} from db={global_db_name}")
-    return all_docs
+        fetched = 0
+        client = MongoClient(self.mongo_uri)
+        try:
+            db = client[self.global_db_name]
+            cursor = db["job-descriptions"].find(
+                {},
+                {"_id": 0, "title": 1, "description": 1, "location": 1},
+                batch_size=self.batch_size,
+            )
+            for doc in cursor:
+                fetched += 1
+                yield doc
+        finally:
+            client.close()
+
+        print(f"[training.extract] fetched={fetched} from db={self.global_db_name}")
+
+
+def fetch_training_documents(mongo_uri: str, global_db_name: str) -> TrainingDocumentSource:
+    return TrainingDocumentSource(mongo_uri, global_db_name)
 
 
 def write_job_pool(
@@ -186,6 +430,39 @@ def write_job_pool(
         json.dump(payload, handle, indent=2, ensure_ascii=False)
 
 
+class _SnippetRetriever:
+    """`retrieve_relevant_snippets` for every preference, embedding each text only once.
+
+    Each preference guidance is embedded once per run and each description
+    once per call; every preference is then ranked against the cached chunk
+    vectors. Returns one snippet list per preference, in `preferences` order,
+    identical to calling `retrieve_relevant_snippets(description, guidance)`.
+    """
+
+    def __init__(self, preferences: list[dict]) -> None:
+        self.guidances = [str(pref.get("guidance", "") or "") for pref in preferences]
+        self._vectors: dict[str, list[float]] = {}
+
+    def _guidance_vector(self, guidance: str) -> list[float]:
+        from src.python.ai_scorer.ai_scorer import embed_requirement
+
+        vector = self._vectors.get(guidance)
+        if vector is None:
+            vector = self._vectors[guidance] = embed_requirement(guidance)
+        return vector
+
+    def __call__(self, description: str) -> list[list[str]]:
+        from src.python.ai_scorer.ai_scorer import embed_snippet_chunks, rank_snippets
+
+        chunks, chunk_vectors = embed_snippet_chunks(description)
+        if not chunk_vectors:
+            return [[] for _ in self.guidances]
+        return [
+            rank_snippets(chunks, chunk_vectors, self._guidance_vector(guidance)) if guidance else []
+            for guidance in self.guidances
+        ]
+
+
 def extract_training_cases(
     mongo_uri: str,
     global_db_name: str,
@@ -194,8 +471,9 @@ def extract_training_cases(
     promotion_fingerprints: set[str],
     split_seed: int,
     val_ratio: float,
+    workers: int = 1,
 ) -> tuple[list[TrainingCase], list[str], list[str]]:
-    from src.python.ai_scorer.ai_scorer import build_prompt, retrieve_relevant_snippets
+    from src.python.ai_scorer.ai_scorer import build_prompt
 
     all_docs = fetch_training_documents(mongo_uri, global_db_name)
 
@@ -205,19 +483,21 @@ def extract_training_cases(
         promotion_fingerprints=promotion_fingerprints,
         split_seed=split_seed,
         val_ratio=val_ratio,
+        workers=workers,
     )
     print(f"[training.extract] sampled={len(sampled)} limit={limit}")
 
     cases: list[TrainingCase] = []
+    snippets_for = _SnippetRetriever(preferences)
     for doc in sampled:
         job_fingerprint = str(doc["job_fingerprint"])
         title = str(doc.get("title", "") or "")
         location = str(doc.get("location", "") or "")
         description = str(doc.get("description", "") or "")
+        snippets_by_preference = snippets_for(description)
 
-        for pref in preferences:
+        for pref, snippets in zip(preferences, snippets_by_preference):
             guidance = str(pref.get("guidance", "") or "")
-            snippets = retrieve_relevant_snippets(description, guidance)
             system_prompt, user_prompt = build_prompt(
                 {"title": title, "location": location, "description": description},
                 {},
@@ -263,6 +543,12 @@ def main(argv: list[str] | None = None) -> None:
     parser.add_argument("--val-ratio", type=float, default=0.1)
     parser.add_argument("--promotion-fixtures", default=DEFAULT_PROMOTION_FIXTURES)
     parser.add_argument("--split-manifest", default=DEFAULT_SPLIT_MANIFEST)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes used to normalize and fingerprint job descriptions (1 runs in-process)",
+    )
     parser.add_argument(
         "--jobs-only",
         action="store_true",
@@ -281,6 +567,7 @@ def main(argv: list[str] | None = None) -> None:
             all_docs,
             limit=args.limit,
             promotion_fingerprints=set(golden_fingerprints),
+            workers=args.workers,
         )
         write_job_pool(
             jobs,
@@ -314,6 +601,7 @@ def main(argv: list[str] | None = None) -> None:
         promotion_fingerprints=set(golden_fingerprints),
         split_seed=args.split_seed,
         val_ratio=args.val_ratio,
+        workers=args.workers,
     )
 
     os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import math
 import os
 import random
 import time
@@ -17,12 +18,20 @@ from src.python.ai_scorer.training.fine_tune_manifest import (
 from src.python.ai_scorer.training.fine_tune_preflight import run_preflight
 from src.python.ai_scorer.training.fine_tune_runtime import detect_runtime
 from src.python.ai_scorer.training.dataset_split import load_split_manifest
+from src.python.ai_scorer.training.tokenization_cache import (
+    load_or_encode_split,
+    tokenization_cache_key,
+    tokenizer_fingerprint,
+)
 from src.python.ai_scorer.training.training_balance import (
     BALANCED_MODE,
+    DEFAULT_LENGTH_WINDOW_BATCHES,
     DEFAULT_NA_SHARE,
     SAMPLING_MODES,
+    LengthBucketedSampler,
     RotatingGroupSampler,
     build_balanced_training_plan,
+    shuffled_epoch_indices,
 )
 
 
@@ -227,6 +236,43 @@ class _CausalLMCollator:
         return {name: torch.tensor(values, dtype=torch.long) for name, values in batch.items()}
 
 
+def _source_row_indices(source_rows: list[dict], rows: list[dict]) -> list[int]:
+    """Positions in `source_rows` of the row objects a balance plan selected."""
+    position = {id(row): index for index, row in enumerate(source_rows)}
+    return [position[id(row)] for row in rows]
+
+
+def _planned_epoch_count(
+    records_per_epoch: int,
+    per_device_batch_size: int,
+    gradient_accumulation_steps: int,
+    max_steps: int,
+    num_train_epochs: int,
+) -> int:
+    """Epochs the trainer will start: `max_steps` wins over `num_train_epochs` when positive."""
+    if max_steps <= 0:
+        return max(1, num_train_epochs)
+    batches = math.ceil(records_per_epoch / per_device_batch_size)
+    updates_per_epoch = max(1, batches // gradient_accumulation_steps)
+    return max(1, math.ceil(max_steps / updates_per_epoch))
+
+
+def _length_bucketing_report(sampler: LengthBucketedSampler, epochs: int) -> dict:
+    """Per-epoch padding efficiency of `sampler` next to the plan's unbucketed order."""
+    per_epoch = [sampler.padding_report(epoch) for epoch in range(epochs)]
+    real = sum(entry["real_tokens"] for entry in per_epoch)
+    padded = sum(entry["padded_tokens"] for entry in per_epoch)
+    unbucketed = sum(entry["unbucketed_padded_tokens"] for entry in per_epoch)
+    return {
+        "batch_size": sampler.batch_size,
+        "window_batches": sampler.window_batches,
+        "epoch_count": epochs,
+        "padding_efficiency": round(real / padded, 6) if padded else 1.0,
+        "unbucketed_padding_efficiency": round(real / unbucketed, 6) if unbucketed else 1.0,
+        "epochs": per_epoch,
+    }
+
+
 def _set_determinism(seed: int) -> None:
     random.seed(seed)
     try:
@@ -264,6 +310,9 @@ def _train_cpu_transformers(
     samples_per_label: int,
     na_share: float,
     resume_from_checkpoint: str,
+    tokenization_cache_dir: str = "",
+    dataset_hash: str = "",
+    length_window_batches: int = DEFAULT_LENGTH_WINDOW_BATCHES,
 ) -> dict:
     try:
         import torch  # type: ignore
@@ -280,23 +329,23 @@ def _train_cpu_transformers(
         ) from exc
 
     class _TextDataset(torch.utils.data.Dataset):
-        def __init__(self, rows: list[dict], tokenizer, max_len: int, selected_loss_mode: str):
-            self.examples = []
-            for row in rows:
-                self.examples.append(
-                    _encode_training_example(
-                        list(row.get("messages", [])),
-                        tokenizer,
-                        max_len,
-                        selected_loss_mode,
-                    )
-                )
+        """Encoded examples, optionally restricted to `indices` of a pre-tokenized split."""
+
+        def __init__(self, examples, indices: list[int] | None = None):
+            self.examples = examples
+            self.indices = indices if indices is not None else list(range(len(examples)))
 
         def __len__(self):
-            return len(self.examples)
+            return len(self.indices)
 
         def __getitem__(self, idx):
-            return self.examples[idx]
+            return self.examples[self.indices[idx]]
+
+        def lengths(self) -> list[int]:
+            if hasattr(self.examples, "lengths"):
+                source_lengths = self.examples.lengths()
+                return [source_lengths[index] for index in self.indices]
+            return [len(self.examples[index]["input_ids"]) for index in self.indices]
 
     tokenizer = AutoTokenizer.from_pretrained(base_model_hf, use_fast=True)
     if tokenizer.pad_token is None:
@@ -329,8 +378,58 @@ def _train_cpu_transformers(
         )
         train_rows = balance_plan.rows
 
-    train_ds = _TextDataset(train_rows, tokenizer, max_seq_length, loss_mode)
-    val_ds = _TextDataset(val_rows, tokenizer, max_seq_length, loss_mode)
+    def encode(row: dict) -> dict[str, list[int]]:
+        return _encode_training_example(list(row.get("messages", [])), tokenizer, max_seq_length, loss_mode)
+
+    tokenization_cache = {"enabled": bool(tokenization_cache_dir)}
+    if tokenization_cache_dir:
+        # Cache the full source splits; a balance plan only selects indices into them.
+        cache_key = tokenization_cache_key(
+            tokenizer_fingerprint(tokenizer), max_seq_length, loss_mode, dataset_hash
+        )
+        cache_meta = {"base_model_hf": base_model_hf, "max_seq_length": max_seq_length, "loss_mode": loss_mode}
+        train_examples, train_hit = load_or_encode_split(
+            tokenization_cache_dir, cache_key, "train", source_train_rows, encode, meta=cache_meta
+        )
+        val_examples, val_hit = load_or_encode_split(
+            tokenization_cache_dir, cache_key, "val", val_rows, encode, meta=cache_meta
+        )
+        train_ds = _TextDataset(train_examples, _source_row_indices(source_train_rows, train_rows))
+        val_ds = _TextDataset(val_examples)
+        tokenization_cache.update({"key": cache_key, "train_hit": train_hit, "val_hit": val_hit})
+        print(
+            f"[training.train] tokenization cache key={cache_key[:12]} "
+            f"train={'hit' if train_hit else 'encoded'} val={'hit' if val_hit else 'encoded'}"
+        )
+    else:
+        train_ds = _TextDataset([encode(row) for row in train_rows])
+        val_ds = _TextDataset([encode(row) for row in val_rows])
+
+    train_sampler = RotatingGroupSampler(balance_plan) if balance_plan is not None else None
+    length_bucketing = {"enabled": length_window_batches > 0}
+    if length_window_batches > 0:
+        # Same per-epoch examples (and quotas) as the plan, ordered by length within windows.
+        train_sampler = LengthBucketedSampler(
+            balance_plan.epoch_indices if balance_plan is not None else shuffled_epoch_indices(len(train_ds), seed),
+            train_ds.lengths(),
+            batch_size=per_device_batch_size,
+            seed=seed,
+            window_batches=length_window_batches,
+            epoch_size=len(train_sampler) if train_sampler is not None else len(train_ds),
+        )
+        epochs = _planned_epoch_count(
+            len(train_sampler), per_device_batch_size, gradient_accumulation_steps, max_steps, num_train_epochs
+        )
+        report = _length_bucketing_report(train_sampler, epochs)
+        report_path = os.path.join(output_dir, "padding_efficiency.json")
+        write_manifest(report_path, report)
+        length_bucketing.update({key: value for key, value in report.items() if key != "epochs"})
+        length_bucketing["report"] = report_path
+        print(
+            "[training.train] length bucketing "
+            f"padding_efficiency={report['padding_efficiency']} "
+            f"(unbucketed {report['unbucketed_padding_efficiency']}) over {epochs} epochs"
+        )
 
     collator = _CausalLMCollator(tokenizer)
     training_args = TrainingArguments(
@@ -368,7 +467,7 @@ def _train_cpu_transformers(
         eval_dataset=val_ds,
         data_collator=collator,
         processing_class=tokenizer,
-        balance_sampler=RotatingGroupSampler(balance_plan) if balance_plan is not None else None,
+        balance_sampler=train_sampler,
     )
 
     resume = resume_from_checkpoint if resume_from_checkpoint else None
@@ -388,6 +487,8 @@ def _train_cpu_transformers(
             ),
             "val_records": len(val_rows),
             "sampling_mode": sampling_mode,
+            "tokenization_cache": tokenization_cache,
+            "length_bucketing": length_bucketing,
         }
     )
     return metrics
@@ -431,6 +532,22 @@ def main(argv: list[str] | None = None) -> int:
         help="PyTorch inter-op threads when --cpu-threads is set",
     )
     parser.add_argument("--resume-from-checkpoint", default="")
+    parser.add_argument(
+        "--tokenization-cache-dir",
+        default="",
+        help="Shared pre-tokenized split cache; defaults to <output-root>/tokenization-cache",
+    )
+    parser.add_argument(
+        "--no-tokenization-cache",
+        action="store_true",
+        help="Encode the splits in memory for this run only",
+    )
+    parser.add_argument(
+        "--length-window-batches",
+        type=int,
+        default=DEFAULT_LENGTH_WINDOW_BATCHES,
+        help="Batches per length-sorting window of the train sampler; 0 keeps plan order",
+    )
     parser.add_argument("--smoke-run", action="store_true")
     args = parser.parse_args(argv)
 
@@ -484,6 +601,11 @@ def main(argv: list[str] | None = None) -> int:
     balance_report_path = os.path.join(run_dir, "training_balance.json")
     write_manifest(balance_report_path, balance_report)
 
+    dataset_hash = tree_sha256(collect_jsonl_paths(dataset_dir))
+    tokenization_cache_dir = "" if args.no_tokenization_cache else (
+        args.tokenization_cache_dir or os.path.join(args.output_root, "tokenization-cache")
+    )
+
     manifest_path = os.path.join(run_dir, "run_manifest.json")
     pre_manifest = {
         "run_id": run_id,
@@ -495,7 +617,7 @@ def main(argv: list[str] | None = None) -> int:
         "cpu_runtime": cpu_runtime,
         "dataset_profile": args.dataset_profile,
         "dataset_dir": dataset_dir,
-        "dataset_hash": tree_sha256(collect_jsonl_paths(dataset_dir)),
+        "dataset_hash": dataset_hash,
         "job_fingerprint_identity": {
             "bases": split_manifest["fingerprint_bases"],
             "preference_set_hash": split_manifest["preference_set_hash"],
@@ -531,6 +653,8 @@ def main(argv: list[str] | None = None) -> int:
         },
         "training_balance_report": balance_report_path,
         "resume_from_checkpoint": args.resume_from_checkpoint,
+        "tokenization_cache_dir": tokenization_cache_dir,
+        "length_window_batches": args.length_window_batches,
         "started_at_epoch": now_epoch(),
     }
     write_manifest(manifest_path, pre_manifest)
@@ -556,6 +680,9 @@ def main(argv: list[str] | None = None) -> int:
         samples_per_label=args.samples_per_label,
         na_share=args.na_share,
         resume_from_checkpoint=args.resume_from_checkpoint,
+        tokenization_cache_dir=tokenization_cache_dir,
+        dataset_hash=dataset_hash,
+        length_window_batches=args.length_window_batches,
     )
 
     elapsed = round(time.time() - started, 3)
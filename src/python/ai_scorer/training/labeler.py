@@ -3,6 +3,7 @@ from __future__ import annotations
 import argparse
 import os
 
+from src.python.ai_scorer.evals.checkpoint import RunCheckpoint, default_checkpoint_path, input_digest
 from src.python.ai_scorer.training.schema import TrainingCase, dump_cases, load_cases, validate_cases
 
 
@@ -74,7 +75,13 @@ def label_cases(
     reusable_cases: list[TrainingCase] | None = None,
     allow_paid_calls: bool = False,
     overwrite_labels: bool = False,
+    checkpoint: RunCheckpoint | None = None,
 ) -> list[TrainingCase]:
+    """Label `cases`, calling Gemini only for cases without a preserved, reusable or checkpointed label.
+
+    Every Gemini label is appended to `checkpoint` as soon as it is returned, so
+    an interrupted run resumed from the same checkpoint does not pay for it again.
+    """
     reusable = (
         {}
         if overwrite_labels
@@ -91,10 +98,22 @@ def label_cases(
         case.label_available is None and _reuse_key(case) in reusable
         for case in cases
     )
-    paid_count = len(cases) - preserved_count - reusable_count
+
+    def _checkpointed(case: TrainingCase) -> dict | None:
+        if checkpoint is None:
+            return None
+        return checkpoint.get(case.case_id, model_name, input_digest(*_reuse_key(case)))
+
+    needs_label = [
+        case for case in cases
+        if overwrite_labels or (case.label_available is None and _reuse_key(case) not in reusable)
+    ]
+    checkpointed_count = sum(_checkpointed(case) is not None for case in needs_label)
+    paid_count = len(needs_label) - checkpointed_count
     print(
         f"[training.label] preserved={preserved_count} reusable={reusable_count} "
-        f"paid_required={paid_count} overwrite_labels={str(overwrite_labels).lower()}"
+        f"checkpointed={checkpointed_count} paid_required={paid_count} "
+        f"overwrite_labels={str(overwrite_labels).lower()}"
     )
     if paid_count and not allow_paid_calls:
         raise RuntimeError(
@@ -113,9 +132,19 @@ def label_cases(
         elif reused is not None:
             score, available = reused.label_score, bool(reused.label_available)
             source = "reused"
+        elif (recorded := _checkpointed(case)) is not None:
+            score, available = recorded["label_score"], bool(recorded["label_available"])
+            source = "checkpoint"
         else:
             score, available = _label_case(model_name, case)
             source = "gemini"
+            if checkpoint is not None:
+                checkpoint.record(
+                    case.case_id,
+                    model_name,
+                    {"label_score": score, "label_available": available},
+                    input_digest(*_reuse_key(case)),
+                )
         labeled = _with_label(case, score, available)
         output.append(labeled)
         print(
@@ -138,6 +167,16 @@ def main(argv: list[str] | None = None) -> None:
         action="store_true",
         help="Relabel every input case with Gemini, ignoring input and reusable labels",
     )
+    parser.add_argument(
+        "--checkpoint",
+        default="",
+        help="Checkpoint file of Gemini labels (default: <output>.checkpoint.jsonl)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run without paying again for labels in the checkpoint",
+    )
     args = parser.parse_args(argv)
 
     cases = load_cases(args.input)
@@ -149,13 +188,21 @@ def main(argv: list[str] | None = None) -> None:
         raise SystemExit(2)
 
     reusable_cases = load_cases(args.reuse_labels) if args.reuse_labels else []
-    labeled = label_cases(
-        cases,
-        model_name=args.model,
-        reusable_cases=reusable_cases,
-        allow_paid_calls=args.allow_paid_calls,
-        overwrite_labels=args.overwrite_labels,
-    )
+    checkpoint_path = args.checkpoint or default_checkpoint_path(args.output)
+    try:
+        checkpoint = RunCheckpoint(checkpoint_path, resume=args.resume)
+    except FileExistsError as exc:
+        print(f"[training.label] ERROR: {exc}")
+        raise SystemExit(2)
+    with checkpoint:
+        labeled = label_cases(
+            cases,
+            model_name=args.model,
+            reusable_cases=reusable_cases,
+            allow_paid_calls=args.allow_paid_calls,
+            overwrite_labels=args.overwrite_labels,
+            checkpoint=checkpoint,
+        )
     os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
     dump_cases(labeled, args.output)
     print(f"[training.label] done -> {args.output}")
@@ -10,6 +10,11 @@ For the Hugging Face side, package-default is emulated by replacing the
 dataset system message with the Modelfile SYSTEM text. This keeps the effective
 conversation aligned across runtimes instead of comparing a no-system HF prompt
 with a default-system Ollama prompt.
+
+The HF runtime generates in length-sorted batches (longest first, bounded by
+rows and padded tokens per batch) and the Ollama runtime keeps several chat
+requests in flight; predictions are always reported in validation order. Each
+runtime/profile also reports its throughput in rows and tokens per second.
 """
 from __future__ import annotations
 
@@ -19,6 +24,7 @@ import os
 import re
 import time
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from src.python.ai_scorer.ai_scorer import (
@@ -115,6 +121,50 @@ def _expected_label(row: dict[str, Any]) -> str:
     return _prediction_label(parsed)
 
 
+def _length_sorted_batches(lengths: list[int], max_rows: int, max_tokens: int = 0) -> list[list[int]]:
+    """Group row indexes longest first into batches of similar length.
+
+    A batch holds at most `max_rows` rows and, when `max_tokens` is set, at
+    most `max_tokens` tokens after padding to its longest row. A single row
+    longer than `max_tokens` still gets a batch of its own.
+    """
+    if max_rows <= 0:
+        raise ValueError("max_rows must be greater than zero")
+    batches: list[list[int]] = []
+    current: list[int] = []
+    for index in sorted(range(len(lengths)), key=lambda item: (-lengths[item], item)):
+        # Sorted longest first, so the first row sets the padded width.
+        full = len(current) >= max_rows or (
+            max_tokens > 0 and current and lengths[current[0]] * (len(current) + 1) > max_tokens
+        )
+        if current and full:
+            batches.append(current)
+            current = []
+        current.append(index)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _throughput(
+    rows: int,
+    wall_seconds: float,
+    prompt_tokens: int,
+    generated_tokens: int,
+    **extra: Any,
+) -> dict[str, Any]:
+    return {
+        "rows": rows,
+        "wall_seconds": round(wall_seconds, 3),
+        "rows_per_second": rows / wall_seconds if wall_seconds > 0 else None,
+        "prompt_tokens": prompt_tokens,
+        "generated_tokens": generated_tokens,
+        "tokens_per_second": (prompt_tokens + generated_tokens) / wall_seconds if wall_seconds > 0 else None,
+        "generated_tokens_per_second": generated_tokens / wall_seconds if wall_seconds > 0 else None,
+        **extra,
+    }
+
+
 def _run_hf(
     rows: list[dict[str, Any]],
     merged_dir: str,
@@ -123,7 +173,8 @@ def _run_hf(
     max_seq_length: int,
     max_new_tokens: int,
     batch_size: int,
-) -> list[dict[str, Any]]:
+    max_batch_tokens: int = 0,
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
     import torch  # type: ignore
     from transformers import AutoModelForCausalLM, AutoTokenizer  # type: ignore
 
@@ -148,11 +199,18 @@ def _run_hf(
         for row in rows
     ]
 
-    predictions: list[dict[str, Any]] = []
-    for start in range(0, len(prompts), batch_size):
-        batch_prompts = prompts[start : start + batch_size]
+    run_started = time.perf_counter()
+    lengths = [
+        len(ids)
+        for ids in tokenizer(prompts, truncation=True, max_length=max_seq_length)["input_ids"]
+    ]
+    batches = _length_sorted_batches(lengths, batch_size, max_batch_tokens)
+
+    predictions: list[dict[str, Any] | None] = [None] * len(prompts)
+    generated_tokens = 0
+    for batch in batches:
         encoded = tokenizer(
-            batch_prompts,
+            [prompts[index] for index in batch],
             return_tensors="pt",
             padding=True,
             truncation=True,
@@ -169,13 +227,32 @@ def _run_hf(
                 eos_token_id=tokenizer.eos_token_id,
             )
         elapsed_ms = (time.perf_counter() - started) * 1000.0
-        decoded = tokenizer.batch_decode(generated[:, input_width:], skip_special_tokens=True)
+        new_tokens = generated[:, input_width:]
+        generated_tokens += int((new_tokens != tokenizer.pad_token_id).sum())
+        decoded = tokenizer.batch_decode(new_tokens, skip_special_tokens=True)
         per_item_ms = elapsed_ms / len(decoded)
-        for content in decoded:
+        for index, content in zip(batch, decoded):
             prediction = _parsed_prediction(content)
             prediction["latency_ms"] = per_item_ms
-            predictions.append(prediction)
-    return predictions
+            predictions[index] = prediction
+    throughput = _throughput(
+        len(prompts),
+        time.perf_counter() - run_started,
+        sum(lengths),
+        generated_tokens,
+        batches=len(batches),
+        padded_prompt_tokens=sum(lengths[batch[0]] * len(batch) for batch in batches),
+    )
+    return predictions, throughput
+
+
+def _ollama_token_counts(response: Any) -> tuple[int, int]:
+    """(prompt, generated) token counts reported by Ollama; 0 when absent."""
+    if isinstance(response, dict):
+        prompt, generated = response.get("prompt_eval_count"), response.get("eval_count")
+    else:
+        prompt, generated = getattr(response, "prompt_eval_count", None), getattr(response, "eval_count", None)
+    return int(prompt or 0), int(generated or 0)
 
 
 def _run_ollama(
@@ -184,10 +261,12 @@ def _run_ollama(
     ollama_model: str,
     profile: str,
     package_system: str,
-) -> list[dict[str, Any]]:
+    concurrency: int = 1,
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
     client = build_ollama_client(ollama_host)
-    predictions: list[dict[str, Any]] = []
-    for row in rows:
+    concurrency = max(1, int(concurrency))
+
+    def _chat(row: dict[str, Any]) -> tuple[dict[str, Any], tuple[int, int]]:
         messages = _messages_for_profile(
             list(row.get("messages", [])),
             profile,
@@ -203,8 +282,20 @@ def _run_ollama(
         elapsed_ms = (time.perf_counter() - started) * 1000.0
         prediction = _parsed_prediction(str(extract_ollama_content(response)))
         prediction["latency_ms"] = elapsed_ms
-        predictions.append(prediction)
-    return predictions
+        return prediction, _ollama_token_counts(response)
+
+    run_started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="runtime-parity") as pool:
+        # map() yields in submission order, so predictions stay in row order.
+        completed = list(pool.map(_chat, rows))
+    throughput = _throughput(
+        len(rows),
+        time.perf_counter() - run_started,
+        sum(prompt for _, (prompt, _) in completed),
+        sum(generated for _, (_, generated) in completed),
+        concurrency=concurrency,
+    )
+    return [prediction for prediction, _ in completed], throughput
 
 
 def _summarize(expected: list[str], predictions: list[dict[str, Any]]) -> dict[str, Any]:
@@ -239,6 +330,10 @@ def _pair_summary(left: list[dict[str, Any]], right: list[dict[str, Any]]) -> di
     }
 
 
+def _rate(value: float | None) -> str:
+    return "N/A" if value is None else f"{value:.2f}"
+
+
 def _write_report(path: str, result: dict[str, Any]) -> None:
     lines = [
         "# Runtime Parity Report",
@@ -276,6 +371,33 @@ def _write_report(path: str, result: dict[str, Any]) -> None:
             f"({summary['exact_accuracy']:.1%}) | {mae} | `{summary['distribution']}` |"
         )
 
+    throughput = result.get("throughput", {})
+    if throughput:
+        lines.extend([
+            "",
+            "## Throughput",
+            "",
+            "| Runtime/profile | Rows/s | Tokens/s | Generated tokens/s | Wall time | Parallelism |",
+            "|---|---:|---:|---:|---:|---|",
+        ])
+        for key in (
+            "hf/request-system",
+            "ollama/request-system",
+            "hf/package-default",
+            "ollama/package-default",
+        ):
+            stats = throughput.get(key)
+            if not stats:
+                continue
+            parallelism = (
+                f"{stats['batches']} length-sorted batches" if "batches" in stats
+                else f"{stats['concurrency']} in flight"
+            )
+            lines.append(
+                f"| {key} | {_rate(stats['rows_per_second'])} | {_rate(stats['tokens_per_second'])} "
+                f"| {_rate(stats['generated_tokens_per_second'])} | {stats['wall_seconds']:.1f}s | {parallelism} |"
+            )
+
     lines.extend([
         "",
         "## Prompt-profile sensitivity",
@@ -302,17 +424,30 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument("--output-dir", required=True)
     parser.add_argument("--max-seq-length", type=int, default=1024)
     parser.add_argument("--max-new-tokens", type=int, default=8)
-    parser.add_argument("--hf-batch-size", type=int, default=4)
+    parser.add_argument("--hf-batch-size", type=int, default=4, help="Maximum rows per HF generate batch")
+    parser.add_argument(
+        "--hf-max-batch-tokens",
+        type=int,
+        default=0,
+        help="Maximum padded prompt tokens per HF batch; 0 limits batches by --hf-batch-size only",
+    )
+    parser.add_argument(
+        "--ollama-concurrency",
+        type=int,
+        default=int(os.environ.get("OLLAMA_NUM_PARALLEL", "1")),
+        help="Ollama chat requests in flight (default: OLLAMA_NUM_PARALLEL env or 1)",
+    )
     args = parser.parse_args(argv)
 
     rows = _read_jsonl(args.validation)
     package_system = _read_modelfile_system(args.modelfile)
     expected = [_expected_label(row) for row in rows]
     predictions: dict[str, list[dict[str, Any]]] = {}
+    throughput: dict[str, dict[str, Any]] = {}
 
     for profile in ("request-system", "package-default"):
         print(f"[runtime-parity] hf profile={profile} cases={len(rows)}", flush=True)
-        predictions[f"hf/{profile}"] = _run_hf(
+        predictions[f"hf/{profile}"], throughput[f"hf/{profile}"] = _run_hf(
             rows,
             args.merged_dir,
             profile,
@@ -320,15 +455,24 @@ def main(argv: list[str] | None = None) -> int:
             args.max_seq_length,
             args.max_new_tokens,
             args.hf_batch_size,
+            args.hf_max_batch_tokens,
         )
         print(f"[runtime-parity] ollama profile={profile} cases={len(rows)}", flush=True)
-        predictions[f"ollama/{profile}"] = _run_ollama(
+        predictions[f"ollama/{profile}"], throughput[f"ollama/{profile}"] = _run_ollama(
             rows,
             args.ollama_host,
             args.ollama_model,
             profile,
             package_system,
+            args.ollama_concurrency,
         )
+        for runtime in ("hf", "ollama"):
+            stats = throughput[f"{runtime}/{profile}"]
+            print(
+                f"[runtime-parity] {runtime} profile={profile} rows/s={_rate(stats['rows_per_second'])} "
+                f"tokens/s={_rate(stats['tokens_per_second'])}",
+                flush=True,
+            )
 
     result: dict[str, Any] = {
         "validation": args.validation,
@@ -340,6 +484,7 @@ def main(argv: list[str] | None = None) -> int:
         "summaries": {
             key: _summarize(expected, value) for key, value in predictions.items()
         },
+        "throughput": throughput,
         "runtime_agreement": {
             profile: _pair_summary(
                 predictions[f"hf/{profile}"],
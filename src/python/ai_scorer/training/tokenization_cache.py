@@ -0,0 +1,159 @@
+"""Pre-tokenized, memory-mapped training splits shared across fine-tuning runs.
+
+Encoding a split applies the chat template twice per row, which dominates the
+startup of CPU fine-tuning runs and is repeated on every resume. The encoded
+`input_ids`/`labels` of each split are stored once as flat NumPy arrays plus a
+row-offset index, keyed by everything the encoding depends on:
+
+    <cache_root>/<key>/<split>/{input_ids,labels,offsets}.npy + meta.json
+    key = sha256(format version, tokenizer fingerprint, max length, loss mode,
+                 dataset tree sha256)
+
+Runs with the same tokenizer, max length, loss mode and dataset reuse the same
+shards, whatever their sampling mode or hyperparameters. A split directory is
+written under a temporary name and renamed into place, so a crashed or
+concurrent writer never leaves a partial split behind.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Callable
+
+# Bump when `_encode_training_example` changes what it produces.
+CACHE_FORMAT_VERSION = "1"
+
+_ARRAYS = ("input_ids", "labels", "offsets")
+
+
+def tokenizer_fingerprint(tokenizer) -> str:
+    """Digest of the tokenizer state that determines the encoded ids."""
+    backend = getattr(tokenizer, "backend_tokenizer", None)
+    if backend is not None:
+        vocabulary = backend.to_str()
+    elif hasattr(tokenizer, "get_vocab"):
+        vocabulary = json.dumps(sorted(tokenizer.get_vocab().items()), ensure_ascii=False)
+    else:
+        vocabulary = ""
+    parts = [
+        type(tokenizer).__name__,
+        str(getattr(tokenizer, "name_or_path", "") or ""),
+        vocabulary,
+        str(getattr(tokenizer, "chat_template", "") or ""),
+        str(getattr(tokenizer, "eos_token_id", "")),
+    ]
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def tokenization_cache_key(tokenizer_hash: str, max_length: int, loss_mode: str, dataset_hash: str) -> str:
+    raw = json.dumps(
+        [CACHE_FORMAT_VERSION, tokenizer_hash, int(max_length), loss_mode, dataset_hash],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TokenizedSplit:
+    """Encoded rows of one split; arrays are opened lazily, memory-mapped, on first access."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._arrays: dict | None = None
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as handle:
+            self.meta = json.load(handle)
+        self.row_count = int(self.meta["row_count"])
+
+    def _load(self) -> dict:
+        if self._arrays is None:
+            import numpy as np  # type: ignore
+
+            self._arrays = {
+                name: np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode="r") for name in _ARRAYS
+            }
+        return self._arrays
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def lengths(self) -> list[int]:
+        """Token count of every row, read from the offsets index alone."""
+        import numpy as np  # type: ignore
+
+        return np.diff(self._load()["offsets"]).tolist()
+
+    def __getitem__(self, idx: int) -> dict[str, list[int]]:
+        if not 0 <= idx < self.row_count:
+            raise IndexError(idx)
+        arrays = self._load()
+        start, end = int(arrays["offsets"][idx]), int(arrays["offsets"][idx + 1])
+        input_ids = arrays["input_ids"][start:end].tolist()
+        return {
+            "input_ids": input_ids,
+            "attention_mask": [1] * len(input_ids),
+            "labels": arrays["labels"][start:end].tolist(),
+        }
+
+
+def _write_split(path: str, rows: list[dict], encode: Callable[[dict], dict], meta: dict) -> None:
+    import numpy as np  # type: ignore
+
+    input_ids: list[int] = []
+    labels: list[int] = []
+    offsets = [0]
+    for row in rows:
+        example = encode(row)
+        input_ids.extend(example["input_ids"])
+        labels.extend(example["labels"])
+        offsets.append(len(input_ids))
+
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, "input_ids.npy"), np.asarray(input_ids, dtype=np.int32))
+    np.save(os.path.join(path, "labels.npy"), np.asarray(labels, dtype=np.int32))
+    np.save(os.path.join(path, "offsets.npy"), np.asarray(offsets, dtype=np.int64))
+    # meta.json is written last; a split without it is never read.
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as handle:
+        json.dump({**meta, "row_count": len(rows), "token_count": len(input_ids)}, handle, indent=2)
+        handle.write("\n")
+
+
+def load_or_encode_split(
+    cache_root: str,
+    key: str,
+    split: str,
+    rows: list[dict],
+    encode: Callable[[dict], dict],
+    *,
+    meta: dict | None = None,
+) -> tuple[TokenizedSplit, bool]:
+    """Return the cached encoding of `rows` and whether it was a cache hit.
+
+    `rows` must be the split exactly as read from the hashed dataset file;
+    callers that train on a subset index into the returned split.
+    """
+    split_dir = os.path.join(cache_root, key, split)
+    if os.path.isfile(os.path.join(split_dir, "meta.json")):
+        cached = TokenizedSplit(split_dir)
+        if cached.row_count != len(rows):
+            raise ValueError(
+                f"tokenization cache {split_dir} holds {cached.row_count} rows, expected {len(rows)}; "
+                "delete it to re-encode"
+            )
+        return cached, True
+
+    os.makedirs(os.path.dirname(split_dir), exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".{split}-", dir=os.path.dirname(split_dir))
+    try:
+        _write_split(staging, rows, encode, {**(meta or {}), "key": key, "split": split})
+        try:
+            os.rename(staging, split_dir)
+        except OSError:
+            # Another run published the same split first; theirs is identical.
+            if not os.path.isfile(os.path.join(split_dir, "meta.json")):
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return TokenizedSplit(split_dir), False
+
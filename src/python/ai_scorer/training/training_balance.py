@@ -657,6 +657,108 @@ class RotatingGroupSampler:
         self.epoch = int(epoch)
 
 
+# Batches per sorting window of `LengthBucketedSampler`.
+DEFAULT_LENGTH_WINDOW_BATCHES = 64
+
+
+def padding_efficiency(order: list[int], lengths: list[int], batch_size: int) -> dict:
+    """Real vs padded token counts when `order` is cut into consecutive batches."""
+    real_tokens = 0
+    padded_tokens = 0
+    for start in range(0, len(order), batch_size):
+        batch = [lengths[index] for index in order[start : start + batch_size]]
+        real_tokens += sum(batch)
+        padded_tokens += max(batch) * len(batch)
+    return {
+        "real_tokens": real_tokens,
+        "padded_tokens": padded_tokens,
+        "padding_efficiency": round(real_tokens / padded_tokens, 6) if padded_tokens else 1.0,
+    }
+
+
+class LengthBucketedSampler:
+    """Reorder each epoch so consecutive `batch_size` runs hold similar-length examples.
+
+    `epoch_indices` supplies the epoch's examples (e.g. `BalancedTrainingPlan.epoch_indices`).
+    Each window of `window_batches` batches is sorted by length, cut into
+    batches, and the full batches are shuffled per epoch. Only the order
+    changes, so the per-epoch label and preference quotas of the plan hold
+    exactly. A trailing partial batch stays last so it cannot shift the batch
+    boundaries of the batches after it.
+    """
+
+    def __init__(
+        self,
+        epoch_indices: Callable[[int], list[int]],
+        lengths: list[int],
+        *,
+        batch_size: int,
+        seed: int,
+        window_batches: int = DEFAULT_LENGTH_WINDOW_BATCHES,
+        epoch_size: int | None = None,
+    ):
+        if batch_size <= 0:
+            raise ValueError("batch_size must be greater than zero")
+        if window_batches <= 0:
+            raise ValueError("window_batches must be greater than zero")
+        self.epoch_indices = epoch_indices
+        self.lengths = lengths
+        self.batch_size = batch_size
+        self.seed = seed
+        self.window_batches = window_batches
+        self.epoch_size = epoch_size
+        self.epoch = 0
+
+    def epoch_order(self, epoch: int) -> list[int]:
+        order = list(self.epoch_indices(epoch))
+        window = self.batch_size * self.window_batches
+        batches: list[list[int]] = []
+        for start in range(0, len(order), window):
+            ordered = sorted(order[start : start + window], key=lambda index: self.lengths[index])
+            batches.extend(
+                ordered[offset : offset + self.batch_size] for offset in range(0, len(ordered), self.batch_size)
+            )
+        tail = batches.pop() if batches and len(batches[-1]) < self.batch_size else None
+        random.Random(_stable_hash([self.seed, "length-buckets", epoch])).shuffle(batches)
+        if tail is not None:
+            batches.append(tail)
+        return [index for batch in batches for index in batch]
+
+    def padding_report(self, epoch: int) -> dict:
+        unbucketed = padding_efficiency(list(self.epoch_indices(epoch)), self.lengths, self.batch_size)
+        bucketed = padding_efficiency(self.epoch_order(epoch), self.lengths, self.batch_size)
+        return {
+            "epoch": epoch,
+            **bucketed,
+            "unbucketed_padded_tokens": unbucketed["padded_tokens"],
+            "unbucketed_padding_efficiency": unbucketed["padding_efficiency"],
+        }
+
+    def __iter__(self):
+        indices = self.epoch_order(self.epoch)
+        self.epoch += 1
+        return iter(indices)
+
+    def __len__(self) -> int:
+        if self.epoch_size is not None:
+            return self.epoch_size
+        return len(self.epoch_indices(0))
+
+    def set_epoch(self, epoch: int) -> None:
+        self.epoch = int(epoch)
+
+
+def shuffled_epoch_indices(record_count: int, seed: int) -> Callable[[int], list[int]]:
+    """Per-epoch seeded permutation of every record, for the unbalanced `all` mode."""
+
+    def epoch_indices(epoch: int) -> list[int]:
+        indices = list(range(record_count))
+        random.Random(seed + epoch).shuffle(indices)
+        return indices
+
+    return epoch_indices
+
+
 def audit_training_balance(
     rows: list[dict],
     *,
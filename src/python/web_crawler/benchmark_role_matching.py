@@ -0,0 +1,171 @@
+"""Benchmark role matching over a synthetic job corpus.
+
+Compares the previous per-call substring scan with :class:`RoleMatcher` and
+two alternatives that were considered (a combined alternation regex and a
+pure-Python Aho-Corasick automaton), and checks that every strategy accepts
+the same jobs.
+
+    python -m src.python.web_crawler.benchmark_role_matching --jobs 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import string
+import time
+from collections import deque
+from typing import Callable
+
+from src.python.web_crawler.role_filtering import RoleMatcher
+
+DEFAULT_ROLES = [
+    "Software Engineer",
+    "Platform Engineer",
+    "Site Reliability Engineer",
+    "Data Engineer",
+    "Backend Developer",
+    "Machine Learning Engineer",
+    "DevOps Engineer",
+]
+_JOB_TITLES = [
+    "Senior Software Engineer",
+    "Staff Platform Engineer",
+    "Data Engineer II",
+    "Product Manager",
+    "Product Designer",
+    "Account Executive",
+    "Engineering Manager",
+    "Customer Success Lead",
+]
+_JOB_VOCABULARY = [
+    "engineer",
+    "software",
+    "platform",
+    "data",
+    "manager",
+    "senior",
+    "backend",
+    "developer",
+    "product",
+    "designer",
+]
+
+
+def build_corpus(job_count: int, *, description_words: int = 500, seed: int = 0) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    filler = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(3000)]
+    vocabulary = filler + _JOB_VOCABULARY
+    corpus = []
+    for _ in range(job_count):
+        description = rng.choices(vocabulary, k=description_words)
+        if rng.random() < 0.2:
+            # Some descriptions mention a role phrase even when the title does not.
+            description.insert(rng.randrange(description_words), rng.choice(DEFAULT_ROLES).lower())
+        corpus.append((rng.choice(_JOB_TITLES), " ".join(description)))
+    return corpus
+
+
+def _legacy_matches(title: str, description: str, roles: list[str]) -> bool:
+    title_lower = (title or "").lower()
+    description_lower = (description or "").lower()
+    for role in roles:
+        role_lower = role.lower()
+        if role_lower in title_lower or role_lower in description_lower:
+            return True
+    return False
+
+
+class _AhoCorasick:
+    def __init__(self, patterns: list[str]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[bool] = [False]
+        for pattern in patterns:
+            node = 0
+            for char in pattern:
+                if char not in self._goto[node]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(False)
+                    self._goto[node][char] = len(self._goto) - 1
+                node = self._goto[node][char]
+            self._output[node] = True
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                candidate = self._goto[fallback].get(char, 0)
+                self._fail[child] = candidate if candidate != child else 0
+                self._output[child] = self._output[child] or self._output[self._fail[child]]
+
+    def search(self, text: str) -> bool:
+        node = 0
+        goto, fail, output = self._goto, self._fail, self._output
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node]:
+                return True
+        return False
+
+
+def _strategies(roles: list[str]) -> dict[str, Callable[[str, str], bool]]:
+    matcher = RoleMatcher(roles)
+    folded_roles = sorted({role.strip().casefold() for role in roles if role.strip()}, key=len, reverse=True)
+    combined = re.compile("|".join(re.escape(role) for role in folded_roles))
+    automaton = _AhoCorasick(folded_roles)
+    return {
+        "legacy_substring": lambda title, description: _legacy_matches(title, description, roles),
+        "role_matcher": matcher.matches,
+        "combined_regex": lambda title, description: bool(
+            combined.search(title.casefold()) or combined.search(description.casefold())
+        ),
+        "aho_corasick_py": lambda title, description: automaton.search(title.casefold())
+        or automaton.search(description.casefold()),
+    }
+
+
+def run_benchmark(corpus: list[tuple[str, str]], roles: list[str], *, include_slow: bool = False) -> dict[str, dict]:
+    results: dict[str, dict] = {}
+    for name, match in _strategies(roles).items():
+        if name == "aho_corasick_py" and not include_slow:
+            continue
+        started = time.perf_counter()
+        accepted = sum(1 for title, description in corpus if match(title, description))
+        results[name] = {"seconds": time.perf_counter() - started, "accepted": accepted}
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=50_000)
+    parser.add_argument("--description-words", type=int, default=500)
+    parser.add_argument("--roles", nargs="*", default=DEFAULT_ROLES)
+    parser.add_argument("--include-slow", action="store_true", help="also time the pure-Python Aho-Corasick automaton")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    corpus = build_corpus(args.jobs, description_words=args.description_words)
+    results = run_benchmark(corpus, args.roles, include_slow=args.include_slow)
+    baseline = results["legacy_substring"]["seconds"]
+    for name, outcome in results.items():
+        print(
+            f"{name:18s} {outcome['seconds']:8.3f}s  x{baseline / outcome['seconds']:5.2f}  "
+            f"accepted={outcome['accepted']}"
+        )
+    if len({outcome["accepted"] for outcome in results.values()}) != 1:
+        raise SystemExit("strategies disagree on accepted jobs")
+
+
+if __name__ == "__main__":
+    main()
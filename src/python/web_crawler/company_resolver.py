@@ -3,11 +3,14 @@ from __future__ import annotations
 import logging
 import re
 from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import Iterable
 from urllib.parse import urlparse
 
 from bson import ObjectId
 from google.protobuf.json_format import MessageToDict
+from pymongo import ASCENDING, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
 
 from src.python.ai_querier import common_pb2
 from src.python.web_crawler.models import DiscoveredCompany
@@ -15,6 +18,8 @@ from src.python.web_crawler.sources.ats_slug_resolver import extract_slug_from_u
 
 logger = logging.getLogger(__name__)
 
+COMPANY_CANONICAL_NAME_INDEX = "uq_company_canonical_name"
+_DUPLICATE_KEY_ERROR_CODE = 11000
 
 _LEGAL_SUFFIXES = {
     "inc",
@@ -136,57 +141,137 @@ def build_company_document(company: DiscoveredCompany, field_id: str | None = No
     return company_data
 
 
-def upsert_companies(collection, companies: Iterable[DiscoveredCompany], field_id: str | None = None) -> tuple[int, int, list[str]]:
-    inserted_count = 0
-    updated_count = 0
-    company_ids: list[str] = []
+@dataclass(slots=True)
+class CompanyResolution:
+    inserted_count: int = 0
+    updated_count: int = 0
+    company_ids: list[str] = field(default_factory=list)
+    canonical_to_oid: dict[str, ObjectId] = field(default_factory=dict)
+    inserted_canonical_names: set[str] = field(default_factory=set)
+
+
+def ensure_company_indexes(collection) -> None:
+    """Back canonical-name resolution with a unique index; tolerate legacy duplicates."""
+    try:
+        collection.create_index(
+            [("canonical_name", ASCENDING)],
+            unique=True,
+            name=COMPANY_CANONICAL_NAME_INDEX,
+        )
+    except Exception as exc:
+        logger.warning("could not ensure unique index on companies.canonical_name: %s", exc)
+
+
+def _build_company_update(existing: dict, document: dict, canonical_name: str, field_id: str | None) -> dict:
+    existing_sources = existing.get("discovery_sources", [])
+    merged_sources = existing_sources + [src for src in document["discovery_sources"] if src not in existing_sources]
+    update = {
+        "$set": {
+            "name": existing.get("name") or document["name"],
+            "canonical_name": canonical_name,
+            "description": document["description"] or existing.get("description", ""),
+            "discovery_sources": merged_sources,
+        }
+    }
+    if field_id:
+        update["$set"]["field_id"] = document["field_id"]
+
+    if not existing.get("ats_provider") or not existing.get("ats_slug"):
+        merged_document = dict(existing)
+        merged_document["discovery_sources"] = merged_sources
+        merged_ats = _extract_ats_from_company_document(merged_document)
+        if merged_ats:
+            update["$set"]["ats_provider"] = merged_ats[0]
+            update["$set"]["ats_slug"] = merged_ats[1]
+    return update
+
+
+def _duplicate_key_insert_indexes(exc: BulkWriteError) -> set[int]:
+    return {
+        int(error["index"])
+        for error in exc.details.get("writeErrors", [])
+        if error.get("code") == _DUPLICATE_KEY_ERROR_CODE
+    }
+
+
+def resolve_companies(collection, companies: Iterable[DiscoveredCompany], field_id: str | None = None) -> CompanyResolution:
+    """Upsert companies with one ``$in`` lookup and one unordered ``bulk_write``.
 
+    Returns the canonical_name -> ObjectId map for every resolved company so
+    callers do not need a follow-up lookup pass.
+    """
+    resolution = CompanyResolution()
+
+    documents: OrderedDict[str, dict] = OrderedDict()
     for company in deduplicate_companies(companies):
         canonical_name = canonicalize_company_name(company.name)
         if not canonical_name:
             logger.debug("upsert: skipping company with empty canonical name: %r", company.name)
             continue
-
-        existing = collection.find_one({"canonical_name": canonical_name})
         document = build_company_document(company, field_id=field_id)
         document["canonical_name"] = canonical_name
-
         discovered_ats = _extract_ats_from_company_document(document)
         if discovered_ats:
             document["ats_provider"] = discovered_ats[0]
             document["ats_slug"] = discovered_ats[1]
+        documents[canonical_name] = document
+
+    if not documents:
+        return resolution
 
+    existing_by_name = {
+        str(doc["canonical_name"]): doc
+        for doc in collection.find({"canonical_name": {"$in": list(documents)}})
+    }
+
+    operations: list[InsertOne | UpdateOne] = []
+    operation_names: list[str] = []
+    for canonical_name, document in documents.items():
+        existing = existing_by_name.get(canonical_name)
         if existing:
             logger.debug("updating existing company canonical_name=%r _id=%s", canonical_name, existing["_id"])
-            existing_sources = existing.get("discovery_sources", [])
-            merged_sources = existing_sources + [src for src in document["discovery_sources"] if src not in existing_sources]
-            update = {
-                "$set": {
-                    "name": existing.get("name") or document["name"],
-                    "canonical_name": canonical_name,
-                    "description": document["description"] or existing.get("description", ""),
-                    "discovery_sources": merged_sources,
-                }
-            }
-            if field_id:
-                update["$set"]["field_id"] = document["field_id"]
-
-            if not existing.get("ats_provider") or not existing.get("ats_slug"):
-                merged_document = dict(existing)
-                merged_document["discovery_sources"] = merged_sources
-                merged_ats = _extract_ats_from_company_document(merged_document)
-                if merged_ats:
-                    update["$set"]["ats_provider"] = merged_ats[0]
-                    update["$set"]["ats_slug"] = merged_ats[1]
-
-            collection.update_one({"_id": existing["_id"]}, update)
-            updated_count += 1
-            company_ids.append(str(existing["_id"]))
-            continue
+            operations.append(
+                UpdateOne({"_id": existing["_id"]}, _build_company_update(existing, document, canonical_name, field_id))
+            )
+            resolution.canonical_to_oid[canonical_name] = existing["_id"]
+        else:
+            logger.debug("inserting new company canonical_name=%r", canonical_name)
+            document["_id"] = ObjectId()
+            operations.append(InsertOne(document))
+            resolution.canonical_to_oid[canonical_name] = document["_id"]
+            resolution.inserted_canonical_names.add(canonical_name)
+        operation_names.append(canonical_name)
+
+    try:
+        collection.bulk_write(operations, ordered=False)
+    except BulkWriteError as exc:
+        conflicted = _duplicate_key_insert_indexes(exc)
+        if len(conflicted) != len(exc.details.get("writeErrors", [])):
+            raise
+        # Another worker inserted the same canonical names between our lookup and
+        # write; adopt the ids it created and merge this batch's discovery sources
+        # into its documents instead of failing the whole batch.
+        conflicted_names = [operation_names[index] for index in sorted(conflicted)]
+        logger.debug("resolving %d companies inserted concurrently: %s", len(conflicted_names), conflicted_names)
+        merges: list[UpdateOne] = []
+        for doc in collection.find({"canonical_name": {"$in": conflicted_names}}):
+            canonical_name = str(doc["canonical_name"])
+            resolution.canonical_to_oid[canonical_name] = doc["_id"]
+            resolution.inserted_canonical_names.discard(canonical_name)
+            document = dict(documents[canonical_name])
+            document.pop("_id", None)
+            merges.append(
+                UpdateOne({"_id": doc["_id"]}, _build_company_update(doc, document, canonical_name, field_id))
+            )
+        if merges:
+            collection.bulk_write(merges, ordered=False)
+
+    resolution.inserted_count = len(resolution.inserted_canonical_names)
+    resolution.updated_count = len(documents) - resolution.inserted_count
+    resolution.company_ids = [str(resolution.canonical_to_oid[name]) for name in documents if name in resolution.canonical_to_oid]
+    return resolution
 
-        logger.debug("inserting new company canonical_name=%r", canonical_name)
-        insert_result = collection.insert_one(document)
-        inserted_count += 1
-        company_ids.append(str(insert_result.inserted_id))
 
-    return inserted_count, updated_count, company_ids
\ No newline at end of file
+def upsert_companies(collection, companies: Iterable[DiscoveredCompany], field_id: str | None = None) -> tuple[int, int, list[str]]:
+    resolution = resolve_companies(collection, companies, field_id=field_id)
+    return resolution.inserted_count, resolution.updated_count, resolution.company_ids
@@ -14,6 +14,8 @@ CRAWLER_YCOMBINATOR_QUEUE = "crawler_ycombinator_queue"
 CRAWLER_HACKERNEWS_QUEUE = "crawler_hackernews_queue"
 CRAWLER_4DAYWEEK_QUEUE = "crawler_4dayweek_queue"
 CRAWLER_ENRICHMENT_RETIRING_JOBS_QUEUE = "enrichment_retiring_jobs_queue"
+ENRICHMENT_LEASE_KEY_PREFIX = "enrichment_ats_enrichment_lease"
+SOURCE_SNAPSHOT_KEY_PREFIX = "crawler_source_snapshot"
 JOB_UPDATE_CHANNEL = "job_update_channel"
 
 DEFAULT_USER_AGENT = (
@@ -54,7 +56,10 @@ class CrawlerConfig:
     hn_comments_hits_per_page: int = 500
     hn_max_comments_per_thread: int = 1000
     hn_max_companies_per_role: int = 50
+    hn_fetch_concurrency: int = 4
+    hn_incremental: bool = False
     levelsfyi_max_companies_per_role: int = 50
+    levelsfyi_detail_concurrency: int = 8
     serper_api_key: str | None = None
     serper_search_url: str = "https://google.serper.dev/search"
     force_serp_retry_on_prior_attempt: bool = False
@@ -62,6 +67,15 @@ class CrawlerConfig:
     redis_port: int = 6379
     enable_scoring_enqueue: bool = False
     referer: str = "https://4dayweek.io/jobs"
+    fourdayweek_incremental: bool = False
+    fourdayweek_full_sweep_interval_seconds: int = 604800
+    ats_title_prefilter: bool = True
+    ats_detail_fetch_limit: int = 20
+    http_validator_cache_enabled: bool = True
+    ats_schedule_enabled: bool = True
+    ats_schedule_base_interval_seconds: int = 21600
+    ats_schedule_max_interval_seconds: int = 604800
+    ats_max_companies_per_run: int = 2000
     crawler_trigger_queue_name: str = CRAWLER_TRIGGER_QUEUE
     crawler_ats_job_extraction_queue_name: str = CRAWLER_ATS_JOB_EXTRACTION_QUEUE
     crawler_enrichment_ats_enrichment_queue_name: str = CRAWLER_ENRICHMENT_ATS_ENRICHMENT_QUEUE
@@ -74,6 +88,19 @@ class CrawlerConfig:
     enable_workflow_dispatch_mode: bool = False
     crawler_enrichment_retiring_jobs_queue_name: str = CRAWLER_ENRICHMENT_RETIRING_JOBS_QUEUE
     job_update_channel_name: str = JOB_UPDATE_CHANNEL
+    redis_emit_batch_size: int = 500
+    stream_batch_size: int = 50
+    queue_visibility_timeout_seconds: int = 60
+    queue_max_deliveries: int = 5
+    # 0 disables the per-message deadline: a claimed message is held for as long as its consumer lives.
+    queue_message_deadline_seconds: int = 0
+    enrichment_fanout_max_companies: int = 500
+    enrichment_lease_ttl_seconds: int = 21600
+    enrichment_lease_key_prefix: str = ENRICHMENT_LEASE_KEY_PREFIX
+    source_snapshot_ttl_seconds: int = 900
+    source_snapshot_lock_ttl_seconds: int = 300
+    source_snapshot_wait_seconds: int = 120
+    source_snapshot_key_prefix: str = SOURCE_SNAPSHOT_KEY_PREFIX
 
     @classmethod
     def from_env(cls) -> "CrawlerConfig":
@@ -95,7 +122,10 @@ class CrawlerConfig:
             hn_comments_hits_per_page=max(1, min(int(os.getenv("CRAWLER_HN_COMMENTS_HITS_PER_PAGE", "500")), 1000)),
             hn_max_comments_per_thread=max(1, int(os.getenv("CRAWLER_HN_MAX_COMMENTS_PER_THREAD", "1000"))),
             hn_max_companies_per_role=max(1, int(os.getenv("CRAWLER_HN_MAX_COMPANIES_PER_ROLE", "50"))),
+            hn_fetch_concurrency=max(1, int(os.getenv("CRAWLER_HN_FETCH_CONCURRENCY", "4"))),
+            hn_incremental=_parse_bool(os.getenv("CRAWLER_HN_INCREMENTAL"), default=False),
             levelsfyi_max_companies_per_role=max(1, int(os.getenv("CRAWLER_LEVELSFYI_MAX_COMPANIES_PER_ROLE", "50"))),
+            levelsfyi_detail_concurrency=max(1, int(os.getenv("CRAWLER_LEVELSFYI_DETAIL_CONCURRENCY", "8"))),
             serper_api_key=os.getenv("SERPER_API_KEY") or None,
             serper_search_url=os.getenv("SERPER_SEARCH_URL", "https://google.serper.dev/search"),
             force_serp_retry_on_prior_attempt=_parse_bool(os.getenv("CRAWLER_FORCE_SERP_RETRY_ON_PRIOR_ATTEMPT"), default=False),
@@ -103,6 +133,15 @@ class CrawlerConfig:
             redis_port=int(os.getenv("REDIS_PORT", "6379")),
             enable_scoring_enqueue=_parse_bool(os.getenv("CRAWLER_ENABLE_SCORING_ENQUEUE"), default=False),
             referer=os.getenv("CRAWLER_REFERER", "https://4dayweek.io/jobs"),
+            fourdayweek_incremental=_parse_bool(os.getenv("CRAWLER_4DAYWEEK_INCREMENTAL"), default=False),
+            fourdayweek_full_sweep_interval_seconds=max(0, int(os.getenv("CRAWLER_4DAYWEEK_FULL_SWEEP_INTERVAL_SECONDS", "604800"))),
+            ats_title_prefilter=_parse_bool(os.getenv("CRAWLER_ATS_TITLE_PREFILTER"), default=True),
+            ats_detail_fetch_limit=max(0, int(os.getenv("CRAWLER_ATS_DETAIL_FETCH_LIMIT", "20"))),
+            http_validator_cache_enabled=_parse_bool(os.getenv("CRAWLER_HTTP_VALIDATOR_CACHE"), default=True),
+            ats_schedule_enabled=_parse_bool(os.getenv("CRAWLER_ATS_SCHEDULE_ENABLED"), default=True),
+            ats_schedule_base_interval_seconds=max(0, int(os.getenv("CRAWLER_ATS_SCHEDULE_BASE_INTERVAL_SECONDS", "21600"))),
+            ats_schedule_max_interval_seconds=max(0, int(os.getenv("CRAWLER_ATS_SCHEDULE_MAX_INTERVAL_SECONDS", "604800"))),
+            ats_max_companies_per_run=max(0, int(os.getenv("CRAWLER_ATS_MAX_COMPANIES_PER_RUN", "2000"))),
             crawler_trigger_queue_name=os.getenv("CRAWLER_TRIGGER_QUEUE_NAME", CRAWLER_TRIGGER_QUEUE),
             crawler_ats_job_extraction_queue_name=os.getenv("CRAWLER_ATS_JOB_EXTRACTION_QUEUE_NAME", CRAWLER_ATS_JOB_EXTRACTION_QUEUE),
             crawler_enrichment_ats_enrichment_queue_name=os.getenv("CRAWLER_ENRICHMENT_ATS_ENRICHMENT_QUEUE_NAME", CRAWLER_ENRICHMENT_ATS_ENRICHMENT_QUEUE),
@@ -115,4 +154,16 @@ class CrawlerConfig:
             enable_workflow_dispatch_mode=_parse_bool(os.getenv("CRAWLER_ENABLE_WORKFLOW_DISPATCH_MODE"), default=False),
             crawler_enrichment_retiring_jobs_queue_name=os.getenv("CRAWLER_ENRICHMENT_RETIRING_JOBS_QUEUE_NAME", CRAWLER_ENRICHMENT_RETIRING_JOBS_QUEUE),
             job_update_channel_name=os.getenv("JOB_UPDATE_CHANNEL_NAME", JOB_UPDATE_CHANNEL),
+            redis_emit_batch_size=max(1, int(os.getenv("CRAWLER_REDIS_EMIT_BATCH_SIZE", "500"))),
+            stream_batch_size=max(1, int(os.getenv("CRAWLER_STREAM_BATCH_SIZE", "50"))),
+            queue_visibility_timeout_seconds=max(1, int(os.getenv("CRAWLER_QUEUE_VISIBILITY_TIMEOUT_SECONDS", "60"))),
+            queue_max_deliveries=max(1, int(os.getenv("CRAWLER_QUEUE_MAX_DELIVERIES", "5"))),
+            queue_message_deadline_seconds=max(0, int(os.getenv("CRAWLER_QUEUE_MESSAGE_DEADLINE_SECONDS", "0"))),
+            enrichment_fanout_max_companies=max(1, int(os.getenv("CRAWLER_ENRICHMENT_FANOUT_MAX_COMPANIES", "500"))),
+            enrichment_lease_ttl_seconds=max(1, int(os.getenv("CRAWLER_ENRICHMENT_LEASE_TTL_SECONDS", "21600"))),
+            enrichment_lease_key_prefix=os.getenv("CRAWLER_ENRICHMENT_LEASE_KEY_PREFIX", ENRICHMENT_LEASE_KEY_PREFIX),
+            source_snapshot_ttl_seconds=max(0, int(os.getenv("CRAWLER_SOURCE_SNAPSHOT_TTL_SECONDS", "900"))),
+            source_snapshot_lock_ttl_seconds=max(1, int(os.getenv("CRAWLER_SOURCE_SNAPSHOT_LOCK_TTL_SECONDS", "300"))),
+            source_snapshot_wait_seconds=max(0, int(os.getenv("CRAWLER_SOURCE_SNAPSHOT_WAIT_SECONDS", "120"))),
+            source_snapshot_key_prefix=os.getenv("CRAWLER_SOURCE_SNAPSHOT_KEY_PREFIX", SOURCE_SNAPSHOT_KEY_PREFIX),
         )
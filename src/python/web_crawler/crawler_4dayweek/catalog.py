@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+
+from pymongo import UpdateOne
+
+from src.python.web_crawler.config import CrawlerConfig
+from src.python.web_crawler.crawler_4dayweek.fourdayweek import (
+    FourDayWeekAdapter,
+    FourDayWeekJobCard,
+    job_card_fingerprint,
+)
+
+logger = logging.getLogger(__name__)
+
+CATALOG_COLLECTION = "fourdayweek_catalog"
+CRAWL_STATE_COLLECTION = "crawler_source_state"
+_STATE_ID = "4dayweek"
+# A full sweep that lists fewer than this fraction of the stored catalog is
+# treated as truncated (outage, layout change, rate limit) and removes nothing.
+_MIN_SWEEP_FRACTION = 0.5
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _needs_full_sweep(state: dict | None, config: CrawlerConfig, now: datetime) -> bool:
+    last_full_sweep_at = (state or {}).get("last_full_sweep_at")
+    if not isinstance(last_full_sweep_at, datetime):
+        return True
+    return now - _as_utc(last_full_sweep_at) >= timedelta(seconds=config.fourdayweek_full_sweep_interval_seconds)
+
+
+def _load_known_fingerprints(catalog_collection) -> dict[str, str]:
+    return {
+        str(doc["_id"]): str(doc.get("fingerprint") or "")
+        for doc in catalog_collection.find({}, {"_id": 1, "fingerprint": 1})
+    }
+
+
+def _load_catalog_cards(catalog_collection) -> list[FourDayWeekJobCard]:
+    docs = catalog_collection.find({}, {"card": 1, "first_seen_at": 1})
+    ordered = sorted(docs, key=lambda doc: _as_utc(doc.get("first_seen_at") or datetime.min), reverse=True)
+    return [FourDayWeekJobCard(**doc["card"]) for doc in ordered if isinstance(doc.get("card"), dict)]
+
+
+def _store_cards(catalog_collection, cards: list[FourDayWeekJobCard], *, seen_at: datetime) -> None:
+    operations = [
+        UpdateOne(
+            {"_id": card.external_job_id},
+            {
+                "$set": {"card": asdict(card), "fingerprint": job_card_fingerprint(card), "last_seen_at": seen_at},
+                "$setOnInsert": {"first_seen_at": seen_at},
+            },
+            upsert=True,
+        )
+        for card in cards
+    ]
+    if operations:
+        catalog_collection.bulk_write(operations, ordered=False)
+
+
+def discover_catalog(
+    adapter: FourDayWeekAdapter,
+    database,
+    config: CrawlerConfig,
+    *,
+    now: datetime | None = None,
+) -> list[FourDayWeekJobCard]:
+    """Return the full 4dayweek catalog, fetching only new pages when possible.
+
+    The catalog is persisted in ``fourdayweek_catalog`` keyed by
+    ``external_job_id`` with a fingerprint of each card. Incremental runs pass
+    the stored fingerprints to the adapter, which stops at the first page of
+    known unchanged jobs, and the rest of the catalog is served from MongoDB.
+    Every ``fourdayweek_full_sweep_interval_seconds`` (or when no sweep has been
+    recorded) the whole catalog is fetched, and jobs it no longer lists are
+    removed. A sweep that returns no jobs, or fewer than ``_MIN_SWEEP_FRACTION``
+    of the stored catalog, removes nothing and is retried on the next run.
+    """
+    now = now or datetime.now(timezone.utc)
+    catalog_collection = database[CATALOG_COLLECTION]
+    state_collection = database[CRAWL_STATE_COLLECTION]
+    state = state_collection.find_one({"_id": _STATE_ID})
+
+    if _needs_full_sweep(state, config, now):
+        cards = adapter.discover_jobs(config)
+        _store_cards(catalog_collection, cards, seen_at=now)
+        stored_count = catalog_collection.count_documents({})
+        if not cards or len(cards) < _MIN_SWEEP_FRACTION * stored_count:
+            logger.warning(
+                "crawler_4dayweek: full sweep returned %d jobs for a catalog of %d; keeping delisted candidates "
+                "and retrying the sweep next run",
+                len(cards),
+                stored_count,
+            )
+            state_collection.update_one({"_id": _STATE_ID}, {"$set": {"last_crawl_at": now}}, upsert=True)
+            return _load_catalog_cards(catalog_collection)
+        removed = catalog_collection.delete_many({"last_seen_at": {"$lt": now}}).deleted_count
+        state_collection.update_one(
+            {"_id": _STATE_ID},
+            {"$set": {"last_full_sweep_at": now, "last_crawl_at": now}},
+            upsert=True,
+        )
+        logger.debug("crawler_4dayweek: full sweep stored %d jobs and removed %d delisted jobs", len(cards), removed)
+        return cards
+
+    fetched_cards = adapter.discover_jobs(config, known_fingerprints=_load_known_fingerprints(catalog_collection))
+    _store_cards(catalog_collection, fetched_cards, seen_at=now)
+    state_collection.update_one({"_id": _STATE_ID}, {"$set": {"last_crawl_at": now}}, upsert=True)
+    cards = _load_catalog_cards(catalog_collection)
+    logger.debug(
+        "crawler_4dayweek: incremental crawl fetched %d jobs; catalog holds %d jobs",
+        len(fetched_cards),
+        len(cards),
+    )
+    return cards
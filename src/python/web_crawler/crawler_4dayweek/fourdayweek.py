@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
-from dataclasses import dataclass
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import astuple, dataclass
 import hashlib
 import html
 import json
@@ -60,6 +60,11 @@ def derive_external_job_id(source_url: str) -> str:
     return hashlib.sha1(path.encode("utf-8")).hexdigest()[:16]
 
 
+def job_card_fingerprint(card: FourDayWeekJobCard) -> str:
+    """Stable digest of every card field, used to tell unchanged jobs from edited ones."""
+    return hashlib.sha1(json.dumps(astuple(card), ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
 def _normalize_domain(url: str) -> str:
     host = urlparse(url).netloc.casefold().removeprefix("www.")
     return host
@@ -461,20 +466,52 @@ class FourDayWeekAdapter:
         )
         return session
 
-    def discover_jobs(self, config: CrawlerConfig) -> list[FourDayWeekJobCard]:
+    def discover_jobs(
+        self,
+        config: CrawlerConfig,
+        *,
+        known_fingerprints: Mapping[str, str] | None = None,
+    ) -> list[FourDayWeekJobCard]:
+        """Discover 4dayweek jobs, newest first; see :meth:`iter_jobs`."""
+        return list(self.iter_jobs(config, known_fingerprints=known_fingerprints))
+
+    def iter_jobs(
+        self,
+        config: CrawlerConfig,
+        *,
+        known_fingerprints: Mapping[str, str] | None = None,
+    ) -> Iterator[FourDayWeekJobCard]:
+        """Yield 4dayweek jobs, newest first, as each listing page is fetched.
+
+        With ``known_fingerprints`` (``external_job_id`` -> :func:`job_card_fingerprint`)
+        the crawl is incremental: API paging stops after a full page of known,
+        unchanged jobs, and the HTML fallback skips detail pages of known jobs and
+        stops following listing pages that only contain known jobs. Only the jobs
+        actually fetched are yielded. If the API fails part-way, the HTML crawl
+        continues without repeating jobs that were already yielded.
+        """
         session = self._build_session(config)
+        yielded_urls: set[str] = set()
         try:
             try:
-                return self._discover_jobs_via_api(session, config)
+                for card in self._iter_jobs_via_api(session, config, known_fingerprints):
+                    yielded_urls.add(card.source_url)
+                    yield card
             except Exception as exc:
                 logger.warning("4dayweek API discovery failed, falling back to HTML crawl: %s", exc)
-                return self._discover_jobs_via_html(session, config)
+                for card in self._iter_jobs_via_html(session, config, known_fingerprints):
+                    if card.source_url not in yielded_urls:
+                        yield card
         finally:
             session.close()
 
-    def _discover_jobs_via_api(self, session: requests.Session, config: CrawlerConfig) -> list[FourDayWeekJobCard]:
+    def _iter_jobs_via_api(
+        self,
+        session: requests.Session,
+        config: CrawlerConfig,
+        known_fingerprints: Mapping[str, str] | None = None,
+    ) -> Iterator[FourDayWeekJobCard]:
         page = 1
-        jobs: list[FourDayWeekJobCard] = []
         seen_urls: set[str] = set()
 
         while True:
@@ -492,6 +529,7 @@ class FourDayWeekAdapter:
             if not isinstance(payload, dict):
                 raise ValueError("4dayweek API returned non-object payload")
 
+            page_cards: list[FourDayWeekJobCard] = []
             for item in payload.get("data") or []:
                 if not isinstance(item, dict):
                     continue
@@ -499,19 +537,27 @@ class FourDayWeekAdapter:
                 if card is None or card.source_url in seen_urls:
                     continue
                 seen_urls.add(card.source_url)
-                jobs.append(card)
+                page_cards.append(card)
+            yield from page_cards
 
             if not payload.get("has_more"):
                 break
+            if known_fingerprints is not None and page_cards and all(
+                known_fingerprints.get(card.external_job_id) == job_card_fingerprint(card) for card in page_cards
+            ):
+                logger.debug("4dayweek API page %d only has known unchanged jobs; stopping incremental crawl", page)
+                break
             page += 1
 
-        return jobs
-
-    def _discover_jobs_via_html(self, session: requests.Session, config: CrawlerConfig) -> list[FourDayWeekJobCard]:
+    def _iter_jobs_via_html(
+        self,
+        session: requests.Session,
+        config: CrawlerConfig,
+        known_fingerprints: Mapping[str, str] | None = None,
+    ) -> Iterator[FourDayWeekJobCard]:
         queue = [_FALLBACK_PAGE_URL]
         seen_pages: set[str] = set()
         seen_jobs: set[str] = set()
-        jobs: list[FourDayWeekJobCard] = []
 
         while queue:
             page_url = queue.pop(0)
@@ -523,11 +569,22 @@ class FourDayWeekAdapter:
             response.raise_for_status()
             html_text = response.text
 
-            for next_page in _extract_next_page_urls(html_text, page_url):
-                if next_page not in seen_pages:
-                    queue.append(next_page)
+            job_urls = _extract_job_urls(html_text)
+            if known_fingerprints is not None:
+                # Listing pages carry no job content, so known jobs are assumed unchanged
+                # until the next full sweep.
+                unknown_job_urls = [url for url in job_urls if derive_external_job_id(url) not in known_fingerprints]
+                follow_next_pages = bool(unknown_job_urls) or not job_urls
+                job_urls = unknown_job_urls
+            else:
+                follow_next_pages = True
+
+            if follow_next_pages:
+                for next_page in _extract_next_page_urls(html_text, page_url):
+                    if next_page not in seen_pages:
+                        queue.append(next_page)
 
-            for job_url in _extract_job_urls(html_text):
+            for job_url in job_urls:
                 if job_url in seen_jobs:
                     continue
                 seen_jobs.add(job_url)
@@ -536,6 +593,4 @@ class FourDayWeekAdapter:
                 detail_response.raise_for_status()
                 card = _parse_job_detail_html(job_url, detail_response.text)
                 if card is not None:
-                    jobs.append(card)
-
-        return jobs
+                    yield card
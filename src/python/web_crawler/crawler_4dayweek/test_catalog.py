@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import ANY, Mock
+
+from src.python.web_crawler.config import CrawlerConfig
+from src.python.web_crawler.crawler_4dayweek.catalog import (
+    CATALOG_COLLECTION,
+    CRAWL_STATE_COLLECTION,
+    discover_catalog,
+)
+from src.python.web_crawler.crawler_4dayweek.fourdayweek import FourDayWeekJobCard, job_card_fingerprint
+
+
+class FakeDeleteResult:
+    def __init__(self, deleted_count):
+        self.deleted_count = deleted_count
+
+
+class FakeCollection:
+    def __init__(self):
+        self.docs: dict[str, dict] = {}
+
+    def find(self, filter_doc=None, projection=None):
+        return [dict(doc) for doc in self.docs.values()]
+
+    def find_one(self, filter_doc, projection=None):
+        doc = self.docs.get(filter_doc["_id"])
+        return dict(doc) if doc is not None else None
+
+    def update_one(self, filter_doc, update_doc, upsert=False):
+        doc = self.docs.setdefault(filter_doc["_id"], {"_id": filter_doc["_id"]})
+        doc.update(update_doc["$set"])
+
+    def bulk_write(self, operations, ordered=True):
+        for operation in operations:
+            self.update_one(operation._filter, operation._doc)
+            doc = self.docs[operation._filter["_id"]]
+            for key, value in operation._doc.get("$setOnInsert", {}).items():
+                doc.setdefault(key, value)
+
+    def count_documents(self, filter_doc):
+        return len(self.docs)
+
+    def delete_many(self, filter_doc):
+        threshold = filter_doc["last_seen_at"]["$lt"]
+        stale = [key for key, doc in self.docs.items() if doc["last_seen_at"] < threshold]
+        for key in stale:
+            del self.docs[key]
+        return FakeDeleteResult(len(stale))
+
+
+def _card(job_id: str, title: str = "Software Engineer") -> FourDayWeekJobCard:
+    return FourDayWeekJobCard(
+        job_title=title,
+        company_name="Acme",
+        source_url=f"https://4dayweek.io/job/x-{job_id}",
+        external_job_id=job_id,
+        role=title,
+        description="Build systems.",
+        location="Remote",
+    )
+
+
+def _make_config(**kwargs) -> CrawlerConfig:
+    return CrawlerConfig(mongo_host="mongodb://localhost:27017/", db_name="test", fourdayweek_incremental=True, **kwargs)
+
+
+class DiscoverCatalogTests(unittest.TestCase):
+    def setUp(self):
+        self.database = {CATALOG_COLLECTION: FakeCollection(), CRAWL_STATE_COLLECTION: FakeCollection()}
+        self.started = datetime(2026, 5, 1, tzinfo=timezone.utc)
+
+    def test_first_run_is_a_full_sweep(self):
+        adapter = Mock()
+        adapter.discover_jobs.return_value = [_card("a1"), _card("a2")]
+
+        cards = discover_catalog(adapter, self.database, _make_config(), now=self.started)
+
+        adapter.discover_jobs.assert_called_once_with(ANY)
+        self.assertEqual([card.external_job_id for card in cards], ["a1", "a2"])
+        self.assertEqual(self.database[CATALOG_COLLECTION].docs["a1"]["fingerprint"], job_card_fingerprint(_card("a1")))
+        self.assertEqual(self.database[CRAWL_STATE_COLLECTION].docs["4dayweek"]["last_full_sweep_at"], self.started)
+
+    def test_incremental_run_merges_new_jobs_with_stored_catalog(self):
+        full = Mock()
+        full.discover_jobs.return_value = [_card("a1")]
+        discover_catalog(full, self.database, _make_config(), now=self.started)
+
+        incremental = Mock()
+        incremental.discover_jobs.return_value = [_card("a2")]
+        cards = discover_catalog(incremental, self.database, _make_config(), now=self.started + timedelta(days=1))
+
+        known = incremental.discover_jobs.call_args.kwargs["known_fingerprints"]
+        self.assertEqual(known, {"a1": job_card_fingerprint(_card("a1"))})
+        self.assertEqual([card.external_job_id for card in cards], ["a2", "a1"])
+
+    def test_periodic_full_sweep_removes_delisted_jobs(self):
+        first = Mock()
+        first.discover_jobs.return_value = [_card("a1"), _card("a2")]
+        discover_catalog(first, self.database, _make_config(), now=self.started)
+
+        sweep = Mock()
+        sweep.discover_jobs.return_value = [_card("a2", title="Staff Engineer")]
+        cards = discover_catalog(
+            sweep,
+            self.database,
+            _make_config(fourdayweek_full_sweep_interval_seconds=3600),
+            now=self.started + timedelta(hours=2),
+        )
+
+        self.assertNotIn("known_fingerprints", sweep.discover_jobs.call_args.kwargs)
+        self.assertEqual([card.job_title for card in cards], ["Staff Engineer"])
+        self.assertEqual(list(self.database[CATALOG_COLLECTION].docs), ["a2"])
+
+    def test_empty_or_truncated_sweep_keeps_the_catalog(self):
+        first = Mock()
+        first.discover_jobs.return_value = [_card("a1"), _card("a2"), _card("a3")]
+        discover_catalog(first, self.database, _make_config(), now=self.started)
+        config = _make_config(fourdayweek_full_sweep_interval_seconds=3600)
+
+        for offset, returned in ((2, []), (4, [_card("a3")])):
+            sweep = Mock()
+            sweep.discover_jobs.return_value = returned
+            cards = discover_catalog(sweep, self.database, config, now=self.started + timedelta(hours=offset))
+
+            self.assertEqual(sorted(card.external_job_id for card in cards), ["a1", "a2", "a3"])
+            self.assertEqual(sorted(self.database[CATALOG_COLLECTION].docs), ["a1", "a2", "a3"])
+        state = self.database[CRAWL_STATE_COLLECTION].docs["4dayweek"]
+        self.assertEqual(state["last_full_sweep_at"], self.started)
+
+
+if __name__ == "__main__":
+    unittest.main()
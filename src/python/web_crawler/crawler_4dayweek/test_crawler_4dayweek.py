@@ -6,11 +6,13 @@ from unittest.mock import Mock, patch
 
 from bson import ObjectId
 
+from src.python.web_crawler.company_resolver import CompanyResolution
 from src.python.web_crawler.config import CrawlerConfig
 from src.python.web_crawler.crawler_4dayweek import worker as worker_module
 from src.python.web_crawler.crawler_4dayweek import workflow as workflow_module
 from src.python.web_crawler.crawler_4dayweek.fourdayweek import FourDayWeekJobCard
 from src.python.web_crawler.models import WorkflowResult
+from src.python.web_crawler.reliable_queue import ClaimedMessage
 
 
 
@@ -22,6 +24,7 @@ class FakeInsertResult:
 class FakeCollection:
     def __init__(self, docs=None):
         self.docs: list[dict] = list(docs or [])
+        self.indexes: list[tuple] = []
 
     def find_one(self, filter_doc, projection=None):
         for doc in self.docs:
@@ -73,41 +76,107 @@ class FakeCollection:
             raise AssertionError("document not found for update")
         target.update(update_doc.get("$set", {}))
 
+    def create_index(self, keys, **kwargs):
+        self.indexes.append((keys, kwargs))
+        return kwargs.get("name", "")
+
 
 class FakeDatabase(dict):
     pass
 
 
+class FakePipeline:
+    def __init__(self, redis_client):
+        self._redis_client = redis_client
+        self._commands: list[tuple[str, tuple[str, ...]]] = []
+
+    def rpush(self, queue_name, *payloads):
+        self._commands.append((queue_name, payloads))
+
+    def execute(self, raise_on_error=True):
+        replies = []
+        for queue_name, payloads in self._commands:
+            if self._redis_client.push_error is not None:
+                replies.append(self._redis_client.push_error)
+                continue
+            for payload in payloads:
+                self._redis_client.rpush(queue_name, payload)
+            replies.append(len(payloads))
+        return replies
+
+
+class FakeWorkQueue:
+    def __init__(self, claim_side_effect=None):
+        self._claim_side_effect = list(claim_side_effect or [])
+        self.acked: list[str] = []
+
+    def claim(self):
+        if not self._claim_side_effect:
+            return None
+        next_item = self._claim_side_effect.pop(0)
+        if isinstance(next_item, BaseException):
+            raise next_item
+        return ClaimedMessage(payload=next_item, delivery_count=1)
+
+    def ack(self, message):
+        self.acked.append(message.payload)
+
+
 class FakeRedis:
-    def __init__(self, blpop_side_effect=None):
-        self._blpop_side_effect = list(blpop_side_effect or [])
+    def __init__(self):
         self.rpush_calls: list[tuple[str, str]] = []
         self.publish_calls: list[tuple[str, str]] = []
         self.ping_calls = 0
+        self.push_error: Exception | None = None
 
     def ping(self):
         self.ping_calls += 1
         return True
 
-    def blpop(self, _queues, timeout=0):
-        if not self._blpop_side_effect:
-            return None
-        next_item = self._blpop_side_effect.pop(0)
-        if isinstance(next_item, BaseException):
-            raise next_item
-        return next_item
-
     def rpush(self, queue_name, payload):
         self.rpush_calls.append((queue_name, payload))
 
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
     def publish(self, channel_name, payload):
         self.publish_calls.append((channel_name, payload))
 
 
+class FakeSnapshotRedis:
+    def __init__(self):
+        self.values: dict[str, str] = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+    def exists(self, key):
+        return int(key in self.values)
+
+
 def _make_config(**kwargs) -> CrawlerConfig:
     return CrawlerConfig(mongo_host="mongodb://localhost:27017/", db_name="test", **kwargs)
 
 
+def _make_resolution(company_oid, canonical_name="acme", *, inserted=False) -> CompanyResolution:
+    return CompanyResolution(
+        inserted_count=1 if inserted else 0,
+        updated_count=0 if inserted else 1,
+        company_ids=[str(company_oid)],
+        canonical_to_oid={canonical_name: company_oid},
+        inserted_canonical_names={canonical_name} if inserted else set(),
+    )
+
+
 def _make_card(
     *,
     title="Software Engineer",
@@ -163,12 +232,12 @@ class Crawler4DayWeekWorkflowTests(unittest.TestCase):
             }
         )
         fake_adapter = Mock()
-        fake_adapter.discover_jobs.return_value = [
+        fake_adapter.iter_jobs.return_value = [
             _make_card(external_id="81d43928", location="Remote (United States)")
         ]
 
         with patch("src.python.web_crawler.crawler_4dayweek.workflow.FourDayWeekAdapter", return_value=fake_adapter), \
-            patch("src.python.web_crawler.crawler_4dayweek.workflow.upsert_companies", return_value=(1, 0, [str(company_oid)])):
+            patch("src.python.web_crawler.crawler_4dayweek.workflow.resolve_companies", return_value=_make_resolution(company_oid, inserted=True)):
             result = workflow_module.run_crawler_4dayweek(
                 db,
                 _make_config(),
@@ -183,6 +252,36 @@ class Crawler4DayWeekWorkflowTests(unittest.TestCase):
             "Remote (United States)",
         )
 
+    def test_run_crawler_4dayweek_reports_progress_against_the_job_total(self):
+        identity_id = str(ObjectId())
+        company_oid = ObjectId()
+        cards = [_make_card(external_id="81d43928"), _make_card(external_id="81d43929")]
+
+        for listed, expected in ((list, [(1, 2), (2, 2), (2, 2)]), (iter, [(1, 2), (2, 3), (2, 2)])):
+            with self.subTest(listed=listed.__name__):
+                db = FakeDatabase(
+                    {
+                        "identities": FakeCollection(docs=[{"_id": ObjectId(identity_id), "roles": ["software engineer"]}]),
+                        "companies": FakeCollection(),
+                        "job-descriptions": FakeCollection(),
+                    }
+                )
+                fake_adapter = Mock()
+                fake_adapter.iter_jobs.return_value = listed(cards)
+                progress_events = []
+
+                with patch("src.python.web_crawler.crawler_4dayweek.workflow.FourDayWeekAdapter", return_value=fake_adapter), \
+                    patch("src.python.web_crawler.crawler_4dayweek.workflow.resolve_companies", return_value=_make_resolution(company_oid)):
+                    workflow_module.run_crawler_4dayweek(
+                        db,
+                        _make_config(),
+                        identity_id,
+                        progress_callback=lambda completed, estimated, message: progress_events.append((completed, estimated)),
+                        identity_database=db,
+                    )
+
+                self.assertEqual(progress_events[1:], expected)
+
     def test_run_crawler_4dayweek_does_not_mark_existing_company_as_new(self):
         identity_id = str(ObjectId())
         company_oid = ObjectId()
@@ -194,10 +293,10 @@ class Crawler4DayWeekWorkflowTests(unittest.TestCase):
             }
         )
         fake_adapter = Mock()
-        fake_adapter.discover_jobs.return_value = [_make_card(external_id="81d43928")]
+        fake_adapter.iter_jobs.return_value = [_make_card(external_id="81d43928")]
 
         with patch("src.python.web_crawler.crawler_4dayweek.workflow.FourDayWeekAdapter", return_value=fake_adapter), \
-            patch("src.python.web_crawler.crawler_4dayweek.workflow.upsert_companies", return_value=(0, 1, [str(company_oid)])):
+            patch("src.python.web_crawler.crawler_4dayweek.workflow.resolve_companies", return_value=_make_resolution(company_oid)):
             result = workflow_module.run_crawler_4dayweek(
                 db,
                 _make_config(),
@@ -219,11 +318,11 @@ class Crawler4DayWeekWorkflowTests(unittest.TestCase):
             }
         )
         fake_adapter = Mock()
-        fake_adapter.discover_jobs.return_value = [_make_card(external_id="81d43928")]
+        fake_adapter.iter_jobs.return_value = [_make_card(external_id="81d43928")]
 
         with self.assertLogs("src.python.web_crawler.crawler_4dayweek.workflow", level="DEBUG") as captured_logs, \
             patch("src.python.web_crawler.crawler_4dayweek.workflow.FourDayWeekAdapter", return_value=fake_adapter), \
-            patch("src.python.web_crawler.crawler_4dayweek.workflow.upsert_companies", return_value=(0, 1, [str(company_oid)])), \
+            patch("src.python.web_crawler.crawler_4dayweek.workflow.resolve_companies", return_value=_make_resolution(company_oid)), \
             patch("src.python.web_crawler.crawler_4dayweek.workflow._upsert_job") as mock_upsert:
             result = workflow_module.run_crawler_4dayweek(
                 db,
@@ -250,7 +349,7 @@ class Crawler4DayWeekWorkflowTests(unittest.TestCase):
             }
         )
         fake_adapter = Mock()
-        fake_adapter.discover_jobs.return_value = [
+        fake_adapter.iter_jobs.return_value = [
             _make_card(company="", external_id="81d43928", title="Software Engineer", role="software engineer")
         ]
 
@@ -281,11 +380,11 @@ class Crawler4DayWeekWorkflowTests(unittest.TestCase):
             }
         )
         fake_adapter = Mock()
-        fake_adapter.discover_jobs.return_value = [_make_card(external_id="81d43928")]
+        fake_adapter.iter_jobs.return_value = [_make_card(external_id="81d43928")]
 
         with self.assertLogs("src.python.web_crawler.crawler_4dayweek.workflow", level="DEBUG") as captured_logs, \
             patch("src.python.web_crawler.crawler_4dayweek.workflow.FourDayWeekAdapter", return_value=fake_adapter), \
-            patch("src.python.web_crawler.crawler_4dayweek.workflow.upsert_companies", return_value=(1, 0, [str(company_oid)])):
+            patch("src.python.web_crawler.crawler_4dayweek.workflow.resolve_companies", return_value=_make_resolution(company_oid, inserted=True)):
             result = workflow_module.run_crawler_4dayweek(
                 db,
                 _make_config(),
@@ -299,6 +398,37 @@ class Crawler4DayWeekWorkflowTests(unittest.TestCase):
             captured_logs.output,
         )
 
+    def test_run_crawler_4dayweek_reuses_source_snapshot_across_identities(self):
+        company_oid = ObjectId()
+        snapshot_redis = FakeSnapshotRedis()
+        fake_adapter = Mock()
+        fake_adapter.discover_jobs.return_value = [_make_card(external_id="81d43928")]
+
+        inserted_counts = []
+        for roles in (["software engineer"], ["engineer"]):
+            identity_id = str(ObjectId())
+            db = FakeDatabase(
+                {
+                    "identities": FakeCollection(docs=[{"_id": ObjectId(identity_id), "roles": roles}]),
+                    "companies": FakeCollection(),
+                    "job-descriptions": FakeCollection(),
+                }
+            )
+            with patch("src.python.web_crawler.crawler_4dayweek.workflow.FourDayWeekAdapter", return_value=fake_adapter), \
+                patch("src.python.web_crawler.crawler_4dayweek.workflow.resolve_companies", return_value=_make_resolution(company_oid)):
+                result = workflow_module.run_crawler_4dayweek(
+                    db,
+                    _make_config(),
+                    identity_id,
+                    identity_database=db,
+                    redis_client=snapshot_redis,
+                )
+            inserted_counts.append(result.inserted_count)
+            self.assertEqual(db["job-descriptions"].docs[0]["external_job_id"], "81d43928")
+
+        self.assertEqual(inserted_counts, [1, 1])
+        fake_adapter.discover_jobs.assert_called_once()
+
 
 class Crawler4DayWeekWorkerTests(unittest.TestCase):
     def test_worker_emits_enrichment_events_for_new_companies(self):
@@ -312,9 +442,11 @@ class Crawler4DayWeekWorkerTests(unittest.TestCase):
             "trigger_kind": "public_crawl",
             "attempt": 1,
         }
-        fake_redis = FakeRedis(blpop_side_effect=[("crawler_4dayweek_queue", json.dumps(message)), KeyboardInterrupt()])
+        fake_redis = FakeRedis()
+        work_queue = FakeWorkQueue(claim_side_effect=[json.dumps(message), KeyboardInterrupt()])
 
         with patch("src.python.web_crawler.crawler_4dayweek.worker._connect_redis", return_value=fake_redis), \
+            patch("src.python.web_crawler.crawler_4dayweek.worker.build_work_queue", return_value=work_queue), \
             patch("src.python.web_crawler.crawler_4dayweek.worker.get_database", return_value=FakeDatabase()), \
             patch("src.python.web_crawler.crawler_4dayweek.worker.get_user_database", return_value=FakeDatabase()), \
             patch(
@@ -8,8 +8,10 @@ from src.python.web_crawler.config import CrawlerConfig
 from src.python.web_crawler.crawler_4dayweek.fourdayweek import (
     FourDayWeekAdapter,
     _normalize_location,
+    _job_card_from_api_item,
     _parse_job_detail_html,
     derive_external_job_id,
+    job_card_fingerprint,
 )
 
 
@@ -17,6 +19,24 @@ def _make_config(**kwargs) -> CrawlerConfig:
     return CrawlerConfig(mongo_host="mongodb://localhost:27017/", db_name="test", **kwargs)
 
 
+def _api_item(job_id: str, title: str = "Software Engineer") -> dict:
+    return {
+        "url": f"https://4dayweek.io/job/software-engineer-at-acme-{job_id}",
+        "title": title,
+        "description": "Build systems",
+        "company": {"name": "Acme", "website": "https://acme.test"},
+    }
+
+
+def _api_page(items: list[dict], has_more: bool) -> Mock:
+    return Mock(
+        status_code=200,
+        json=Mock(return_value={"data": items, "has_more": has_more}),
+        headers={},
+        raise_for_status=Mock(),
+    )
+
+
 class FourDayWeekSourceTests(unittest.TestCase):
     def test_derive_external_job_id_prefers_slug_suffix(self):
         self.assertEqual(
@@ -78,6 +98,86 @@ class FourDayWeekSourceTests(unittest.TestCase):
         self.assertEqual(cards[0].location, "Remote (Italy)")
         fake_session.close.assert_called_once()
 
+    def test_incremental_api_crawl_stops_after_page_of_known_unchanged_jobs(self):
+        adapter = FourDayWeekAdapter()
+        known_card = _job_card_from_api_item(_api_item("a2"))
+        known = {"a2": job_card_fingerprint(known_card), "a3": job_card_fingerprint(_job_card_from_api_item(_api_item("a3")))}
+        fake_session = Mock()
+        fake_session.get.side_effect = [
+            _api_page([_api_item("a1"), _api_item("a2")], has_more=True),
+            _api_page([_api_item("a3")], has_more=True),
+            _api_page([_api_item("a4")], has_more=False),
+        ]
+
+        with patch.object(adapter, "_build_session", return_value=fake_session):
+            cards = adapter.discover_jobs(_make_config(), known_fingerprints=known)
+
+        self.assertEqual([card.external_job_id for card in cards], ["a1", "a2", "a3"])
+        self.assertEqual(fake_session.get.call_count, 2)
+
+    def test_incremental_api_crawl_continues_past_edited_jobs(self):
+        adapter = FourDayWeekAdapter()
+        known = {"a1": job_card_fingerprint(_job_card_from_api_item(_api_item("a1")))}
+        fake_session = Mock()
+        fake_session.get.side_effect = [
+            _api_page([_api_item("a1", title="Senior Software Engineer")], has_more=True),
+            _api_page([], has_more=False),
+        ]
+
+        with patch.object(adapter, "_build_session", return_value=fake_session):
+            cards = adapter.discover_jobs(_make_config(), known_fingerprints=known)
+
+        self.assertEqual(cards[0].job_title, "Senior Software Engineer")
+        self.assertEqual(fake_session.get.call_count, 2)
+
+    def test_iter_jobs_falls_back_to_html_without_repeating_streamed_jobs(self):
+        adapter = FourDayWeekAdapter()
+        fake_session = Mock()
+        fake_session.get.side_effect = [
+            _api_page([_api_item("a1")], has_more=True),
+            RuntimeError("api down"),
+        ]
+        html_cards = [_job_card_from_api_item(_api_item("a1")), _job_card_from_api_item(_api_item("a2"))]
+
+        with patch.object(adapter, "_build_session", return_value=fake_session), \
+            patch.object(adapter, "_iter_jobs_via_html", return_value=iter(html_cards)):
+            stream = adapter.iter_jobs(_make_config())
+            first = next(stream)
+            rest = list(stream)
+
+        self.assertEqual(first.external_job_id, "a1")
+        self.assertEqual([card.external_job_id for card in rest], ["a2"])
+        fake_session.close.assert_called_once()
+
+    def test_incremental_html_crawl_skips_known_job_detail_pages(self):
+        adapter = FourDayWeekAdapter()
+        listing = Mock(
+            text=(
+                '<a href="/job/software-engineer-at-acme-aaa111">a</a>'
+                '<a href="/job/platform-engineer-at-acme-bbb222">b</a>'
+                '<a href="/jobs?page=2">next</a>'
+            ),
+            raise_for_status=Mock(),
+        )
+        second_listing = Mock(text='<a href="/job/software-engineer-at-acme-aaa111">a</a>', raise_for_status=Mock())
+        detail = Mock(text="<h1>Platform Engineer</h1>", raise_for_status=Mock())
+        fake_session = Mock()
+        fake_session.get.side_effect = [listing, detail, second_listing]
+
+        with patch("src.python.web_crawler.crawler_4dayweek.fourdayweek._parse_job_detail_html", return_value=None) as parse:
+            list(adapter._iter_jobs_via_html(fake_session, _make_config(), {"aaa111": "fp"}))
+
+        requested = [call.args[0] for call in fake_session.get.call_args_list]
+        self.assertEqual(
+            requested,
+            [
+                "https://4dayweek.io/jobs",
+                "https://4dayweek.io/job/platform-engineer-at-acme-bbb222",
+                "https://4dayweek.io/jobs?page=2",
+            ],
+        )
+        parse.assert_called_once()
+
     def test_normalize_location_uses_current_api_location_restriction(self):
         item = {
             "work_arrangement": "remote",
@@ -1,41 +1,46 @@
 from __future__ import annotations
 
-import json
 import logging
 import time
+from collections.abc import Iterable, Sized
+from dataclasses import asdict
 from typing import Callable
 
 import redis
 from bson import ObjectId
-from bson.errors import InvalidId
 
-from src.python.ai_querier import common_pb2
-from src.python.web_crawler.company_resolver import canonicalize_company_name, upsert_companies
+from src.python.web_crawler.company_resolver import (
+    canonicalize_company_name,
+    ensure_company_indexes,
+    resolve_companies,
+)
 from src.python.web_crawler.config import CrawlerConfig
 from src.python.web_crawler.models import DiscoveredCompany, WorkflowResult
-from src.python.web_crawler.progress import utc_timestamp
-from src.python.web_crawler.role_filtering import load_identity_roles, text_matches_roles
+from src.python.web_crawler.queue_emitter import (
+    build_emitter,
+    enqueue_scoring_job,
+    scoring_failed_count,
+    scoring_sent_count,
+)
+from src.python.web_crawler.role_filtering import RoleMatcher, load_identity_roles
+from src.python.web_crawler.scoring_lanes import BULK_RESCORE_LANE, NEW_JOB_LANE
+from src.python.web_crawler.snapshot_cache import SourceSnapshotCache, build_snapshot_cache
+from src.python.web_crawler.workflow_utils import iter_batches
+from src.python.web_crawler.crawler_4dayweek.catalog import discover_catalog
 from src.python.web_crawler.crawler_4dayweek.fourdayweek import FourDayWeekAdapter, FourDayWeekJobCard
-from src.python.web_crawler.workflow_messages import company_discovery_event_to_json
 
 logging.basicConfig(level=logging.DEBUG, format="%(levelname)s %(name)s: %(message)s")
 logger = logging.getLogger(__name__)
 
 _WORKFLOW_ID = "crawler_4dayweek"
 _PLATFORM = "4dayweek"
+_ENRICHMENT_REASON = "new_company_via_4dayweek"
 
 
 def _now_timestamp() -> dict:
     return {"seconds": int(time.time()), "nanos": 0}
 
 
-def _to_object_id(value: str) -> ObjectId | None:
-    try:
-        return ObjectId(value)
-    except (InvalidId, TypeError):
-        return None
-
-
 def _upsert_job(
     jobs_collection,
     *,
@@ -81,22 +86,6 @@ def _upsert_job(
     return job_id, False
 
 
-def _try_enqueue(redis_client, config: CrawlerConfig, job_id: str, user_id: str, identity_id: str = "") -> bool:
-    if not user_id:
-        logger.warning("crawler_4dayweek: missing user_id for scoring enqueue job_id=%s", job_id)
-        return False
-    try:
-        msg: dict = {"job_id": job_id, "user_id": user_id}
-        if identity_id:
-            msg["identity_id"] = identity_id
-        payload = json.dumps(msg)
-        redis_client.rpush(config.job_scoring_queue_name, payload)
-        return True
-    except Exception as exc:
-        logger.warning("crawler_4dayweek: failed to enqueue job_id=%s: %s", job_id, exc)
-        return False
-
-
 def _connect_redis(config: CrawlerConfig):
     try:
         client = redis.Redis(
@@ -112,61 +101,6 @@ def _connect_redis(config: CrawlerConfig):
         return None
 
 
-def _emit_enrichment_events(
-    redis_client: redis.Redis,
-    config: CrawlerConfig,
-    *,
-    run_id: str,
-    workflow_run_id: str,
-    identity_id: str,
-    company_ids: list[str],
-) -> None:
-    for company_id in company_ids:
-        try:
-            event = common_pb2.CompanyDiscoveryEvent(
-                run_id=run_id,
-                workflow_run_id=workflow_run_id,
-                workflow_id=_WORKFLOW_ID,
-                identity_id=identity_id,
-                company_id=company_id,
-                reason="new_company_via_4dayweek",
-            )
-            event.emitted_at.CopyFrom(utc_timestamp())
-            redis_client.rpush(
-                config.crawler_enrichment_ats_enrichment_queue_name,
-                company_discovery_event_to_json(event),
-            )
-        except Exception as exc:
-            logger.warning("crawler_4dayweek: failed to emit CompanyDiscoveryEvent for company %s: %s", company_id, exc)
-
-
-def _build_company_lookup(companies_collection, company_ids: list[str]) -> dict[str, ObjectId]:
-    canonical_to_oid: dict[str, ObjectId] = {}
-    for company_id in company_ids:
-        oid = _to_object_id(company_id)
-        if oid is None:
-            continue
-        doc = companies_collection.find_one({"_id": oid}, {"canonical_name": 1})
-        if doc and doc.get("canonical_name"):
-            canonical_to_oid[str(doc["canonical_name"])] = oid
-    return canonical_to_oid
-
-
-def _merge_company_lookup(
-    companies_collection,
-    canonical_names: list[str],
-    company_ids: list[str],
-) -> dict[str, ObjectId]:
-    canonical_to_oid = _build_company_lookup(companies_collection, company_ids)
-    for canonical_name, company_id in zip(canonical_names, company_ids):
-        if canonical_name in canonical_to_oid:
-            continue
-        oid = _to_object_id(company_id)
-        if oid is not None:
-            canonical_to_oid[canonical_name] = oid
-    return canonical_to_oid
-
-
 def _unique_company_names(cards: list[FourDayWeekJobCard]) -> dict[str, FourDayWeekJobCard]:
     result: dict[str, FourDayWeekJobCard] = {}
     for card in cards:
@@ -176,6 +110,28 @@ def _unique_company_names(cards: list[FourDayWeekJobCard]) -> dict[str, FourDayW
     return result
 
 
+def _discover_job_cards(
+    adapter: FourDayWeekAdapter,
+    database,
+    config: CrawlerConfig,
+    snapshot_cache: SourceSnapshotCache | None,
+) -> Iterable[FourDayWeekJobCard]:
+    def fetch() -> list[FourDayWeekJobCard]:
+        if config.fourdayweek_incremental:
+            return discover_catalog(adapter, database, config)
+        return adapter.discover_jobs(config)
+
+    # The catalog does not depend on the identity (roles are applied below), so
+    # concurrent crawls share one fetch through the snapshot cache.
+    if snapshot_cache is not None:
+        records = snapshot_cache.get_or_fetch(_PLATFORM, lambda: [asdict(card) for card in fetch()])
+        return [FourDayWeekJobCard(**record) for record in records]
+    if config.fourdayweek_incremental:
+        return discover_catalog(adapter, database, config)
+    # Without a shared snapshot the cards are processed page by page as they arrive.
+    return adapter.iter_jobs(config)
+
+
 def run_crawler_4dayweek(
     database,
     config: CrawlerConfig,
@@ -184,6 +140,7 @@ def run_crawler_4dayweek(
     progress_callback: Callable[[int, int, str], None] | None = None,
     *,
     identity_database,
+    redis_client: redis.Redis | None = None,
 ) -> WorkflowResult:
     identities_collection = identity_database["identities"]
     companies_collection = database["companies"]
@@ -206,35 +163,24 @@ def run_crawler_4dayweek(
     if progress_callback:
         progress_callback(0, 1, "Fetching job listings from 4dayweek")
 
-    job_cards = adapter.discover_jobs(config)
-    result.discovered_count = len(job_cards)
-    logger.debug(
-        "crawler_4dayweek: discovered %d job cards for identity %s across %d roles",
-        result.discovered_count,
-        identity_id,
-        len(roles),
-    )
-    if not job_cards:
-        if progress_callback:
-            progress_callback(1, 1, "No jobs discovered from 4dayweek")
-        return result
-
-    estimated = max(len(job_cards), 1)
-    company_map = _unique_company_names(job_cards)
-    logger.debug(
-        "crawler_4dayweek: deduplicated %d unique companies from %d discovered job cards",
-        len(company_map),
-        result.discovered_count,
-    )
-    discovered_companies: list[DiscoveredCompany] = []
-    discovered_canonical_names: list[str] = []
-    existing_canonicals: set[str] = set()
-    for canonical, card in company_map.items():
-        existing = companies_collection.find_one({"canonical_name": canonical}, {"_id": 1})
-        if existing is not None:
-            existing_canonicals.add(canonical)
-        discovered_canonical_names.append(canonical)
-        discovered_companies.append(
+    job_cards = _discover_job_cards(adapter, database, config, build_snapshot_cache(redis_client, config))
+    role_matcher = RoleMatcher(roles)
+    scoring_emitter = None
+    new_company_ids: dict[str, None] = {}
+    # Snapshot and catalog runs know the total up front; a page-by-page crawl
+    # reports "at least one more" until it ends.
+    total = len(job_cards) if isinstance(job_cards, Sized) else None
+
+    for batch in iter_batches(job_cards, config.stream_batch_size):
+        if result.discovered_count == 0:
+            ensure_company_indexes(companies_collection)
+            if config.enable_scoring_enqueue:
+                scoring_redis = redis_client if redis_client is not None else _connect_redis(config)
+                if scoring_redis is not None:
+                    scoring_emitter = build_emitter(scoring_redis, config)
+
+        company_map = _unique_company_names(batch)
+        discovered_companies = [
             DiscoveredCompany(
                 name=card.company_name,
                 source=_PLATFORM,
@@ -242,97 +188,98 @@ def run_crawler_4dayweek(
                 source_url=card.source_url,
                 domain=card.company_domain,
             )
-        )
-
-    _, _, all_company_ids = upsert_companies(companies_collection, discovered_companies)
-    canonical_to_oid = _merge_company_lookup(companies_collection, discovered_canonical_names, all_company_ids)
-    result.new_company_ids = []
-    for canonical, oid in canonical_to_oid.items():
-        if canonical not in existing_canonicals:
-            result.new_company_ids.append(str(oid))
-
-    redis_client = None
-    if config.enable_scoring_enqueue:
-        redis_client = _connect_redis(config)
-
-    for index, card in enumerate(job_cards, start=1):
-        if progress_callback:
-            progress_callback(index, estimated, f"Upserting job {index}/{estimated}: {card.job_title}")
-
-        if not text_matches_roles(card.job_title, card.description, roles):
-            logger.debug(
-                "crawler_4dayweek: job %s (external_id=%s) does not match identity roles; skipping",
-                card.job_title,
-                card.external_job_id,
+            for card in company_map.values()
+        ]
+        resolution = resolve_companies(companies_collection, discovered_companies)
+        canonical_to_oid = resolution.canonical_to_oid
+        new_company_ids.update(
+            dict.fromkeys(
+                str(oid) for canonical, oid in canonical_to_oid.items() if canonical in resolution.inserted_canonical_names
             )
-            result.skipped_count += 1
-            continue
-
-        canonical = canonicalize_company_name(card.company_name) if card.company_name else ""
-        company_oid = canonical_to_oid.get(canonical) if canonical else None
+        )
 
-        if company_oid is None and card.company_name:
-            existing = companies_collection.find_one({"canonical_name": canonical}, {"_id": 1})
-            if existing is not None:
-                company_oid = existing["_id"]
-                canonical_to_oid[canonical] = company_oid
-            else:
-                _, _, new_ids = upsert_companies(
-                    companies_collection,
-                    [
-                        DiscoveredCompany(
-                            name=card.company_name,
-                            source=_PLATFORM,
-                            role=card.role,
-                            source_url=card.source_url,
-                            domain=card.company_domain,
-                        )
-                    ],
+        for card in batch:
+            result.discovered_count += 1
+            index = result.discovered_count
+            if progress_callback:
+                estimated = max(total, index) if total is not None else index + 1
+                progress_callback(index, estimated, f"Upserting job {index}/{estimated}: {card.job_title}")
+
+            if not role_matcher.matches(card.job_title, card.description):
+                logger.debug(
+                    "crawler_4dayweek: job %s (external_id=%s) does not match identity roles; skipping",
+                    card.job_title,
+                    card.external_job_id,
                 )
-                if new_ids:
-                    company_oid = _to_object_id(new_ids[0])
-                    if company_oid is not None:
-                        canonical_to_oid[canonical] = company_oid
-                        if new_ids[0] not in result.new_company_ids:
-                            result.new_company_ids.append(new_ids[0])
-
-        if company_oid is None:
-            logger.debug(
-                "crawler_4dayweek: skipping job %s (%s) - could not resolve company for %r",
-                card.external_job_id,
-                card.source_url,
-                card.company_name,
-            )
-            result.skipped_count += 1
-            continue
-
-        try:
-            job_id, was_inserted = _upsert_job(
-                jobs_collection,
-                job_title=card.job_title,
-                description=card.description,
-                location=card.location,
-                external_job_id=card.external_job_id,
-                source_url=card.source_url,
-                company_oid=company_oid,
-            )
-        except Exception as exc:
-            logger.warning("crawler_4dayweek: upsert failed for job %s: %s", card.external_job_id, exc)
-            result.failed_urls.append({"url": card.source_url, "error": str(exc)})
-            continue
-
-        result.job_ids.append(job_id)
-        if was_inserted:
-            result.inserted_count += 1
-        else:
-            result.updated_count += 1
-
-        if redis_client is not None and config.enable_scoring_enqueue:
-            if _try_enqueue(redis_client, config, job_id, user_id, identity_id=identity_id or ""):
-                result.enqueued_count += 1
+                result.skipped_count += 1
+                continue
+
+            canonical = canonicalize_company_name(card.company_name) if card.company_name else ""
+            company_oid = canonical_to_oid.get(canonical) if canonical else None
+
+            if company_oid is None:
+                logger.debug(
+                    "crawler_4dayweek: skipping job %s (%s) - could not resolve company for %r",
+                    card.external_job_id,
+                    card.source_url,
+                    card.company_name,
+                )
+                result.skipped_count += 1
+                continue
+
+            try:
+                job_id, was_inserted = _upsert_job(
+                    jobs_collection,
+                    job_title=card.job_title,
+                    description=card.description,
+                    location=card.location,
+                    external_job_id=card.external_job_id,
+                    source_url=card.source_url,
+                    company_oid=company_oid,
+                )
+            except Exception as exc:
+                logger.warning("crawler_4dayweek: upsert failed for job %s: %s", card.external_job_id, exc)
+                result.failed_urls.append({"url": card.source_url, "error": str(exc)})
+                continue
+
+            result.job_ids.append(job_id)
+            if was_inserted:
+                result.inserted_count += 1
             else:
-                result.enqueue_failed_count += 1
+                result.updated_count += 1
+
+            if scoring_emitter is not None:
+                if not enqueue_scoring_job(
+                    scoring_emitter,
+                    config,
+                    job_id=job_id,
+                    user_id=user_id,
+                    identity_id=identity_id or "",
+                    workflow_id=_WORKFLOW_ID,
+                    lane=NEW_JOB_LANE if was_inserted else BULK_RESCORE_LANE,
+                ):
+                    result.enqueue_failed_count += 1
+
+        if scoring_emitter is not None:
+            scoring_emitter.flush()
+
+    result.new_company_ids = list(new_company_ids)
+    logger.debug(
+        "crawler_4dayweek: discovered %d job cards for identity %s across %d roles",
+        result.discovered_count,
+        identity_id,
+        len(roles),
+    )
+    if result.discovered_count == 0:
+        if progress_callback:
+            progress_callback(1, 1, "No jobs discovered from 4dayweek")
+        return result
+
+    if scoring_emitter is not None:
+        result.enqueued_count = scoring_sent_count(scoring_emitter, config)
+        result.enqueue_failed_count += scoring_failed_count(scoring_emitter, config)
 
+    estimated = result.discovered_count
     if progress_callback:
         progress_callback(
             estimated,
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import hashlib
+import heapq
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from src.python.ai_querier import common_pb2
+from src.python.web_crawler.config import CrawlerConfig
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_COLLECTION = "ats_crawl_schedule"
+# Caps 2 ** n so the backoff arithmetic stays small; the max interval applies long before.
+_MAX_BACKOFF_EXPONENT = 30
+
+
+@dataclass(slots=True)
+class BoardCrawlState:
+    last_fetched_at: datetime | None = None
+    last_changed_at: datetime | None = None
+    posting_count: int = 0
+    unchanged_streak: int = 0
+    fingerprint: str = ""
+
+    @classmethod
+    def from_document(cls, doc: dict) -> "BoardCrawlState":
+        return cls(
+            last_fetched_at=_as_utc(doc.get("last_fetched_at")),
+            last_changed_at=_as_utc(doc.get("last_changed_at")),
+            posting_count=int(doc.get("posting_count") or 0),
+            unchanged_streak=int(doc.get("unchanged_streak") or 0),
+            fingerprint=str(doc.get("fingerprint") or ""),
+        )
+
+
+def _as_utc(value) -> datetime | None:
+    if not isinstance(value, datetime):
+        return None
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def board_fingerprint(jobs: list[common_pb2.Job]) -> str:
+    """Digest of a board's postings (id, title, location), independent of posting order."""
+    entries = sorted(f"{job.external_job_id}\x1f{job.title}\x1f{job.location}" for job in jobs)
+    return hashlib.sha1("\x1e".join(entries).encode("utf-8")).hexdigest()
+
+
+def backoff_seconds(state: BoardCrawlState, config: CrawlerConfig) -> int:
+    """Delay before the next fetch: none after a change, then doubling per unchanged fetch."""
+    if state.unchanged_streak <= 0:
+        return 0
+    exponent = min(state.unchanged_streak - 1, _MAX_BACKOFF_EXPONENT)
+    return min(config.ats_schedule_base_interval_seconds * 2**exponent, config.ats_schedule_max_interval_seconds)
+
+
+def next_fetch_at(state: BoardCrawlState, config: CrawlerConfig) -> datetime | None:
+    """When the board is due again, or ``None`` if it has never been fetched."""
+    if state.last_fetched_at is None:
+        return None
+    return state.last_fetched_at + timedelta(seconds=backoff_seconds(state, config))
+
+
+def load_crawl_states(schedule_collection, scope: str) -> dict[str, BoardCrawlState]:
+    # Documents are keyed "<scope>:<company_id>"; an anchored prefix match uses the _id index.
+    docs = schedule_collection.find(
+        {"_id": {"$regex": f"^{scope}:"}},
+        {"company_id": 1, "last_fetched_at": 1, "last_changed_at": 1, "posting_count": 1, "unchanged_streak": 1, "fingerprint": 1},
+    )
+    return {str(doc["company_id"]): BoardCrawlState.from_document(doc) for doc in docs if doc.get("company_id")}
+
+
+def select_companies(
+    companies: list[common_pb2.Company],
+    states: dict[str, BoardCrawlState],
+    config: CrawlerConfig,
+    now: datetime,
+) -> tuple[list[common_pb2.Company], int]:
+    """Pick the companies to crawl this run, most urgent first.
+
+    Never-fetched boards come first, then due boards ordered by how long they
+    have been overdue. Boards still inside their backoff window are deferred,
+    and at most ``ats_max_companies_per_run`` companies are returned (0 means
+    no cap). Returns ``(selected, deferred_count)``.
+    """
+    candidates: list[tuple[int, float, int, common_pb2.Company]] = []
+    for index, company in enumerate(companies):
+        due_at = next_fetch_at(states.get(company.id, BoardCrawlState()), config)
+        if due_at is None:
+            candidates.append((0, 0.0, index, company))
+        elif due_at <= now:
+            candidates.append((1, -(now - due_at).total_seconds(), index, company))
+
+    limit = config.ats_max_companies_per_run
+    selected = heapq.nsmallest(limit, candidates) if limit > 0 else sorted(candidates)
+    return [company for *_, company in selected], len(companies) - len(selected)
+
+
+def record_fetch(
+    schedule_collection,
+    scope: str,
+    company_id: str,
+    previous: BoardCrawlState | None,
+    jobs: list[common_pb2.Job] | None,
+    now: datetime,
+) -> BoardCrawlState:
+    """Store the outcome of a fully processed board fetch; ``jobs=None`` means HTTP 304."""
+    previous = previous or BoardCrawlState()
+    if jobs is None:
+        fingerprint, posting_count = previous.fingerprint, previous.posting_count
+    else:
+        fingerprint, posting_count = board_fingerprint(jobs), len(jobs)
+    changed = previous.last_fetched_at is None or fingerprint != previous.fingerprint
+    state = BoardCrawlState(
+        last_fetched_at=now,
+        last_changed_at=now if changed else previous.last_changed_at,
+        posting_count=posting_count,
+        unchanged_streak=0 if changed else previous.unchanged_streak + 1,
+        fingerprint=fingerprint,
+    )
+    try:
+        schedule_collection.update_one(
+            {"_id": f"{scope}:{company_id}"},
+            {
+                "$set": {
+                    "scope": scope,
+                    "company_id": company_id,
+                    "last_fetched_at": state.last_fetched_at,
+                    "last_changed_at": state.last_changed_at,
+                    "posting_count": state.posting_count,
+                    "unchanged_streak": state.unchanged_streak,
+                    "fingerprint": state.fingerprint,
+                }
+            },
+            upsert=True,
+        )
+    except Exception as exc:
+        logger.warning("crawler_ats_job_extraction: failed to record crawl state for company %s: %s", company_id, exc)
+    return state
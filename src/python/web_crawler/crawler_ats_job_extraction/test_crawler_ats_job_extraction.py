@@ -2,13 +2,20 @@ from __future__ import annotations
 
 import json
 import unittest
+from datetime import datetime, timezone
 from unittest.mock import MagicMock, Mock, patch
 
 from bson import ObjectId
 
 from src.python.ai_querier import common_pb2
 from src.python.web_crawler.config import CrawlerConfig
+from src.python.web_crawler.crawler_ats_job_extraction import worker as worker_module
+from src.python.web_crawler.crawler_ats_job_extraction.schedule import SCHEDULE_COLLECTION
+from src.python.web_crawler.sources.ats_job_fetcher import AtsFetchError
 from src.python.web_crawler.crawler_ats_job_extraction.workflow import run_crawler_ats_job_extraction, upsert_job
+from src.python.web_crawler.http_validator_cache import HTTP_VALIDATORS_COLLECTION
+from src.python.web_crawler.models import WorkflowResult
+from src.python.web_crawler.reliable_queue import ClaimedMessage
 
 
 class FakeCollection:
@@ -79,7 +86,7 @@ class FakeCollection:
         result.inserted_id = oid
         return result
 
-    def update_one(self, filter_doc, update_doc):
+    def update_one(self, filter_doc, update_doc, upsert=False):
         for doc in self.docs:
             if "_id" in filter_doc and doc.get("_id") != filter_doc["_id"]:
                 continue
@@ -91,6 +98,34 @@ class FakeDatabase(dict):
     pass
 
 
+class FakePipeline:
+    def __init__(self, redis_client):
+        self._redis_client = redis_client
+        self._commands: list[tuple[str, tuple[str, ...]]] = []
+
+    def rpush(self, queue_name, *payloads):
+        self._commands.append((queue_name, payloads))
+
+    def execute(self, raise_on_error=True):
+        replies = []
+        for queue_name, payloads in self._commands:
+            if self._redis_client.push_error is not None:
+                replies.append(self._redis_client.push_error)
+                continue
+            self._redis_client.rpush_calls.extend((queue_name, payload) for payload in payloads)
+            replies.append(len(payloads))
+        return replies
+
+
+class FakeRedis:
+    def __init__(self, push_error: Exception | None = None):
+        self.push_error = push_error
+        self.rpush_calls: list[tuple[str, str]] = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
 def _make_config(**kwargs) -> CrawlerConfig:
     return CrawlerConfig(mongo_host="mongodb://localhost:27017/", db_name="test", **kwargs)
 
@@ -168,6 +203,8 @@ class CrawlerAtsJobExtractionTests(unittest.TestCase):
         db["companies"] = FakeCollection(docs=companies or [])
         db["job-descriptions"] = FakeCollection(docs=jobs or [])
         db["identities"] = FakeCollection(docs=identities or [])
+        db[HTTP_VALIDATORS_COLLECTION] = FakeCollection()
+        db[SCHEDULE_COLLECTION] = FakeCollection()
         return db
 
     def _make_company_doc(self, provider="greenhouse", slug="acme"):
@@ -303,17 +340,16 @@ class CrawlerAtsJobExtractionTests(unittest.TestCase):
             identities=[self._make_identity_doc()],
         )
 
-        fake_redis = Mock()
-        fake_redis.rpush = Mock()
+        fake_redis = FakeRedis()
 
         with patch("src.python.web_crawler.crawler_ats_job_extraction.workflow.fetch_jobs", side_effect=self._stub_fetch_jobs), \
              patch("src.python.web_crawler.crawler_ats_job_extraction.workflow._connect_redis", return_value=fake_redis):
             result = run_crawler_ats_job_extraction(db, config, user_id="user-1", identity_id=str(self.identity_oid), identity_database=db)
 
-        fake_redis.rpush.assert_called_once()
-        call_args = fake_redis.rpush.call_args
-        self.assertEqual(call_args[0][0], "custom_job_scoring_queue")
-        payload = json.loads(call_args[0][1])
+        self.assertEqual(len(fake_redis.rpush_calls), 1)
+        queue_name, raw_payload = fake_redis.rpush_calls[0]
+        self.assertEqual(queue_name, "custom_job_scoring_queue")
+        payload = json.loads(raw_payload)
         self.assertIn("job_id", payload)
         self.assertEqual(result.enqueued_count, 1)
         self.assertEqual(result.enqueue_failed_count, 0)
@@ -325,8 +361,7 @@ class CrawlerAtsJobExtractionTests(unittest.TestCase):
             identities=[self._make_identity_doc()],
         )
 
-        fake_redis = Mock()
-        fake_redis.rpush = Mock(side_effect=Exception("redis down"))
+        fake_redis = FakeRedis(push_error=Exception("redis down"))
 
         with patch("src.python.web_crawler.crawler_ats_job_extraction.workflow.fetch_jobs", side_effect=self._stub_fetch_jobs), \
              patch("src.python.web_crawler.crawler_ats_job_extraction.workflow._connect_redis", return_value=fake_redis):
@@ -452,5 +487,149 @@ class CrawlerAtsJobExtractionTests(unittest.TestCase):
         self.assertEqual(completed_values, sorted(completed_values))
 
 
+    def test_run_crawler_ats_job_extraction_skips_unchanged_boards(self):
+        db = self._make_fake_database(
+            companies=[self._make_company_doc()],
+            identities=[self._make_identity_doc()],
+        )
+
+        with patch("src.python.web_crawler.crawler_ats_job_extraction.workflow.fetch_jobs", return_value=None) as mock_fetch:
+            result = run_crawler_ats_job_extraction(db, self.config, identity_id=str(self.identity_oid), identity_database=db)
+
+        self.assertIsNotNone(mock_fetch.call_args.args[5])
+        self.assertEqual(result.not_modified_count, 1)
+        self.assertEqual(result.fetched_count, 0)
+        self.assertEqual(len(db["job-descriptions"].docs), 0)
+
+    def _fetch_staging_validators(self, provider, slug, config, session, role_matcher=None, validator_cache=None):
+        response = Mock(headers={"ETag": '"v1"'})
+        validator_cache.remember(f"https://boards.example/{slug}", response)
+        return self._stub_fetch_jobs()
+
+    def test_run_crawler_ats_job_extraction_commits_validators_after_clean_board(self):
+        db = self._make_fake_database(
+            companies=[self._make_company_doc()],
+            identities=[self._make_identity_doc()],
+        )
+        validators = Mock()
+        db[HTTP_VALIDATORS_COLLECTION] = validators
+
+        with patch("src.python.web_crawler.crawler_ats_job_extraction.workflow.fetch_jobs", side_effect=self._fetch_staging_validators):
+            run_crawler_ats_job_extraction(db, self.config, identity_id=str(self.identity_oid), identity_database=db)
+
+        validators.update_one.assert_called_once()
+        self.assertTrue(validators.update_one.call_args.args[0]["_id"].endswith(":https://boards.example/acme"))
+
+    def test_run_crawler_ats_job_extraction_discards_validators_when_enqueue_fails(self):
+        config = _make_config(enable_scoring_enqueue=True)
+        db = self._make_fake_database(
+            companies=[self._make_company_doc()],
+            identities=[self._make_identity_doc()],
+        )
+        validators = Mock()
+        db[HTTP_VALIDATORS_COLLECTION] = validators
+
+        with patch("src.python.web_crawler.crawler_ats_job_extraction.workflow.fetch_jobs", side_effect=self._fetch_staging_validators), \
+             patch("src.python.web_crawler.crawler_ats_job_extraction.workflow._connect_redis", return_value=FakeRedis(push_error=Exception("redis down"))):
+            result = run_crawler_ats_job_extraction(db, config, user_id="user-1", identity_id=str(self.identity_oid), identity_database=db)
+
+        self.assertEqual(result.enqueue_failed_count, 1)
+        validators.update_one.assert_not_called()
+
+
+    def test_run_crawler_ats_job_extraction_does_not_advance_schedule_of_failed_fetch(self):
+        db = self._make_fake_database(
+            companies=[self._make_company_doc()],
+            identities=[self._make_identity_doc()],
+        )
+        workflow = "src.python.web_crawler.crawler_ats_job_extraction.workflow"
+
+        with patch(f"{workflow}.fetch_jobs", side_effect=AtsFetchError("greenhouse: could not fetch board for slug=acme")), \
+             patch(f"{workflow}.record_fetch") as mock_record:
+            result = run_crawler_ats_job_extraction(db, self.config, identity_id=str(self.identity_oid), identity_database=db)
+
+        self.assertEqual(len(result.failed_companies), 1)
+        mock_record.assert_not_called()
+
+        with patch(f"{workflow}.fetch_jobs", return_value=[]), patch(f"{workflow}.record_fetch") as mock_record:
+            run_crawler_ats_job_extraction(db, self.config, identity_id=str(self.identity_oid), identity_database=db)
+
+        self.assertEqual(mock_record.call_args.args[2], str(self.company_oid))
+        self.assertEqual(mock_record.call_args.args[4], [])
+
+    def test_run_crawler_ats_job_extraction_defers_dormant_boards_on_full_runs(self):
+        dormant = {"_id": ObjectId(), "name": "Dormant", "ats_provider": "lever", "ats_slug": "dormant"}
+        db = self._make_fake_database(
+            companies=[self._make_company_doc(), dormant],
+            identities=[self._make_identity_doc()],
+        )
+        db[SCHEDULE_COLLECTION].docs.append(
+            {"company_id": str(dormant["_id"]), "last_fetched_at": datetime.now(timezone.utc), "unchanged_streak": 5}
+        )
+
+        with patch("src.python.web_crawler.crawler_ats_job_extraction.workflow.fetch_jobs", side_effect=self._stub_fetch_jobs) as mock_fetch:
+            result = run_crawler_ats_job_extraction(db, self.config, identity_id=str(self.identity_oid), identity_database=db)
+
+        self.assertEqual([call.args[1] for call in mock_fetch.call_args_list], ["acme"])
+        self.assertEqual(result.deferred_count, 1)
+
+        with patch("src.python.web_crawler.crawler_ats_job_extraction.workflow.fetch_jobs", side_effect=self._stub_fetch_jobs) as mock_fetch:
+            run_crawler_ats_job_extraction(
+                db,
+                self.config,
+                company_ids=[str(dormant["_id"])],
+                identity_id=str(self.identity_oid),
+                identity_database=db,
+            )
+
+        self.assertEqual([call.args[1] for call in mock_fetch.call_args_list], ["dormant"])
+
+
+class CrawlerAtsJobExtractionWorkerTests(unittest.TestCase):
+    def _run_worker(self, message: common_pb2.WorkflowDispatchMessage) -> Mock:
+        work_queue = Mock()
+        work_queue.claim.side_effect = [ClaimedMessage(payload="payload", delivery_count=1), RuntimeError("stop")]
+        with patch.object(worker_module, "_connect_redis", return_value=Mock()), \
+            patch.object(worker_module, "build_work_queue", return_value=work_queue), \
+            patch.object(worker_module, "parse_workflow_dispatch", return_value=message), \
+            patch.object(worker_module, "get_database", return_value=FakeDatabase()), \
+            patch.object(worker_module, "get_user_database", return_value=FakeDatabase()), \
+            patch.object(worker_module, "run_crawler_ats_job_extraction", return_value=WorkflowResult()) as mock_run, \
+            patch.object(worker_module, "increment_discovered_jobs_counter"), \
+            patch.object(worker_module, "publish_progress"), \
+            patch.object(worker_module.time, "sleep", side_effect=StopIteration):
+            with self.assertRaises(StopIteration):
+                worker_module.worker_main(_make_config())
+        return mock_run
+
+    def test_company_enriched_dispatch_crawls_only_that_company(self):
+        company_id = str(ObjectId())
+        message = common_pb2.WorkflowDispatchMessage(
+            run_id="run-1",
+            workflow_run_id="wf-1",
+            identity_id=str(ObjectId()),
+            user_id="user-1",
+            company_id=company_id,
+            trigger_kind="company_enriched",
+        )
+
+        mock_run = self._run_worker(message)
+
+        self.assertEqual(mock_run.call_args.kwargs["company_ids"], [company_id])
+
+    def test_trigger_dispatch_crawls_all_enriched_companies(self):
+        message = common_pb2.WorkflowDispatchMessage(
+            run_id="run-1",
+            workflow_run_id="wf-1",
+            identity_id=str(ObjectId()),
+            user_id="user-1",
+            trigger_kind="public_crawl",
+        )
+
+        mock_run = self._run_worker(message)
+
+        self.assertIsNone(mock_run.call_args.kwargs["company_ids"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from src.python.ai_querier import common_pb2
+from src.python.web_crawler.config import CrawlerConfig
+from src.python.web_crawler.crawler_ats_job_extraction.schedule import (
+    BoardCrawlState,
+    backoff_seconds,
+    board_fingerprint,
+    load_crawl_states,
+    record_fetch,
+    select_companies,
+)
+
+
+class FakeScheduleCollection:
+    def __init__(self):
+        self.docs: dict[str, dict] = {}
+
+    def find(self, filter_doc, projection=None):
+        prefix = filter_doc["_id"]["$regex"].lstrip("^")
+        return [dict(doc) for key, doc in self.docs.items() if key.startswith(prefix)]
+
+    def update_one(self, filter_doc, update_doc, upsert=False):
+        self.docs.setdefault(filter_doc["_id"], {"_id": filter_doc["_id"]}).update(update_doc["$set"])
+
+
+def _make_config(**kwargs) -> CrawlerConfig:
+    defaults = {"ats_schedule_base_interval_seconds": 3600, "ats_schedule_max_interval_seconds": 4 * 3600}
+    return CrawlerConfig(mongo_host="mongodb://localhost:27017/", db_name="test", **{**defaults, **kwargs})
+
+
+def _job(external_id: str, title: str = "Engineer") -> common_pb2.Job:
+    return common_pb2.Job(external_job_id=external_id, title=title, location="Remote", platform="lever")
+
+
+def _company(company_id: str) -> common_pb2.Company:
+    return common_pb2.Company(id=company_id, name=company_id, ats_provider="lever", ats_slug=company_id)
+
+
+class BackoffTests(unittest.TestCase):
+    def test_backoff_doubles_per_unchanged_fetch_up_to_the_cap(self):
+        config = _make_config()
+
+        delays = [backoff_seconds(BoardCrawlState(unchanged_streak=streak), config) for streak in range(6)]
+
+        self.assertEqual(delays, [0, 3600, 7200, 14400, 14400, 14400])
+        self.assertEqual(backoff_seconds(BoardCrawlState(unchanged_streak=10_000), config), 14400)
+
+    def test_board_fingerprint_ignores_posting_order_and_descriptions(self):
+        first = [_job("1"), _job("2")]
+        second = [_job("2"), common_pb2.Job(external_job_id="1", title="Engineer", location="Remote", description="x")]
+
+        self.assertEqual(board_fingerprint(first), board_fingerprint(second))
+        self.assertNotEqual(board_fingerprint(first), board_fingerprint([_job("1")]))
+
+
+class SelectCompaniesTests(unittest.TestCase):
+    def setUp(self):
+        self.now = datetime(2026, 6, 1, 12, tzinfo=timezone.utc)
+
+    def test_new_boards_first_then_most_overdue_and_dormant_boards_deferred(self):
+        states = {
+            "due-recently": BoardCrawlState(last_fetched_at=self.now - timedelta(hours=1), unchanged_streak=1),
+            "long-overdue": BoardCrawlState(last_fetched_at=self.now - timedelta(hours=9), unchanged_streak=3),
+            "dormant": BoardCrawlState(last_fetched_at=self.now - timedelta(hours=1), unchanged_streak=4),
+            "changing": BoardCrawlState(last_fetched_at=self.now - timedelta(minutes=5), unchanged_streak=0),
+        }
+        companies = [_company(name) for name in ("due-recently", "dormant", "new", "long-overdue", "changing")]
+
+        selected, deferred = select_companies(companies, states, _make_config(), self.now)
+
+        self.assertEqual([company.id for company in selected], ["new", "long-overdue", "changing", "due-recently"])
+        self.assertEqual(deferred, 1)
+
+    def test_cap_keeps_the_most_urgent_companies(self):
+        states = {"old": BoardCrawlState(last_fetched_at=self.now - timedelta(days=3), unchanged_streak=1)}
+        companies = [_company("old"), _company("new-a"), _company("new-b")]
+
+        selected, deferred = select_companies(companies, states, _make_config(ats_max_companies_per_run=2), self.now)
+
+        self.assertEqual([company.id for company in selected], ["new-a", "new-b"])
+        self.assertEqual(deferred, 1)
+
+
+class RecordFetchTests(unittest.TestCase):
+    def test_unchanged_fetches_extend_the_streak_and_changes_reset_it(self):
+        collection = FakeScheduleCollection()
+        started = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+        state = record_fetch(collection, "scope", "c1", None, [_job("1")], started)
+        state = record_fetch(collection, "scope", "c1", state, [_job("1")], started + timedelta(hours=1))
+        state = record_fetch(collection, "scope", "c1", state, None, started + timedelta(hours=2))
+        self.assertEqual((state.unchanged_streak, state.posting_count, state.last_changed_at), (2, 1, started))
+
+        state = record_fetch(collection, "scope", "c1", state, [_job("1"), _job("2")], started + timedelta(hours=3))
+        self.assertEqual((state.unchanged_streak, state.posting_count), (0, 2))
+
+        loaded = load_crawl_states(collection, "scope")
+        self.assertEqual(loaded, {"c1": state})
+        self.assertEqual(load_crawl_states(collection, "other"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
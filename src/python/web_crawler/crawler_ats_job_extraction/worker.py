@@ -3,7 +3,6 @@ from __future__ import annotations
 import argparse
 import logging
 import time
-from typing import cast
 
 import redis
 
@@ -11,6 +10,7 @@ from src.python.web_crawler.config import CrawlerConfig
 from src.python.web_crawler.crawler_ats_job_extraction.workflow import run_crawler_ats_job_extraction
 from src.python.web_crawler.db import get_database, get_user_database
 from src.python.web_crawler.progress import publish_progress, utc_timestamp
+from src.python.web_crawler.reliable_queue import ReliableQueue, build_work_queue
 from src.python.web_crawler.workflow_counters import increment_discovered_jobs_counter
 from src.python.web_crawler.workflow_messages import parse_workflow_dispatch
 
@@ -28,6 +28,7 @@ def _connect_redis(config: CrawlerConfig) -> redis.Redis:
 
 def worker_main(config: CrawlerConfig) -> None:
     redis_client: redis.Redis | None = None
+    work_queue: ReliableQueue | None = None
 
     while True:
         try:
@@ -35,27 +36,31 @@ def worker_main(config: CrawlerConfig) -> None:
                 redis_client = _connect_redis(config)
                 logger.info("connected to redis at %s:%s", config.redis_host, config.redis_port)
 
-            queue_item = cast(
-                tuple[str, str] | None,
-                redis_client.blpop([config.crawler_ats_job_extraction_queue_name], timeout=0),
-            )
-            if not queue_item:
+            if work_queue is None:
+                work_queue = build_work_queue(redis_client, config, config.crawler_ats_job_extraction_queue_name)
+            claimed = work_queue.claim()
+            if claimed is None:
                 continue
 
-            _, raw_payload = queue_item
+            raw_payload = claimed.payload
             try:
                 message = parse_workflow_dispatch(raw_payload)
             except Exception as exc:
                 logger.warning("invalid workflow dispatch payload: %s", exc)
+                work_queue.ack(claimed)
                 continue
 
             run_id = message.run_id.strip()
             workflow_run_id = message.workflow_run_id.strip()
             identity_id = message.identity_id.strip()
             user_id = message.user_id.strip()
+            # "company_enriched" dispatches carry the one company that enrichment
+            # just resolved; trigger dispatches crawl every enriched company.
+            company_id = message.company_id.strip()
 
             if not run_id or not identity_id or not user_id:
                 logger.warning("dispatch message missing run_id, identity_id, or user_id: %s", raw_payload)
+                work_queue.ack(claimed)
                 continue
 
             started_at = utc_timestamp()
@@ -80,6 +85,7 @@ def worker_main(config: CrawlerConfig) -> None:
                     database,
                     config,
                     user_id=user_id,
+                    company_ids=[company_id] if company_id else None,
                     identity_id=identity_id,
                     identity_database=user_database,
                 )
@@ -124,9 +130,12 @@ def worker_main(config: CrawlerConfig) -> None:
                     workflow_id=_WORKFLOW_ID,
                     workflow_run_id=workflow_run_id,
                 )
+
+            work_queue.ack(claimed)
         except Exception as exc:
             logger.warning("worker loop error: %s", exc)
             redis_client = None
+            work_queue = None
             time.sleep(2)
 
 
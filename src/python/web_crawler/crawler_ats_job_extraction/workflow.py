@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-import json
 import logging
 import time
+from datetime import datetime, timezone
 from typing import Callable, Iterable
 
 import redis as redis_lib
@@ -14,10 +14,24 @@ from google.protobuf.json_format import MessageToDict
 
 from src.python.ai_querier import common_pb2
 from src.python.web_crawler.config import CrawlerConfig
+from src.python.web_crawler.crawler_ats_job_extraction.schedule import (
+    SCHEDULE_COLLECTION,
+    load_crawl_states,
+    record_fetch,
+    select_companies,
+)
+from src.python.web_crawler.http_validator_cache import build_validator_cache, validator_scope
 from src.python.web_crawler.models import WorkflowResult
-from src.python.web_crawler.sources.ats_job_fetcher import fetch_jobs
+from src.python.web_crawler.queue_emitter import (
+    build_emitter,
+    enqueue_scoring_job,
+    scoring_failed_count,
+    scoring_sent_count,
+)
+from src.python.web_crawler.sources.ats_job_fetcher import AtsFetchError, fetch_jobs
 from src.python.web_crawler.enrichment_ats_enrichment.workflow import _company_from_document
-from src.python.web_crawler.role_filtering import load_identity_roles, text_matches_roles
+from src.python.web_crawler.role_filtering import RoleMatcher, load_identity_roles
+from src.python.web_crawler.scoring_lanes import BULK_RESCORE_LANE, NEW_JOB_LANE
 
 logger = logging.getLogger(__name__)
 
@@ -52,22 +66,6 @@ def _build_job_document(job: common_pb2.Job, company_oid: ObjectId) -> dict:
     return doc
 
 
-def _try_enqueue(redis_client, config: CrawlerConfig, job_id: str, user_id: str, identity_id: str = "") -> bool:
-    if not user_id:
-        logger.warning("crawler_ats_job_extraction: missing user_id for scoring enqueue job_id=%s", job_id)
-        return False
-    try:
-        msg: dict = {"job_id": job_id, "user_id": user_id}
-        if identity_id:
-            msg["identity_id"] = identity_id
-        payload = json.dumps(msg)
-        redis_client.rpush(config.job_scoring_queue_name, payload)
-        return True
-    except Exception as exc:
-        logger.warning("crawler_ats_job_extraction: failed to enqueue job_id=%s: %s", job_id, exc)
-        return False
-
-
 def _connect_redis(config: CrawlerConfig):
     try:
         client = redis_lib.Redis(host=config.redis_host, port=config.redis_port, socket_connect_timeout=5)
@@ -166,8 +164,26 @@ def run_crawler_ats_job_extraction(
             progress_callback(0, 1, "Skipping ATS extraction: identity has no configured roles")
         return result
 
+    role_matcher = RoleMatcher(identity_roles)
+    # Validators and crawl schedules describe what this user/identity/role set has
+    # already processed, so both are kept per such scope.
+    crawl_scope = validator_scope("ats_board", user_id, identity_id or "", *sorted(role.casefold() for role in role_matcher.roles))
     companies = _load_ats_companies(companies_collection, company_ids)
     logger.debug("crawler_ats_job_extraction: loaded %d ATS-enriched companies", len(companies))
+
+    schedule_collection = None
+    crawl_states = {}
+    if config.ats_schedule_enabled:
+        schedule_collection = database[SCHEDULE_COLLECTION]
+        crawl_states = load_crawl_states(schedule_collection, crawl_scope)
+        # Explicitly requested companies are always fetched; full runs follow the schedule.
+        if company_ids is None:
+            companies, result.deferred_count = select_companies(companies, crawl_states, config, datetime.now(timezone.utc))
+            logger.debug(
+                "crawler_ats_job_extraction: scheduled %d companies, deferred %d",
+                len(companies),
+                result.deferred_count,
+            )
     total_companies = len(companies)
     completed_checks = 0
     estimated_checks = estimate_ats_job_extraction_checks(total_companies)
@@ -179,9 +195,18 @@ def run_crawler_ats_job_extraction(
             f"Preparing job extraction for {total_companies} ATS-enriched companies",
         )
 
-    redis_client = None
+    scoring_emitter = None
     if config.enable_scoring_enqueue:
         redis_client = _connect_redis(config)
+        if redis_client is not None:
+            scoring_emitter = build_emitter(redis_client, config)
+
+    # An unchanged board (HTTP 304) is skipped entirely, so validators are not used
+    # when accepted jobs could not be enqueued for scoring (a later run must
+    # process those boards again).
+    validator_cache = None
+    if scoring_emitter is not None or not config.enable_scoring_enqueue:
+        validator_cache = build_validator_cache(database, config, scope=crawl_scope)
 
     session = requests.Session()
     session.headers.update({"User-Agent": config.user_agent})
@@ -206,14 +231,25 @@ def run_crawler_ats_job_extraction(
                 result.skipped_count += 1
                 continue
 
+            board_failures = 0
+            jobs = []
+            fetched = False
+            enqueue_failures_before = (
+                scoring_failed_count(scoring_emitter, config) if scoring_emitter is not None else 0
+            )
             try:
-                jobs = fetch_jobs(provider, slug, config, session)
+                jobs = fetch_jobs(provider, slug, config, session, role_matcher, validator_cache)
+                fetched = True
+                if jobs is None:
+                    logger.debug("crawler_ats_job_extraction: board %s/%s unchanged since last crawl; skipping", provider, slug)
+                    result.not_modified_count += 1
+                    continue
                 result.fetched_count += len(jobs)
 
                 for job in jobs:
                     try:
                         # Filter job by identity roles before insertion
-                        if not text_matches_roles(job.title, job.description, identity_roles):
+                        if not role_matcher.matches(job.title, job.description):
                             logger.debug("crawler_ats_job_extraction: job %s (external_id=%s) does not match identity roles; skipping", job.title, job.external_job_id)
                             result.skipped_count += 1
                             continue
@@ -226,20 +262,53 @@ def run_crawler_ats_job_extraction(
                         else:
                             result.updated_count += 1
 
-                        if config.enable_scoring_enqueue and redis_client is not None:
-                            if _try_enqueue(redis_client, config, job_id, user_id, identity_id=identity_id or ""):
-                                result.enqueued_count += 1
-                            else:
+                        if scoring_emitter is not None:
+                            if not enqueue_scoring_job(
+                                scoring_emitter,
+                                config,
+                                job_id=job_id,
+                                user_id=user_id,
+                                identity_id=identity_id or "",
+                                workflow_id="crawler_ats_job_extraction",
+                                lane=NEW_JOB_LANE if inserted else BULK_RESCORE_LANE,
+                            ):
                                 result.enqueue_failed_count += 1
+                                board_failures += 1
 
                     except Exception as exc:
                         logger.exception("crawler_ats_job_extraction: failed to upsert job external_id=%s company=%s: %s", job.external_job_id, company_id, exc)
                         result.skipped_count += 1
+                        board_failures += 1
 
+            except AtsFetchError as exc:
+                # A failed fetch is not an empty board: the schedule must not advance.
+                logger.warning("crawler_ats_job_extraction: could not fetch board for company %s (%s): %s", company_id, company_name, exc)
+                result.failed_companies.append({"company_id": company_id, "company_name": company_name, "error": str(exc)})
+                board_failures += 1
             except Exception as exc:
                 logger.exception("crawler_ats_job_extraction: failed for company %s (%s): %s", company_id, company_name, exc)
                 result.failed_companies.append({"company_id": company_id, "company_name": company_name, "error": str(exc)})
+                board_failures += 1
             finally:
+                # Flush per company so the scorer starts on early boards while later ones are fetched.
+                if scoring_emitter is not None:
+                    scoring_emitter.flush()
+                    board_failures += scoring_failed_count(scoring_emitter, config) - enqueue_failures_before
+                # Only a fully processed board may be skipped as unchanged next time.
+                if validator_cache is not None:
+                    if board_failures:
+                        validator_cache.discard()
+                    else:
+                        validator_cache.commit()
+                if schedule_collection is not None and fetched and not board_failures:
+                    record_fetch(
+                        schedule_collection,
+                        crawl_scope,
+                        company_id,
+                        crawl_states.get(company_id),
+                        jobs,
+                        datetime.now(timezone.utc),
+                    )
                 completed_checks += 1
                 if progress_callback:
                     progress_callback(
@@ -251,8 +320,13 @@ def run_crawler_ats_job_extraction(
     finally:
         session.close()
 
+    if scoring_emitter is not None:
+        result.enqueued_count = scoring_sent_count(scoring_emitter, config)
+        result.enqueue_failed_count += scoring_failed_count(scoring_emitter, config)
+
     logger.debug(
-        "crawler_ats_job_extraction summary: fetched=%d inserted=%d updated=%d skipped=%d enqueued=%d enqueue_failed=%d failed_companies=%d",
+        "crawler_ats_job_extraction summary: fetched=%d inserted=%d updated=%d skipped=%d enqueued=%d enqueue_failed=%d failed_companies=%d "
+        "boards_not_modified=%d validator_hit_rate=%.2f deferred=%d",
         result.fetched_count,
         result.inserted_count,
         result.updated_count,
@@ -260,5 +334,8 @@ def run_crawler_ats_job_extraction(
         result.enqueued_count,
         result.enqueue_failed_count,
         len(result.failed_companies),
+        result.not_modified_count,
+        validator_cache.hit_rate() if validator_cache is not None else 0.0,
+        result.deferred_count,
     )
     return result
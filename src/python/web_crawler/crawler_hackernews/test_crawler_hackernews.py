@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import ANY, Mock, patch
+
+from bson import ObjectId
+
+from src.python.web_crawler.config import CrawlerConfig
+from src.python.web_crawler.crawler_hackernews.workflow import (
+    _THREAD_WATERMARKS_COLLECTION,
+    _watermark_scope,
+    run_crawler_hackernews,
+)
+from src.python.web_crawler.models import DiscoveredCompany
+from src.python.web_crawler.sources.hackernews import HackerNewsThreadWatermark
+
+
+class FakeWatermarkCollection:
+    def __init__(self, docs=None):
+        self.docs: dict[str, dict] = {doc["_id"]: dict(doc) for doc in docs or []}
+
+    def find(self, filter_doc=None, projection=None):
+        return [dict(doc) for doc in self.docs.values() if doc.get("scope") == (filter_doc or {}).get("scope")]
+
+    def bulk_write(self, operations, ordered=True):
+        for operation in operations:
+            update = operation._doc
+            doc = self.docs.setdefault(operation._filter["_id"], {"_id": operation._filter["_id"]})
+            if len(doc) == 1:
+                doc.update(update["$setOnInsert"])
+            doc.update(update["$set"])
+            for key, value in update["$max"].items():
+                doc[key] = max(doc.get(key, value), value)
+
+
+class FakeSnapshotRedis:
+    def __init__(self):
+        self.values: dict[str, str] = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+    def exists(self, key):
+        return int(key in self.values)
+
+
+def _make_config(**kwargs) -> CrawlerConfig:
+    return CrawlerConfig(mongo_host="mongodb://localhost:27017/", db_name="test", **kwargs)
+
+
+class HackerNewsIncrementalWorkflowTests(unittest.TestCase):
+    def setUp(self):
+        self.identity_id = str(ObjectId())
+        self.roles = ["Software Engineer"]
+        self.scope = _watermark_scope(self.roles)
+        self.watermarks = FakeWatermarkCollection(
+            [{"_id": f"{self.scope}:100", "scope": self.scope, "story_id": "100", "created_at_i": 10, "object_id": 101}]
+        )
+        self.database = {"companies": object(), _THREAD_WATERMARKS_COLLECTION: self.watermarks}
+
+    def _run(self, adapter_side_effect, redis_client=None, adapter=None, **config_kwargs):
+        seed = type("Seed", (), {"roles": self.roles, "field_id": ""})()
+        with (
+            patch("src.python.web_crawler.crawler_hackernews.workflow.load_identity_seed", return_value=seed),
+            patch("src.python.web_crawler.crawler_hackernews.workflow.HackerNewsAdapter") as adapter_cls,
+            patch("src.python.web_crawler.crawler_hackernews.workflow.ensure_company_indexes"),
+            patch("src.python.web_crawler.crawler_hackernews.workflow.upsert_companies", return_value=(1, 0, ["c1"])),
+            patch("src.python.web_crawler.crawler_hackernews.workflow._find_companies_missing_slug", return_value=[]),
+        ):
+            if adapter is not None:
+                adapter_cls.return_value = adapter
+            adapter_cls.return_value.source_name = "hackernews"
+            adapter_cls.return_value.discover_companies.side_effect = adapter_side_effect
+            result = run_crawler_hackernews(
+                self.database,
+                _make_config(**config_kwargs),
+                self.identity_id,
+                identity_database={"identities": object()},
+                redis_client=redis_client,
+            )
+        return adapter_cls.return_value, result
+
+    def test_incremental_run_loads_and_advances_thread_watermarks(self):
+        def discover(roles, config, *, thread_watermarks):
+            self.assertEqual(thread_watermarks, {"100": HackerNewsThreadWatermark(created_at_i=10, object_id=101)})
+            thread_watermarks["100"].advance([{"objectID": "150", "created_at_i": 20}])
+            thread_watermarks["200"] = HackerNewsThreadWatermark(created_at_i=30, object_id=201)
+            return [DiscoveredCompany(name="Acme", source="hackernews", role="Software Engineer")]
+
+        _, result = self._run(discover, hn_incremental=True)
+
+        self.assertEqual(result.inserted_count, 1)
+        self.assertEqual(self.watermarks.docs[f"{self.scope}:100"]["object_id"], 150)
+        self.assertEqual(self.watermarks.docs[f"{self.scope}:200"]["created_at_i"], 30)
+
+    def test_failed_discovery_does_not_advance_watermarks(self):
+        def discover(roles, config, *, thread_watermarks):
+            thread_watermarks["100"].advance([{"objectID": "150", "created_at_i": 20}])
+            raise RuntimeError("algolia down")
+
+        _, result = self._run(discover, hn_incremental=True)
+
+        self.assertEqual(result.failed_sources[0]["error"], "algolia down")
+        self.assertEqual(self.watermarks.docs[f"{self.scope}:100"]["object_id"], 101)
+
+    def test_full_mode_does_not_pass_watermarks(self):
+        adapter, _ = self._run(lambda roles, config: [])
+
+        adapter.discover_companies.assert_called_once_with(self.roles, ANY)
+
+    def test_full_mode_shares_thread_snapshot_between_runs(self):
+        redis_client = FakeSnapshotRedis()
+        threads = [{"story_id": "100", "comments": [{"objectID": "101", "created_at_i": 10, "comment_text": "x"}]}]
+
+        for _ in range(2):
+            adapter = Mock()
+            adapter.fetch_threads.return_value = threads
+            adapter.companies_from_threads.return_value = []
+            self._run(None, redis_client=redis_client, adapter=adapter)
+            adapter.companies_from_threads.assert_called_once_with(threads, self.roles, ANY)
+
+        adapter.fetch_threads.assert_not_called()
+        adapter.discover_companies.assert_not_called()
+        self.assertEqual(len([key for key in redis_client.values if key.startswith("crawler_source_snapshot:hackernews")]), 1)
+
+    def test_watermark_scope_ignores_role_order_and_case(self):
+        self.assertEqual(_watermark_scope(["Backend", "sre "]), _watermark_scope(["SRE", "backend"]))
+        self.assertNotEqual(_watermark_scope(["Backend"]), _watermark_scope(["Backend", "SRE"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,6 @@ from __future__ import annotations
 import argparse
 import logging
 import time
-from typing import cast
 
 import redis
 
@@ -15,6 +14,7 @@ from src.python.web_crawler.crawler_hackernews.workflow import (
 from src.python.web_crawler.workflow_utils import emit_enrichment_events
 from src.python.web_crawler.db import get_database, get_user_database
 from src.python.web_crawler.progress import publish_progress, utc_timestamp
+from src.python.web_crawler.reliable_queue import ReliableQueue, build_work_queue
 from src.python.web_crawler.workflow_counters import increment_discovered_jobs_counter
 from src.python.web_crawler.workflow_messages import parse_workflow_dispatch
 
@@ -30,6 +30,7 @@ def _connect_redis(config: CrawlerConfig) -> redis.Redis:
 
 def worker_main(config: CrawlerConfig) -> None:
     redis_client: redis.Redis | None = None
+    work_queue: ReliableQueue | None = None
 
     while True:
         try:
@@ -37,18 +38,18 @@ def worker_main(config: CrawlerConfig) -> None:
                 redis_client = _connect_redis(config)
                 logger.info("connected to redis at %s:%s", config.redis_host, config.redis_port)
 
-            queue_item = cast(
-                tuple[str, str] | None,
-                redis_client.blpop([config.crawler_hackernews_queue_name], timeout=0),
-            )
-            if not queue_item:
+            if work_queue is None:
+                work_queue = build_work_queue(redis_client, config, config.crawler_hackernews_queue_name)
+            claimed = work_queue.claim()
+            if claimed is None:
                 continue
 
-            _, raw_payload = queue_item
+            raw_payload = claimed.payload
             try:
                 message = parse_workflow_dispatch(raw_payload)
             except Exception as exc:
                 logger.warning("invalid workflow dispatch payload: %s", exc)
+                work_queue.ack(claimed)
                 continue
 
             run_id = message.run_id.strip()
@@ -58,6 +59,7 @@ def worker_main(config: CrawlerConfig) -> None:
 
             if not run_id or not identity_id or not user_id:
                 logger.warning("dispatch message missing run_id, identity_id, or user_id: %s", raw_payload)
+                work_queue.ack(claimed)
                 continue
 
             started_at = utc_timestamp()
@@ -78,7 +80,13 @@ def worker_main(config: CrawlerConfig) -> None:
             try:
                 database = get_database(config)
                 user_database = get_user_database(config, user_id)
-                result = run_crawler_hackernews(database, config, identity_id, identity_database=user_database)
+                result = run_crawler_hackernews(
+                    database,
+                    config,
+                    identity_id,
+                    identity_database=user_database,
+                    redis_client=redis_client,
+                )
                 increment_discovered_jobs_counter(
                     config,
                     workflow_id=_WORKFLOW_ID,
@@ -92,6 +100,7 @@ def worker_main(config: CrawlerConfig) -> None:
                     workflow_id=_WORKFLOW_ID,
                     identity_id=identity_id,
                     company_ids=result.enrichment_pending_company_ids,
+                    user_id=user_id,
                 )
                 finished_at = utc_timestamp()
                 publish_progress(
@@ -128,9 +137,12 @@ def worker_main(config: CrawlerConfig) -> None:
                     workflow_id=_WORKFLOW_ID,
                     workflow_run_id=workflow_run_id,
                 )
+
+            work_queue.ack(claimed)
         except Exception as exc:
             logger.warning("worker loop error: %s", exc)
             redis_client = None
+            work_queue = None
             time.sleep(2)
 
 
@@ -1,23 +1,83 @@
 from __future__ import annotations
 
+import hashlib
 import logging
+from datetime import datetime, timezone
 
-from src.python.web_crawler.company_resolver import deduplicate_companies, upsert_companies
+import redis
+from pymongo import UpdateOne
+
+from src.python.web_crawler.company_resolver import deduplicate_companies, ensure_company_indexes, upsert_companies
 from src.python.web_crawler.config import CrawlerConfig
 from src.python.web_crawler.workflow_utils import (
     find_companies_missing_slug as _find_companies_missing_slug,
     load_identity_seed,
 )
 from src.python.web_crawler.models import WorkflowResult
-from src.python.web_crawler.sources.hackernews import HackerNewsAdapter
+from src.python.web_crawler.snapshot_cache import build_snapshot_cache
+from src.python.web_crawler.sources.hackernews import HackerNewsAdapter, HackerNewsThreadWatermark
 
 logging.basicConfig(level=logging.DEBUG, format="%(levelname)s %(name)s: %(message)s")
 logger = logging.getLogger(__name__)
 
 _WORKFLOW_ID = "crawler_hackernews"
+_THREAD_WATERMARKS_COLLECTION = "hackernews_thread_watermarks"
+
+
+def _watermark_scope(roles: list[str]) -> str:
+    # Comments skipped by the watermark were only checked against these roles,
+    # so a different role set must not inherit them.
+    normalized = sorted({role.strip().casefold() for role in roles if role.strip()})
+    return hashlib.sha1("\n".join(normalized).encode("utf-8")).hexdigest()[:16]
+
+
+def _load_thread_watermarks(collection, scope: str) -> dict[str, HackerNewsThreadWatermark]:
+    watermarks: dict[str, HackerNewsThreadWatermark] = {}
+    for doc in collection.find({"scope": scope}, {"story_id": 1, "created_at_i": 1, "object_id": 1}):
+        story_id = str(doc.get("story_id") or "")
+        if story_id:
+            watermarks[story_id] = HackerNewsThreadWatermark(
+                created_at_i=int(doc.get("created_at_i") or 0),
+                object_id=int(doc.get("object_id") or 0),
+            )
+    return watermarks
+
 
+def _save_thread_watermarks(collection, scope: str, watermarks: dict[str, HackerNewsThreadWatermark]) -> None:
+    now = datetime.now(timezone.utc)
+    operations = [
+        UpdateOne(
+            {"_id": f"{scope}:{story_id}"},
+            {
+                "$set": {"updated_at": now},
+                "$setOnInsert": {"scope": scope, "story_id": story_id},
+                "$max": {"created_at_i": watermark.created_at_i, "object_id": watermark.object_id},
+            },
+            upsert=True,
+        )
+        for story_id, watermark in watermarks.items()
+        if watermark.object_id > 0
+    ]
+    if operations:
+        collection.bulk_write(operations, ordered=False)
 
-def run_crawler_hackernews(database, config: CrawlerConfig, identity_id: str, *, identity_database) -> WorkflowResult:
+
+def _snapshot_source(config: CrawlerConfig) -> str:
+    # Thread selection and comment caps come from config, so workers with different
+    # settings must not share a snapshot.
+    return (
+        f"hackernews:{config.hn_max_threads}:{config.hn_comments_hits_per_page}:{config.hn_max_comments_per_thread}"
+    )
+
+
+def run_crawler_hackernews(
+    database,
+    config: CrawlerConfig,
+    identity_id: str,
+    *,
+    identity_database,
+    redis_client: redis.Redis | None = None,
+) -> WorkflowResult:
     identities_collection = identity_database["identities"]
     companies_collection = database["companies"]
     seed = load_identity_seed(identities_collection, identity_id)
@@ -28,13 +88,26 @@ def run_crawler_hackernews(database, config: CrawlerConfig, identity_id: str, *,
 
     result = WorkflowResult()
     discovered_companies = []
+    watermarks_collection = database[_THREAD_WATERMARKS_COLLECTION]
+    watermark_scope = _watermark_scope(list(seed.roles))
+    thread_watermarks: dict[str, HackerNewsThreadWatermark] | None = None
+    snapshot_cache = build_snapshot_cache(redis_client, config)
 
     try:
-        companies = adapter.discover_companies(list(seed.roles), config)
+        if config.hn_incremental:
+            thread_watermarks = _load_thread_watermarks(watermarks_collection, watermark_scope)
+            companies = adapter.discover_companies(list(seed.roles), config, thread_watermarks=thread_watermarks)
+        elif snapshot_cache is not None:
+            # Incremental runs depend on per-role watermarks, so only full crawls share snapshots.
+            threads = snapshot_cache.get_or_fetch(_snapshot_source(config), lambda: adapter.fetch_threads(config))
+            companies = adapter.companies_from_threads(threads, list(seed.roles), config)
+        else:
+            companies = adapter.discover_companies(list(seed.roles), config)
         logger.debug("adapter %s returned %d companies", adapter.source_name, len(companies))
         discovered_companies.extend(companies)
     except Exception as exc:
         logger.exception("adapter %s failed: %s", adapter.source_name, exc)
+        thread_watermarks = None
         result.failed_sources.append({"source": adapter.source_name, "error": str(exc)})
 
     logger.debug("total raw discovered: %d", len(discovered_companies))
@@ -43,6 +116,7 @@ def run_crawler_hackernews(database, config: CrawlerConfig, identity_id: str, *,
     result.discovered_count = len(deduped_companies)
     result.skipped_count = max(len(discovered_companies) - len(deduped_companies), 0)
 
+    ensure_company_indexes(companies_collection)
     inserted_count, updated_count, company_ids = upsert_companies(
         companies_collection,
         deduped_companies,
@@ -53,6 +127,10 @@ def run_crawler_hackernews(database, config: CrawlerConfig, identity_id: str, *,
     result.company_ids = company_ids
     logger.debug("upsert done — inserted: %d, updated: %d", inserted_count, updated_count)
 
+    # Only advance watermarks once the companies they cover are stored.
+    if thread_watermarks is not None:
+        _save_thread_watermarks(watermarks_collection, watermark_scope, thread_watermarks)
+
     result.enrichment_pending_company_ids = _find_companies_missing_slug(companies_collection, company_ids)
     logger.debug(
         "companies pending enrichment (no ats_slug): %d",
@@ -7,10 +7,12 @@ from unittest.mock import Mock, patch
 from bson import ObjectId
 
 from src.python.ai_querier import common_pb2
+from src.python.web_crawler.company_resolver import CompanyResolution
 from src.python.web_crawler.config import CrawlerConfig
 from src.python.web_crawler.crawler_levelsfyi import worker as worker_module
 from src.python.web_crawler.crawler_levelsfyi import workflow as workflow_module
 from src.python.web_crawler.models import WorkflowResult
+from src.python.web_crawler.reliable_queue import ClaimedMessage
 from src.python.web_crawler import role_filtering
 from src.python.web_crawler.sources.levelsfyi import LevelsFyiJobCard
 
@@ -23,6 +25,7 @@ class FakeInsertResult:
 class FakeCollection:
     def __init__(self, docs=None):
         self.docs: list[dict] = list(docs or [])
+        self.indexes: list[tuple] = []
 
     def find_one(self, filter_doc, projection=None):
         for doc in self.docs:
@@ -88,33 +91,69 @@ class FakeCollection:
             raise AssertionError("document not found for update")
         target.update(update_doc.get("$set", {}))
 
+    def create_index(self, keys, **kwargs):
+        self.indexes.append((keys, kwargs))
+        return kwargs.get("name", "")
+
 
 class FakeDatabase(dict):
     pass
 
 
+class FakePipeline:
+    def __init__(self, redis_client):
+        self._redis_client = redis_client
+        self._commands: list[tuple[str, tuple[str, ...]]] = []
+
+    def rpush(self, queue_name, *payloads):
+        self._commands.append((queue_name, payloads))
+
+    def execute(self, raise_on_error=True):
+        replies = []
+        for queue_name, payloads in self._commands:
+            if self._redis_client.push_error is not None:
+                replies.append(self._redis_client.push_error)
+                continue
+            for payload in payloads:
+                self._redis_client.rpush(queue_name, payload)
+            replies.append(len(payloads))
+        return replies
+
+
+class FakeWorkQueue:
+    def __init__(self, claim_side_effect=None):
+        self._claim_side_effect = list(claim_side_effect or [])
+        self.acked: list[str] = []
+
+    def claim(self):
+        if not self._claim_side_effect:
+            return None
+        next_item = self._claim_side_effect.pop(0)
+        if isinstance(next_item, BaseException):
+            raise next_item
+        return ClaimedMessage(payload=next_item, delivery_count=1)
+
+    def ack(self, message):
+        self.acked.append(message.payload)
+
+
 class FakeRedis:
-    def __init__(self, blpop_side_effect=None):
-        self._blpop_side_effect = list(blpop_side_effect or [])
+    def __init__(self):
         self.rpush_calls: list[tuple[str, str]] = []
         self.publish_calls: list[tuple[str, str]] = []
         self.ping_calls = 0
+        self.push_error: Exception | None = None
 
     def ping(self):
         self.ping_calls += 1
         return True
 
-    def blpop(self, _queues, timeout=0):
-        if not self._blpop_side_effect:
-            return None
-        next_item = self._blpop_side_effect.pop(0)
-        if isinstance(next_item, Exception):
-            raise next_item
-        return next_item
-
     def rpush(self, queue_name, payload):
         self.rpush_calls.append((queue_name, payload))
 
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
     def publish(self, channel_name, payload):
         self.publish_calls.append((channel_name, payload))
 
@@ -123,6 +162,16 @@ def _make_config(**kwargs) -> CrawlerConfig:
     return CrawlerConfig(mongo_host="mongodb://localhost:27017/", db_name="test", **kwargs)
 
 
+def _make_resolution(company_oid, canonical_name="acme", *, inserted=False) -> CompanyResolution:
+    return CompanyResolution(
+        inserted_count=1 if inserted else 0,
+        updated_count=0 if inserted else 1,
+        company_ids=[str(company_oid)],
+        canonical_to_oid={canonical_name: company_oid},
+        inserted_canonical_names={canonical_name} if inserted else set(),
+    )
+
+
 def _make_card(
     *,
     title="Software Engineer",
@@ -234,27 +283,6 @@ class CrawlerLevelsFyiHelperTests(unittest.TestCase):
         self.assertEqual(jobs.docs[0]["title"], "Engineer II")
         self.assertEqual(jobs.docs[0]["created_at"], created_at)
 
-    def test_try_enqueue_success_and_failure(self):
-        config = _make_config()
-        redis_client = Mock()
-
-        self.assertTrue(workflow_module._try_enqueue(redis_client, config, "abc", "user-1"))
-        queue_name, payload = redis_client.rpush.call_args[0]
-        self.assertEqual(queue_name, config.job_scoring_queue_name)
-        self.assertEqual(json.loads(payload), {"job_id": "abc", "user_id": "user-1"})
-
-        redis_client.rpush.side_effect = RuntimeError("boom")
-        self.assertFalse(workflow_module._try_enqueue(redis_client, config, "def", "user-1"))
-
-    def test_try_enqueue_includes_identity_id_when_provided(self):
-        config = _make_config()
-        redis_client = Mock()
-
-        self.assertTrue(workflow_module._try_enqueue(redis_client, config, "abc", "user-1", identity_id="id-123"))
-        queue_name, payload = redis_client.rpush.call_args[0]
-        self.assertEqual(queue_name, config.job_scoring_queue_name)
-        self.assertEqual(json.loads(payload), {"job_id": "abc", "user_id": "user-1", "identity_id": "id-123"})
-
 
 class CrawlerLevelsFyiWorkflowTests(unittest.TestCase):
     def test_run_crawler_levelsfyi_returns_early_when_no_roles(self):
@@ -293,7 +321,7 @@ class CrawlerLevelsFyiWorkflowTests(unittest.TestCase):
         progress_events = []
 
         fake_adapter = Mock()
-        fake_adapter.discover_jobs.return_value = []
+        fake_adapter.iter_jobs.return_value = []
 
         with patch("src.python.web_crawler.crawler_levelsfyi.workflow.LevelsFyiAdapter", return_value=fake_adapter):
             result = workflow_module.run_crawler_levelsfyi(
@@ -326,10 +354,10 @@ class CrawlerLevelsFyiWorkflowTests(unittest.TestCase):
         progress_events = []
 
         fake_adapter = Mock()
-        fake_adapter.discover_jobs.return_value = cards
+        fake_adapter.iter_jobs.return_value = cards
 
         with patch("src.python.web_crawler.crawler_levelsfyi.workflow.LevelsFyiAdapter", return_value=fake_adapter), \
-            patch("src.python.web_crawler.crawler_levelsfyi.workflow.upsert_companies", return_value=(0, 0, [str(company_oid)])), \
+            patch("src.python.web_crawler.crawler_levelsfyi.workflow.resolve_companies", return_value=_make_resolution(company_oid)), \
             patch("src.python.web_crawler.crawler_levelsfyi.workflow._connect_redis") as mock_connect_redis:
             result = workflow_module.run_crawler_levelsfyi(
                 db,
@@ -346,9 +374,10 @@ class CrawlerLevelsFyiWorkflowTests(unittest.TestCase):
         self.assertEqual(result.skipped_count, 0)
         self.assertEqual(len(result.job_ids), 2)
         self.assertEqual(result.new_company_ids, [str(company_oid)])
+        self.assertEqual([event[:2] for event in progress_events[1:3]], [(1, 2), (2, 2)])
         self.assertEqual(progress_events[-1][0], 2)
 
-    def test_run_crawler_levelsfyi_fallback_company_resolution(self):
+    def test_run_crawler_levelsfyi_uses_resolution_map_without_company_lookup(self):
         identity_id = str(ObjectId())
         company_oid = ObjectId()
         db = FakeDatabase(
@@ -362,10 +391,10 @@ class CrawlerLevelsFyiWorkflowTests(unittest.TestCase):
         card = _make_card(external_id="job-fallback")
 
         fake_adapter = Mock()
-        fake_adapter.discover_jobs.return_value = [card]
+        fake_adapter.iter_jobs.return_value = [card]
 
         with patch("src.python.web_crawler.crawler_levelsfyi.workflow.LevelsFyiAdapter", return_value=fake_adapter), \
-            patch("src.python.web_crawler.crawler_levelsfyi.workflow.upsert_companies", side_effect=[(1, 0, [str(company_oid)]), (1, 0, [str(company_oid)])]):
+            patch("src.python.web_crawler.crawler_levelsfyi.workflow.resolve_companies", return_value=_make_resolution(company_oid, inserted=True)):
             result = workflow_module.run_crawler_levelsfyi(db, config, identity_id, identity_database=db)
 
         self.assertEqual(result.inserted_count, 1)
@@ -385,10 +414,10 @@ class CrawlerLevelsFyiWorkflowTests(unittest.TestCase):
         card = _make_card(external_id="job-skip", company="Unknown Co")
 
         fake_adapter = Mock()
-        fake_adapter.discover_jobs.return_value = [card]
+        fake_adapter.iter_jobs.return_value = [card]
 
         with patch("src.python.web_crawler.crawler_levelsfyi.workflow.LevelsFyiAdapter", return_value=fake_adapter), \
-            patch("src.python.web_crawler.crawler_levelsfyi.workflow.upsert_companies", side_effect=[(0, 0, []), (0, 0, [])]):
+            patch("src.python.web_crawler.crawler_levelsfyi.workflow.resolve_companies", return_value=CompanyResolution()):
             result = workflow_module.run_crawler_levelsfyi(db, config, identity_id, identity_database=db)
 
         self.assertEqual(result.inserted_count, 0)
@@ -408,10 +437,10 @@ class CrawlerLevelsFyiWorkflowTests(unittest.TestCase):
         cards = [_make_card(external_id="job-bad"), _make_card(external_id="job-good", source_url="https://example.com/good")]
 
         fake_adapter = Mock()
-        fake_adapter.discover_jobs.return_value = cards
+        fake_adapter.iter_jobs.return_value = cards
 
         with patch("src.python.web_crawler.crawler_levelsfyi.workflow.LevelsFyiAdapter", return_value=fake_adapter), \
-            patch("src.python.web_crawler.crawler_levelsfyi.workflow.upsert_companies", return_value=(0, 0, [str(company_oid)])), \
+            patch("src.python.web_crawler.crawler_levelsfyi.workflow.resolve_companies", return_value=_make_resolution(company_oid)), \
             patch("src.python.web_crawler.crawler_levelsfyi.workflow._upsert_job", side_effect=[RuntimeError("db down"), ("abc", True)]):
             result = workflow_module.run_crawler_levelsfyi(db, config, identity_id, identity_database=db)
 
@@ -433,10 +462,10 @@ class CrawlerLevelsFyiWorkflowTests(unittest.TestCase):
         cards = [_make_card(title="Data Scientist", external_id="job-role-miss")]
 
         fake_adapter = Mock()
-        fake_adapter.discover_jobs.return_value = cards
+        fake_adapter.iter_jobs.return_value = cards
 
         with patch("src.python.web_crawler.crawler_levelsfyi.workflow.LevelsFyiAdapter", return_value=fake_adapter), \
-            patch("src.python.web_crawler.crawler_levelsfyi.workflow.upsert_companies", return_value=(0, 0, [str(company_oid)])), \
+            patch("src.python.web_crawler.crawler_levelsfyi.workflow.resolve_companies", return_value=_make_resolution(company_oid)), \
             patch("src.python.web_crawler.crawler_levelsfyi.workflow._upsert_job") as mock_upsert:
             result = workflow_module.run_crawler_levelsfyi(db, config, identity_id, identity_database=db)
 
@@ -467,10 +496,10 @@ class CrawlerLevelsFyiWorkflowTests(unittest.TestCase):
         cards[0].description = "You will work as a platform engineer across our stack."
 
         fake_adapter = Mock()
-        fake_adapter.discover_jobs.return_value = cards
+        fake_adapter.iter_jobs.return_value = cards
 
         with patch("src.python.web_crawler.crawler_levelsfyi.workflow.LevelsFyiAdapter", return_value=fake_adapter), \
-            patch("src.python.web_crawler.crawler_levelsfyi.workflow.upsert_companies", return_value=(0, 0, [str(company_oid)])):
+            patch("src.python.web_crawler.crawler_levelsfyi.workflow.resolve_companies", return_value=_make_resolution(company_oid)):
             result = workflow_module.run_crawler_levelsfyi(db, config, identity_id, identity_database=db)
 
         self.assertEqual(result.discovered_count, 1)
@@ -492,16 +521,19 @@ class CrawlerLevelsFyiWorkflowTests(unittest.TestCase):
         config = _make_config(enable_scoring_enqueue=True)
 
         fake_adapter = Mock()
-        fake_adapter.discover_jobs.return_value = [_make_card(external_id="job-score")]
-        fake_redis = Mock()
+        fake_adapter.iter_jobs.return_value = [_make_card(external_id="job-score")]
+        fake_redis = FakeRedis()
 
         with patch("src.python.web_crawler.crawler_levelsfyi.workflow.LevelsFyiAdapter", return_value=fake_adapter), \
-            patch("src.python.web_crawler.crawler_levelsfyi.workflow.upsert_companies", return_value=(0, 0, [str(company_oid)])), \
+            patch("src.python.web_crawler.crawler_levelsfyi.workflow.resolve_companies", return_value=_make_resolution(company_oid)), \
             patch("src.python.web_crawler.crawler_levelsfyi.workflow._connect_redis", return_value=fake_redis):
             result = workflow_module.run_crawler_levelsfyi(db, config, identity_id, "user-1", identity_database=db)
 
         self.assertEqual(result.enqueued_count, 1)
         self.assertEqual(result.enqueue_failed_count, 0)
+        queue_name, payload = fake_redis.rpush_calls[0]
+        self.assertEqual(queue_name, config.job_scoring_queue_name)
+        self.assertEqual(json.loads(payload)["identity_id"], identity_id)
 
     def test_run_crawler_levelsfyi_enqueue_failure_tracks_failed_enqueue(self):
         identity_id = str(ObjectId())
@@ -516,12 +548,12 @@ class CrawlerLevelsFyiWorkflowTests(unittest.TestCase):
         config = _make_config(enable_scoring_enqueue=True)
 
         fake_adapter = Mock()
-        fake_adapter.discover_jobs.return_value = [_make_card(external_id="job-score-fail")]
-        fake_redis = Mock()
-        fake_redis.rpush.side_effect = RuntimeError("redis down")
+        fake_adapter.iter_jobs.return_value = [_make_card(external_id="job-score-fail")]
+        fake_redis = FakeRedis()
+        fake_redis.push_error = RuntimeError("redis down")
 
         with patch("src.python.web_crawler.crawler_levelsfyi.workflow.LevelsFyiAdapter", return_value=fake_adapter), \
-            patch("src.python.web_crawler.crawler_levelsfyi.workflow.upsert_companies", return_value=(0, 0, [str(company_oid)])), \
+            patch("src.python.web_crawler.crawler_levelsfyi.workflow.resolve_companies", return_value=_make_resolution(company_oid)), \
             patch("src.python.web_crawler.crawler_levelsfyi.workflow._connect_redis", return_value=fake_redis):
             result = workflow_module.run_crawler_levelsfyi(db, config, identity_id, identity_database=db)
 
@@ -529,6 +561,41 @@ class CrawlerLevelsFyiWorkflowTests(unittest.TestCase):
         self.assertEqual(result.enqueue_failed_count, 1)
 
 
+    def test_run_crawler_levelsfyi_enqueues_first_batch_before_discovery_finishes(self):
+        identity_id = str(ObjectId())
+        company_oid = ObjectId()
+        db = FakeDatabase(
+            {
+                "identities": FakeCollection(docs=[{"_id": ObjectId(identity_id), "roles": ["software engineer"]}]),
+                "companies": FakeCollection(docs=[{"_id": company_oid, "canonical_name": "acme"}]),
+                "job-descriptions": FakeCollection(),
+            }
+        )
+        config = _make_config(enable_scoring_enqueue=True, stream_batch_size=2)
+        fake_redis = FakeRedis()
+        enqueued_before_last_card = []
+
+        def stream_cards(_roles, _config):
+            yield _make_card(external_id="job-1")
+            yield _make_card(external_id="job-2")
+            enqueued_before_last_card.append(len(fake_redis.rpush_calls))
+            yield _make_card(external_id="job-3")
+
+        fake_adapter = Mock()
+        fake_adapter.iter_jobs.side_effect = stream_cards
+
+        with patch("src.python.web_crawler.crawler_levelsfyi.workflow.LevelsFyiAdapter", return_value=fake_adapter), \
+            patch("src.python.web_crawler.crawler_levelsfyi.workflow.resolve_companies", return_value=_make_resolution(company_oid)) as mock_resolve, \
+            patch("src.python.web_crawler.crawler_levelsfyi.workflow._connect_redis", return_value=fake_redis):
+            result = workflow_module.run_crawler_levelsfyi(db, config, identity_id, "user-1", identity_database=db)
+
+        self.assertEqual(enqueued_before_last_card, [2])
+        self.assertEqual(mock_resolve.call_count, 2)
+        self.assertEqual(result.discovered_count, 3)
+        self.assertEqual(result.enqueued_count, 3)
+        self.assertEqual(result.new_company_ids, [str(company_oid)])
+
+
 class CrawlerLevelsFyiWorkerTests(unittest.TestCase):
     def test_connect_redis_initializes_client_and_pings(self):
         config = _make_config(redis_host="redis.local", redis_port=6380)
@@ -551,9 +618,11 @@ class CrawlerLevelsFyiWorkerTests(unittest.TestCase):
 
     def test_worker_main_drops_invalid_dispatch_payload(self):
         config = _make_config()
-        fake_redis = FakeRedis(blpop_side_effect=[("queue", "bad payload"), RuntimeError("stop")])
+        fake_redis = FakeRedis()
+        work_queue = FakeWorkQueue(claim_side_effect=["bad payload", RuntimeError("stop")])
 
         with patch("src.python.web_crawler.crawler_levelsfyi.worker._connect_redis", return_value=fake_redis), \
+            patch("src.python.web_crawler.crawler_levelsfyi.worker.build_work_queue", return_value=work_queue), \
             patch("src.python.web_crawler.crawler_levelsfyi.worker.parse_workflow_dispatch", side_effect=ValueError("invalid")), \
             patch("src.python.web_crawler.crawler_levelsfyi.worker.run_crawler_levelsfyi") as mock_run, \
             patch("src.python.web_crawler.crawler_levelsfyi.worker.time.sleep", side_effect=StopIteration):
@@ -561,10 +630,12 @@ class CrawlerLevelsFyiWorkerTests(unittest.TestCase):
                 worker_module.worker_main(config)
 
         mock_run.assert_not_called()
+        self.assertEqual(work_queue.acked, ["bad payload"])
 
     def test_worker_main_drops_payload_missing_identity(self):
         config = _make_config()
-        fake_redis = FakeRedis(blpop_side_effect=[("queue", "ignored"), RuntimeError("stop")])
+        fake_redis = FakeRedis()
+        work_queue = FakeWorkQueue(claim_side_effect=["ignored", RuntimeError("stop")])
         message = common_pb2.WorkflowDispatchMessage(
             run_id="run-1",
             workflow_run_id="wf-1",
@@ -572,6 +643,7 @@ class CrawlerLevelsFyiWorkerTests(unittest.TestCase):
         )
 
         with patch("src.python.web_crawler.crawler_levelsfyi.worker._connect_redis", return_value=fake_redis), \
+            patch("src.python.web_crawler.crawler_levelsfyi.worker.build_work_queue", return_value=work_queue), \
             patch("src.python.web_crawler.crawler_levelsfyi.worker.parse_workflow_dispatch", return_value=message), \
             patch("src.python.web_crawler.crawler_levelsfyi.worker.run_crawler_levelsfyi") as mock_run, \
             patch("src.python.web_crawler.crawler_levelsfyi.worker.time.sleep", side_effect=StopIteration):
@@ -582,7 +654,8 @@ class CrawlerLevelsFyiWorkerTests(unittest.TestCase):
 
     def test_worker_main_success_publishes_running_and_completed(self):
         config = _make_config()
-        fake_redis = FakeRedis(blpop_side_effect=[("queue", "payload"), RuntimeError("stop")])
+        fake_redis = FakeRedis()
+        work_queue = FakeWorkQueue(claim_side_effect=["payload", RuntimeError("stop")])
         message = common_pb2.WorkflowDispatchMessage(
             run_id="run-1",
             workflow_run_id="wf-1",
@@ -592,12 +665,13 @@ class CrawlerLevelsFyiWorkerTests(unittest.TestCase):
         result = WorkflowResult(discovered_count=2, inserted_count=1, updated_count=1, skipped_count=0, new_company_ids=[str(ObjectId())])
 
         with patch("src.python.web_crawler.crawler_levelsfyi.worker._connect_redis", return_value=fake_redis), \
+            patch("src.python.web_crawler.crawler_levelsfyi.worker.build_work_queue", return_value=work_queue), \
             patch("src.python.web_crawler.crawler_levelsfyi.worker.parse_workflow_dispatch", return_value=message), \
             patch("src.python.web_crawler.crawler_levelsfyi.worker.get_database", return_value=FakeDatabase()), \
             patch("src.python.web_crawler.crawler_levelsfyi.worker.get_user_database", return_value=FakeDatabase()), \
             patch("src.python.web_crawler.crawler_levelsfyi.worker.run_crawler_levelsfyi", return_value=result) as mock_run, \
             patch("src.python.web_crawler.crawler_levelsfyi.worker.increment_discovered_jobs_counter") as mock_increment, \
-            patch("src.python.web_crawler.crawler_levelsfyi.worker._emit_enrichment_events") as mock_emit, \
+            patch("src.python.web_crawler.crawler_levelsfyi.worker.emit_enrichment_events") as mock_emit, \
             patch("src.python.web_crawler.crawler_levelsfyi.worker.publish_progress") as mock_publish, \
             patch("src.python.web_crawler.crawler_levelsfyi.worker.time.sleep", side_effect=StopIteration):
             with self.assertRaises(StopIteration):
@@ -610,13 +684,16 @@ class CrawlerLevelsFyiWorkerTests(unittest.TestCase):
             delta=2,
         )
         mock_emit.assert_called_once()
+        self.assertEqual(mock_emit.call_args.kwargs["user_id"], "test_user")
         statuses = [call.kwargs.get("status") for call in mock_publish.mock_calls if hasattr(call, "kwargs")]
         self.assertIn("running", statuses)
         self.assertIn("completed", statuses)
+        self.assertEqual(work_queue.acked, ["payload"])
 
     def test_worker_main_failure_publishes_failed_status(self):
         config = _make_config()
-        fake_redis = FakeRedis(blpop_side_effect=[("queue", "payload"), RuntimeError("stop")])
+        fake_redis = FakeRedis()
+        work_queue = FakeWorkQueue(claim_side_effect=["payload", RuntimeError("stop")])
         message = common_pb2.WorkflowDispatchMessage(
             run_id="run-1",
             workflow_run_id="wf-1",
@@ -625,6 +702,7 @@ class CrawlerLevelsFyiWorkerTests(unittest.TestCase):
         )
 
         with patch("src.python.web_crawler.crawler_levelsfyi.worker._connect_redis", return_value=fake_redis), \
+            patch("src.python.web_crawler.crawler_levelsfyi.worker.build_work_queue", return_value=work_queue), \
             patch("src.python.web_crawler.crawler_levelsfyi.worker.parse_workflow_dispatch", return_value=message), \
             patch("src.python.web_crawler.crawler_levelsfyi.worker.get_database", return_value=FakeDatabase()), \
             patch("src.python.web_crawler.crawler_levelsfyi.worker.get_user_database", return_value=FakeDatabase()), \
@@ -637,6 +715,8 @@ class CrawlerLevelsFyiWorkerTests(unittest.TestCase):
         status_calls = [call.kwargs.get("status") for call in mock_publish.mock_calls if hasattr(call, "kwargs")]
         self.assertIn("running", status_calls)
         self.assertIn("failed", status_calls)
+        # A handled failure is reported, so the dispatch is not redelivered.
+        self.assertEqual(work_queue.acked, ["payload"])
 
 
 if __name__ == "__main__":
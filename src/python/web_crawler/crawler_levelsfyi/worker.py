@@ -4,20 +4,21 @@ import argparse
 import logging
 import time
 import uuid
-from typing import cast
 
 import redis
 
 from src.python.web_crawler.config import CrawlerConfig
 from src.python.web_crawler.crawler_levelsfyi.workflow import (
+    _ENRICHMENT_REASON,
     _WORKFLOW_ID,
-    _emit_enrichment_events,
     run_crawler_levelsfyi,
 )
 from src.python.web_crawler.db import get_database, get_user_database
 from src.python.web_crawler.progress import publish_progress, utc_timestamp
+from src.python.web_crawler.reliable_queue import ReliableQueue, build_work_queue
 from src.python.web_crawler.workflow_counters import increment_discovered_jobs_counter
 from src.python.web_crawler.workflow_messages import parse_workflow_dispatch
+from src.python.web_crawler.workflow_utils import emit_enrichment_events
 
 logging.basicConfig(level=logging.DEBUG, format="%(levelname)s %(name)s: %(message)s")
 logger = logging.getLogger(__name__)
@@ -40,6 +41,7 @@ def _connect_redis(config: CrawlerConfig) -> redis.Redis:
 
 def worker_main(config: CrawlerConfig) -> None:
     redis_client: redis.Redis | None = None
+    work_queue: ReliableQueue | None = None
 
     while True:
         try:
@@ -51,18 +53,18 @@ def worker_main(config: CrawlerConfig) -> None:
                     config.redis_port,
                 )
 
-            queue_item = cast(
-                tuple[str, str] | None,
-                redis_client.blpop([config.crawler_levelsfyi_queue_name], timeout=0),
-            )
-            if not queue_item:
+            if work_queue is None:
+                work_queue = build_work_queue(redis_client, config, config.crawler_levelsfyi_queue_name)
+            claimed = work_queue.claim()
+            if claimed is None:
                 continue
 
-            _, raw_payload = queue_item
+            raw_payload = claimed.payload
             try:
                 message = parse_workflow_dispatch(raw_payload)
             except Exception as exc:
                 logger.warning("crawler_levelsfyi: invalid workflow dispatch payload: %s", exc)
+                work_queue.ack(claimed)
                 continue
 
             run_id = message.run_id.strip()
@@ -74,6 +76,7 @@ def worker_main(config: CrawlerConfig) -> None:
                 logger.warning(
                     "crawler_levelsfyi: dispatch message missing identity_id or user_id: %s", raw_payload
                 )
+                work_queue.ack(claimed)
                 continue
 
             started_at = utc_timestamp()
@@ -125,13 +128,16 @@ def worker_main(config: CrawlerConfig) -> None:
                     delta=crawl_result.inserted_count + crawl_result.updated_count,
                 )
 
-                _emit_enrichment_events(
+                emit_enrichment_events(
                     redis_client,
                     config,
                     run_id=run_id,
                     workflow_run_id=workflow_run_id,
+                    workflow_id=_WORKFLOW_ID,
                     identity_id=identity_id,
                     company_ids=crawl_result.new_company_ids,
+                    reason=_ENRICHMENT_REASON,
+                    user_id=user_id,
                 )
 
                 finished_at = utc_timestamp()
@@ -188,9 +194,11 @@ def worker_main(config: CrawlerConfig) -> None:
                     workflow_run_id=workflow_run_id,
                 )
 
+            work_queue.ack(claimed)
         except Exception as exc:
             logger.warning("crawler_levelsfyi worker loop error: %s", exc)
             redis_client = None
+            work_queue = None
             time.sleep(2)
 
 
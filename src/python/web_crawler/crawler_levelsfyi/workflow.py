@@ -1,31 +1,38 @@
 from __future__ import annotations
 
-import json
 import logging
 import time
+from collections.abc import Sized
 from typing import Callable
 
 import redis
 from bson import ObjectId
 from bson.errors import InvalidId
 
-from src.python.ai_querier import common_pb2
 from src.python.web_crawler.company_resolver import (
     canonicalize_company_name,
-    upsert_companies,
+    ensure_company_indexes,
+    resolve_companies,
 )
 from src.python.web_crawler.config import CrawlerConfig
 from src.python.web_crawler.models import DiscoveredCompany, WorkflowResult
-from src.python.web_crawler.progress import utc_timestamp
-from src.python.web_crawler.role_filtering import load_identity_roles, text_matches_roles
-from src.python.web_crawler.sources.levelsfyi import LevelsFyiAdapter, LevelsFyiJobCard
-from src.python.web_crawler.workflow_messages import company_discovery_event_to_json
+from src.python.web_crawler.queue_emitter import (
+    build_emitter,
+    enqueue_scoring_job,
+    scoring_failed_count,
+    scoring_sent_count,
+)
+from src.python.web_crawler.role_filtering import RoleMatcher, load_identity_roles
+from src.python.web_crawler.scoring_lanes import BULK_RESCORE_LANE, NEW_JOB_LANE
+from src.python.web_crawler.sources.levelsfyi import LevelsFyiAdapter
+from src.python.web_crawler.workflow_utils import iter_batches
 
 logging.basicConfig(level=logging.DEBUG, format="%(levelname)s %(name)s: %(message)s")
 logger = logging.getLogger(__name__)
 
 _WORKFLOW_ID = "crawler_levelsfyi"
 _PLATFORM = "levelsfyi"
+_ENRICHMENT_REASON = "new_company_or_newly_actionable"
 
 
 def _now_timestamp() -> dict:
@@ -85,22 +92,6 @@ def _upsert_job(
         return job_id, False
 
 
-def _try_enqueue(redis_client, config: CrawlerConfig, job_id: str, user_id: str, identity_id: str = "") -> bool:
-    if not user_id:
-        logger.warning("crawler_levelsfyi: missing user_id for scoring enqueue job_id=%s", job_id)
-        return False
-    try:
-        msg: dict = {"job_id": job_id, "user_id": user_id}
-        if identity_id:
-            msg["identity_id"] = identity_id
-        payload = json.dumps(msg)
-        redis_client.rpush(config.job_scoring_queue_name, payload)
-        return True
-    except Exception as exc:
-        logger.warning("crawler_levelsfyi: failed to enqueue job_id=%s: %s", job_id, exc)
-        return False
-
-
 def _connect_redis(config: CrawlerConfig):
     try:
         client = redis.Redis(
@@ -132,40 +123,6 @@ def _find_companies_missing_slug(collection, company_ids: list[str]) -> list[str
     return [str(doc["_id"]) for doc in docs]
 
 
-def _emit_enrichment_events(
-    redis_client: redis.Redis,
-    config: CrawlerConfig,
-    *,
-    run_id: str,
-    workflow_run_id: str,
-    identity_id: str,
-    company_ids: list[str],
-) -> None:
-    """Push one CompanyDiscoveryEvent per company into the enrichment queue."""
-    for company_id in company_ids:
-        try:
-            event = common_pb2.CompanyDiscoveryEvent(
-                run_id=run_id,
-                workflow_run_id=workflow_run_id,
-                workflow_id=_WORKFLOW_ID,
-                identity_id=identity_id,
-                company_id=company_id,
-                reason="new_company_or_newly_actionable",
-            )
-            event.emitted_at.CopyFrom(utc_timestamp())
-            redis_client.rpush(
-                config.crawler_enrichment_ats_enrichment_queue_name,
-                company_discovery_event_to_json(event),
-            )
-            logger.debug("crawler_levelsfyi: emitted CompanyDiscoveryEvent for company %s", company_id)
-        except Exception as exc:
-            logger.warning(
-                "crawler_levelsfyi: failed to emit CompanyDiscoveryEvent for company %s: %s",
-                company_id,
-                exc,
-            )
-
-
 def run_crawler_levelsfyi(
     database,
     config: CrawlerConfig,
@@ -199,129 +156,124 @@ def run_crawler_levelsfyi(
     if progress_callback:
         progress_callback(0, 1, "Fetching job listings from Levels.fyi")
 
-    job_cards = adapter.discover_jobs(roles, config)
-    result.discovered_count = len(job_cards)
-    logger.debug("crawler_levelsfyi: discovered %d job cards", len(job_cards))
-
-    if not job_cards:
-        if progress_callback:
-            progress_callback(1, 1, "No jobs discovered from Levels.fyi")
-        return result
-
-    estimated = max(len(job_cards), 1)
-
-    # Collect all DiscoveredCompany objects for batch upsert
-    discovered_companies: list[DiscoveredCompany] = []
-    company_name_to_card: dict[str, LevelsFyiJobCard] = {}
-    for card in job_cards:
-        if card.company_name:
-            dc = DiscoveredCompany(
+    role_matcher = RoleMatcher(roles)
+    scoring_emitter = None
+    new_company_ids: dict[str, None] = {}
+
+    # Jobs are resolved, upserted and enqueued batch by batch while detail pages
+    # are still being fetched, so scoring starts before discovery finishes.
+    job_cards = adapter.iter_jobs(roles, config)
+    # The listing count is known before detail pages stream in; fall back to
+    # "at least one more" for unsized iterables.
+    total = len(job_cards) if isinstance(job_cards, Sized) else None
+    for batch in iter_batches(job_cards, config.stream_batch_size):
+        if result.discovered_count == 0:
+            ensure_company_indexes(companies_collection)
+            if config.enable_scoring_enqueue:
+                redis_client = _connect_redis(config)
+                if redis_client is not None:
+                    scoring_emitter = build_emitter(redis_client, config)
+
+        discovered_companies = [
+            DiscoveredCompany(
                 name=card.company_name,
                 source=_PLATFORM,
                 role=card.role,
                 source_url=card.source_url,
                 domain=card.domain,
             )
-            discovered_companies.append(dc)
-            canonical = canonicalize_company_name(card.company_name)
-            company_name_to_card.setdefault(canonical, card)
-
-    _, _, all_company_ids = upsert_companies(companies_collection, discovered_companies)
-
-    # Build a lookup: canonical_name -> company_oid (from DB after upsert)
-    canonical_to_oid: dict[str, ObjectId] = {}
-    for company_id in all_company_ids:
-        oid = _to_object_id(company_id)
-        if oid is None:
-            continue
-        doc = companies_collection.find_one({"_id": oid}, {"canonical_name": 1})
-        if doc and doc.get("canonical_name"):
-            canonical_to_oid[doc["canonical_name"]] = oid
-
-    # Determine new companies pending enrichment
-    result.new_company_ids = _find_companies_missing_slug(companies_collection, all_company_ids)
-
-    # Optional scoring enqueue
-    redis_client = None
-    if config.enable_scoring_enqueue:
-        redis_client = _connect_redis(config)
-
-    for idx, card in enumerate(job_cards, start=1):
-        if progress_callback:
-            progress_callback(idx, estimated, f"Upserting job {idx}/{estimated}: {card.job_title}")
+            for card in batch
+            if card.company_name
+        ]
+        resolution = resolve_companies(companies_collection, discovered_companies)
+        canonical_to_oid = resolution.canonical_to_oid
+
+        # Determine new companies pending enrichment
+        new_company_ids.update(
+            dict.fromkeys(_find_companies_missing_slug(companies_collection, resolution.company_ids))
+        )
 
-        if not text_matches_roles(card.job_title, card.description, roles):
-            logger.debug(
-                "crawler_levelsfyi: job %s (external_id=%s) does not match identity roles; skipping",
-                card.job_title,
-                card.external_job_id,
-            )
-            result.skipped_count += 1
-            continue
-
-        canonical = canonicalize_company_name(card.company_name) if card.company_name else ""
-        company_oid = canonical_to_oid.get(canonical) if canonical else None
-
-        if company_oid is None:
-            # Create a minimal company record inline for jobs with no resolvable company name
-            if card.company_name:
-                dc = DiscoveredCompany(
-                    name=card.company_name,
-                    source=_PLATFORM,
-                    role=card.role,
+        for card in batch:
+            result.discovered_count += 1
+            idx = result.discovered_count
+            if progress_callback:
+                estimated = max(total, idx) if total is not None else idx + 1
+                progress_callback(idx, estimated, f"Upserting job {idx}/{estimated}: {card.job_title}")
+
+            if not role_matcher.matches(card.job_title, card.description):
+                logger.debug(
+                    "crawler_levelsfyi: job %s (external_id=%s) does not match identity roles; skipping",
+                    card.job_title,
+                    card.external_job_id,
+                )
+                result.skipped_count += 1
+                continue
+
+            canonical = canonicalize_company_name(card.company_name) if card.company_name else ""
+            company_oid = canonical_to_oid.get(canonical) if canonical else None
+
+            if company_oid is None:
+                logger.debug(
+                    "crawler_levelsfyi: skipping job %s (%s) — could not resolve company for %r",
+                    card.external_job_id,
+                    card.source_url,
+                    card.company_name,
+                )
+                result.skipped_count += 1
+                continue
+
+            try:
+                job_id, was_inserted = _upsert_job(
+                    jobs_collection,
+                    job_title=card.job_title,
+                    description=card.description,
+                    location=card.location,
+                    external_job_id=card.external_job_id,
                     source_url=card.source_url,
-                    domain=card.domain,
+                    company_oid=company_oid,
                 )
-                _, _, new_ids = upsert_companies(companies_collection, [dc])
-                if new_ids:
-                    company_oid = _to_object_id(new_ids[0])
-                    if company_oid:
-                        canonical_to_oid[canonical] = company_oid
-                        if new_ids[0] not in result.new_company_ids:
-                            missing = _find_companies_missing_slug(companies_collection, new_ids)
-                            result.new_company_ids.extend(missing)
-
-        if company_oid is None:
-            logger.debug(
-                "crawler_levelsfyi: skipping job %s (%s) — could not resolve company for %r",
-                card.external_job_id,
-                card.source_url,
-                card.company_name,
-            )
-            result.skipped_count += 1
-            continue
-
-        try:
-            job_id, was_inserted = _upsert_job(
-                jobs_collection,
-                job_title=card.job_title,
-                description=card.description,
-                location=card.location,
-                external_job_id=card.external_job_id,
-                source_url=card.source_url,
-                company_oid=company_oid,
-            )
-        except Exception as exc:
-            logger.warning(
-                "crawler_levelsfyi: upsert failed for job %s: %s",
-                card.external_job_id,
-                exc,
-            )
-            result.failed_urls.append({"url": card.source_url, "error": str(exc)})
-            continue
-
-        result.job_ids.append(job_id)
-        if was_inserted:
-            result.inserted_count += 1
-        else:
-            result.updated_count += 1
-
-        if redis_client is not None and config.enable_scoring_enqueue:
-            if _try_enqueue(redis_client, config, job_id, user_id, identity_id=identity_id or ""):
-                result.enqueued_count += 1
+            except Exception as exc:
+                logger.warning(
+                    "crawler_levelsfyi: upsert failed for job %s: %s",
+                    card.external_job_id,
+                    exc,
+                )
+                result.failed_urls.append({"url": card.source_url, "error": str(exc)})
+                continue
+
+            result.job_ids.append(job_id)
+            if was_inserted:
+                result.inserted_count += 1
             else:
-                result.enqueue_failed_count += 1
+                result.updated_count += 1
+
+            if scoring_emitter is not None:
+                if not enqueue_scoring_job(
+                    scoring_emitter,
+                    config,
+                    job_id=job_id,
+                    user_id=user_id,
+                    identity_id=identity_id or "",
+                    workflow_id=_WORKFLOW_ID,
+                    lane=NEW_JOB_LANE if was_inserted else BULK_RESCORE_LANE,
+                ):
+                    result.enqueue_failed_count += 1
+
+        if scoring_emitter is not None:
+            scoring_emitter.flush()
+
+    logger.debug("crawler_levelsfyi: discovered %d job cards", result.discovered_count)
+    if result.discovered_count == 0:
+        if progress_callback:
+            progress_callback(1, 1, "No jobs discovered from Levels.fyi")
+        return result
+
+    result.new_company_ids = list(new_company_ids)
+    if scoring_emitter is not None:
+        result.enqueued_count = scoring_sent_count(scoring_emitter, config)
+        result.enqueue_failed_count += scoring_failed_count(scoring_emitter, config)
 
+    estimated = result.discovered_count
     if progress_callback:
         progress_callback(
             estimated,
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 
-from src.python.web_crawler.company_resolver import deduplicate_companies, upsert_companies
+from src.python.web_crawler.company_resolver import deduplicate_companies, ensure_company_indexes, upsert_companies
 from src.python.web_crawler.config import CrawlerConfig
 from src.python.web_crawler.workflow_utils import (
     find_companies_missing_slug as _find_companies_missing_slug,
@@ -43,6 +43,7 @@ def run_crawler_ycombinator(database, config: CrawlerConfig, identity_id: str, *
     result.discovered_count = len(deduped_companies)
     result.skipped_count = max(len(discovered_companies) - len(deduped_companies), 0)
 
+    ensure_company_indexes(companies_collection)
     inserted_count, updated_count, company_ids = upsert_companies(
         companies_collection,
         deduped_companies,
@@ -4,21 +4,26 @@ import argparse
 import json
 import logging
 import time
-from typing import cast
+from itertools import islice
+from typing import Iterator
 import uuid
 
 import redis
+from pymongo import ASCENDING, DESCENDING
 
 from src.python.ai_querier import common_pb2
 from src.python.web_crawler.config import CrawlerConfig
 from src.python.web_crawler.db import get_database, get_user_database
 from src.python.web_crawler.progress import publish_progress, utc_timestamp
+from src.python.web_crawler.reliable_queue import ReliableQueue, build_work_queue
+from src.python.web_crawler.scoring_lanes import BULK_RESCORE_LANE, lane_queue_name
 from src.python.web_crawler.workflow_messages import (
-    company_discovery_event_to_json,
     crawl_trigger_to_dict,
     parse_crawl_trigger,
     workflow_dispatch_to_json,
 )
+from src.python.web_crawler.workflow_graph import DISPATCHER_WORKFLOW_ID, trigger_workflows
+from src.python.web_crawler.workflow_utils import emit_enrichment_events
 
 logging.basicConfig(level=logging.DEBUG, format="%(levelname)s %(name)s: %(message)s")
 logger = logging.getLogger(__name__)
@@ -36,26 +41,107 @@ def _connect_redis(config: CrawlerConfig) -> redis.Redis:
     return client
 
 
-def _query_companies_needing_enrichment(database) -> list[str]:
-    """Return hex _id strings for companies that still need ATS enrichment."""
-    companies = database["companies"]
-    cursor = companies.find(
-        {
-            "$and": [
-                {"enrichment_ats_enrichment_terminal_failure": {"$exists": False}},
-                {
-                    "$or": [
-                        {"ats_provider": {"$in": [None, ""]}},
-                        {"ats_provider": {"$exists": False}},
-                        {"ats_slug": {"$in": [None, ""]}},
-                        {"ats_slug": {"$exists": False}},
-                    ]
-                },
-            ]
-        },
+# Missing and null fields both match ``None``, so this is equivalent to the older
+# ``$exists: False`` form.
+_ENRICHMENT_NEEDED_FILTER = {
+    "enrichment_ats_enrichment_terminal_failure": None,
+    "$or": [
+        {"ats_provider": {"$in": [None, ""]}},
+        {"ats_slug": {"$in": [None, ""]}},
+    ],
+}
+# MongoDB 4.4 partial filters cannot express null/missing or ``$or``, so the
+# fan-out query is served by one plain compound index per ``$or`` branch; the
+# planner merges both branches in ``_id`` order.
+ENRICHMENT_NEEDED_INDEXES = (
+    (
+        "ix_companies_enrichment_needed_provider",
+        [("enrichment_ats_enrichment_terminal_failure", ASCENDING), ("ats_provider", ASCENDING), ("_id", DESCENDING)],
+    ),
+    (
+        "ix_companies_enrichment_needed_slug",
+        [("enrichment_ats_enrichment_terminal_failure", ASCENDING), ("ats_slug", ASCENDING), ("_id", DESCENDING)],
+    ),
+)
+_LEASE_SCAN_CHUNK_SIZE = 500
+
+
+def ensure_enrichment_fanout_index(companies_collection) -> None:
+    """Indexes behind the enrichment fan-out query; called once at worker startup."""
+    for name, keys in ENRICHMENT_NEEDED_INDEXES:
+        try:
+            companies_collection.create_index(keys, name=name)
+        except Exception as exc:
+            logger.warning("could not ensure enrichment fan-out index %s on companies: %s", name, exc)
+
+
+def _iter_companies_needing_enrichment(database, batch_size: int = 500) -> Iterator[str]:
+    """Yield hex _id strings for companies needing ATS enrichment, most recent first."""
+    cursor = database["companies"].find(
+        _ENRICHMENT_NEEDED_FILTER,
         {"_id": 1},
+        sort=[("_id", DESCENDING)],
+        batch_size=batch_size,
     )
-    return [str(doc["_id"]) for doc in cursor]
+    for doc in cursor:
+        yield str(doc["_id"])
+
+
+def _query_companies_needing_enrichment(database) -> list[str]:
+    """Return hex _id strings for companies that still need ATS enrichment."""
+    return list(_iter_companies_needing_enrichment(database))
+
+
+def _acquire_enrichment_leases(
+    redis_client: redis.Redis,
+    config: CrawlerConfig,
+    company_ids: list[str],
+    *,
+    run_id: str,
+) -> list[str]:
+    """Claim a TTL lease per company; return the ids no other run is already covering."""
+    if not company_ids:
+        return []
+    pipeline = redis_client.pipeline(transaction=False)
+    for company_id in company_ids:
+        pipeline.set(
+            f"{config.enrichment_lease_key_prefix}:{company_id}",
+            run_id,
+            nx=True,
+            ex=config.enrichment_lease_ttl_seconds,
+        )
+    replies = pipeline.execute()
+    return [company_id for company_id, acquired in zip(company_ids, replies) if acquired]
+
+
+def _unleased_company_ids(redis_client: redis.Redis, config: CrawlerConfig, company_ids: list[str]) -> list[str]:
+    pipeline = redis_client.pipeline(transaction=False)
+    for company_id in company_ids:
+        pipeline.exists(f"{config.enrichment_lease_key_prefix}:{company_id}")
+    replies = pipeline.execute()
+    return [company_id for company_id, leased in zip(company_ids, replies) if not leased]
+
+
+def _select_companies_for_enrichment(
+    redis_client: redis.Redis,
+    config: CrawlerConfig,
+    database,
+    *,
+    run_id: str,
+) -> list[str]:
+    """Lease up to ``enrichment_fanout_max_companies`` unleased companies, most recent first."""
+    limit = config.enrichment_fanout_max_companies
+    selected: list[str] = []
+    company_ids = _iter_companies_needing_enrichment(database, batch_size=_LEASE_SCAN_CHUNK_SIZE)
+    while len(selected) < limit:
+        chunk = list(islice(company_ids, _LEASE_SCAN_CHUNK_SIZE))
+        if not chunk:
+            break
+        # Only claim what will actually be emitted: a lease we do not emit would
+        # hide the company from every other trigger until it expires.
+        unleased = _unleased_company_ids(redis_client, config, chunk)[: limit - len(selected)]
+        selected.extend(_acquire_enrichment_leases(redis_client, config, unleased, run_id=run_id))
+    return selected
 
 
 def enqueue_scoring_if_needed(
@@ -90,7 +176,7 @@ def enqueue_scoring_if_needed(
             return
 
         payload = json.dumps({"job_id": job_id, "user_id": user_id, "identity_id": identity_id})
-        redis_client.rpush(config.job_scoring_queue_name, payload)
+        redis_client.rpush(lane_queue_name(config.job_scoring_queue_name, BULK_RESCORE_LANE), payload)
         logger.info("dispatcher: enqueued scoring for job %s identity %s", job_id, identity_id)
     except Exception as exc:
         logger.warning("dispatcher: failed to enqueue scoring for job %s: %s", job_id, exc)
@@ -105,29 +191,24 @@ def _fan_out_enrichment_events(
     identity_id: str,
     user_id: str,
 ) -> int:
-    """Push one CompanyDiscoveryEvent per unenriched company to the enrichment queue."""
-    company_ids = _query_companies_needing_enrichment(database)
-    workflow_run_id = _new_workflow_run_id()
-    emitted = 0
-    for company_id in company_ids:
-        try:
-            event = common_pb2.CompanyDiscoveryEvent(
-                run_id=run_id,
-                workflow_run_id=workflow_run_id,
-                workflow_id="dispatcher",
-                identity_id=identity_id,
-                company_id=company_id,
-                reason="no_ats_slug",
-                user_id=user_id,
-            )
-            event.emitted_at.CopyFrom(utc_timestamp())
-            redis_client.rpush(
-                config.crawler_enrichment_ats_enrichment_queue_name,
-                company_discovery_event_to_json(event),
-            )
-            emitted += 1
-        except Exception as exc:
-            logger.warning("failed to emit enrichment event for company %s: %s", company_id, exc)
+    """Push one CompanyDiscoveryEvent per unenriched, unleased company to the enrichment queue.
+
+    Each company is leased in Redis for ``enrichment_lease_ttl_seconds`` so
+    concurrent or back-to-back triggers do not re-emit it, and at most
+    ``enrichment_fanout_max_companies`` events are emitted per trigger.
+    """
+    company_ids = _select_companies_for_enrichment(redis_client, config, database, run_id=run_id)
+    emitted = emit_enrichment_events(
+        redis_client,
+        config,
+        run_id=run_id,
+        workflow_run_id=_new_workflow_run_id(),
+        workflow_id=DISPATCHER_WORKFLOW_ID,
+        identity_id=identity_id,
+        company_ids=company_ids,
+        reason="no_ats_slug",
+        user_id=user_id,
+    )
     logger.info(
         "fanned out %d enrichment events run_id=%s identity_id=%s",
         emitted,
@@ -164,6 +245,8 @@ def _dispatch_workflow(
 
 def worker_main(config: CrawlerConfig) -> None:
     redis_client: redis.Redis | None = None
+    work_queue: ReliableQueue | None = None
+    ensure_enrichment_fanout_index(get_database(config)["companies"])
 
     while True:
         try:
@@ -171,18 +254,18 @@ def worker_main(config: CrawlerConfig) -> None:
                 redis_client = _connect_redis(config)
                 logger.info("connected to redis at %s:%s", config.redis_host, config.redis_port)
 
-            queue_item = cast(
-                tuple[str, str] | None,
-                redis_client.blpop([config.crawler_trigger_queue_name], timeout=0),
-            )
-            if not queue_item:
+            if work_queue is None:
+                work_queue = build_work_queue(redis_client, config, config.crawler_trigger_queue_name)
+            claimed = work_queue.claim()
+            if claimed is None:
                 continue
 
-            _, raw_payload = queue_item
+            raw_payload = claimed.payload
             try:
                 payload = parse_crawl_trigger(raw_payload)
             except Exception as exc:
                 logger.warning("invalid crawler trigger payload: %s", exc)
+                work_queue.ack(claimed)
                 continue
 
             identity_id = payload.identity_id.strip()
@@ -193,6 +276,7 @@ def worker_main(config: CrawlerConfig) -> None:
                     "crawler trigger payload missing required keys: %s",
                     crawl_trigger_to_dict(payload),
                 )
+                work_queue.ack(claimed)
                 continue
 
             publish_progress(
@@ -208,85 +292,25 @@ def worker_main(config: CrawlerConfig) -> None:
                 message="Worker picked up queued crawl request",
             )
 
-            ycombinator_workflow_run_id = _dispatch_workflow(
-                redis_client,
-                config,
-                run_id=run_id,
-                identity_id=identity_id,
-                user_id=user_id,
-                workflow_id="crawler_ycombinator",
-                queue_name=config.crawler_ycombinator_queue_name,
-            )
-            logger.info(
-                "dispatched crawler_ycombinator run_id=%s workflow_run_id=%s identity_id=%s",
-                run_id,
-                ycombinator_workflow_run_id,
-                identity_id,
-            )
-
-            hackernews_workflow_run_id = _dispatch_workflow(
-                redis_client,
-                config,
-                run_id=run_id,
-                identity_id=identity_id,
-                user_id=user_id,
-                workflow_id="crawler_hackernews",
-                queue_name=config.crawler_hackernews_queue_name,
-            )
-            logger.info(
-                "dispatched crawler_hackernews run_id=%s workflow_run_id=%s identity_id=%s",
-                run_id,
-                hackernews_workflow_run_id,
-                identity_id,
-            )
-
-            ats_workflow_run_id = _dispatch_workflow(
-                redis_client,
-                config,
-                run_id=run_id,
-                identity_id=identity_id,
-                user_id=user_id,
-                workflow_id="crawler_ats_job_extraction",
-                queue_name=config.crawler_ats_job_extraction_queue_name,
-            )
-            logger.info(
-                "dispatched crawler_ats_job_extraction run_id=%s workflow_run_id=%s identity_id=%s",
-                run_id,
-                ats_workflow_run_id,
-                identity_id,
-            )
-
-            levelsfyi_workflow_run_id = _dispatch_workflow(
-                redis_client,
-                config,
-                run_id=run_id,
-                identity_id=identity_id,
-                user_id=user_id,
-                workflow_id="crawler_levelsfyi",
-                queue_name=config.crawler_levelsfyi_queue_name,
-            )
-            logger.info(
-                "dispatched crawler_levelsfyi run_id=%s workflow_run_id=%s identity_id=%s",
-                run_id,
-                levelsfyi_workflow_run_id,
-                identity_id,
-            )
-
-            fourdayweek_workflow_run_id = _dispatch_workflow(
-                redis_client,
-                config,
-                run_id=run_id,
-                identity_id=identity_id,
-                user_id=user_id,
-                workflow_id="crawler_4dayweek",
-                queue_name=config.crawler_4dayweek_queue_name,
-            )
-            logger.info(
-                "dispatched crawler_4dayweek run_id=%s workflow_run_id=%s identity_id=%s",
-                run_id,
-                fourdayweek_workflow_run_id,
-                identity_id,
-            )
+            # Trigger workflows run concurrently; enrichment and per-company ATS
+            # extraction follow from per-company events the workflows emit (see workflow_graph).
+            for node in trigger_workflows():
+                workflow_run_id = _dispatch_workflow(
+                    redis_client,
+                    config,
+                    run_id=run_id,
+                    identity_id=identity_id,
+                    user_id=user_id,
+                    workflow_id=node.workflow_id,
+                    queue_name=node.queue_name(config),
+                )
+                logger.info(
+                    "dispatched %s run_id=%s workflow_run_id=%s identity_id=%s",
+                    node.workflow_id,
+                    run_id,
+                    workflow_run_id,
+                    identity_id,
+                )
 
             database = get_database(config)
             _fan_out_enrichment_events(
@@ -298,9 +322,11 @@ def worker_main(config: CrawlerConfig) -> None:
                 user_id=user_id,
             )
 
+            work_queue.ack(claimed)
         except Exception as exc:
             logger.warning("worker loop error: %s", exc)
             redis_client = None
+            work_queue = None
             time.sleep(2)
 
 
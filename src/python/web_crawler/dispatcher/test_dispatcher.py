@@ -7,10 +7,16 @@ from unittest.mock import MagicMock, call, patch
 from bson import ObjectId
 
 from src.python.web_crawler.config import CrawlerConfig
+from src.python.web_crawler.reliable_queue import ClaimedMessage
+from src.python.web_crawler.workflow_messages import parse_workflow_dispatch
 from src.python.web_crawler.dispatcher.main import (
+    ENRICHMENT_NEEDED_INDEXES,
+    _ENRICHMENT_NEEDED_FILTER,
     _fan_out_enrichment_events,
     _query_companies_needing_enrichment,
     enqueue_scoring_if_needed,
+    ensure_enrichment_fanout_index,
+    worker_main,
 )
 
 
@@ -20,8 +26,13 @@ class FakeCollection:
 
     def __init__(self, docs=None):
         self.docs = list(docs or [])
+        self.indexes: list[tuple] = []
 
-    def find(self, filter_doc=None, projection=None):
+    def create_index(self, keys, **kwargs):
+        self.indexes.append((keys, kwargs))
+        return kwargs.get("name", "")
+
+    def find(self, filter_doc=None, projection=None, sort=None, batch_size=None):
         def _matches(doc, flt):
             for key, condition in flt.items():
                 if key == "$and":
@@ -45,6 +56,8 @@ class FakeCollection:
             return True
 
         results = [doc for doc in self.docs if filter_doc is None or _matches(doc, filter_doc)]
+        for key, direction in reversed(sort or []):
+            results.sort(key=lambda doc: doc[key], reverse=direction < 0)
 
         if projection is None:
             return results
@@ -75,6 +88,55 @@ class FakeUserDatabase(dict):
     pass
 
 
+class FakePipeline:
+    def __init__(self, redis_client):
+        self._redis_client = redis_client
+        self._commands: list[tuple[str, tuple[str, ...]]] = []
+
+    def rpush(self, queue_name, *payloads):
+        self._commands.append((queue_name, payloads))
+
+    def exists(self, key):
+        self._commands.append(("exists", key))
+
+    def set(self, key, value, nx=False, ex=None):
+        self._commands.append(("set", (key, value, nx, ex)))
+
+    def execute(self, raise_on_error=True):
+        replies = []
+        for queue_name, payloads in self._commands:
+            if queue_name == "exists":
+                replies.append(int(payloads in self._redis_client.leases))
+                continue
+            if queue_name == "set":
+                key, value, nx, ex = payloads
+                if nx and key in self._redis_client.leases:
+                    replies.append(None)
+                    continue
+                self._redis_client.leases[key] = (value, ex)
+                replies.append(True)
+                continue
+            batch_index = len(self._redis_client.batches)
+            self._redis_client.batches.append((queue_name, list(payloads)))
+            if batch_index in self._redis_client.failing_batches:
+                replies.append(RuntimeError("connection lost"))
+                continue
+            self._redis_client.rpush_calls.extend((queue_name, payload) for payload in payloads)
+            replies.append(len(payloads))
+        return replies
+
+
+class FakeRedis:
+    def __init__(self, failing_batches=()):
+        self.failing_batches = set(failing_batches)
+        self.batches: list[tuple[str, list[str]]] = []
+        self.rpush_calls: list[tuple[str, str]] = []
+        self.leases: dict[str, tuple[str, int | None]] = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
 # ---------------------------------------------------------------------------
 # Tests for _query_companies_needing_enrichment
 # ---------------------------------------------------------------------------
@@ -174,8 +236,8 @@ class FanOutEnrichmentEventsTests(unittest.TestCase):
             db_name="cover_letter",
         )
 
-    def _redis(self):
-        return MagicMock()
+    def _redis(self, failing_batches=()):
+        return FakeRedis(failing_batches=failing_batches)
 
     def _db(self, docs):
         return FakeDatabase({"companies": FakeCollection(docs)})
@@ -190,9 +252,9 @@ class FanOutEnrichmentEventsTests(unittest.TestCase):
         )
 
         self.assertEqual(count, 3)
-        self.assertEqual(redis_client.rpush.call_count, 3)
-        for c in redis_client.rpush.call_args_list:
-            queue_name = c.args[0]
+        self.assertEqual(len(redis_client.rpush_calls), 3)
+        self.assertEqual(len(redis_client.batches), 1)
+        for queue_name, _ in redis_client.rpush_calls:
             self.assertEqual(queue_name, self.config.crawler_enrichment_ats_enrichment_queue_name)
 
     def test_event_payload_has_correct_fields(self):
@@ -204,8 +266,8 @@ class FanOutEnrichmentEventsTests(unittest.TestCase):
             redis_client, self.config, db, run_id="run42", identity_id="id99", user_id="test_user"
         )
 
-        self.assertEqual(redis_client.rpush.call_count, 1)
-        _, raw_payload = redis_client.rpush.call_args.args
+        self.assertEqual(len(redis_client.rpush_calls), 1)
+        _, raw_payload = redis_client.rpush_calls[-1]
         payload = json.loads(raw_payload)
 
         self.assertEqual(payload["run_id"], "run42")
@@ -224,7 +286,7 @@ class FanOutEnrichmentEventsTests(unittest.TestCase):
             redis_client, self.config, db, run_id="r1", identity_id="i1", user_id="test_user"
         )
 
-        payloads = [json.loads(c.args[1]) for c in redis_client.rpush.call_args_list]
+        payloads = [json.loads(raw_payload) for _, raw_payload in redis_client.rpush_calls]
         workflow_run_ids = {p["workflow_run_id"] for p in payloads}
         self.assertEqual(len(workflow_run_ids), 1)
 
@@ -238,21 +300,21 @@ class FanOutEnrichmentEventsTests(unittest.TestCase):
         )
 
         self.assertEqual(count, 0)
-        redis_client.rpush.assert_not_called()
+        self.assertEqual(redis_client.batches, [])
 
-    def test_continues_after_individual_push_failure(self):
+    def test_continues_after_batch_push_failure(self):
         ids = [ObjectId(), ObjectId(), ObjectId()]
         db = self._db([{"_id": oid, "name": f"Co{i}"} for i, oid in enumerate(ids)])
-        redis_client = self._redis()
-        # Fail on the second push, succeed on the others.
-        redis_client.rpush.side_effect = [None, RuntimeError("connection lost"), None]
+        self.config.redis_emit_batch_size = 2
+        # Fail the first pipelined batch, succeed on the second.
+        redis_client = self._redis(failing_batches={0})
 
         count = _fan_out_enrichment_events(
             redis_client, self.config, db, run_id="r1", identity_id="i1", user_id="test_user"
         )
 
-        self.assertEqual(count, 2)
-        self.assertEqual(redis_client.rpush.call_count, 3)
+        self.assertEqual(count, 1)
+        self.assertEqual([len(payloads) for _, payloads in redis_client.batches], [2, 1])
 
     def test_excludes_terminal_failure_companies_from_fan_out(self):
         good_id = ObjectId()
@@ -272,7 +334,7 @@ class FanOutEnrichmentEventsTests(unittest.TestCase):
         )
 
         self.assertEqual(count, 1)
-        _, raw_payload = redis_client.rpush.call_args.args
+        _, raw_payload = redis_client.rpush_calls[-1]
         payload = json.loads(raw_payload)
         self.assertEqual(payload["company_id"], str(good_id))
 
@@ -285,11 +347,162 @@ class FanOutEnrichmentEventsTests(unittest.TestCase):
             redis_client, self.config, db, run_id="my-run-id", identity_id="my-identity", user_id="test_user"
         )
 
-        _, raw_payload = redis_client.rpush.call_args.args
+        _, raw_payload = redis_client.rpush_calls[-1]
         payload = json.loads(raw_payload)
         self.assertEqual(payload["run_id"], "my-run-id")
         self.assertEqual(payload["identity_id"], "my-identity")
 
+    def test_leases_companies_so_later_triggers_do_not_re_emit(self):
+        oid = ObjectId()
+        db = self._db([{"_id": oid, "name": "Acme"}])
+        redis_client = self._redis()
+
+        first = _fan_out_enrichment_events(
+            redis_client, self.config, db, run_id="r1", identity_id="i1", user_id="user-1"
+        )
+        second = _fan_out_enrichment_events(
+            redis_client, self.config, db, run_id="r2", identity_id="i2", user_id="user-2"
+        )
+
+        self.assertEqual((first, second), (1, 0))
+        lease_key = f"{self.config.enrichment_lease_key_prefix}:{oid}"
+        self.assertEqual(redis_client.leases[lease_key], ("r1", self.config.enrichment_lease_ttl_seconds))
+
+    def test_fan_out_is_bounded_and_prefers_most_recent_companies(self):
+        ids = sorted([ObjectId() for _ in range(3)])
+        db = self._db([{"_id": oid, "name": f"Co{i}"} for i, oid in enumerate(ids)])
+        redis_client = self._redis()
+        self.config.enrichment_fanout_max_companies = 2
+
+        count = _fan_out_enrichment_events(
+            redis_client, self.config, db, run_id="r1", identity_id="i1", user_id="user-1"
+        )
+
+        emitted = [json.loads(raw_payload)["company_id"] for _, raw_payload in redis_client.rpush_calls]
+        self.assertEqual(count, 2)
+        self.assertEqual(emitted, [str(ids[2]), str(ids[1])])
+        # The company that was not emitted must stay unleased for the next trigger.
+        self.assertNotIn(f"{self.config.enrichment_lease_key_prefix}:{ids[0]}", redis_client.leases)
+
+    def test_skips_leased_companies_and_fills_bound_with_older_ones(self):
+        ids = sorted([ObjectId() for _ in range(3)])
+        db = self._db([{"_id": oid, "name": f"Co{i}"} for i, oid in enumerate(ids)])
+        redis_client = self._redis()
+        redis_client.leases[f"{self.config.enrichment_lease_key_prefix}:{ids[2]}"] = ("other-run", 60)
+        self.config.enrichment_fanout_max_companies = 1
+
+        count = _fan_out_enrichment_events(
+            redis_client, self.config, db, run_id="r1", identity_id="i1", user_id="user-1"
+        )
+
+        _, raw_payload = redis_client.rpush_calls[-1]
+        self.assertEqual(count, 1)
+        self.assertEqual(json.loads(raw_payload)["company_id"], str(ids[1]))
+
+
+class WorkerMainTests(unittest.TestCase):
+    def test_dispatches_trigger_workflows_and_leaves_enrichment_to_events(self):
+        config = CrawlerConfig(mongo_host="mongodb://localhost:27017/", db_name="cover_letter")
+        redis_client = MagicMock()
+        trigger = json.dumps({"run_id": "run-1", "identity_id": "ident-1", "user_id": "user-1"})
+        work_queue = MagicMock()
+        work_queue.claim.side_effect = [ClaimedMessage(payload=trigger, delivery_count=1), RuntimeError("stop")]
+
+        with patch("src.python.web_crawler.dispatcher.main._connect_redis", return_value=redis_client), \
+            patch("src.python.web_crawler.dispatcher.main.build_work_queue", return_value=work_queue), \
+            patch("src.python.web_crawler.dispatcher.main.publish_progress"), \
+            patch("src.python.web_crawler.dispatcher.main.get_database", return_value=FakeDatabase({"companies": FakeCollection()})), \
+            patch("src.python.web_crawler.dispatcher.main._fan_out_enrichment_events") as mock_fan_out, \
+            patch("src.python.web_crawler.dispatcher.main.time.sleep", side_effect=StopIteration):
+            with self.assertRaises(StopIteration):
+                worker_main(config)
+
+        dispatched = {
+            queue_name: parse_workflow_dispatch(payload)
+            for queue_name, payload in (rpush.args for rpush in redis_client.rpush.call_args_list)
+        }
+        self.assertEqual(
+            {queue_name: message.workflow_id for queue_name, message in dispatched.items()},
+            {
+                config.crawler_ycombinator_queue_name: "crawler_ycombinator",
+                config.crawler_hackernews_queue_name: "crawler_hackernews",
+                config.crawler_levelsfyi_queue_name: "crawler_levelsfyi",
+                config.crawler_4dayweek_queue_name: "crawler_4dayweek",
+                config.crawler_ats_job_extraction_queue_name: "crawler_ats_job_extraction",
+            },
+        )
+        self.assertTrue(all(message.trigger_kind == "public_crawl" for message in dispatched.values()))
+        self.assertEqual(len({message.workflow_run_id for message in dispatched.values()}), len(dispatched))
+        mock_fan_out.assert_called_once()
+        work_queue.ack.assert_called_once_with(ClaimedMessage(payload=trigger, delivery_count=1))
+
+
+# Operators MongoDB 4.4 accepts in a partialFilterExpression.
+_MONGO44_PARTIAL_FILTER_OPERATORS = {"$exists", "$gt", "$gte", "$lt", "$lte", "$type", "$eq"}
+
+
+def _partial_filter_supported_on_mongo44(filter_doc, top_level=True) -> bool:
+    for key, value in filter_doc.items():
+        if key == "$and":
+            if not top_level or not all(_partial_filter_supported_on_mongo44(branch, False) for branch in value):
+                return False
+        elif key.startswith("$"):
+            return False
+        elif value is None:
+            return False
+        elif isinstance(value, dict):
+            if any(op not in _MONGO44_PARTIAL_FILTER_OPERATORS for op in value):
+                return False
+            if value.get("$exists") is False or any(value.get(op, 0) is None for op in value):
+                return False
+    return True
+
+
+    def test_fan_out_indexes_are_ensured_once_at_startup(self):
+        config = CrawlerConfig(mongo_host="mongodb://localhost:27017/", db_name="cover_letter")
+        trigger = json.dumps({"run_id": "run-1", "identity_id": "ident-1", "user_id": "user-1"})
+        work_queue = MagicMock()
+        work_queue.claim.side_effect = [
+            ClaimedMessage(payload=trigger, delivery_count=1),
+            ClaimedMessage(payload=trigger, delivery_count=1),
+            RuntimeError("stop"),
+        ]
+        companies = FakeCollection()
+
+        with patch("src.python.web_crawler.dispatcher.main._connect_redis", return_value=MagicMock()), \
+            patch("src.python.web_crawler.dispatcher.main.build_work_queue", return_value=work_queue), \
+            patch("src.python.web_crawler.dispatcher.main.publish_progress"), \
+            patch("src.python.web_crawler.dispatcher.main.get_database", return_value=FakeDatabase({"companies": companies})), \
+            patch("src.python.web_crawler.dispatcher.main._fan_out_enrichment_events") as mock_fan_out, \
+            patch("src.python.web_crawler.dispatcher.main.time.sleep", side_effect=StopIteration):
+            with self.assertRaises(StopIteration):
+                worker_main(config)
+
+        self.assertEqual(mock_fan_out.call_count, 2)
+        self.assertEqual(len(companies.indexes), len(ENRICHMENT_NEEDED_INDEXES))
+
+
+class EnsureEnrichmentFanoutIndexTests(unittest.TestCase):
+    def test_indexes_cover_each_fan_out_branch_with_mongo44_valid_options(self):
+        companies = FakeCollection()
+
+        ensure_enrichment_fanout_index(companies)
+
+        self.assertEqual(
+            [(options["name"], keys) for keys, options in companies.indexes],
+            [(name, keys) for name, keys in ENRICHMENT_NEEDED_INDEXES],
+        )
+        for keys, options in companies.indexes:
+            self.assertTrue(_partial_filter_supported_on_mongo44(options.get("partialFilterExpression", {})))
+            self.assertEqual(keys[0][0], "enrichment_ats_enrichment_terminal_failure")
+            self.assertEqual(keys[-1], ("_id", -1))
+        branch_fields = {next(iter(branch)) for branch in _ENRICHMENT_NEEDED_FILTER["$or"]}
+        self.assertEqual({keys[1][0] for keys, _ in companies.indexes}, branch_fields)
+
+    def test_partial_filter_check_rejects_operators_mongo44_does_not_support(self):
+        self.assertFalse(_partial_filter_supported_on_mongo44(_ENRICHMENT_NEEDED_FILTER))
+        self.assertTrue(_partial_filter_supported_on_mongo44({"$and": [{"a": {"$exists": True}}, {"b": 1}]}))
+
 
 class EnqueueScoringIfNeededTests(unittest.TestCase):
     def setUp(self):
@@ -315,7 +528,7 @@ class EnqueueScoringIfNeededTests(unittest.TestCase):
         redis_client.rpush.assert_called_once()
         queue_name, payload_raw = redis_client.rpush.call_args.args
         payload = json.loads(payload_raw)
-        self.assertEqual(queue_name, "job_scoring_queue")
+        self.assertEqual(queue_name, "job_scoring_queue:bulk_rescore")
         self.assertEqual(payload["user_id"], "user-1")
         self.assertIn("job_id", payload)
         self.assertIn("identity_id", payload)
@@ -65,7 +65,10 @@ class FakeCollection:
 
 
 class FakeDatabase(dict):
-    pass
+    def __missing__(self, name):
+        # Like MongoDB, an unknown collection behaves as an empty one.
+        self[name] = FakeCollection()
+        return self[name]
 
 
 class EnrichmentAtsEnrichmentTests(unittest.TestCase):
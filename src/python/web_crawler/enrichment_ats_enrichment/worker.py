@@ -5,7 +5,6 @@ import argparse
 import logging
 import time
 import uuid
-from typing import cast
 
 import redis
 from bson import ObjectId
@@ -15,6 +14,7 @@ from src.python.web_crawler.config import CrawlerConfig
 from src.python.web_crawler.db import get_database, get_user_database
 from src.python.web_crawler.models import WorkflowResult
 from src.python.web_crawler.progress import publish_progress, utc_timestamp
+from src.python.web_crawler.reliable_queue import ReliableQueue, build_work_queue
 from src.python.web_crawler.enrichment_ats_enrichment.workflow import run_enrichment_ats_enrichment
 from src.python.web_crawler.workflow_messages import (
     parse_company_discovery_event,
@@ -127,6 +127,7 @@ def _run_enrichment_for_event(
 
 def worker_main(config: CrawlerConfig) -> None:
     redis_client: redis.Redis | None = None
+    work_queue: ReliableQueue | None = None
 
     while True:
         try:
@@ -138,20 +139,18 @@ def worker_main(config: CrawlerConfig) -> None:
                     config.redis_port,
                 )
 
-            queue_item = cast(
-                tuple[str, str] | None,
-                redis_client.blpop(
-                    [config.crawler_enrichment_ats_enrichment_queue_name], timeout=0
-                ),
-            )
-            if not queue_item:
+            if work_queue is None:
+                work_queue = build_work_queue(redis_client, config, config.crawler_enrichment_ats_enrichment_queue_name)
+            claimed = work_queue.claim()
+            if claimed is None:
                 continue
 
-            _, raw_payload = queue_item
+            raw_payload = claimed.payload
             try:
                 event = parse_company_discovery_event(raw_payload)
             except Exception as exc:
                 logger.warning("invalid company discovery event payload: %s", exc)
+                work_queue.ack(claimed)
                 continue
 
             run_id = event.run_id.strip()
@@ -165,6 +164,7 @@ def worker_main(config: CrawlerConfig) -> None:
                     "company discovery event missing identity_id, company_id, or user_id: %s",
                     raw_payload,
                 )
+                work_queue.ack(claimed)
                 continue
 
             # Generate a new workflow_run_id for this enrichment attempt.
@@ -234,9 +234,12 @@ def worker_main(config: CrawlerConfig) -> None:
                     workflow_id=_WORKFLOW_ID,
                     workflow_run_id=enrichment_workflow_run_id,
                 )
+
+            work_queue.ack(claimed)
         except Exception as exc:
             logger.warning("enrichment worker loop error: %s", exc)
             redis_client = None
+            work_queue = None
             time.sleep(2)
 
 
@@ -18,6 +18,7 @@ from src.python.web_crawler.executor import (
     ThreadSafeSessionPool,
     _detect_ats_worker,
 )
+from src.python.web_crawler.http_validator_cache import build_validator_cache
 from src.python.web_crawler.models import WorkflowResult
 from src.python.web_crawler.sources.ats_detector import ATSRequestFailure, detect_ats_provider
 from src.python.web_crawler.sources.ats_slug_resolver import resolve_direct_slug, resolve_slug_via_search_dorking
@@ -331,6 +332,7 @@ def run_enrichment_ats_enrichment(
         logger.info("enrichment_ats_enrichment: Phase B - Starting sequential ATS detection")
         
         session_pool = ThreadSafeSessionPool(config.user_agent)
+        validator_cache = build_validator_cache(database, config, scope="career_page")
         
         try:
             completed_count = 0
@@ -339,7 +341,7 @@ def run_enrichment_ats_enrichment(
                 completed_checks += _task_progress_units(task)
 
                 try:
-                    worker_result: ATSWorkerResult = _detect_ats_worker(task, config, session_pool)
+                    worker_result: ATSWorkerResult = _detect_ats_worker(task, config, session_pool, validator_cache)
 
                     # ===== PHASE B.1: Process worker result =====
                     if worker_result.success:
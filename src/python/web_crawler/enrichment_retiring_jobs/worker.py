@@ -4,7 +4,6 @@ import argparse
 import logging
 import time
 import uuid
-from typing import cast
 
 import redis
 
@@ -12,6 +11,7 @@ from src.python.web_crawler.config import CrawlerConfig
 from src.python.web_crawler.db import get_database
 from src.python.web_crawler.enrichment_retiring_jobs.workflow import _WORKFLOW_ID, run_enrichment_retiring_jobs
 from src.python.web_crawler.progress import publish_progress, utc_timestamp
+from src.python.web_crawler.reliable_queue import ReliableQueue, build_work_queue
 from src.python.web_crawler.workflow_messages import job_update_event_to_json, parse_job_retire_event
 from src.python.ai_querier import common_pb2
 
@@ -60,6 +60,7 @@ def _connect_redis(config: CrawlerConfig) -> redis.Redis:
 
 def worker_main(config: CrawlerConfig) -> None:
     redis_client: redis.Redis | None = None
+    work_queue: ReliableQueue | None = None
 
     while True:
         try:
@@ -71,20 +72,18 @@ def worker_main(config: CrawlerConfig) -> None:
                     config.redis_port,
                 )
 
-            queue_item = cast(
-                tuple[str, str] | None,
-                redis_client.blpop(
-                    [config.crawler_enrichment_retiring_jobs_queue_name], timeout=0
-                ),
-            )
-            if not queue_item:
+            if work_queue is None:
+                work_queue = build_work_queue(redis_client, config, config.crawler_enrichment_retiring_jobs_queue_name)
+            claimed = work_queue.claim()
+            if claimed is None:
                 continue
 
-            _, raw_payload = queue_item
+            raw_payload = claimed.payload
             try:
                 event = parse_job_retire_event(raw_payload)
             except Exception as exc:
                 logger.warning("enrichment_retiring_jobs: invalid job retire event payload: %s", exc)
+                work_queue.ack(claimed)
                 continue
 
             run_id = event.run_id
@@ -96,6 +95,7 @@ def worker_main(config: CrawlerConfig) -> None:
                 logger.warning(
                     "enrichment_retiring_jobs: event missing job_id: %s", raw_payload
                 )
+                work_queue.ack(claimed)
                 continue
 
             # Generate a new workflow_run_id for this retirement attempt if the
@@ -167,9 +167,12 @@ def worker_main(config: CrawlerConfig) -> None:
                     workflow_id=_WORKFLOW_ID,
                     workflow_run_id=workflow_run_id,
                 )
+
+            work_queue.ack(claimed)
         except Exception as exc:
             logger.warning("enrichment_retiring_jobs worker loop error: %s", exc)
             redis_client = None
+            work_queue = None
             time.sleep(2)
 
 
@@ -16,6 +16,7 @@ import requests
 from bson import ObjectId
 
 from src.python.web_crawler.config import CrawlerConfig
+from src.python.web_crawler.http_validator_cache import HttpValidatorCache
 from src.python.web_crawler.sources.ats_detector import (
     ATSRequestFailure,
     detect_ats_provider,
@@ -112,6 +113,7 @@ def _detect_ats_worker(
     task: ATSWorkerTask,
     config: CrawlerConfig,
     session_pool: ThreadSafeSessionPool,
+    validator_cache: HttpValidatorCache | None = None,
 ) -> ATSWorkerResult:
     """
     Worker function for parallel ATS detection.
@@ -123,6 +125,7 @@ def _detect_ats_worker(
         task: Input task data for the company.
         config: Crawler configuration.
         session_pool: Thread-safe session provider.
+        validator_cache: Optional ETag/Last-Modified cache for career pages.
 
     Returns:
         ATSWorkerResult with detection outcome (success/failure) and details.
@@ -138,7 +141,7 @@ def _detect_ats_worker(
         )
 
         # Detect ATS provider from candidate URLs
-        detection = detect_ats_provider(task.candidate_urls, config, session=session)
+        detection = detect_ats_provider(task.candidate_urls, config, session=session, validator_cache=validator_cache)
         if detection is None:
             logger.debug("Worker: No ATS provider detected for company %s", task.company_id)
             return ATSWorkerResult(
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from datetime import datetime, timezone
+
+import requests
+
+from src.python.web_crawler.config import CrawlerConfig
+
+logger = logging.getLogger(__name__)
+
+HTTP_VALIDATORS_COLLECTION = "http_validators"
+
+
+def validator_scope(*parts: str) -> str:
+    """Stable short digest of ``parts``, used to keep validators of different crawl contexts apart."""
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+class HttpValidatorCache:
+    """Persist ``ETag``/``Last-Modified`` validators per URL in MongoDB.
+
+    Callers send :meth:`conditional_headers` with a request and treat a 304 as
+    "unchanged since the last stored response". Documents are keyed by
+    ``<scope>:<url>``, so the same URL can carry separate validators for
+    contexts whose downstream work differs (for example one per identity for
+    ATS boards). An optional ``payload`` stores whatever was derived from the
+    last full response, for callers that need it back on a 304.
+
+    Validators are either written at once with :meth:`store`, or staged with
+    :meth:`remember` and written by :meth:`commit` only after the response has
+    been fully processed; :meth:`discard` drops staged validators so a failed
+    run is retried with a full request. MongoDB errors are logged and never
+    fail a crawl.
+    """
+
+    def __init__(self, collection, *, scope: str = "") -> None:
+        self._collection = collection
+        self._scope = scope
+        self._entries: dict[str, dict | None] = {}
+        self._pending: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.not_modified_count = 0
+
+    def _key(self, url: str) -> str:
+        return f"{self._scope}:{url}" if self._scope else url
+
+    def _entry(self, url: str) -> dict | None:
+        key = self._key(url)
+        if key not in self._entries:
+            try:
+                self._entries[key] = self._collection.find_one({"_id": key}, {"etag": 1, "last_modified": 1, "payload": 1})
+            except Exception as exc:
+                logger.warning("http validator lookup failed for %s: %s", url, exc)
+                self._entries[key] = None
+        return self._entries[key]
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """Return ``If-None-Match``/``If-Modified-Since`` headers for ``url`` (empty when unknown)."""
+        with self._lock:
+            self.request_count += 1
+        entry = self._entry(url) or {}
+        headers: dict[str, str] = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def payload(self, url: str) -> dict | None:
+        payload = (self._entry(url) or {}).get("payload")
+        return payload if isinstance(payload, dict) else None
+
+    def record_not_modified(self, url: str) -> None:
+        with self._lock:
+            self.not_modified_count += 1
+        try:
+            self._collection.update_one(
+                {"_id": self._key(url)},
+                {"$inc": {"not_modified_count": 1}, "$set": {"checked_at": datetime.now(timezone.utc)}},
+            )
+        except Exception as exc:
+            logger.warning("http validator hit update failed for %s: %s", url, exc)
+
+    def _validator_doc(self, url: str, response: requests.Response, payload: dict | None) -> dict | None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return None
+        now = datetime.now(timezone.utc)
+        doc = {"url": url, "etag": etag, "last_modified": last_modified, "checked_at": now, "modified_at": now}
+        if payload is not None:
+            doc["payload"] = payload
+        return doc
+
+    def remember(self, url: str, response: requests.Response, payload: dict | None = None) -> None:
+        """Stage the validators of a full (200) response until :meth:`commit`."""
+        doc = self._validator_doc(url, response, payload)
+        if doc is not None:
+            with self._lock:
+                self._pending[self._key(url)] = doc
+
+    def store(self, url: str, response: requests.Response, payload: dict | None = None) -> None:
+        """Write the validators of a full (200) response immediately."""
+        doc = self._validator_doc(url, response, payload)
+        if doc is not None:
+            self._write({self._key(url): doc})
+
+    def commit(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        self._write(pending)
+
+    def discard(self) -> None:
+        with self._lock:
+            self._pending = {}
+
+    def _write(self, docs: dict[str, dict]) -> None:
+        for key, doc in docs.items():
+            try:
+                self._collection.update_one({"_id": key}, {"$set": doc, "$setOnInsert": {"not_modified_count": 0}}, upsert=True)
+            except Exception as exc:
+                logger.warning("http validator write failed for %s: %s", doc.get("url"), exc)
+                continue
+            self._entries[key] = doc
+
+    def hit_rate(self) -> float:
+        return self.not_modified_count / self.request_count if self.request_count else 0.0
+
+
+def build_validator_cache(database, config: CrawlerConfig, *, scope: str = "") -> HttpValidatorCache | None:
+    if not config.http_validator_cache_enabled:
+        return None
+    return HttpValidatorCache(database[HTTP_VALIDATORS_COLLECTION], scope=scope)
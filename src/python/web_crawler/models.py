@@ -20,6 +20,8 @@ class WorkflowResult:
     deleted_count: int = 0
     enqueued_count: int = 0
     enqueue_failed_count: int = 0
+    not_modified_count: int = 0
+    deferred_count: int = 0
     ats_providers: dict[str, int] = field(default_factory=dict)
     failed_sources: list[dict[str, str]] = field(default_factory=list)
     failed_companies: list[dict[str, str]] = field(default_factory=list)
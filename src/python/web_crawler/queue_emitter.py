@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+import logging
+from collections import Counter, defaultdict
+
+import redis
+
+from src.python.web_crawler.config import CrawlerConfig
+from src.python.web_crawler.scoring_lanes import NEW_JOB_LANE, SCORING_LANES, lane_queue_name
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMIT_BATCH_SIZE = 500
+
+
+class BatchedQueueEmitter:
+    """Buffer Redis queue payloads and flush them through one pipeline.
+
+    Each flush issues a single ``rpush`` with many values per queue, so a
+    fan-out of N messages costs ceil(N / batch_size) round-trips instead of N.
+    Delivery outcomes are tallied per queue in ``sent_counts`` and
+    ``failed_counts``; a failed flush never raises.
+    """
+
+    def __init__(self, redis_client: redis.Redis, *, batch_size: int = DEFAULT_EMIT_BATCH_SIZE) -> None:
+        self._redis_client = redis_client
+        self._batch_size = max(1, int(batch_size))
+        self._buffers: defaultdict[str, list[str]] = defaultdict(list)
+        self._pending = 0
+        self.sent_counts: Counter[str] = Counter()
+        self.failed_counts: Counter[str] = Counter()
+
+    def __enter__(self) -> "BatchedQueueEmitter":
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self.flush()
+
+    @property
+    def pending_count(self) -> int:
+        return self._pending
+
+    def push(self, queue_name: str, payload: str) -> None:
+        self._buffers[queue_name].append(payload)
+        self._pending += 1
+        if self._pending >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """Send every buffered payload; return how many were delivered."""
+        batches = [(queue_name, payloads) for queue_name, payloads in self._buffers.items() if payloads]
+        self._buffers = defaultdict(list)
+        self._pending = 0
+        if not batches:
+            return 0
+
+        try:
+            pipeline = self._redis_client.pipeline(transaction=False)
+            for queue_name, payloads in batches:
+                pipeline.rpush(queue_name, *payloads)
+            replies = pipeline.execute(raise_on_error=False)
+        except Exception as exc:
+            replies = [exc] * len(batches)
+
+        delivered = 0
+        for (queue_name, payloads), reply in zip(batches, replies):
+            if isinstance(reply, Exception):
+                logger.warning("failed to push %d messages to %s: %s", len(payloads), queue_name, reply)
+                self.failed_counts[queue_name] += len(payloads)
+                continue
+            self.sent_counts[queue_name] += len(payloads)
+            delivered += len(payloads)
+        return delivered
+
+
+def build_emitter(redis_client: redis.Redis, config: CrawlerConfig) -> BatchedQueueEmitter:
+    return BatchedQueueEmitter(redis_client, batch_size=config.redis_emit_batch_size)
+
+
+def enqueue_scoring_job(
+    emitter: BatchedQueueEmitter,
+    config: CrawlerConfig,
+    *,
+    job_id: str,
+    user_id: str,
+    identity_id: str = "",
+    workflow_id: str = "",
+    lane: str = NEW_JOB_LANE,
+) -> bool:
+    """Buffer one job scoring message on ``lane``; return False when it cannot be enqueued."""
+    if not user_id:
+        logger.warning("%s: missing user_id for scoring enqueue job_id=%s", workflow_id or "crawler", job_id)
+        return False
+    message: dict = {"job_id": job_id, "user_id": user_id}
+    if identity_id:
+        message["identity_id"] = identity_id
+    emitter.push(lane_queue_name(config.job_scoring_queue_name, lane), json.dumps(message))
+    return True
+
+
+def scoring_sent_count(emitter: BatchedQueueEmitter, config: CrawlerConfig) -> int:
+    return sum(emitter.sent_counts[lane_queue_name(config.job_scoring_queue_name, lane)] for lane in SCORING_LANES)
+
+
+def scoring_failed_count(emitter: BatchedQueueEmitter, config: CrawlerConfig) -> int:
+    return sum(emitter.failed_counts[lane_queue_name(config.job_scoring_queue_name, lane)] for lane in SCORING_LANES)
@@ -0,0 +1,320 @@
+"""At-least-once consumption of the Redis work queues.
+
+Producers keep ``RPUSH``-ing onto the plain list. A consumer claims a message
+with ``BLMOVE`` into its own processing list ``<queue>:processing:<consumer>``
+instead of popping it, and removes it from there with :meth:`ReliableQueue.ack`
+once the message has been handled, so a worker that dies mid-message no longer
+loses it.
+
+Every consumer holds a lease key ``<queue>:lease:<consumer>`` that a
+background thread refreshes while the process is alive. When a lease expires
+(the visibility timeout), any other consumer of the queue moves the dead
+consumer's processing list back to the head of the queue. A consumer that
+restarts under the same id (``<hostname>:<pid>``, stable across container
+restarts) requeues its own leftovers immediately.
+
+The lease is per process, not per message: it only detects consumers that
+died. A handler that hangs in a live process keeps its message until the
+optional per-message deadline (``message_deadline_seconds``) passes; any
+consumer then requeues it during its periodic reclaim. Without a deadline the
+lease is crash-only.
+
+On its first claim a message gets an id, and its processing-list entry is
+rewritten to ``rq1:<id>|<payload>``. The envelope travels with the message when
+it is requeued, so delivery counts (``<queue>:deliveries``) and claim times
+(``<queue>:claimed_at``) are kept per message, not per payload: identical
+payloads are counted, acked and dead-lettered independently. Handlers only see
+the original payload. A message claimed more than ``max_deliveries`` times is
+moved to ``<queue>:dead`` instead of being handed out again. Handlers must stay
+idempotent, because a reclaimed message may already have been partly processed.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.python.web_crawler.config import CrawlerConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VISIBILITY_TIMEOUT_SECONDS = 60
+DEFAULT_MAX_DELIVERIES = 5
+DEFAULT_CLAIM_TIMEOUT_SECONDS = 5.0
+# Processing-list entries are ``rq1:<message id>|<payload>``; scoring_lanes unwraps the same format.
+ENVELOPE_PREFIX = "rq1:"
+_ENVELOPE_SEPARATOR = "|"
+
+# KEYS: processing list, deliveries hash, claimed-at hash.
+# ARGV: claimed entry, enveloped entry, message id, claim time.
+# Replaces the claimed entry (the tail, unless acks raced it) by its envelope and counts the delivery.
+_STAMP_SCRIPT = """
+if ARGV[1] ~= ARGV[2] then
+  if redis.call('LINDEX', KEYS[1], -1) == ARGV[1] then
+    redis.call('LSET', KEYS[1], -1, ARGV[2])
+  elseif redis.call('LREM', KEYS[1], -1, ARGV[1]) > 0 then
+    redis.call('RPUSH', KEYS[1], ARGV[2])
+  end
+end
+redis.call('HSET', KEYS[3], ARGV[3], ARGV[4])
+return redis.call('HINCRBY', KEYS[2], ARGV[3], 1)
+"""
+
+# KEYS: processing list, queue. ARGV: entry. Requeues the entry only if it is still in flight.
+_REQUEUE_ENTRY_SCRIPT = """
+if redis.call('LREM', KEYS[1], 1, ARGV[1]) == 0 then return 0 end
+redis.call('LPUSH', KEYS[2], ARGV[1])
+return 1
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class ClaimedMessage:
+    payload: str | bytes
+    delivery_count: int
+    message_id: str = ""
+    # The processing-list entry (the enveloped payload); ``None`` means ``payload`` itself.
+    entry: str | bytes | None = None
+
+
+def default_consumer_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _as_str(value: str | bytes) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def _unwrap(entry: str | bytes) -> tuple[str | None, str | bytes]:
+    """``(message id, payload)`` of a queue entry; the id is ``None`` for a message never claimed."""
+    prefix: str | bytes = ENVELOPE_PREFIX
+    separator: str | bytes = _ENVELOPE_SEPARATOR
+    if isinstance(entry, bytes):
+        prefix, separator = prefix.encode("ascii"), separator.encode("ascii")
+    if not entry.startswith(prefix):
+        return None, entry
+    message_id, found, payload = entry[len(prefix):].partition(separator)
+    if not found or not message_id:
+        return None, entry
+    return _as_str(message_id), payload
+
+
+def _envelope(message_id: str, payload: str | bytes) -> str | bytes:
+    header = f"{ENVELOPE_PREFIX}{message_id}{_ENVELOPE_SEPARATOR}"
+    return header.encode("ascii") + payload if isinstance(payload, bytes) else header + payload
+
+
+class _LeaseKeeper:
+    """One daemon thread per process that refreshes every live consumer lease."""
+
+    def __init__(self) -> None:
+        self._leases: dict[str, tuple[object, str, str, int]] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def keep(self, lease_key: str, redis_client, consumers_key: str, consumer_id: str, ttl_seconds: int) -> None:
+        with self._lock:
+            # A reconnecting worker re-registers the same lease with its new client.
+            self._leases[lease_key] = (redis_client, consumers_key, consumer_id, ttl_seconds)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="reliable-queue-leases", daemon=True)
+                self._thread.start()
+
+    def release(self, lease_key: str) -> None:
+        with self._lock:
+            self._leases.pop(lease_key, None)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                leases = dict(self._leases)
+            interval = max(1.0, min((ttl for *_, ttl in leases.values()), default=3) / 3)
+            time.sleep(interval)
+            for lease_key, (redis_client, consumers_key, consumer_id, ttl_seconds) in leases.items():
+                try:
+                    _refresh_lease(redis_client, lease_key, consumers_key, consumer_id, ttl_seconds)
+                except Exception as exc:
+                    logger.warning("reliable queue lease refresh failed for %s: %s", lease_key, exc)
+
+
+_LEASE_KEEPER = _LeaseKeeper()
+
+
+def _refresh_lease(redis_client, lease_key: str, consumers_key: str, consumer_id: str, ttl_seconds: int) -> None:
+    pipeline = redis_client.pipeline(transaction=False)
+    pipeline.set(lease_key, "1", ex=ttl_seconds)
+    # Re-adds a consumer that was presumed dead (e.g. after a long pause) and reclaimed.
+    pipeline.sadd(consumers_key, consumer_id)
+    pipeline.execute()
+
+
+class ReliableQueue:
+    def __init__(
+        self,
+        redis_client,
+        queue_name: str,
+        *,
+        consumer_id: str | None = None,
+        visibility_timeout_seconds: int = DEFAULT_VISIBILITY_TIMEOUT_SECONDS,
+        max_deliveries: int = DEFAULT_MAX_DELIVERIES,
+        claim_timeout_seconds: float = DEFAULT_CLAIM_TIMEOUT_SECONDS,
+        message_deadline_seconds: float | None = None,
+    ) -> None:
+        self._redis = redis_client
+        self.queue_name = queue_name
+        self.consumer_id = consumer_id or default_consumer_id()
+        self.visibility_timeout_seconds = max(1, int(visibility_timeout_seconds))
+        self.max_deliveries = max(1, int(max_deliveries))
+        self.claim_timeout_seconds = claim_timeout_seconds
+        # ``None`` (or 0) keeps a message claimed for as long as its consumer is alive.
+        self.message_deadline_seconds = message_deadline_seconds or None
+        self.processing_key = self._processing_key(self.consumer_id)
+        self.lease_key = f"{queue_name}:lease:{self.consumer_id}"
+        self.consumers_key = f"{queue_name}:consumers"
+        self.deliveries_key = f"{queue_name}:deliveries"
+        self.claimed_at_key = f"{queue_name}:claimed_at"
+        self.dead_letter_key = f"{queue_name}:dead"
+        self._next_reclaim_at = 0.0
+        self._stamp = redis_client.register_script(_STAMP_SCRIPT)
+        self._requeue_entry = redis_client.register_script(_REQUEUE_ENTRY_SCRIPT)
+
+        self._keep_lease()
+        _LEASE_KEEPER.keep(
+            self.lease_key, redis_client, self.consumers_key, self.consumer_id, self.visibility_timeout_seconds
+        )
+        recovered = self._requeue(self.processing_key)
+        if recovered:
+            logger.warning("%s: requeued %d unacknowledged messages of %s", queue_name, recovered, self.consumer_id)
+
+    def _processing_key(self, consumer_id: str) -> str:
+        return f"{self.queue_name}:processing:{consumer_id}"
+
+    def _keep_lease(self) -> None:
+        _refresh_lease(self._redis, self.lease_key, self.consumers_key, self.consumer_id, self.visibility_timeout_seconds)
+
+    def _requeue(self, processing_key: str) -> int:
+        """Move ``processing_key`` back to the head of the queue, keeping the original order."""
+        moved = 0
+        while self._redis.lmove(processing_key, self.queue_name, "RIGHT", "LEFT") is not None:
+            moved += 1
+        return moved
+
+    def maintain(self) -> None:
+        """Refresh the lease and, at most once per visibility timeout, reclaim expired consumers."""
+        if time.monotonic() >= self._next_reclaim_at:
+            self.reclaim_expired()
+            self._next_reclaim_at = time.monotonic() + self.visibility_timeout_seconds
+        self._keep_lease()
+
+    def claim(self, timeout: float | None = None) -> ClaimedMessage | None:
+        """Block up to ``timeout`` seconds for the next message; ``None`` on timeout or dead-lettering."""
+        self.maintain()
+        wait = self.claim_timeout_seconds if timeout is None else timeout
+        payload = self._redis.blmove(self.queue_name, self.processing_key, wait, "LEFT", "RIGHT")
+        if payload is None:
+            return None
+        return self.register_claim(payload)
+
+    def register_claim(self, entry: str | bytes) -> ClaimedMessage | None:
+        """Count a delivery of ``entry``, which the caller already moved into :attr:`processing_key`."""
+        message_id, payload = _unwrap(entry)
+        if message_id is None:
+            message_id = uuid.uuid4().hex
+        stamped = _envelope(message_id, payload)
+        delivery_count = int(
+            self._stamp(
+                keys=[self.processing_key, self.deliveries_key, self.claimed_at_key],
+                args=[entry, stamped, message_id, time.time()],
+            )
+        )
+        message = ClaimedMessage(payload=payload, delivery_count=delivery_count, message_id=message_id, entry=stamped)
+        if delivery_count > self.max_deliveries:
+            self._dead_letter(message)
+            logger.warning(
+                "%s: moved message to %s after %d deliveries", self.queue_name, self.dead_letter_key, delivery_count - 1
+            )
+            return None
+        return message
+
+    def ack(self, message: ClaimedMessage) -> None:
+        entry = message.payload if message.entry is None else message.entry
+        # A message requeued past its deadline is in flight again; its counters belong to the redelivery.
+        if not self._redis.lrem(self.processing_key, 1, entry) or not message.message_id:
+            return
+        pipeline = self._redis.pipeline(transaction=False)
+        pipeline.hdel(self.deliveries_key, message.message_id)
+        pipeline.hdel(self.claimed_at_key, message.message_id)
+        pipeline.execute()
+
+    def _dead_letter(self, message: ClaimedMessage) -> None:
+        pipeline = self._redis.pipeline(transaction=True)
+        pipeline.lrem(self.processing_key, 1, message.entry)
+        pipeline.rpush(self.dead_letter_key, message.payload)
+        pipeline.hdel(self.deliveries_key, message.message_id)
+        pipeline.hdel(self.claimed_at_key, message.message_id)
+        pipeline.execute()
+
+    def reclaim_expired(self) -> int:
+        """Requeue the in-flight messages of expired consumers and, with a deadline, of overdue handlers."""
+        reclaimed = 0
+        live_consumers = [self.consumer_id]
+        for member in self._redis.smembers(self.consumers_key):
+            consumer_id = _as_str(member)
+            if consumer_id == self.consumer_id:
+                continue
+            if self._redis.exists(f"{self.queue_name}:lease:{consumer_id}"):
+                live_consumers.append(consumer_id)
+                continue
+            moved = self._requeue(self._processing_key(consumer_id))
+            self._redis.srem(self.consumers_key, member)
+            if moved:
+                logger.warning("%s: reclaimed %d messages from expired consumer %s", self.queue_name, moved, consumer_id)
+            reclaimed += moved
+        if self.message_deadline_seconds is not None:
+            for consumer_id in live_consumers:
+                reclaimed += self._requeue_overdue(consumer_id)
+        return reclaimed
+
+    def _requeue_overdue(self, consumer_id: str) -> int:
+        """Requeue the messages ``consumer_id`` has held for longer than the message deadline."""
+        processing_key = self._processing_key(consumer_id)
+        entries = [(entry, _unwrap(entry)[0]) for entry in self._redis.lrange(processing_key, 0, -1)]
+        entries = [(entry, message_id) for entry, message_id in entries if message_id is not None]
+        if not entries:
+            return 0
+        claimed_at = self._redis.hmget(self.claimed_at_key, [message_id for _, message_id in entries])
+        cutoff = time.time() - self.message_deadline_seconds
+        moved = 0
+        for (entry, message_id), claimed in zip(entries, claimed_at):
+            if claimed is not None and float(claimed) < cutoff:
+                moved += int(self._requeue_entry(keys=[processing_key, self.queue_name], args=[entry]))
+        if moved:
+            logger.warning(
+                "%s: requeued %d messages held by %s past the %ss message deadline",
+                self.queue_name,
+                moved,
+                consumer_id,
+                self.message_deadline_seconds,
+            )
+        return moved
+
+    def close(self) -> None:
+        """Stop refreshing the lease; unacknowledged messages are reclaimed once it expires."""
+        _LEASE_KEEPER.release(self.lease_key)
+
+
+def build_work_queue(redis_client, config: CrawlerConfig, queue_name: str) -> ReliableQueue:
+    return ReliableQueue(
+        redis_client,
+        queue_name,
+        visibility_timeout_seconds=config.queue_visibility_timeout_seconds,
+        max_deliveries=config.queue_max_deliveries,
+        message_deadline_seconds=config.queue_message_deadline_seconds,
+    )
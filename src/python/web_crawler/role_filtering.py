@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import re
 
 from bson import ObjectId
 from bson.errors import InvalidId
@@ -39,15 +40,97 @@ def load_identity_roles(
     return roles
 
 
-def text_matches_roles(title: str, description: str, roles: list[str]) -> bool:
-    """Return True when any role keyword appears in title or description."""
-    if not roles:
+_WORD_RE = re.compile(r"[^\W_]+")
+# Words too generic to make a title worth a closer look on their own.
+_GENERIC_ROLE_WORDS = frozenset(
+    {"a", "an", "and", "at", "for", "in", "of", "or", "the", "to", "with",
+     "senior", "sr", "junior", "jr", "lead", "staff", "principal", "head", "associate", "ii", "iii"}
+)
+
+
+def _role_words(folded_role: str) -> set[str]:
+    words = set(_WORD_RE.findall(folded_role))
+    return (words - _GENERIC_ROLE_WORDS) or words
+
+
+class RoleMatcher:
+    """Case-insensitive role keyword matcher compiled once per identity.
+
+    Roles are trimmed, de-duplicated, and casefolded up front. For yes/no
+    matching, roles that contain another role are dropped (``"engineer"``
+    makes ``"software engineer"`` redundant), and each text is casefolded
+    lazily, so a title hit never touches the description.
+
+    Substring search on casefolded text is kept deliberately: CPython's ``in``
+    runs in C and beats both a combined alternation regex and a pure-Python
+    Aho-Corasick automaton for the handful of roles an identity carries (see
+    ``benchmark_role_matching``).
+    """
+
+    __slots__ = ("roles", "_folded_roles", "_needles", "_words")
+
+    def __init__(self, roles: list[str] | tuple[str, ...]) -> None:
+        unique: dict[str, str] = {}
+        for role in roles:
+            stripped = role.strip() if isinstance(role, str) else ""
+            if stripped and stripped.casefold() not in unique:
+                unique[stripped.casefold()] = stripped
+        self.roles: tuple[str, ...] = tuple(unique.values())
+        self._folded_roles: tuple[str, ...] = tuple(unique)
+        self._needles: tuple[str, ...] = tuple(
+            folded for folded in self._folded_roles if not any(other != folded and other in folded for other in self._folded_roles)
+        )
+        self._words: frozenset[str] = frozenset(word for folded in self._folded_roles for word in _role_words(folded))
+
+    def matches(self, *texts: str) -> bool:
+        """Return True when any role appears in any of ``texts``."""
+        if not self._needles:
+            return False
+        for text in texts:
+            if not text:
+                continue
+            folded = text.casefold()
+            for needle in self._needles:
+                if needle in folded:
+                    return True
         return False
 
-    title_lower = (title or "").lower()
-    description_lower = (description or "").lower()
-    for role in roles:
-        role_lower = role.lower()
-        if role_lower in title_lower or role_lower in description_lower:
-            return True
-    return False
+    def shares_word(self, text: str) -> bool:
+        """Return True when ``text`` contains a non-generic word of any role.
+
+        Used to decide whether a posting whose title does not match is still
+        worth fetching a description for (``"Sales Engineer"`` for a
+        ``"Software Engineer"`` identity), while clearly unrelated titles are
+        rejected without one.
+        """
+        if not text or not self._words:
+            return False
+        return not self._words.isdisjoint(_WORD_RE.findall(text.casefold()))
+
+    def matched_roles(self, *texts: str) -> list[str]:
+        """Return the roles (original spelling, identity order) found in any of ``texts``."""
+        folded_texts = [text.casefold() for text in texts if text]
+        if not folded_texts:
+            return []
+        return [
+            role
+            for role, folded_role in zip(self.roles, self._folded_roles)
+            if any(folded_role in folded for folded in folded_texts)
+        ]
+
+    def first_match(self, *texts: str) -> str:
+        """Return the first role in identity order found in any of ``texts``, or ``""``."""
+        folded_texts = [text.casefold() for text in texts if text]
+        for role, folded_role in zip(self.roles, self._folded_roles):
+            if any(folded_role in folded for folded in folded_texts):
+                return role
+        return ""
+
+
+def text_matches_roles(title: str, description: str, roles: list[str] | RoleMatcher) -> bool:
+    """Return True when any role keyword appears in title or description.
+
+    Callers filtering many jobs should pass a prebuilt :class:`RoleMatcher`.
+    """
+    matcher = roles if isinstance(roles, RoleMatcher) else RoleMatcher(roles)
+    return matcher.matches(title, description)
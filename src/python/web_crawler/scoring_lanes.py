@@ -0,0 +1,169 @@
+"""Priority lanes for the job scoring queue.
+
+Producers push scoring messages onto one inbox list per lane:
+
+- ``interactive`` (``<queue>:interactive``): rescoring a user asked for from the
+  UI, e.g. a "score" click or a preference edit;
+- ``new_job`` (``<queue>`` itself): jobs a crawl inserted. Producers that do not
+  know about lanes, and messages requeued by :class:`ReliableQueue` recovery,
+  land here as well;
+- ``bulk_rescore`` (``<queue>:bulk_rescore``): jobs a re-crawl updated and
+  backlog re-enqueues.
+
+The consumer routes each inbox into one list per ``user_id`` and claims from
+the users of a lane round-robin, so one user's bulk enqueue cannot starve
+another user. Lanes are served by smooth weighted round-robin, skipping lanes
+without pending work. Routing and claiming are Lua scripts, so a message is
+always in exactly one Redis list; claimed messages go to the reliable queue's
+processing list like any other claim.
+
+The scripts build per-user keys from a prefix, so all lane keys of one queue
+must live on the same Redis node.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from src.python.web_crawler.reliable_queue import ClaimedMessage, ReliableQueue
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE_LANE = "interactive"
+NEW_JOB_LANE = "new_job"
+BULK_RESCORE_LANE = "bulk_rescore"
+SCORING_LANES = (INTERACTIVE_LANE, NEW_JOB_LANE, BULK_RESCORE_LANE)
+DEFAULT_LANE_WEIGHTS = {INTERACTIVE_LANE: 8, NEW_JOB_LANE: 3, BULK_RESCORE_LANE: 1}
+
+# KEYS: inbox, ready ring, routed counter. ARGV: per-user key prefix, max messages.
+_ROUTE_SCRIPT = """
+local moved = 0
+for _ = 1, tonumber(ARGV[2]) do
+  local payload = redis.call('LPOP', KEYS[1])
+  if not payload then break end
+  -- Requeued messages carry the reliable queue envelope ``rq1:<id>|``; route on the payload behind it.
+  local ok, message = pcall(cjson.decode, string.match(payload, '^rq1:%x+|(.*)$') or payload)
+  local user = ''
+  if ok and type(message) == 'table' and type(message.user_id) == 'string' then user = message.user_id end
+  if redis.call('RPUSH', ARGV[1] .. user, payload) == 1 then redis.call('RPUSH', KEYS[2], user) end
+  moved = moved + 1
+end
+if moved > 0 then redis.call('INCRBY', KEYS[3], moved) end
+return moved
+"""
+
+# KEYS: ready ring, processing list, routed counter. ARGV: per-user key prefix.
+_CLAIM_SCRIPT = """
+local user = redis.call('LPOP', KEYS[1])
+if not user then return false end
+local key = ARGV[1] .. user
+local payload = redis.call('LMOVE', key, KEYS[2], 'LEFT', 'RIGHT')
+if redis.call('LLEN', key) > 0 then redis.call('RPUSH', KEYS[1], user) end
+if payload then redis.call('DECR', KEYS[3]) end
+return payload
+"""
+
+
+def lane_queue_name(queue_name: str, lane: str) -> str:
+    """The inbox list producers push ``lane`` messages onto."""
+    if lane not in SCORING_LANES:
+        raise ValueError(f"unknown scoring lane: {lane}")
+    return queue_name if lane == NEW_JOB_LANE else f"{queue_name}:{lane}"
+
+
+def _lane_key(queue_name: str, lane: str, suffix: str) -> str:
+    return f"{queue_name}:lane:{lane}:{suffix}"
+
+
+def parse_lane_weights(value: str | None) -> dict[str, int]:
+    """Parse ``"interactive=8,new_job=3,bulk_rescore=1"``; missing or invalid entries keep their default."""
+    weights = dict(DEFAULT_LANE_WEIGHTS)
+    for entry in (value or "").split(","):
+        lane, _, raw_weight = entry.partition("=")
+        lane = lane.strip()
+        if lane not in weights:
+            continue
+        try:
+            weights[lane] = max(1, int(raw_weight))
+        except ValueError:
+            continue
+    return weights
+
+
+def lane_depths(redis_client, queue_name: str) -> dict[str, int]:
+    """Pending messages per lane: the lane inbox plus messages already routed to per-user lists."""
+    pipeline = redis_client.pipeline(transaction=False)
+    for lane in SCORING_LANES:
+        pipeline.llen(lane_queue_name(queue_name, lane))
+        pipeline.get(_lane_key(queue_name, lane, "routed"))
+    replies = pipeline.execute()
+    return {
+        lane: int(replies[2 * index] or 0) + int(replies[2 * index + 1] or 0)
+        for index, lane in enumerate(SCORING_LANES)
+    }
+
+
+class WeightedLaneScheduler:
+    """Smooth weighted round-robin over lanes; a lane found empty stops accumulating credit."""
+
+    def __init__(self, weights: dict[str, int]) -> None:
+        self._weights = {lane: max(1, int(weights.get(lane, 1))) for lane in SCORING_LANES}
+        self._total = sum(self._weights.values())
+        self._credit = {lane: 0 for lane in SCORING_LANES}
+
+    def order(self) -> list[str]:
+        """Lanes to try for the next claim, best first."""
+        for lane, weight in self._weights.items():
+            self._credit[lane] += weight
+        return sorted(SCORING_LANES, key=lambda lane: -self._credit[lane])
+
+    def served(self, lane: str) -> None:
+        self._credit[lane] -= self._total
+
+    def empty(self, lane: str) -> None:
+        self._credit[lane] = min(self._credit[lane], 0)
+
+
+class ScoringLaneConsumer:
+    def __init__(
+        self,
+        redis_client,
+        work_queue: ReliableQueue,
+        *,
+        weights: dict[str, int] | None = None,
+        idle_wait_seconds: float = 0.5,
+        route_batch_size: int = 500,
+    ) -> None:
+        self._queue = work_queue
+        self._scheduler = WeightedLaneScheduler(weights or DEFAULT_LANE_WEIGHTS)
+        self._idle_wait_seconds = idle_wait_seconds
+        self._route_batch_size = max(1, route_batch_size)
+        self._route = redis_client.register_script(_ROUTE_SCRIPT)
+        self._claim = redis_client.register_script(_CLAIM_SCRIPT)
+        queue_name = work_queue.queue_name
+        self._lanes = {
+            lane: (
+                lane_queue_name(queue_name, lane),
+                _lane_key(queue_name, lane, "ready"),
+                _lane_key(queue_name, lane, "routed"),
+                _lane_key(queue_name, lane, "user:"),
+            )
+            for lane in SCORING_LANES
+        }
+
+    def claim(self) -> tuple[str, ClaimedMessage] | None:
+        """Claim the next message as ``(lane, message)``; waits briefly and returns ``None`` when every lane is empty."""
+        self._queue.maintain()
+        for lane in self._scheduler.order():
+            inbox, ready, routed, user_prefix = self._lanes[lane]
+            self._route(keys=[inbox, ready, routed], args=[user_prefix, self._route_batch_size])
+            payload = self._claim(keys=[ready, self._queue.processing_key, routed], args=[user_prefix])
+            if payload is None:
+                self._scheduler.empty(lane)
+                continue
+            self._scheduler.served(lane)
+            message = self._queue.register_claim(payload)
+            return (lane, message) if message is not None else None
+        time.sleep(self._idle_wait_seconds)
+        return None
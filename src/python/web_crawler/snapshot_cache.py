@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+import uuid
+from typing import Callable
+
+import redis
+
+from src.python.web_crawler.config import CrawlerConfig
+
+logger = logging.getLogger(__name__)
+
+_POLL_INTERVAL_SECONDS = 0.5
+
+
+class SourceSnapshotCache:
+    """Share one fetch of an identity-independent source across concurrent crawls.
+
+    A snapshot is a JSON list of normalized records stored under
+    ``<prefix>:<source>`` with a TTL. Fetches are single-flight: the first
+    caller takes ``<prefix>:<source>:lock`` (SET NX EX) and fetches, other
+    callers poll for the snapshot until the lock is released or
+    ``wait_seconds`` elapse, then fetch on their own. Redis errors never fail
+    a crawl; they fall back to a direct fetch.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        *,
+        ttl_seconds: int,
+        lock_ttl_seconds: int,
+        wait_seconds: int,
+        key_prefix: str,
+    ) -> None:
+        self._redis_client = redis_client
+        self._ttl_seconds = ttl_seconds
+        self._lock_ttl_seconds = max(1, lock_ttl_seconds)
+        self._wait_seconds = max(0, wait_seconds)
+        self._key_prefix = key_prefix
+
+    def snapshot_key(self, source: str) -> str:
+        return f"{self._key_prefix}:{source}"
+
+    def _read(self, key: str) -> list | None:
+        try:
+            raw = self._redis_client.get(key)
+        except Exception as exc:
+            logger.warning("source snapshot read failed for %s: %s", key, exc)
+            return None
+        if raw is None:
+            return None
+        try:
+            value = json.loads(raw)
+        except (TypeError, ValueError):
+            logger.warning("discarding malformed source snapshot %s", key)
+            return None
+        return value if isinstance(value, list) else None
+
+    def _write(self, key: str, records: list) -> None:
+        try:
+            self._redis_client.set(key, json.dumps(records), ex=self._ttl_seconds)
+        except Exception as exc:
+            logger.warning("source snapshot write failed for %s: %s", key, exc)
+
+    def _acquire(self, lock_key: str, token: str) -> bool | None:
+        """Return whether the lock was taken, or None when Redis is unusable."""
+        try:
+            return bool(self._redis_client.set(lock_key, token, nx=True, ex=self._lock_ttl_seconds))
+        except Exception as exc:
+            logger.warning("source snapshot lock failed for %s: %s", lock_key, exc)
+            return None
+
+    def _release(self, lock_key: str, token: str) -> None:
+        try:
+            current = self._redis_client.get(lock_key)
+            if isinstance(current, bytes):
+                current = current.decode("utf-8")
+            if current == token:
+                self._redis_client.delete(lock_key)
+        except Exception as exc:
+            logger.warning("source snapshot unlock failed for %s: %s", lock_key, exc)
+
+    def _lock_held(self, lock_key: str) -> bool:
+        try:
+            return bool(self._redis_client.exists(lock_key))
+        except Exception:
+            return False
+
+    def _wait_for_snapshot(self, key: str, lock_key: str) -> list | None:
+        deadline = time.monotonic() + self._wait_seconds
+        while time.monotonic() < deadline:
+            time.sleep(_POLL_INTERVAL_SECONDS)
+            records = self._read(key)
+            if records is not None:
+                return records
+            if not self._lock_held(lock_key):
+                # The fetching worker finished without storing (or died); stop waiting.
+                return self._read(key)
+        return None
+
+    def get_or_fetch(self, source: str, fetch: Callable[[], list[dict]]) -> list[dict]:
+        """Return the cached snapshot for ``source``, fetching it at most once per TTL."""
+        if self._ttl_seconds <= 0:
+            return fetch()
+
+        key = self.snapshot_key(source)
+        records = self._read(key)
+        if records is not None:
+            logger.debug("source snapshot hit for %s (%d records)", source, len(records))
+            return records
+
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        acquired = self._acquire(lock_key, token)
+        if acquired is None:
+            return fetch()
+        if not acquired:
+            records = self._wait_for_snapshot(key, lock_key)
+            if records is not None:
+                logger.debug("source snapshot for %s filled by another worker (%d records)", source, len(records))
+                return records
+            logger.debug("source snapshot for %s not available after waiting; fetching directly", source)
+            return fetch()
+
+        try:
+            records = fetch()
+            self._write(key, records)
+            return records
+        finally:
+            self._release(lock_key, token)
+
+
+def build_snapshot_cache(redis_client: redis.Redis | None, config: CrawlerConfig) -> SourceSnapshotCache | None:
+    if redis_client is None or config.source_snapshot_ttl_seconds <= 0:
+        return None
+    return SourceSnapshotCache(
+        redis_client,
+        ttl_seconds=config.source_snapshot_ttl_seconds,
+        lock_ttl_seconds=config.source_snapshot_lock_ttl_seconds,
+        wait_seconds=config.source_snapshot_wait_seconds,
+        key_prefix=config.source_snapshot_key_prefix,
+    )
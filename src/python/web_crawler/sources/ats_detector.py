@@ -11,6 +11,7 @@ from bs4 import BeautifulSoup
 from urllib3.exceptions import NameResolutionError
 
 from src.python.web_crawler.config import CrawlerConfig
+from src.python.web_crawler.http_validator_cache import HttpValidatorCache
 
 logger = logging.getLogger(__name__)
 
@@ -125,12 +126,18 @@ def extract_ats_signatures_from_html(html: str) -> set[str]:
     return providers
 
 
-def fetch_url(session: requests.Session, url: str, config: CrawlerConfig) -> requests.Response | None:
+def fetch_url(
+    session: requests.Session,
+    url: str,
+    config: CrawlerConfig,
+    headers: dict[str, str] | None = None,
+) -> requests.Response | None:
     last_error: Exception | None = None
     last_status_code: int | None = None
+    request_kwargs = {"headers": headers} if headers else {}
     for attempt in range(1, max(config.max_retries, 1) + 1):
         try:
-            response = session.get(url, timeout=config.http_timeout_seconds, allow_redirects=True)
+            response = session.get(url, timeout=config.http_timeout_seconds, allow_redirects=True, **request_kwargs)
         except requests.RequestException as exc:
             last_error = exc
             logger.debug("request attempt %d failed for %s: %s", attempt, url, exc)
@@ -166,7 +173,51 @@ def fetch_url(session: requests.Session, url: str, config: CrawlerConfig) -> req
     return None
 
 
-def detect_ats_provider(candidate_urls: list[str], config: CrawlerConfig, session: requests.Session | None = None) -> ATSDetectionResult | None:
+def _page_evidence(response: requests.Response) -> dict:
+    """ATS evidence found on one fetched page: final URL, ATS links and HTML signatures."""
+    evidence: dict = {"final_url": response.url, "links": [], "signatures": []}
+    if _provider_from_url(response.url):
+        return evidence
+
+    soup = BeautifulSoup(response.text, "html.parser")
+    for anchor in soup.find_all("a", href=True):
+        href = urljoin(response.url, anchor["href"])
+        provider = _provider_from_url(href)
+        if provider:
+            evidence["links"].append([provider, href])
+    evidence["signatures"] = sorted(extract_ats_signatures_from_html(response.text))
+    return evidence
+
+
+def _fetch_page_evidence(
+    session: requests.Session,
+    url: str,
+    config: CrawlerConfig,
+    validator_cache: HttpValidatorCache | None,
+) -> dict | None:
+    """Fetch and analyse ``url``, reusing the stored evidence when the page is unchanged (HTTP 304)."""
+    cached = validator_cache.payload(url) if validator_cache is not None else None
+    headers = validator_cache.conditional_headers(url) if cached is not None else None
+    response = fetch_url(session, url, config, headers=headers)
+    if response is None:
+        return None
+    if response.status_code == 304 and cached is not None:
+        validator_cache.record_not_modified(url)
+        logger.debug("career page %s unchanged; reusing stored ATS evidence", url)
+        return cached
+
+    evidence = _page_evidence(response)
+    if validator_cache is not None:
+        validator_cache.store(url, response, payload=evidence)
+    return evidence
+
+
+def detect_ats_provider(
+    candidate_urls: list[str],
+    config: CrawlerConfig,
+    session: requests.Session | None = None,
+    validator_cache: HttpValidatorCache | None = None,
+) -> ATSDetectionResult | None:
     if not candidate_urls:
         return None
 
@@ -191,7 +242,7 @@ def detect_ats_provider(candidate_urls: list[str], config: CrawlerConfig, sessio
                 return ATSDetectionResult(provider=direct_provider, board_url=candidate_url, checked_url=candidate_url)
 
             try:
-                response = fetch_url(session, candidate_url, config)
+                evidence = _fetch_page_evidence(session, candidate_url, config, validator_cache)
             except ATSRequestFailure as exc:
                 if exc.failure_type in {"dns_resolution", "timeout", "host_unreachable"}:
                     skipped_hosts.add(host)
@@ -203,21 +254,15 @@ def detect_ats_provider(candidate_urls: list[str], config: CrawlerConfig, sessio
                     continue
                 raise
 
-            if response is None:
+            if evidence is None:
                 continue
 
-            response_provider = _provider_from_url(response.url)
+            response_provider = _provider_from_url(evidence["final_url"])
             if response_provider:
-                return ATSDetectionResult(provider=response_provider, board_url=response.url, checked_url=candidate_url)
-
-            soup = BeautifulSoup(response.text, "html.parser")
-            for anchor in soup.find_all("a", href=True):
-                href = urljoin(response.url, anchor["href"])
-                provider = _provider_from_url(href)
-                if provider:
-                    detected_links.append((provider, href))
+                return ATSDetectionResult(provider=response_provider, board_url=evidence["final_url"], checked_url=candidate_url)
 
-            detected_signatures.update(extract_ats_signatures_from_html(response.text))
+            detected_links.extend((provider, href) for provider, href in evidence["links"])
+            detected_signatures.update(evidence["signatures"])
 
         if detected_links:
             detected_links.sort(key=lambda item: _PROVIDER_PRECEDENCE.get(item[0], len(_PROVIDER_PRECEDENCE)))
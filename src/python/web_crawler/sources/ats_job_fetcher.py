@@ -7,33 +7,134 @@ from bs4 import BeautifulSoup
 
 from src.python.ai_querier import common_pb2
 from src.python.web_crawler.config import CrawlerConfig
+from src.python.web_crawler.http_validator_cache import HttpValidatorCache
+from src.python.web_crawler.role_filtering import RoleMatcher
 from src.python.web_crawler.sources.ats_slug_resolver import _request_with_retries
 
 logger = logging.getLogger(__name__)
 
+# Returned by _get_json when a conditional request is answered with 304.
+_NOT_MODIFIED = object()
+
+
+class AtsFetchError(RuntimeError):
+    """A board could not be fetched; distinct from a board with no postings."""
+
 
 def _html_to_text(html: str) -> str:
     return BeautifulSoup(html, "html.parser").get_text(separator="\n").strip()
 
 
-def _fetch_greenhouse_jobs(slug: str, config: CrawlerConfig, session: requests.Session) -> list[common_pb2.Job]:
-    url = f"https://boards-api.greenhouse.io/v1/boards/{slug}/jobs?content=true"
-    response = _request_with_retries(session, "GET", url, config)
+def _needs_description(title: str, role_matcher: RoleMatcher | None) -> bool:
+    """Return whether a posting's description must be fetched and parsed.
+
+    Without a matcher every posting needs one. With a matcher, postings whose
+    title matches a role or shares a role word are candidates; the rest are
+    returned with an empty description and rejected by role filtering.
+    """
+    return role_matcher is None or role_matcher.matches(title) or role_matcher.shares_word(title)
+
+
+def _get_json(
+    session: requests.Session,
+    url: str,
+    config: CrawlerConfig,
+    provider: str,
+    slug: str,
+    validator_cache: HttpValidatorCache | None = None,
+):
+    headers = validator_cache.conditional_headers(url) if validator_cache is not None else {}
+    response = _request_with_retries(session, "GET", url, config, headers=headers)
+    if response is not None and response.status_code == 304 and validator_cache is not None:
+        validator_cache.record_not_modified(url)
+        logger.debug("%s: board unchanged for slug=%s", provider, slug)
+        return _NOT_MODIFIED
     if response is None or response.status_code >= 400:
-        logger.warning("greenhouse: failed to fetch jobs for slug=%s status=%s", slug, response.status_code if response else "no response")
-        return []
+        logger.warning("%s: failed to fetch jobs for slug=%s status=%s", provider, slug, response.status_code if response else "no response")
+        return None
 
     try:
         body = response.json()
     except ValueError:
-        logger.warning("greenhouse: invalid JSON for slug=%s", slug)
-        return []
+        logger.warning("%s: invalid JSON for slug=%s", provider, slug)
+        return None
+    if validator_cache is not None:
+        validator_cache.remember(url, response)
+    return body
+
+
+def _greenhouse_candidate_contents(
+    items: list[dict],
+    board_url: str,
+    slug: str,
+    config: CrawlerConfig,
+    session: requests.Session,
+    role_matcher: RoleMatcher,
+) -> dict[str, str] | None:
+    """Fetch ``content`` for candidate postings of a board listed without content.
+
+    Small candidate sets are fetched one posting at a time; larger sets, or a
+    failed detail request, fall back to one ``?content=true`` board request.
+    Returns ``None`` when the board cannot be fetched at all.
+    """
+    candidate_ids = [
+        str(item.get("id") or "").strip()
+        for item in items
+        if str(item.get("id") or "").strip() and _needs_description(str(item.get("title") or "").strip(), role_matcher)
+    ]
+    if not candidate_ids:
+        return {}
+
+    if len(candidate_ids) <= config.ats_detail_fetch_limit:
+        contents: dict[str, str] = {}
+        for job_id in candidate_ids:
+            detail = _get_json(session, f"{board_url}/{job_id}", config, "greenhouse", slug)
+            if not isinstance(detail, dict):
+                break
+            contents[job_id] = str(detail.get("content") or "")
+        else:
+            return contents
+        logger.debug("greenhouse: detail fetch failed for slug=%s; falling back to full board content", slug)
+
+    body = _get_json(session, f"{board_url}?content=true", config, "greenhouse", slug)
+    if not isinstance(body, dict):
+        return None
+    wanted = set(candidate_ids)
+    return {
+        str(item.get("id")): str(item.get("content") or "")
+        for item in body.get("jobs") or []
+        if str(item.get("id") or "").strip() in wanted
+    }
+
+
+def _fetch_greenhouse_jobs(
+    slug: str,
+    config: CrawlerConfig,
+    session: requests.Session,
+    role_matcher: RoleMatcher | None = None,
+    validator_cache: HttpValidatorCache | None = None,
+) -> list[common_pb2.Job] | None:
+    board_url = f"https://boards-api.greenhouse.io/v1/boards/{slug}/jobs"
+    prefilter = role_matcher is not None and config.ats_title_prefilter
+    listing_url = board_url if prefilter else f"{board_url}?content=true"
+    body = _get_json(session, listing_url, config, "greenhouse", slug, validator_cache)
+    if body is _NOT_MODIFIED:
+        return None
+    if not isinstance(body, dict):
+        raise AtsFetchError(f"greenhouse: could not fetch board for slug={slug}")
+
+    items = body.get("jobs") or []
+    contents: dict[str, str] | None = None
+    if prefilter:
+        contents = _greenhouse_candidate_contents(items, board_url, slug, config, session, role_matcher)
+        if contents is None:
+            raise AtsFetchError(f"greenhouse: could not fetch descriptions for slug={slug}")
 
     jobs: list[common_pb2.Job] = []
-    for item in body.get("jobs") or []:
+    for item in items:
         external_id = str(item.get("id") or "").strip()
         title = str(item.get("title") or "").strip()
-        raw_content = str(item.get("content") or "").strip()
+        raw_content = (contents.get(external_id, "") if contents is not None else str(item.get("content") or "")).strip()
         description = _html_to_text(raw_content) if raw_content else ""
         location_obj = item.get("location") or {}
         location = str(location_obj.get("name") or "").strip() if isinstance(location_obj, dict) else ""
@@ -53,27 +154,33 @@ def _fetch_greenhouse_jobs(slug: str, config: CrawlerConfig, session: requests.S
             )
         )
 
-    logger.debug("greenhouse: fetched %d jobs for slug=%s", len(jobs), slug)
+    logger.debug(
+        "greenhouse: fetched %d jobs for slug=%s (%s descriptions)",
+        len(jobs),
+        slug,
+        len(contents) if contents is not None else "all",
+    )
     return jobs
 
 
-def _fetch_lever_jobs(slug: str, config: CrawlerConfig, session: requests.Session) -> list[common_pb2.Job]:
-    url = f"https://api.lever.co/v0/postings/{slug}"
-    response = _request_with_retries(session, "GET", url, config)
-    if response is None or response.status_code >= 400:
-        logger.warning("lever: failed to fetch jobs for slug=%s status=%s", slug, response.status_code if response else "no response")
-        return []
-
-    try:
-        items = response.json()
-    except ValueError:
-        logger.warning("lever: invalid JSON for slug=%s", slug)
-        return []
+def _fetch_lever_jobs(
+    slug: str,
+    config: CrawlerConfig,
+    session: requests.Session,
+    role_matcher: RoleMatcher | None = None,
+    validator_cache: HttpValidatorCache | None = None,
+) -> list[common_pb2.Job] | None:
+    # Lever has no content-free listing; the prefilter only skips parsing section HTML.
+    items = _get_json(session, f"https://api.lever.co/v0/postings/{slug}", config, "lever", slug, validator_cache)
+    if items is _NOT_MODIFIED:
+        return None
+    if items is None:
+        raise AtsFetchError(f"lever: could not fetch board for slug={slug}")
 
     if not isinstance(items, list):
-        logger.warning("lever: unexpected response shape for slug=%s", slug)
-        return []
+        raise AtsFetchError(f"lever: unexpected response shape for slug={slug}")
 
+    matcher = role_matcher if config.ats_title_prefilter else None
     jobs: list[common_pb2.Job] = []
     for item in items:
         external_id = str(item.get("id") or "").strip()
@@ -84,7 +191,8 @@ def _fetch_lever_jobs(slug: str, config: CrawlerConfig, session: requests.Sessio
 
         # Build description by concatenating named section texts
         description_parts: list[str] = []
-        for section in item.get("lists") or []:
+        sections = (item.get("lists") or []) if _needs_description(title, matcher) else []
+        for section in sections:
             section_text = str(section.get("text") or "").strip()
             section_content = str(section.get("content") or "").strip()
             if section_text:
@@ -111,24 +219,30 @@ def _fetch_lever_jobs(slug: str, config: CrawlerConfig, session: requests.Sessio
     return jobs
 
 
-def _fetch_ashby_jobs(slug: str, config: CrawlerConfig, session: requests.Session) -> list[common_pb2.Job]:
-    url = f"https://api.ashbyhq.com/posting-api/job-board/{slug}"
-    response = _request_with_retries(session, "GET", url, config)
-    if response is None or response.status_code >= 400:
-        logger.warning("ashby: failed to fetch jobs for slug=%s status=%s", slug, response.status_code if response else "no response")
-        return []
-
-    try:
-        body = response.json()
-    except ValueError:
-        logger.warning("ashby: invalid JSON for slug=%s", slug)
-        return []
-
+def _fetch_ashby_jobs(
+    slug: str,
+    config: CrawlerConfig,
+    session: requests.Session,
+    role_matcher: RoleMatcher | None = None,
+    validator_cache: HttpValidatorCache | None = None,
+) -> list[common_pb2.Job] | None:
+    # The posting API always embeds descriptions; the prefilter only skips parsing them.
+    body = _get_json(session, f"https://api.ashbyhq.com/posting-api/job-board/{slug}", config, "ashby", slug, validator_cache)
+    if body is _NOT_MODIFIED:
+        return None
+    if not isinstance(body, dict):
+        raise AtsFetchError(f"ashby: could not fetch board for slug={slug}")
+
+    matcher = role_matcher if config.ats_title_prefilter else None
     jobs: list[common_pb2.Job] = []
     for item in (body.get("jobPostings") or []):
         external_id = str(item.get("id") or "").strip()
         title = str(item.get("title") or "").strip()
-        raw_description = str(item.get("descriptionHtml") or item.get("description") or "").strip()
+        raw_description = (
+            str(item.get("descriptionHtml") or item.get("description") or "").strip()
+            if _needs_description(title, matcher)
+            else ""
+        )
         description = _html_to_text(raw_description) if raw_description else ""
         location = str(item.get("location") or "").strip()
         source_url = str(item.get("jobUrl") or item.get("applyUrl") or "").strip()
@@ -158,13 +272,41 @@ _FETCHERS = {
 }
 
 
-def fetch_jobs(provider: str, slug: str, config: CrawlerConfig, session: requests.Session) -> list[common_pb2.Job]:
+def fetch_jobs(
+    provider: str,
+    slug: str,
+    config: CrawlerConfig,
+    session: requests.Session,
+    role_matcher: RoleMatcher | None = None,
+    validator_cache: HttpValidatorCache | None = None,
+) -> list[common_pb2.Job] | None:
+    """Fetch a board's postings, normalized to ``common_pb2.Job``.
+
+    When ``role_matcher`` is given (and ``config.ats_title_prefilter`` is on),
+    descriptions are only fetched and parsed for postings whose title could
+    match the identity roles; the others come back with an empty description.
+
+    When ``validator_cache`` is given, the board request is conditional and
+    ``None`` is returned if the board is unchanged (HTTP 304). Validators of a
+    changed board are staged on the cache; the caller commits them once the
+    jobs have been processed.
+
+    Raises ``AtsFetchError`` when the board cannot be fetched (HTTP error, bad
+    JSON, unexpected shape, or any other error), so callers can tell a failed
+    fetch from a board with no postings. Staged validators are discarded first.
+    """
     fetcher = _FETCHERS.get(provider)
     if fetcher is None:
         logger.warning("fetch_jobs: unknown provider %r", provider)
         return []
     try:
-        return fetcher(slug, config, session)
+        return fetcher(slug, config, session, role_matcher, validator_cache)
+    except AtsFetchError:
+        if validator_cache is not None:
+            validator_cache.discard()
+        raise
     except Exception as exc:
+        if validator_cache is not None:
+            validator_cache.discard()
         logger.exception("fetch_jobs: unhandled error for provider=%s slug=%s: %s", provider, slug, exc)
-        return []
+        raise AtsFetchError(f"{provider}: unhandled error for slug={slug}: {exc}") from exc
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
 import logging
+import math
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from urllib.parse import urlparse
 
 import requests
 from bs4 import BeautifulSoup
 
 from src.python.web_crawler.config import CrawlerConfig
+from src.python.web_crawler.executor import ThreadSafeSessionPool
 from src.python.web_crawler.models import DiscoveredCompany
+from src.python.web_crawler.role_filtering import RoleMatcher
 from src.python.web_crawler.sources.base import SourceAdapter
 
 logger = logging.getLogger(__name__)
@@ -39,6 +44,36 @@ _STOP_COMPANY_TOKENS = {
 }
 
 
+@dataclass(slots=True)
+class HackerNewsThreadWatermark:
+    """Newest comment already processed for one "Who is hiring" thread."""
+
+    created_at_i: int = 0
+    object_id: int = 0
+
+    def is_newer(self, comment: dict) -> bool:
+        return _comment_object_id(comment) > self.object_id
+
+    def advance(self, comments: list[dict]) -> None:
+        for comment in comments:
+            self.created_at_i = max(self.created_at_i, _comment_created_at(comment))
+            self.object_id = max(self.object_id, _comment_object_id(comment))
+
+
+def _comment_object_id(comment: dict) -> int:
+    try:
+        return int(str(comment.get("objectID") or "0").strip())
+    except ValueError:
+        return 0
+
+
+def _comment_created_at(comment: dict) -> int:
+    try:
+        return int(comment.get("created_at_i") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
 class HackerNewsAdapter(SourceAdapter):
     source_name = "hackernews"
     _search_by_date_url = "https://hn.algolia.com/api/v1/search_by_date"
@@ -194,15 +229,6 @@ class HackerNewsAdapter(SourceAdapter):
 
         return ""
 
-    @staticmethod
-    def _role_matches(text: str, roles: list[str]) -> str:
-        lowered = text.casefold()
-        for role in roles:
-            normalized_role = role.strip()
-            if normalized_role and normalized_role.casefold() in lowered:
-                return normalized_role
-        return ""
-
     def _fetch_recent_threads(self, session: requests.Session, config: CrawlerConfig) -> list[dict]:
         # Search a larger window than the final cap because by-date results include
         # related posts (e.g. "Tell HN") that are not the canonical monthly threads.
@@ -231,38 +257,76 @@ class HackerNewsAdapter(SourceAdapter):
 
         return threads
 
-    def _fetch_thread_comments(self, session: requests.Session, config: CrawlerConfig, story_id: str) -> list[dict]:
-        comments: list[dict] = []
-        page = 0
-
-        while len(comments) < config.hn_max_comments_per_thread:
-            params = {
-                "tags": f"comment,story_{story_id}",
-                "hitsPerPage": config.hn_comments_hits_per_page,
-                "page": page,
-            }
-            response = self._request_with_retries(session, self._search_comments_url, config, params=params)
-            if response is None:
-                break
-
-            response.raise_for_status()
-            payload = response.json()
-            hits = payload.get("hits", [])
-            if not hits:
-                break
-
-            comments.extend(hits)
-            total_pages = int(payload.get("nbPages") or 0)
-            page += 1
-            if page >= total_pages:
-                break
-
-            if config.base_delay_ms > 0:
-                time.sleep(max(config.base_delay_ms, 0) / 1000.0)
+    def _comment_page_params(
+        self,
+        config: CrawlerConfig,
+        story_id: str,
+        page: int,
+        watermark: HackerNewsThreadWatermark | None,
+    ) -> dict:
+        params = {
+            "tags": f"comment,story_{story_id}",
+            "hitsPerPage": config.hn_comments_hits_per_page,
+            "page": page,
+        }
+        if watermark is not None and watermark.created_at_i > 0:
+            # Inclusive so comments posted in the same second as the watermark are not lost;
+            # already processed ones are dropped by object id afterwards.
+            params["numericFilters"] = f"created_at_i>={watermark.created_at_i}"
+        return params
+
+    def _fetch_comment_page(
+        self,
+        session: requests.Session,
+        config: CrawlerConfig,
+        story_id: str,
+        page: int,
+        watermark: HackerNewsThreadWatermark | None = None,
+    ) -> tuple[list[dict], int]:
+        """Fetch one Algolia comment page; return ``(hits, nbPages)``."""
+        params = self._comment_page_params(config, story_id, page, watermark)
+        response = self._request_with_retries(session, self._search_comments_url, config, params=params)
+        if response is None:
+            return [], 0
+        response.raise_for_status()
+        payload = response.json()
+        return list(payload.get("hits", [])), int(payload.get("nbPages") or 0)
+
+    def _remaining_page_count(self, config: CrawlerConfig, total_pages: int) -> int:
+        pages_for_cap = math.ceil(config.hn_max_comments_per_thread / max(config.hn_comments_hits_per_page, 1))
+        return max(min(total_pages, pages_for_cap) - 1, 0)
+
+    def _fetch_thread_comments(
+        self,
+        page_executor: ThreadPoolExecutor,
+        session_pool: ThreadSafeSessionPool,
+        config: CrawlerConfig,
+        story_id: str,
+        watermark: HackerNewsThreadWatermark | None = None,
+    ) -> list[dict]:
+        """Fetch a thread's comments: page 0 first, then the remaining pages on ``page_executor``.
+
+        With a ``watermark`` only comments newer than it are requested and returned.
+        """
+        first_hits, total_pages = self._fetch_comment_page(session_pool.get_session(), config, story_id, 0, watermark)
+        comments = list(first_hits)
+        if first_hits:
+            remaining_pages = range(1, 1 + self._remaining_page_count(config, total_pages))
+            pages = page_executor.map(
+                lambda page: self._fetch_comment_page(session_pool.get_session(), config, story_id, page, watermark)[0],
+                remaining_pages,
+            )
+            for hits in pages:
+                # Preserve the sequential behaviour of stopping at the first empty page.
+                if not hits:
+                    break
+                comments.extend(hits)
 
+        if watermark is not None:
+            comments = [comment for comment in comments if watermark.is_newer(comment)]
         return comments[: config.hn_max_comments_per_thread]
 
-    def _comment_to_company(self, comment: dict, roles: list[str]) -> DiscoveredCompany | None:
+    def _comment_to_company(self, comment: dict, roles: list[str] | RoleMatcher) -> DiscoveredCompany | None:
         comment_html = str(comment.get("comment_text") or "").strip()
         if not comment_html:
             return None
@@ -272,7 +336,8 @@ class HackerNewsAdapter(SourceAdapter):
         if not plain_text:
             return None
 
-        matched_role = self._role_matches(plain_text, roles)
+        role_matcher = roles if isinstance(roles, RoleMatcher) else RoleMatcher(roles)
+        matched_role = role_matcher.first_match(plain_text)
         if not matched_role:
             return None
 
@@ -305,35 +370,109 @@ class HackerNewsAdapter(SourceAdapter):
             domain=domain,
         )
 
-    def discover_companies(self, roles: list[str], config: CrawlerConfig) -> list[DiscoveredCompany]:
-        if not roles:
-            return []
-
+    def _companies_from_comments(
+        self,
+        comments: list[dict],
+        role_matcher: RoleMatcher,
+        config: CrawlerConfig,
+    ) -> list[DiscoveredCompany]:
         discovered: list[DiscoveredCompany] = []
+        per_role_counts: dict[str, int] = {role: 0 for role in role_matcher.roles}
+        for comment in comments:
+            company = self._comment_to_company(comment, role_matcher)
+            if company is None:
+                continue
+
+            if per_role_counts.get(company.role, 0) >= config.hn_max_companies_per_role:
+                continue
+
+            per_role_counts[company.role] = per_role_counts.get(company.role, 0) + 1
+            discovered.append(company)
+        return discovered
+
+    def fetch_threads(
+        self,
+        config: CrawlerConfig,
+        *,
+        thread_watermarks: dict[str, HackerNewsThreadWatermark] | None = None,
+    ) -> list[dict]:
+        """Fetch the most recent "Who is hiring" threads with their comments.
+
+        Returns ``[{"story_id": ..., "comments": [...]}]`` in thread order; the
+        result does not depend on roles, so it can be shared across identities.
+        Threads and their comment pages are fetched concurrently, bounded by
+        ``hn_fetch_concurrency``. When ``thread_watermarks`` is given (incremental
+        mode), only comments newer than each thread's watermark are fetched, and
+        the mapping is advanced in place for every fetched thread.
+        """
         session = requests.Session()
         session.headers.update({"User-Agent": config.user_agent})
 
         threads = self._fetch_recent_threads(session, config)
         logger.debug("hackernews selected %d recent Who Is Hiring threads", len(threads))
-
-        for thread in threads:
-            story_id = str(thread.get("objectID") or "").strip()
-            if not story_id:
-                continue
-            comments = self._fetch_thread_comments(session, config, story_id)
+        story_ids = [story_id for story_id in (str(thread.get("objectID") or "").strip() for thread in threads) if story_id]
+
+        watermarks: dict[str, HackerNewsThreadWatermark | None] = {}
+        for story_id in story_ids:
+            if thread_watermarks is None:
+                watermarks[story_id] = None
+            else:
+                watermarks[story_id] = thread_watermarks.setdefault(story_id, HackerNewsThreadWatermark())
+
+        concurrency = max(1, config.hn_fetch_concurrency)
+        thread_workers = min(concurrency, max(len(story_ids), 1))
+        session_pool = ThreadSafeSessionPool(config.user_agent)
+        # Thread tasks fetch page 0 and then wait on the separate page pool, so the two
+        # pools cannot deadlock; at most thread_workers + concurrency requests are in flight.
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="hn-pages") as page_executor:
+                with ThreadPoolExecutor(max_workers=thread_workers, thread_name_prefix="hn-threads") as thread_executor:
+                    thread_comments = list(
+                        thread_executor.map(
+                            lambda story_id: self._fetch_thread_comments(
+                                page_executor, session_pool, config, story_id, watermarks[story_id]
+                            ),
+                            story_ids,
+                        )
+                    )
+        finally:
+            session_pool.close_all()
+
+        fetched: list[dict] = []
+        for story_id, comments in zip(story_ids, thread_comments):
             logger.debug("hackernews story=%s yielded %d comments", story_id, len(comments))
-
-            per_role_counts: dict[str, int] = {role: 0 for role in roles}
-            for comment in comments:
-                company = self._comment_to_company(comment, roles)
-                if company is None:
-                    continue
-
-                if per_role_counts.get(company.role, 0) >= config.hn_max_companies_per_role:
-                    continue
-
-                per_role_counts[company.role] = per_role_counts.get(company.role, 0) + 1
-                discovered.append(company)
+            watermark = watermarks[story_id]
+            if watermark is not None:
+                watermark.advance(comments)
+            fetched.append(
+                {
+                    "story_id": story_id,
+                    "comments": [
+                        {key: comment.get(key) for key in ("objectID", "created_at_i", "comment_text")}
+                        for comment in comments
+                    ],
+                }
+            )
+        return fetched
+
+    def companies_from_threads(self, threads: list[dict], roles: list[str], config: CrawlerConfig) -> list[DiscoveredCompany]:
+        """Extract role-matching companies from :meth:`fetch_threads` output."""
+        role_matcher = RoleMatcher(roles)
+        discovered: list[DiscoveredCompany] = []
+        for thread in threads:
+            discovered.extend(self._companies_from_comments(thread.get("comments") or [], role_matcher, config))
 
         logger.debug("hackernews discovered %d companies", len(discovered))
         return discovered
+
+    def discover_companies(
+        self,
+        roles: list[str],
+        config: CrawlerConfig,
+        *,
+        thread_watermarks: dict[str, HackerNewsThreadWatermark] | None = None,
+    ) -> list[DiscoveredCompany]:
+        if not roles:
+            return []
+        threads = self.fetch_threads(config, thread_watermarks=thread_watermarks)
+        return self.companies_from_threads(threads, roles, config)
@@ -4,6 +4,8 @@ import json
 import logging
 import re
 import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from urllib.parse import parse_qs, quote_plus, urljoin, urlparse
 
@@ -11,6 +13,7 @@ import requests
 from bs4 import BeautifulSoup, Tag
 
 from src.python.web_crawler.config import CrawlerConfig
+from src.python.web_crawler.executor import ThreadSafeSessionPool
 from src.python.web_crawler.models import DiscoveredCompany
 from src.python.web_crawler.sources.base import SourceAdapter
 
@@ -26,6 +29,12 @@ _MARKDOWN_LINK_RE = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
 _CURRENCY_SUFFIX_RE = re.compile(r"\s+[£$€]\s?\d[\d.,KkMm]*.*$")
 _JOB_DETAIL_PATH_RE = re.compile(r"^/jobs\?(?:.*&)?jobId=\d+(?:[&#].*)?$", re.IGNORECASE)
 _RAW_JOB_ID_RE = re.compile(r"^\d{6,}$")
+# Fast path for detail pages: slice JSON-LD blobs out of the raw HTML without building a DOM.
+_JSON_LD_SCRIPT_RE = re.compile(
+    r"<script\b[^>]*\btype\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+_LOCATION_HINT_RE = re.compile(r"(?:remote|hybrid|on.?site|\b[A-Z][a-z]+,\s*[A-Z]{2}\b)", re.IGNORECASE)
 _NOISE_LABELS = {
     "see all companies",
     "see our leaderboard",
@@ -57,6 +66,20 @@ class LevelsFyiJobCard:
     role: str = ""
 
 
+class LevelsFyiJobStream(Iterator[LevelsFyiJobCard]):
+    """Job cards in detail-page completion order, with the listing count known up front."""
+
+    def __init__(self, count: int, cards: Iterator[LevelsFyiJobCard]) -> None:
+        self._count = count
+        self._cards = cards
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __next__(self) -> LevelsFyiJobCard:
+        return next(self._cards)
+
+
 class LevelsFyiAdapter(SourceAdapter):
     source_name = "levelsfyi"
     base_url = "https://www.levels.fyi"
@@ -551,50 +574,71 @@ class LevelsFyiAdapter(SourceAdapter):
 
         return cards
 
-    def _fetch_job_detail(self, session: requests.Session, url: str, config: CrawlerConfig) -> dict:
-        """Fetch a Levels.fyi job detail page and extract description, location, and compensation.
+    @staticmethod
+    def _empty_job_detail() -> dict:
+        return {"description": "", "location": "", "compensation": ""}
 
-        Returns a dict with keys ``description``, ``location``, ``compensation``.
-        All values default to empty strings on failure or CSR-only content.
+    @staticmethod
+    def _apply_job_posting(data: object, result: dict) -> bool:
+        """Copy JobPosting fields from a JSON-LD blob into ``result``.
+
+        Returns True when the blob carried a non-empty description, which is
+        the signal that no further parsing is needed.
         """
-        result = {"description": "", "location": "", "compensation": ""}
-        response = self._request_with_retries(session, url, config)
-        if response is None:
-            return result
-        try:
-            response.raise_for_status()
-        except requests.HTTPError:
-            return result
+        if not isinstance(data, dict) or data.get("@type") != "JobPosting":
+            return False
+        result["description"] = data.get("description", "")
+        job_loc = data.get("jobLocation", {})
+        if isinstance(job_loc, dict):
+            addr = job_loc.get("address", {})
+            if isinstance(addr, dict):
+                parts = [
+                    addr.get("addressLocality", ""),
+                    addr.get("addressRegion", ""),
+                    addr.get("addressCountry", ""),
+                ]
+                result["location"] = ", ".join(p for p in parts if p)
+        salary = data.get("baseSalary", {})
+        if isinstance(salary, dict):
+            val = salary.get("value", {})
+            if isinstance(val, dict):
+                min_val = val.get("minValue", "")
+                max_val = val.get("maxValue", "")
+                currency = salary.get("currency", "")
+                if min_val or max_val:
+                    result["compensation"] = f"{currency} {min_val}–{max_val}".strip()
+        return bool(result["description"])
 
-        soup = BeautifulSoup(response.text, "html.parser")
+    @classmethod
+    def _extract_job_detail_fast(cls, html: str) -> dict | None:
+        """Extract a JSON-LD JobPosting with a regex scan instead of a DOM parse.
+
+        Returns None when no JobPosting with a description is found so the
+        caller can fall back to :meth:`_parse_job_detail_html`'s DOM path.
+        """
+        for match in _JSON_LD_SCRIPT_RE.finditer(html or ""):
+            result = cls._empty_job_detail()
+            try:
+                if cls._apply_job_posting(json.loads(match.group(1)), result):
+                    return result
+            except Exception:
+                continue
+        return None
+
+    @classmethod
+    def _parse_job_detail_html(cls, html: str) -> dict:
+        fast_result = cls._extract_job_detail_fast(html)
+        if fast_result is not None:
+            return fast_result
+
+        result = cls._empty_job_detail()
+        soup = BeautifulSoup(html, "html.parser")
 
-        # Try JSON-LD first (JobPosting schema)
+        # JSON-LD may still be present with markup the fast path does not match.
         for script in soup.find_all("script", type="application/ld+json"):
             try:
-                data = json.loads(script.string or "")
-                if isinstance(data, dict) and data.get("@type") == "JobPosting":
-                    result["description"] = data.get("description", "")
-                    job_loc = data.get("jobLocation", {})
-                    if isinstance(job_loc, dict):
-                        addr = job_loc.get("address", {})
-                        if isinstance(addr, dict):
-                            parts = [
-                                addr.get("addressLocality", ""),
-                                addr.get("addressRegion", ""),
-                                addr.get("addressCountry", ""),
-                            ]
-                            result["location"] = ", ".join(p for p in parts if p)
-                    salary = data.get("baseSalary", {})
-                    if isinstance(salary, dict):
-                        val = salary.get("value", {})
-                        if isinstance(val, dict):
-                            min_val = val.get("minValue", "")
-                            max_val = val.get("maxValue", "")
-                            currency = salary.get("currency", "")
-                            if min_val or max_val:
-                                result["compensation"] = f"{currency} {min_val}–{max_val}".strip()
-                    if result["description"]:
-                        return result
+                if cls._apply_job_posting(json.loads(script.string or ""), result):
+                    return result
             except Exception:
                 continue
 
@@ -609,7 +653,7 @@ class LevelsFyiAdapter(SourceAdapter):
                     break
 
         # Location: look for location hints
-        for el in soup.find_all(string=re.compile(r"(?:remote|hybrid|on.?site|\b[A-Z][a-z]+,\s*[A-Z]{2}\b)", re.IGNORECASE)):
+        for el in soup.find_all(string=_LOCATION_HINT_RE):
             parent = el.parent
             if parent:
                 loc_text = parent.get_text(" ", strip=True)
@@ -619,6 +663,60 @@ class LevelsFyiAdapter(SourceAdapter):
 
         return result
 
+    def _fetch_job_detail(self, session: requests.Session, url: str, config: CrawlerConfig) -> dict:
+        """Fetch a Levels.fyi job detail page and extract description, location, and compensation.
+
+        Returns a dict with keys ``description``, ``location``, ``compensation``.
+        All values default to empty strings on failure or CSR-only content.
+        """
+        response = self._request_with_retries(session, url, config)
+        if response is None:
+            return self._empty_job_detail()
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            return self._empty_job_detail()
+
+        return self._parse_job_detail_html(response.text)
+
+    def _fetch_job_details(self, cards: list[LevelsFyiJobCard], config: CrawlerConfig) -> None:
+        """Fill description, location, and compensation on ``cards`` in place."""
+        for _ in self._iter_job_details(cards, config):
+            pass
+
+    def _iter_job_details(self, cards: list[LevelsFyiJobCard], config: CrawlerConfig) -> Iterator[LevelsFyiJobCard]:
+        """Fetch detail pages for ``cards`` and yield each card as soon as its page is done.
+
+        Detail pages are fetched by at most ``levelsfyi_detail_concurrency``
+        threads, each with its own session, so cards come back in completion
+        order. A failed fetch leaves the card's detail fields untouched.
+        """
+        if not cards:
+            return
+
+        session_pool = ThreadSafeSessionPool(config.user_agent)
+
+        def fetch(card: LevelsFyiJobCard) -> LevelsFyiJobCard:
+            try:
+                details = self._fetch_job_detail(session_pool.get_session(), card.source_url, config)
+                card.description = details["description"]
+                card.location = details["location"]
+                card.compensation = details["compensation"]
+            except Exception as exc:
+                logger.debug("levelsfyi detail fetch failed for %s: %s", card.source_url, exc)
+            return card
+
+        max_workers = min(max(1, config.levelsfyi_detail_concurrency), len(cards))
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="levelsfyi-detail")
+        try:
+            futures = [executor.submit(fetch, card) for card in cards]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # A consumer that stops early does not wait for the remaining pages.
+            executor.shutdown(wait=True, cancel_futures=True)
+            session_pool.close_all()
+
     def _request_with_retries(self, session: requests.Session, url: str, config: CrawlerConfig) -> requests.Response | None:
         last_error: Exception | None = None
         for attempt in range(1, max(config.max_retries, 1) + 1):
@@ -759,9 +857,24 @@ class LevelsFyiAdapter(SourceAdapter):
     def discover_jobs(self, roles: list[str], config: CrawlerConfig) -> list[LevelsFyiJobCard]:
         """Discover job listings from Levels.fyi search pages and fetch their detail pages.
 
-        Fetches description, location, and compensation from each job's detail page.
-        Deduplicates by ``external_job_id`` (the ``jobId`` query parameter).
+        Fetches description, location, and compensation from each job's detail page
+        with bounded concurrency (``levelsfyi_detail_concurrency``). Deduplicates by ``external_job_id`` (the ``jobId`` query parameter).
+        Cards are returned in listing order; :meth:`iter_jobs` yields them as detail pages complete.
         """
+        cards = self._discover_job_listings(roles, config)
+        self._fetch_job_details(cards, config)
+        return cards
+
+    def iter_jobs(self, roles: list[str], config: CrawlerConfig) -> LevelsFyiJobStream:
+        """Return the jobs of :meth:`discover_jobs`, yielded as soon as each detail page has been fetched.
+
+        The listing pages are fetched by this call, so ``len()`` of the returned
+        stream is the number of jobs it will yield.
+        """
+        cards = self._discover_job_listings(roles, config)
+        return LevelsFyiJobStream(len(cards), self._iter_job_details(cards, config))
+
+    def _discover_job_listings(self, roles: list[str], config: CrawlerConfig) -> list[LevelsFyiJobCard]:
         session = requests.Session()
         session.headers.update({"User-Agent": config.user_agent})
 
@@ -799,16 +912,6 @@ class LevelsFyiAdapter(SourceAdapter):
                 if len(role_cards) >= max_per_role:
                     break
 
-            # Fetch detail pages for this role's cards
-            for card in role_cards:
-                try:
-                    details = self._fetch_job_detail(session, card.source_url, config)
-                    card.description = details["description"]
-                    card.location = details["location"]
-                    card.compensation = details["compensation"]
-                except Exception as exc:
-                    logger.debug("levelsfyi detail fetch failed for %s: %s", card.source_url, exc)
-
             all_cards.extend(role_cards)
 
         logger.debug("Levels.fyi total jobs discovered: %d", len(all_cards))
@@ -6,14 +6,16 @@ from unittest.mock import Mock, patch
 import requests
 
 from src.python.web_crawler.config import CrawlerConfig
+from src.python.web_crawler.http_validator_cache import HttpValidatorCache
 from src.python.web_crawler.sources.ats_detector import ATSRequestFailure, detect_ats_provider, extract_ats_signatures_from_html, fetch_url
 
 
 class FakeResponse:
-    def __init__(self, url: str, text: str = "", status_code: int = 200):
+    def __init__(self, url: str, text: str = "", status_code: int = 200, headers: dict | None = None):
         self.url = url
         self.text = text
         self.status_code = status_code
+        self.headers = headers or {}
 
 
 class AtsDetectorTests(unittest.TestCase):
@@ -112,6 +114,26 @@ class AtsDetectorTests(unittest.TestCase):
         self.assertIsNone(result)
         self.assertEqual(fetch_mock.call_count, 1)
 
+    def test_detect_ats_provider_reuses_stored_evidence_for_unchanged_page(self):
+        collection = Mock()
+        collection.find_one.return_value = None
+        cache = HttpValidatorCache(collection)
+        html = '<a href="https://jobs.lever.co/acme">Jobs</a>'
+        first = FakeResponse(url="https://acme.test/careers", text=html, headers={"ETag": '"v1"'})
+
+        with patch("src.python.web_crawler.sources.ats_detector.fetch_url", return_value=first):
+            detect_ats_provider(["https://acme.test/careers"], self.config, validator_cache=cache)
+
+        with patch(
+            "src.python.web_crawler.sources.ats_detector.fetch_url",
+            return_value=FakeResponse(url="https://acme.test/careers", status_code=304),
+        ) as fetch_mock:
+            result = detect_ats_provider(["https://acme.test/careers"], self.config, validator_cache=cache)
+
+        self.assertEqual(fetch_mock.call_args.kwargs["headers"], {"If-None-Match": '"v1"'})
+        self.assertEqual(result.board_url, "https://jobs.lever.co/acme")
+        self.assertEqual(cache.not_modified_count, 1)
+
 
 if __name__ == "__main__":
     unittest.main()
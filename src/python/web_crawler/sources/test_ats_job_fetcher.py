@@ -4,13 +4,21 @@ import unittest
 from unittest.mock import Mock
 
 from src.python.web_crawler.config import CrawlerConfig
-from src.python.web_crawler.sources.ats_job_fetcher import _fetch_ashby_jobs, _fetch_greenhouse_jobs, _fetch_lever_jobs
+from src.python.web_crawler.role_filtering import RoleMatcher
+from src.python.web_crawler.sources.ats_job_fetcher import (
+    AtsFetchError,
+    _fetch_ashby_jobs,
+    _fetch_greenhouse_jobs,
+    _fetch_lever_jobs,
+    fetch_jobs,
+)
 
 
 class FakeResponse:
-    def __init__(self, payload, status_code: int = 200):
+    def __init__(self, payload, status_code: int = 200, headers: dict | None = None):
         self.status_code = status_code
         self._payload = payload
+        self.headers = headers or {}
 
     def json(self):
         return self._payload
@@ -50,12 +58,52 @@ class AtsFetcherGreenhouseTests(unittest.TestCase):
         self.assertEqual(job.source_url, "https://boards.greenhouse.io/acme/jobs/123")
         self.assertIn("Build things", job.description)
 
-    def test_fetch_greenhouse_jobs_returns_empty_on_non_200(self):
+    def test_fetch_greenhouse_jobs_returns_none_for_unchanged_board(self):
+        validator_cache = Mock()
+        validator_cache.conditional_headers.return_value = {"If-None-Match": '"v1"'}
+        session = Mock()
+        session.request.return_value = FakeResponse(None, status_code=304)
+
+        jobs = _fetch_greenhouse_jobs("acme", self.config, session, validator_cache=validator_cache)
+
+        self.assertIsNone(jobs)
+        self.assertEqual(session.request.call_args.kwargs["headers"], {"If-None-Match": '"v1"'})
+        validator_cache.record_not_modified.assert_called_once()
+        validator_cache.remember.assert_not_called()
+
+    def test_fetch_greenhouse_jobs_stages_validators_of_changed_board(self):
+        validator_cache = Mock()
+        validator_cache.conditional_headers.return_value = {}
+        response = FakeResponse({"jobs": [{"id": 1, "title": "Engineer"}]}, headers={"ETag": '"v2"'})
+        session = Mock()
+        session.request.return_value = response
+
+        jobs = _fetch_greenhouse_jobs("acme", self.config, session, validator_cache=validator_cache)
+
+        self.assertEqual(len(jobs), 1)
+        validator_cache.remember.assert_called_once_with(
+            "https://boards-api.greenhouse.io/v1/boards/acme/jobs?content=true", response
+        )
+
+    def test_fetch_greenhouse_jobs_raises_on_non_200(self):
         session = Mock()
         session.request.return_value = FakeResponse({}, status_code=404)
 
-        jobs = _fetch_greenhouse_jobs("missing", self.config, session)
-        self.assertEqual(jobs, [])
+        with self.assertRaises(AtsFetchError):
+            _fetch_greenhouse_jobs("missing", self.config, session)
+
+    def test_fetch_jobs_tells_a_failed_fetch_from_an_empty_board(self):
+        validator_cache = Mock()
+        validator_cache.conditional_headers.return_value = {}
+        session = Mock()
+        session.request.return_value = FakeResponse({"jobs": []})
+
+        self.assertEqual(fetch_jobs("greenhouse", "acme", self.config, session), [])
+
+        session.request.return_value = FakeResponse(None, status_code=503)
+        with self.assertRaises(AtsFetchError):
+            fetch_jobs("greenhouse", "acme", self.config, session, validator_cache=validator_cache)
+        validator_cache.discard.assert_called_once()
 
     def test_fetch_greenhouse_jobs_skips_entries_missing_id_or_title(self):
         payload = {"jobs": [{"title": "No ID"}, {"id": 456, "title": ""}, {"id": 789, "title": "Valid"}]}
@@ -67,6 +115,76 @@ class AtsFetcherGreenhouseTests(unittest.TestCase):
         self.assertEqual(jobs[0].external_job_id, "789")
 
 
+class AtsFetcherGreenhouseTitlePrefilterTests(unittest.TestCase):
+    board_url = "https://boards-api.greenhouse.io/v1/boards/acme/jobs"
+
+    def setUp(self):
+        self.listing = {
+            "jobs": [
+                {"id": 1, "title": "Senior Software Engineer", "absolute_url": "u1"},
+                {"id": 2, "title": "Sales Engineer", "absolute_url": "u2"},
+                {"id": 3, "title": "Account Executive", "absolute_url": "u3"},
+            ]
+        }
+        self.matcher = RoleMatcher(["Software Engineer"])
+
+    def _session(self, responses: dict[str, FakeResponse]) -> Mock:
+        session = Mock()
+        session.request.side_effect = lambda method, url, **kwargs: responses[url]
+        return session
+
+    def _requested_urls(self, session: Mock) -> list[str]:
+        return [call.args[1] for call in session.request.call_args_list]
+
+    def test_fetches_content_only_for_candidate_titles(self):
+        session = self._session(
+            {
+                self.board_url: FakeResponse(self.listing),
+                f"{self.board_url}/1": FakeResponse({"id": 1, "content": "<p>Build APIs.</p>"}),
+                f"{self.board_url}/2": FakeResponse({"id": 2, "content": "<p>Support software engineers.</p>"}),
+            }
+        )
+
+        jobs = _fetch_greenhouse_jobs("acme", _make_config(), session, self.matcher)
+
+        self.assertEqual(self._requested_urls(session), [self.board_url, f"{self.board_url}/1", f"{self.board_url}/2"])
+        self.assertEqual([job.external_job_id for job in jobs], ["1", "2", "3"])
+        self.assertEqual([job.description for job in jobs], ["Build APIs.", "Support software engineers.", ""])
+
+    def test_many_candidates_use_one_content_request(self):
+        full_board = {"jobs": [dict(item, content=f"<p>Body {item['id']}</p>") for item in self.listing["jobs"]]}
+        session = self._session(
+            {self.board_url: FakeResponse(self.listing), f"{self.board_url}?content=true": FakeResponse(full_board)}
+        )
+
+        jobs = _fetch_greenhouse_jobs("acme", _make_config(ats_detail_fetch_limit=1), session, self.matcher)
+
+        self.assertEqual(self._requested_urls(session), [self.board_url, f"{self.board_url}?content=true"])
+        self.assertEqual([job.description for job in jobs], ["Body 1", "Body 2", ""])
+
+    def test_failed_detail_request_falls_back_to_board_content(self):
+        full_board = {"jobs": [dict(item, content="<p>Body</p>") for item in self.listing["jobs"]]}
+        session = self._session(
+            {
+                self.board_url: FakeResponse(self.listing),
+                f"{self.board_url}/1": FakeResponse({}, status_code=404),
+                f"{self.board_url}?content=true": FakeResponse(full_board),
+            }
+        )
+
+        jobs = _fetch_greenhouse_jobs("acme", _make_config(), session, self.matcher)
+
+        self.assertEqual([job.description for job in jobs], ["Body", "Body", ""])
+
+    def test_prefilter_disabled_keeps_single_content_request(self):
+        session = self._session({f"{self.board_url}?content=true": FakeResponse(self.listing)})
+
+        jobs = _fetch_greenhouse_jobs("acme", _make_config(ats_title_prefilter=False), session, self.matcher)
+
+        self.assertEqual(len(jobs), 3)
+        self.assertEqual(self._requested_urls(session), [f"{self.board_url}?content=true"])
+
+
 class AtsFetcherLeverTests(unittest.TestCase):
     def setUp(self):
         self.config = _make_config()
@@ -97,12 +215,25 @@ class AtsFetcherLeverTests(unittest.TestCase):
         self.assertEqual(job.source_url, "https://jobs.lever.co/acme/abc-123")
         self.assertIn("Requirements", job.description)
 
-    def test_fetch_lever_jobs_returns_empty_on_non_list_response(self):
+    def test_fetch_lever_jobs_skips_description_for_unrelated_titles(self):
+        section = {"text": "About", "content": "<p>Details</p>"}
+        payload = [
+            {"id": "a", "text": "Backend Engineer", "lists": [section]},
+            {"id": "b", "text": "Office Manager", "lists": [section]},
+        ]
+        session = Mock()
+        session.request.return_value = FakeResponse(payload)
+
+        jobs = _fetch_lever_jobs("acme", self.config, session, RoleMatcher(["Backend Engineer"]))
+
+        self.assertEqual([job.description for job in jobs], ["About\nDetails", ""])
+
+    def test_fetch_lever_jobs_raises_on_non_list_response(self):
         session = Mock()
         session.request.return_value = FakeResponse({"error": "not found"}, status_code=200)
 
-        jobs = _fetch_lever_jobs("acme", self.config, session)
-        self.assertEqual(jobs, [])
+        with self.assertRaises(AtsFetchError):
+            _fetch_lever_jobs("acme", self.config, session)
 
 
 class AtsFetcherAshbyTests(unittest.TestCase):
@@ -135,12 +266,26 @@ class AtsFetcherAshbyTests(unittest.TestCase):
         self.assertEqual(job.source_url, "https://jobs.ashbyhq.com/acme/jid-42")
         self.assertIn("Work with data", job.description)
 
-    def test_fetch_ashby_jobs_returns_empty_on_request_failure(self):
+    def test_fetch_ashby_jobs_skips_description_for_unrelated_titles(self):
+        payload = {
+            "jobPostings": [
+                {"id": "1", "title": "Data Analyst", "descriptionHtml": "<p>SQL and data engineering.</p>"},
+                {"id": "2", "title": "Recruiter", "descriptionHtml": "<p>Hire data engineers.</p>"},
+            ]
+        }
+        session = Mock()
+        session.request.return_value = FakeResponse(payload)
+
+        jobs = _fetch_ashby_jobs("acme", self.config, session, RoleMatcher(["Data Engineer"]))
+
+        self.assertEqual([job.description for job in jobs], ["SQL and data engineering.", ""])
+
+    def test_fetch_ashby_jobs_raises_on_request_failure(self):
         session = Mock()
         session.request.return_value = FakeResponse({}, status_code=500)
 
-        jobs = _fetch_ashby_jobs("acme", self.config, session)
-        self.assertEqual(jobs, [])
+        with self.assertRaises(AtsFetchError):
+            _fetch_ashby_jobs("acme", self.config, session)
 
 
 if __name__ == "__main__":
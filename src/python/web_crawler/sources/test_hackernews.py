@@ -1,8 +1,36 @@
 from __future__ import annotations
 
+import threading
 import unittest
+from unittest.mock import patch
 
-from src.python.web_crawler.sources.hackernews import HackerNewsAdapter
+from src.python.web_crawler.config import CrawlerConfig
+from src.python.web_crawler.sources.hackernews import HackerNewsAdapter, HackerNewsThreadWatermark
+
+
+class FakeResponse:
+    def __init__(self, payload: dict):
+        self._payload = payload
+
+    def raise_for_status(self):
+        return None
+
+    def json(self):
+        return self._payload
+
+
+def _make_config(**kwargs) -> CrawlerConfig:
+    defaults = {"base_delay_ms": 0, "hn_max_threads": 2, "hn_comments_hits_per_page": 2}
+    defaults.update(kwargs)
+    return CrawlerConfig(mongo_host="mongodb://localhost:27017/", db_name="test", **defaults)
+
+
+def _comment(object_id: int, created_at_i: int, title: str = "Software Engineer") -> dict:
+    return {
+        "objectID": str(object_id),
+        "created_at_i": created_at_i,
+        "comment_text": f"Company{object_id} | Remote | {title}<p>https://company{object_id}.com/careers</p>",
+    }
 
 
 class HackerNewsAdapterTests(unittest.TestCase):
@@ -55,5 +83,93 @@ class HackerNewsAdapterTests(unittest.TestCase):
         self.assertFalse(self.adapter._is_monthly_who_is_hiring_title("Tell HN: Who Is Hiring Since 2016, Trend is evolving"))
 
 
+class FakeAlgolia:
+    """Serves thread search and comment pages keyed by story id, recording request params."""
+
+    def __init__(self, threads: dict[str, list[dict]], hits_per_page: int = 2):
+        self.threads = threads
+        self.hits_per_page = hits_per_page
+        self.comment_requests: list[dict] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, session, url, config, params=None):
+        if url == HackerNewsAdapter._search_by_date_url:
+            hits = [{"objectID": story_id, "title": "Ask HN: Who is hiring? (May 2026)"} for story_id in self.threads]
+            return FakeResponse({"hits": hits})
+
+        with self._lock:
+            self.comment_requests.append(dict(params))
+        story_id = params["tags"].removeprefix("comment,story_")
+        comments = self.threads[story_id]
+        numeric_filter = params.get("numericFilters")
+        if numeric_filter:
+            threshold = int(numeric_filter.split(">=")[1])
+            comments = [comment for comment in comments if comment["created_at_i"] >= threshold]
+        page = params["page"]
+        total_pages = -(-len(comments) // self.hits_per_page)
+        start = page * self.hits_per_page
+        return FakeResponse({"hits": comments[start : start + self.hits_per_page], "nbPages": total_pages})
+
+
+class HackerNewsDiscoveryTests(unittest.TestCase):
+    def setUp(self):
+        self.adapter = HackerNewsAdapter()
+
+    def test_fetches_all_pages_of_every_thread_in_order(self):
+        algolia = FakeAlgolia(
+            {
+                "100": [_comment(i, 1_000 + i) for i in range(101, 106)],
+                "200": [_comment(i, 2_000 + i) for i in range(201, 204)],
+            }
+        )
+
+        with patch.object(self.adapter, "_request_with_retries", side_effect=algolia):
+            companies = self.adapter.discover_companies(["software engineer"], _make_config(hn_fetch_concurrency=3))
+
+        self.assertEqual(
+            [company.name for company in companies],
+            [f"Company{i}" for i in (101, 102, 103, 104, 105, 201, 202, 203)],
+        )
+        pages_by_story = sorted((req["tags"], req["page"]) for req in algolia.comment_requests)
+        self.assertEqual(
+            pages_by_story,
+            [("comment,story_100", 0), ("comment,story_100", 1), ("comment,story_100", 2), ("comment,story_200", 0), ("comment,story_200", 1)],
+        )
+
+    def test_stops_requesting_pages_past_comment_cap(self):
+        algolia = FakeAlgolia({"100": [_comment(i, 1_000 + i) for i in range(101, 111)]})
+
+        with patch.object(self.adapter, "_request_with_retries", side_effect=algolia):
+            companies = self.adapter.discover_companies(
+                ["software engineer"], _make_config(hn_max_comments_per_thread=3)
+            )
+
+        self.assertEqual(len(companies), 3)
+        self.assertEqual(sorted(req["page"] for req in algolia.comment_requests), [0, 1])
+
+    def test_incremental_mode_only_processes_comments_newer_than_watermark(self):
+        algolia = FakeAlgolia({"100": [_comment(101, 1_000), _comment(102, 1_050), _comment(103, 1_050), _comment(104, 1_100)]})
+        watermarks = {"100": HackerNewsThreadWatermark(created_at_i=1_050, object_id=102)}
+
+        with patch.object(self.adapter, "_request_with_retries", side_effect=algolia):
+            companies = self.adapter.discover_companies(
+                ["software engineer"], _make_config(), thread_watermarks=watermarks
+            )
+
+        self.assertEqual([company.name for company in companies], ["Company103", "Company104"])
+        self.assertTrue(all(req["numericFilters"] == "created_at_i>=1050" for req in algolia.comment_requests))
+        self.assertEqual(watermarks["100"], HackerNewsThreadWatermark(created_at_i=1_100, object_id=104))
+
+    def test_incremental_mode_creates_watermarks_for_new_threads(self):
+        algolia = FakeAlgolia({"100": [_comment(101, 1_000)]})
+        watermarks: dict[str, HackerNewsThreadWatermark] = {}
+
+        with patch.object(self.adapter, "_request_with_retries", side_effect=algolia):
+            self.adapter.discover_companies(["software engineer"], _make_config(), thread_watermarks=watermarks)
+
+        self.assertNotIn("numericFilters", algolia.comment_requests[0])
+        self.assertEqual(watermarks, {"100": HackerNewsThreadWatermark(created_at_i=1_000, object_id=101)})
+
+
 if __name__ == "__main__":
     unittest.main()
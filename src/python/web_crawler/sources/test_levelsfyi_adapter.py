@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import json
+import threading
 import unittest
+from unittest.mock import patch
 
-from src.python.web_crawler.sources.levelsfyi import LevelsFyiAdapter
+from src.python.web_crawler.config import CrawlerConfig
+from src.python.web_crawler.sources.levelsfyi import LevelsFyiAdapter, LevelsFyiJobCard
 
 
 class LevelsFyiAdapterExtractionTests(unittest.TestCase):
@@ -94,5 +98,117 @@ class LevelsFyiAdapterExtractionTests(unittest.TestCase):
         self.assertEqual(by_id["119257254128952006"].company_name, "Dataiku")
 
 
+_JOB_POSTING = {
+    "@context": "https://schema.org",
+    "@type": "JobPosting",
+    "description": "Build reliable infrastructure.",
+    "jobLocation": {"address": {"addressLocality": "Austin", "addressRegion": "TX", "addressCountry": "US"}},
+    "baseSalary": {"currency": "USD", "value": {"minValue": 150000, "maxValue": 200000}},
+}
+
+
+def _make_config(**kwargs) -> CrawlerConfig:
+    return CrawlerConfig(mongo_host="mongodb://localhost:27017/", db_name="test", **kwargs)
+
+
+class LevelsFyiJobDetailParsingTests(unittest.TestCase):
+    def test_fast_path_extracts_job_posting_without_dom_parse(self):
+        html = (
+            "<html><head>"
+            '<script type="application/ld+json">{"@type": "Organization", "name": "Acme"}</script>'
+            f"<script type='application/ld+json' data-next-head=''>{json.dumps(_JOB_POSTING)}</script>"
+            "</head><body><main>ignored</main></body></html>"
+        )
+
+        with patch("src.python.web_crawler.sources.levelsfyi.BeautifulSoup") as soup_cls:
+            details = LevelsFyiAdapter._parse_job_detail_html(html)
+
+        soup_cls.assert_not_called()
+        self.assertEqual(
+            details,
+            {
+                "description": "Build reliable infrastructure.",
+                "location": "Austin, TX, US",
+                "compensation": "USD 150000–200000",
+            },
+        )
+
+    def test_falls_back_to_dom_scraping_without_job_posting(self):
+        description = "Own the deploy pipeline. " * 10
+        html = f"""
+        <html><body>
+          <script type="application/ld+json">not json</script>
+          <main>{description}</main>
+          <span>Remote</span>
+        </body></html>
+        """
+
+        details = LevelsFyiAdapter._parse_job_detail_html(html)
+
+        self.assertEqual(details["description"], description.strip())
+        self.assertEqual(details["compensation"], "")
+
+
+class LevelsFyiDetailFetchTests(unittest.TestCase):
+    def test_fetches_details_concurrently_within_bound(self):
+        adapter = LevelsFyiAdapter()
+        cards = [
+            LevelsFyiJobCard(job_title=f"SRE {i}", company_name="Acme", source_url=f"https://x/{i}", external_job_id=str(i))
+            for i in range(6)
+        ]
+        lock = threading.Lock()
+        active = 0
+        peak = 0
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fake_fetch(session, url, config):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            try:
+                barrier.wait()
+            except threading.BrokenBarrierError:
+                pass
+            with lock:
+                active -= 1
+            if url.endswith("/3"):
+                raise RuntimeError("boom")
+            return {"description": f"desc {url}", "location": "Remote", "compensation": ""}
+
+        with patch.object(adapter, "_fetch_job_detail", side_effect=fake_fetch):
+            adapter._fetch_job_details(cards, _make_config(levelsfyi_detail_concurrency=2))
+
+        self.assertEqual(peak, 2)
+        self.assertEqual(cards[0].description, "desc https://x/0")
+        self.assertEqual(cards[3].description, "")
+        self.assertEqual(cards[5].location, "Remote")
+
+
+    def test_iter_jobs_yields_cards_as_detail_pages_complete(self):
+        adapter = LevelsFyiAdapter()
+        cards = [
+            LevelsFyiJobCard(job_title=f"SRE {i}", company_name="Acme", source_url=f"https://x/{i}", external_job_id=str(i))
+            for i in range(2)
+        ]
+        slow_page_released = threading.Event()
+
+        def fake_fetch(session, url, config):
+            if url.endswith("/0"):
+                slow_page_released.wait(timeout=5)
+            return {"description": f"desc {url}", "location": "Remote", "compensation": ""}
+
+        with patch.object(adapter, "_discover_job_listings", return_value=cards), \
+            patch.object(adapter, "_fetch_job_detail", side_effect=fake_fetch):
+            stream = adapter.iter_jobs(["sre"], _make_config(levelsfyi_detail_concurrency=2))
+            first = next(stream)
+            slow_page_released.set()
+            rest = list(stream)
+
+        self.assertEqual(first.external_job_id, "1")
+        self.assertEqual([card.external_job_id for card in rest], ["0"])
+        self.assertEqual(rest[0].description, "desc https://x/0")
+
+
 if __name__ == "__main__":
     unittest.main()
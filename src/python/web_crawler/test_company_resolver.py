@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import unittest
+
+from bson import ObjectId
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from src.python.web_crawler.company_resolver import (
+    COMPANY_CANONICAL_NAME_INDEX,
+    ensure_company_indexes,
+    resolve_companies,
+    upsert_companies,
+)
+from src.python.web_crawler.models import DiscoveredCompany
+
+
+class FakeCollection:
+    def __init__(self, docs=None, concurrent_inserts=None):
+        self.docs: list[dict] = list(docs or [])
+        self.find_calls: list[dict] = []
+        self.bulk_write_calls: list[tuple[list, bool]] = []
+        self.indexes: list[tuple] = []
+        # Documents "inserted by another worker" right before our bulk write lands.
+        self._concurrent_inserts = list(concurrent_inserts or [])
+
+    def _matches(self, doc, filter_doc):
+        for key, cond in filter_doc.items():
+            if isinstance(cond, dict) and "$in" in cond:
+                if doc.get(key) not in cond["$in"]:
+                    return False
+            elif doc.get(key) != cond:
+                return False
+        return True
+
+    def find(self, filter_doc=None, projection=None):
+        self.find_calls.append(dict(filter_doc or {}))
+        results = [doc for doc in self.docs if self._matches(doc, filter_doc or {})]
+        if projection is None:
+            return [dict(doc) for doc in results]
+        return [{key: doc[key] for key, include in projection.items() if include and key in doc} for doc in results]
+
+    def find_one(self, filter_doc, projection=None):
+        raise AssertionError("resolve_companies must not issue per-company lookups")
+
+    def bulk_write(self, operations, ordered=True):
+        self.bulk_write_calls.append((list(operations), ordered))
+        self.docs.extend(self._concurrent_inserts)
+        self._concurrent_inserts = []
+        write_errors = []
+        for index, operation in enumerate(operations):
+            if isinstance(operation, InsertOne):
+                document = operation._doc
+                if any(doc.get("canonical_name") == document["canonical_name"] for doc in self.docs):
+                    write_errors.append({"index": index, "code": 11000, "errmsg": "duplicate key"})
+                    continue
+                self.docs.append(dict(document))
+            elif isinstance(operation, UpdateOne):
+                target = next(doc for doc in self.docs if self._matches(doc, operation._filter))
+                target.update(operation._doc["$set"])
+        if write_errors:
+            raise BulkWriteError({"writeErrors": write_errors})
+
+    def create_index(self, keys, **kwargs):
+        self.indexes.append((keys, kwargs))
+        return kwargs.get("name", "")
+
+
+def _company(name: str, **kwargs) -> DiscoveredCompany:
+    return DiscoveredCompany(name=name, source="4dayweek", role="software engineer", **kwargs)
+
+
+class ResolveCompaniesTests(unittest.TestCase):
+    def test_resolves_new_and_existing_companies_in_one_bulk_write(self):
+        existing_oid = ObjectId()
+        collection = FakeCollection(
+            docs=[
+                {
+                    "_id": existing_oid,
+                    "name": "Acme",
+                    "canonical_name": "acme",
+                    "description": "",
+                    "discovery_sources": [{"source": "ycombinator"}],
+                }
+            ]
+        )
+
+        resolution = resolve_companies(
+            collection,
+            [_company("Acme, Inc.", description="Tooling"), _company("Globex"), _company("ACME LLC")],
+        )
+
+        self.assertEqual(len(collection.find_calls), 1)
+        self.assertEqual(collection.find_calls[0], {"canonical_name": {"$in": ["acme", "globex"]}})
+        self.assertEqual(len(collection.bulk_write_calls), 1)
+        self.assertFalse(collection.bulk_write_calls[0][1])
+        self.assertEqual(resolution.inserted_count, 1)
+        self.assertEqual(resolution.updated_count, 1)
+        self.assertEqual(resolution.inserted_canonical_names, {"globex"})
+        self.assertEqual(resolution.canonical_to_oid["acme"], existing_oid)
+        globex = next(doc for doc in collection.docs if doc["canonical_name"] == "globex")
+        self.assertEqual(resolution.canonical_to_oid["globex"], globex["_id"])
+        self.assertEqual(resolution.company_ids, [str(existing_oid), str(globex["_id"])])
+
+        acme = next(doc for doc in collection.docs if doc["_id"] == existing_oid)
+        self.assertEqual(acme["description"], "Tooling")
+        self.assertEqual([src["source"] for src in acme["discovery_sources"]], ["ycombinator", "4dayweek"])
+
+    def test_sets_ats_metadata_from_discovery_sources(self):
+        collection = FakeCollection()
+
+        resolution = resolve_companies(
+            collection,
+            [_company("Initech", careers_url="https://boards.greenhouse.io/initech")],
+        )
+
+        stored = collection.docs[0]
+        self.assertEqual(resolution.canonical_to_oid["initech"], stored["_id"])
+        self.assertEqual(stored["ats_provider"], "greenhouse")
+        self.assertEqual(stored["ats_slug"], "initech")
+
+    def test_adopts_ids_of_companies_inserted_concurrently(self):
+        concurrent_oid = ObjectId()
+        collection = FakeCollection(
+            concurrent_inserts=[{"_id": concurrent_oid, "name": "Globex", "canonical_name": "globex"}],
+        )
+
+        resolution = resolve_companies(collection, [_company("Globex"), _company("Hooli")])
+
+        self.assertEqual(resolution.canonical_to_oid["globex"], concurrent_oid)
+        self.assertEqual(resolution.inserted_canonical_names, {"hooli"})
+        self.assertEqual(resolution.inserted_count, 1)
+        self.assertEqual(resolution.updated_count, 1)
+
+    def test_merges_discovery_sources_into_companies_inserted_concurrently(self):
+        concurrent_oid = ObjectId()
+        collection = FakeCollection(
+            concurrent_inserts=[
+                {
+                    "_id": concurrent_oid,
+                    "name": "Globex",
+                    "canonical_name": "globex",
+                    "description": "",
+                    "discovery_sources": [{"source": "ycombinator"}],
+                }
+            ],
+        )
+
+        resolve_companies(collection, [_company("Globex", careers_url="https://jobs.lever.co/globex")])
+
+        globex = next(doc for doc in collection.docs if doc["_id"] == concurrent_oid)
+        self.assertEqual([src["source"] for src in globex["discovery_sources"]], ["ycombinator", "4dayweek"])
+        self.assertEqual((globex["ats_provider"], globex["ats_slug"]), ("lever", "globex"))
+        self.assertEqual(len(collection.bulk_write_calls), 2)
+
+    def test_skips_database_round_trips_when_nothing_to_resolve(self):
+        collection = FakeCollection()
+
+        resolution = resolve_companies(collection, [_company("Inc.")])
+
+        self.assertEqual(resolution.company_ids, [])
+        self.assertEqual(collection.find_calls, [])
+        self.assertEqual(collection.bulk_write_calls, [])
+
+    def test_upsert_companies_keeps_tuple_contract(self):
+        collection = FakeCollection()
+
+        inserted, updated, company_ids = upsert_companies(collection, [_company("Acme")])
+
+        self.assertEqual((inserted, updated), (1, 0))
+        self.assertEqual(company_ids, [str(collection.docs[0]["_id"])])
+
+    def test_ensure_company_indexes_creates_unique_canonical_name_index(self):
+        collection = FakeCollection()
+
+        ensure_company_indexes(collection)
+
+        self.assertEqual(
+            collection.indexes,
+            [([("canonical_name", 1)], {"unique": True, "name": COMPANY_CANONICAL_NAME_INDEX})],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import Mock
+
+from src.python.web_crawler.config import CrawlerConfig
+from src.python.web_crawler.http_validator_cache import (
+    HTTP_VALIDATORS_COLLECTION,
+    HttpValidatorCache,
+    build_validator_cache,
+    validator_scope,
+)
+
+
+class FakeValidatorCollection:
+    def __init__(self, error: Exception | None = None):
+        self.docs: dict[str, dict] = {}
+        self.error = error
+
+    def find_one(self, filter_doc, projection=None):
+        if self.error is not None:
+            raise self.error
+        doc = self.docs.get(filter_doc["_id"])
+        return dict(doc) if doc is not None else None
+
+    def update_one(self, filter_doc, update_doc, upsert=False):
+        if self.error is not None:
+            raise self.error
+        if filter_doc["_id"] not in self.docs:
+            if not upsert:
+                return
+            self.docs[filter_doc["_id"]] = dict(update_doc.get("$setOnInsert", {}))
+        doc = self.docs[filter_doc["_id"]]
+        doc.update(update_doc.get("$set", {}))
+        for key, amount in update_doc.get("$inc", {}).items():
+            doc[key] = doc.get(key, 0) + amount
+
+
+def _response(etag=None, last_modified=None):
+    headers = {}
+    if etag:
+        headers["ETag"] = etag
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    return Mock(headers=headers)
+
+
+class HttpValidatorCacheTests(unittest.TestCase):
+    url = "https://boards.example/acme"
+
+    def test_stored_validators_become_conditional_headers(self):
+        collection = FakeValidatorCollection()
+        HttpValidatorCache(collection).store(self.url, _response('"v1"', "Tue, 01 Sep 2026 10:00:00 GMT"), payload={"k": 1})
+
+        cache = HttpValidatorCache(collection)
+
+        self.assertEqual(
+            cache.conditional_headers(self.url),
+            {"If-None-Match": '"v1"', "If-Modified-Since": "Tue, 01 Sep 2026 10:00:00 GMT"},
+        )
+        self.assertEqual(cache.payload(self.url), {"k": 1})
+
+    def test_unknown_url_and_responses_without_validators_send_no_headers(self):
+        collection = FakeValidatorCollection()
+        cache = HttpValidatorCache(collection)
+        cache.store(self.url, _response())
+
+        self.assertEqual(cache.conditional_headers(self.url), {})
+        self.assertEqual(collection.docs, {})
+
+    def test_remembered_validators_are_written_only_on_commit(self):
+        collection = FakeValidatorCollection()
+        cache = HttpValidatorCache(collection, scope="s1")
+
+        cache.remember(self.url, _response('"v1"'))
+        cache.discard()
+        cache.commit()
+        self.assertEqual(collection.docs, {})
+
+        cache.remember(self.url, _response('"v2"'))
+        cache.commit()
+        self.assertEqual(collection.docs[f"s1:{self.url}"]["etag"], '"v2"')
+        self.assertEqual(HttpValidatorCache(collection).conditional_headers(self.url), {})
+
+    def test_hit_rate_and_persisted_not_modified_count(self):
+        collection = FakeValidatorCollection()
+        cache = HttpValidatorCache(collection)
+        cache.store(self.url, _response('"v1"'))
+
+        cache.conditional_headers(self.url)
+        cache.record_not_modified(self.url)
+        cache.conditional_headers("https://boards.example/other")
+
+        self.assertEqual(cache.hit_rate(), 0.5)
+        self.assertEqual(collection.docs[self.url]["not_modified_count"], 1)
+
+    def test_mongo_errors_never_raise(self):
+        cache = HttpValidatorCache(FakeValidatorCollection(error=RuntimeError("mongo down")))
+
+        self.assertEqual(cache.conditional_headers(self.url), {})
+        cache.store(self.url, _response('"v1"'))
+        cache.record_not_modified(self.url)
+
+    def test_validator_scope_separates_contexts(self):
+        self.assertEqual(validator_scope("a", "b"), validator_scope("a", "b"))
+        self.assertNotEqual(validator_scope("a", "b"), validator_scope("ab", ""))
+
+    def test_build_validator_cache_respects_config(self):
+        config = CrawlerConfig(mongo_host="mongodb://localhost:27017/", db_name="test")
+        database = {HTTP_VALIDATORS_COLLECTION: FakeValidatorCollection()}
+
+        self.assertIsInstance(build_validator_cache(database, config), HttpValidatorCache)
+        config.http_validator_cache_enabled = False
+        self.assertIsNone(build_validator_cache(database, config))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import unittest
+
+from src.python.web_crawler.config import CrawlerConfig
+from src.python.web_crawler.queue_emitter import (
+    BatchedQueueEmitter,
+    enqueue_scoring_job,
+    scoring_failed_count,
+    scoring_sent_count,
+)
+from src.python.web_crawler.scoring_lanes import BULK_RESCORE_LANE
+from src.python.web_crawler.workflow_utils import emit_enrichment_events
+
+
+class FakePipeline:
+    def __init__(self, redis_client):
+        self._redis_client = redis_client
+        self._commands: list[tuple[str, tuple[str, ...]]] = []
+
+    def rpush(self, queue_name, *payloads):
+        self._commands.append((queue_name, payloads))
+
+    def execute(self, raise_on_error=True):
+        self._redis_client.executions.append(list(self._commands))
+        if self._redis_client.execute_error is not None:
+            raise self._redis_client.execute_error
+        return [len(payloads) for _, payloads in self._commands]
+
+
+class FakeRedis:
+    def __init__(self, execute_error: Exception | None = None):
+        self.execute_error = execute_error
+        self.executions: list[list[tuple[str, tuple[str, ...]]]] = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+def _make_config(**kwargs) -> CrawlerConfig:
+    return CrawlerConfig(mongo_host="mongodb://localhost:27017/", db_name="test", **kwargs)
+
+
+class BatchedQueueEmitterTests(unittest.TestCase):
+    def test_flushes_one_rpush_per_queue_when_batch_size_is_reached(self):
+        redis_client = FakeRedis()
+        emitter = BatchedQueueEmitter(redis_client, batch_size=3)
+
+        emitter.push("a", "1")
+        emitter.push("b", "2")
+        self.assertEqual(redis_client.executions, [])
+
+        emitter.push("a", "3")
+
+        self.assertEqual(redis_client.executions, [[("a", ("1", "3")), ("b", ("2",))]])
+        self.assertEqual(emitter.pending_count, 0)
+        self.assertEqual(emitter.sent_counts, {"a": 2, "b": 1})
+
+    def test_context_manager_flushes_remaining_payloads(self):
+        redis_client = FakeRedis()
+
+        with BatchedQueueEmitter(redis_client, batch_size=100) as emitter:
+            for index in range(5):
+                emitter.push("queue", str(index))
+
+        self.assertEqual(len(redis_client.executions), 1)
+        self.assertEqual(emitter.sent_counts["queue"], 5)
+
+    def test_pipeline_failure_is_counted_not_raised(self):
+        emitter = BatchedQueueEmitter(FakeRedis(execute_error=ConnectionError("redis down")), batch_size=10)
+        emitter.push("queue", "1")
+        emitter.push("queue", "2")
+
+        delivered = emitter.flush()
+
+        self.assertEqual(delivered, 0)
+        self.assertEqual(emitter.failed_counts["queue"], 2)
+        self.assertEqual(emitter.sent_counts["queue"], 0)
+
+    def test_flush_without_payloads_skips_round_trip(self):
+        redis_client = FakeRedis()
+
+        self.assertEqual(BatchedQueueEmitter(redis_client).flush(), 0)
+        self.assertEqual(redis_client.executions, [])
+
+
+class EnqueueScoringJobTests(unittest.TestCase):
+    def test_buffers_scoring_payload_with_identity(self):
+        config = _make_config(job_scoring_queue_name="custom_scoring")
+        redis_client = FakeRedis()
+        emitter = BatchedQueueEmitter(redis_client)
+
+        self.assertTrue(enqueue_scoring_job(emitter, config, job_id="abc", user_id="user-1", identity_id="id-1"))
+        emitter.flush()
+
+        [(queue_name, payloads)] = redis_client.executions[0]
+        self.assertEqual(queue_name, "custom_scoring")
+        self.assertEqual(json.loads(payloads[0]), {"job_id": "abc", "user_id": "user-1", "identity_id": "id-1"})
+
+    def test_lane_selects_inbox_and_counts_sum_over_lanes(self):
+        config = _make_config(job_scoring_queue_name="custom_scoring")
+        redis_client = FakeRedis()
+        emitter = BatchedQueueEmitter(redis_client)
+
+        enqueue_scoring_job(emitter, config, job_id="new", user_id="user-1")
+        enqueue_scoring_job(emitter, config, job_id="old", user_id="user-1", lane=BULK_RESCORE_LANE)
+        emitter.flush()
+
+        self.assertEqual(
+            sorted(queue_name for queue_name, _ in redis_client.executions[0]),
+            ["custom_scoring", "custom_scoring:bulk_rescore"],
+        )
+        self.assertEqual(scoring_sent_count(emitter, config), 2)
+        self.assertEqual(scoring_failed_count(emitter, config), 0)
+
+    def test_rejects_missing_user_id(self):
+        emitter = BatchedQueueEmitter(FakeRedis())
+
+        self.assertFalse(enqueue_scoring_job(emitter, _make_config(), job_id="abc", user_id=""))
+        self.assertEqual(emitter.pending_count, 0)
+
+
+class EmitEnrichmentEventsTests(unittest.TestCase):
+    def test_emits_events_in_batches_of_configured_size(self):
+        config = _make_config(redis_emit_batch_size=2)
+        redis_client = FakeRedis()
+
+        emitted = emit_enrichment_events(
+            redis_client,
+            config,
+            run_id="run-1",
+            workflow_run_id="wf-1",
+            workflow_id="crawler_4dayweek",
+            identity_id="identity-1",
+            company_ids=["c1", "c2", "c3"],
+            reason="new_company_via_4dayweek",
+        )
+
+        self.assertEqual(emitted, 3)
+        self.assertEqual(len(redis_client.executions), 2)
+        payloads = [
+            json.loads(payload)
+            for execution in redis_client.executions
+            for _, batch in execution
+            for payload in batch
+        ]
+        self.assertEqual([payload["company_id"] for payload in payloads], ["c1", "c2", "c3"])
+        self.assertTrue(all(payload["reason"] == "new_company_via_4dayweek" for payload in payloads))
+
+
+if __name__ == "__main__":
+    unittest.main()
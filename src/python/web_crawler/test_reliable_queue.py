@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import importlib.util
+import time
+import unittest
+
+from src.python.web_crawler.config import CrawlerConfig
+from src.python.web_crawler.reliable_queue import ReliableQueue, build_work_queue
+
+HAS_FAKEREDIS = importlib.util.find_spec("fakeredis") is not None
+
+
+@unittest.skipUnless(HAS_FAKEREDIS, "fakeredis is not installed")
+class ReliableQueueTests(unittest.TestCase):
+    def setUp(self):
+        import fakeredis
+
+        self.redis = fakeredis.FakeRedis(decode_responses=True)
+
+    def _queue(self, consumer_id: str, **kwargs) -> ReliableQueue:
+        queue = ReliableQueue(self.redis, "work", consumer_id=consumer_id, claim_timeout_seconds=0.05, **kwargs)
+        self.addCleanup(queue.close)
+        return queue
+
+    def _payloads(self, key: str) -> list[str]:
+        # Claimed messages carry an ``rq1:<id>|`` envelope once they have been claimed.
+        return [entry.partition("|")[2] if entry.startswith("rq1:") else entry for entry in self.redis.lrange(key, 0, -1)]
+
+    def _crash(self, queue: ReliableQueue) -> None:
+        # A dead process stops refreshing its lease, which then expires.
+        queue.close()
+        self.redis.delete(queue.lease_key)
+
+    def test_claim_keeps_message_in_processing_list_until_ack(self):
+        queue = self._queue("a")
+        self.redis.rpush("work", "m1", "m2")
+
+        message = queue.claim()
+
+        self.assertEqual(message.payload, "m1")
+        self.assertEqual(message.delivery_count, 1)
+        self.assertEqual(self.redis.lrange("work:processing:a", 0, -1), [f"rq1:{message.message_id}|m1"])
+        self.assertEqual(self.redis.lrange("work", 0, -1), ["m2"])
+
+        queue.ack(message)
+
+        self.assertEqual(self.redis.lrange("work:processing:a", 0, -1), [])
+        self.assertFalse(self.redis.exists("work:deliveries"))
+        self.assertFalse(self.redis.exists("work:claimed_at"))
+
+    def test_claim_returns_none_when_queue_stays_empty(self):
+        self.assertIsNone(self._queue("a").claim())
+
+    def test_consumer_registers_lease_and_membership(self):
+        queue = self._queue("a", visibility_timeout_seconds=30)
+
+        self.assertEqual(self.redis.smembers("work:consumers"), {"a"})
+        self.assertGreater(self.redis.ttl(queue.lease_key), 0)
+        self.assertLessEqual(self.redis.ttl(queue.lease_key), 30)
+
+    def test_reclaim_requeues_messages_of_consumer_with_expired_lease(self):
+        crashed = self._queue("a")
+        self.redis.rpush("work", "m1", "m2", "m3")
+        crashed.claim()
+        crashed.claim()
+        self._crash(crashed)
+        survivor = self._queue("b")
+
+        self.assertEqual(survivor.reclaim_expired(), 2)
+
+        self.assertEqual(self._payloads("work"), ["m1", "m2", "m3"])
+        self.assertEqual(self.redis.smembers("work:consumers"), {"b"})
+        redelivered = survivor.claim()
+        self.assertEqual(redelivered.payload, "m1")
+        self.assertEqual(redelivered.delivery_count, 2)
+
+    def test_reclaim_leaves_messages_of_live_consumers(self):
+        busy = self._queue("a")
+        self.redis.rpush("work", "m1")
+        busy.claim()
+
+        self.assertEqual(self._queue("b").reclaim_expired(), 0)
+        self.assertEqual(self._payloads("work:processing:a"), ["m1"])
+
+    def test_claim_reclaims_expired_consumers_before_blocking(self):
+        crashed = self._queue("a")
+        self.redis.rpush("work", "m1")
+        crashed.claim()
+        self._crash(crashed)
+
+        message = self._queue("b").claim()
+
+        self.assertEqual(message.payload, "m1")
+        self.assertEqual(message.delivery_count, 2)
+
+    def test_restarted_consumer_requeues_its_own_unacked_messages(self):
+        first = self._queue("a")
+        self.redis.rpush("work", "m1", "m2", "m3")
+        first.claim()
+        first.claim()
+        first.close()
+
+        restarted = self._queue("a")
+
+        self.assertEqual(self._payloads("work"), ["m1", "m2", "m3"])
+        self.assertEqual(self.redis.lrange(restarted.processing_key, 0, -1), [])
+
+    def test_message_is_dead_lettered_after_max_deliveries(self):
+        self.redis.rpush("work", "poison", "next")
+        for _ in range(2):
+            queue = self._queue("a", max_deliveries=2)
+            self.assertEqual(queue.claim().payload, "poison")
+
+        queue = self._queue("a", max_deliveries=2)
+
+        self.assertIsNone(queue.claim())
+        self.assertEqual(self.redis.lrange("work:dead", 0, -1), ["poison"])
+        self.assertEqual(self.redis.lrange("work:processing:a", 0, -1), [])
+        self.assertEqual(self.redis.hlen("work:deliveries"), 0)
+        self.assertEqual(queue.claim().payload, "next")
+
+    def test_ack_resets_delivery_count(self):
+        self.redis.rpush("work", "m1")
+        queue = self._queue("a", max_deliveries=1)
+        queue.ack(queue.claim())
+        self.redis.rpush("work", "m1")
+
+        self.assertEqual(queue.claim().delivery_count, 1)
+
+    def test_identical_payloads_are_counted_and_acked_per_message(self):
+        queue = self._queue("a", max_deliveries=1)
+        self.redis.rpush("work", "same", "same")
+        first = queue.claim()
+        second = queue.claim()
+
+        queue.ack(first)
+        self._crash(queue)
+        survivor = self._queue("b", max_deliveries=1)
+
+        self.assertNotEqual(first.message_id, second.message_id)
+        self.assertEqual(survivor.reclaim_expired(), 1)
+        # The unacked copy keeps its own count, so it is dead-lettered on its second claim.
+        self.assertIsNone(survivor.claim())
+        self.assertEqual(self.redis.lrange("work:dead", 0, -1), ["same"])
+
+    def test_message_held_past_its_deadline_is_requeued_from_a_live_consumer(self):
+        hung = self._queue("a", message_deadline_seconds=30)
+        self.redis.rpush("work", "m1")
+        stuck = hung.claim()
+        self.redis.hset("work:claimed_at", stuck.message_id, time.time() - 60)
+
+        self.assertEqual(self._queue("b", message_deadline_seconds=30).reclaim_expired(), 1)
+        self.assertEqual(self._payloads("work"), ["m1"])
+
+        redelivered = self._queue("b").claim()
+        hung.ack(stuck)
+
+        self.assertEqual(redelivered.message_id, stuck.message_id)
+        self.assertEqual(redelivered.delivery_count, 2)
+        # The late ack of the hung handler does not reset the redelivered message's count.
+        self.assertEqual(self.redis.hget("work:deliveries", stuck.message_id), "2")
+
+    def test_messages_within_their_deadline_stay_claimed(self):
+        busy = self._queue("a", message_deadline_seconds=30)
+        self.redis.rpush("work", "m1")
+        busy.claim()
+
+        self.assertEqual(self._queue("b", message_deadline_seconds=30).reclaim_expired(), 0)
+        self.assertEqual(self._payloads("work:processing:a"), ["m1"])
+
+    def test_bytes_payloads_round_trip(self):
+        import fakeredis
+
+        client = fakeredis.FakeRedis()
+        queue = ReliableQueue(client, "work", consumer_id="a", claim_timeout_seconds=0.05)
+        self.addCleanup(queue.close)
+        client.rpush("work", b'{"job_id": "1"}')
+
+        message = queue.claim()
+        queue.ack(message)
+
+        self.assertEqual(message.payload, b'{"job_id": "1"}')
+        self.assertEqual(client.llen(b"work:processing:a"), 0)
+
+    def test_build_work_queue_uses_config(self):
+        config = CrawlerConfig(
+            mongo_host="mongodb://localhost:27017",
+            db_name="test",
+            queue_visibility_timeout_seconds=90,
+            queue_max_deliveries=3,
+            queue_message_deadline_seconds=600,
+        )
+
+        queue = build_work_queue(self.redis, config, "work")
+        self.addCleanup(queue.close)
+
+        self.assertEqual(queue.visibility_timeout_seconds, 90)
+        self.assertEqual(queue.max_deliveries, 3)
+        self.assertEqual(queue.message_deadline_seconds, 600)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import unittest
+
+from src.python.web_crawler.benchmark_role_matching import build_corpus, run_benchmark
+from src.python.web_crawler.role_filtering import RoleMatcher, text_matches_roles
+
+
+class RoleMatcherTests(unittest.TestCase):
+    def test_matches_title_or_description_case_insensitively(self):
+        matcher = RoleMatcher(["Backend Developer", "SRE"])
+
+        self.assertTrue(matcher.matches("Senior BACKEND developer", ""))
+        self.assertTrue(matcher.matches("Platform", "you will join our sre rotation"))
+        self.assertFalse(matcher.matches("Designer", "figma"))
+        self.assertFalse(matcher.matches("", None))
+
+    def test_redundant_roles_do_not_change_results(self):
+        matcher = RoleMatcher(["Software Engineer", "Engineer", " engineer ", ""])
+
+        self.assertEqual(matcher.roles, ("Software Engineer", "Engineer"))
+        self.assertTrue(matcher.matches("Data Engineer", ""))
+        self.assertFalse(matcher.matches("Data Scientist", ""))
+
+    def test_empty_roles_match_nothing(self):
+        self.assertFalse(RoleMatcher([]).matches("Software Engineer", "anything"))
+
+    def test_matched_roles_and_first_match_keep_identity_order_and_spelling(self):
+        matcher = RoleMatcher(["Software Engineer", "Engineer", "Go"])
+        text = "Golang software engineer"
+
+        self.assertEqual(matcher.matched_roles(text), ["Software Engineer", "Engineer", "Go"])
+        self.assertEqual(matcher.first_match("Staff Engineer", "Go services"), "Engineer")
+        self.assertEqual(matcher.first_match("Designer"), "")
+
+    def test_shares_word_ignores_generic_words(self):
+        matcher = RoleMatcher(["Senior Software Engineer", "Lead"])
+
+        self.assertTrue(matcher.shares_word("Sales Engineer"))
+        self.assertTrue(matcher.shares_word("Team Lead, Support"))
+        self.assertFalse(matcher.shares_word("Senior Account Executive"))
+        self.assertFalse(matcher.shares_word(""))
+
+    def test_text_matches_roles_accepts_list_or_matcher(self):
+        self.assertTrue(text_matches_roles("Software Engineer", "", ["software engineer"]))
+        self.assertTrue(text_matches_roles("", "backend work", RoleMatcher(["Backend"])))
+        self.assertFalse(text_matches_roles("Designer", "", ["Backend"]))
+
+
+class RoleMatchingBenchmarkTests(unittest.TestCase):
+    def test_all_strategies_accept_the_same_jobs(self):
+        corpus = build_corpus(200, description_words=50)
+
+        results = run_benchmark(corpus, ["Software Engineer", "Engineer", "Backend Developer"], include_slow=True)
+
+        self.assertEqual(len({outcome["accepted"] for outcome in results.values()}), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import unittest
+
+from src.python.web_crawler.reliable_queue import ReliableQueue
+from src.python.web_crawler.scoring_lanes import (
+    BULK_RESCORE_LANE,
+    DEFAULT_LANE_WEIGHTS,
+    INTERACTIVE_LANE,
+    NEW_JOB_LANE,
+    ScoringLaneConsumer,
+    WeightedLaneScheduler,
+    lane_depths,
+    lane_queue_name,
+    parse_lane_weights,
+)
+
+# Lane routing runs as Lua scripts, which fakeredis evaluates through lupa.
+HAS_FAKEREDIS_LUA = importlib.util.find_spec("fakeredis") is not None and importlib.util.find_spec("lupa") is not None
+
+
+def _message(job_id: str, user_id: str) -> str:
+    return json.dumps({"job_id": job_id, "user_id": user_id, "identity_id": "identity"})
+
+
+class LaneHelperTests(unittest.TestCase):
+    def test_lane_queue_name(self):
+        self.assertEqual(lane_queue_name("scores", NEW_JOB_LANE), "scores")
+        self.assertEqual(lane_queue_name("scores", INTERACTIVE_LANE), "scores:interactive")
+        self.assertEqual(lane_queue_name("scores", BULK_RESCORE_LANE), "scores:bulk_rescore")
+        with self.assertRaises(ValueError):
+            lane_queue_name("scores", "urgent")
+
+    def test_parse_lane_weights_keeps_defaults_for_missing_or_invalid_entries(self):
+        self.assertEqual(parse_lane_weights(None), DEFAULT_LANE_WEIGHTS)
+        self.assertEqual(
+            parse_lane_weights("interactive=5, bulk_rescore=x, unknown=3, new_job=0"),
+            {INTERACTIVE_LANE: 5, NEW_JOB_LANE: 1, BULK_RESCORE_LANE: DEFAULT_LANE_WEIGHTS[BULK_RESCORE_LANE]},
+        )
+
+    def test_scheduler_serves_lanes_in_proportion_to_weights(self):
+        scheduler = WeightedLaneScheduler({INTERACTIVE_LANE: 3, NEW_JOB_LANE: 2, BULK_RESCORE_LANE: 1})
+        served = []
+        for _ in range(12):
+            lane = scheduler.order()[0]
+            scheduler.served(lane)
+            served.append(lane)
+
+        self.assertEqual(served.count(INTERACTIVE_LANE), 6)
+        self.assertEqual(served.count(NEW_JOB_LANE), 4)
+        self.assertEqual(served.count(BULK_RESCORE_LANE), 2)
+
+
+@unittest.skipUnless(HAS_FAKEREDIS_LUA, "fakeredis with Lua support is not installed")
+class ScoringLaneConsumerTests(unittest.TestCase):
+    def setUp(self):
+        import fakeredis
+
+        self.redis = fakeredis.FakeRedis(decode_responses=True)
+        self.queue = ReliableQueue(self.redis, "scores", consumer_id="a")
+        self.addCleanup(self.queue.close)
+
+    def _consumer(self, **kwargs) -> ScoringLaneConsumer:
+        return ScoringLaneConsumer(self.redis, self.queue, idle_wait_seconds=0, **kwargs)
+
+    def _drain(self, consumer: ScoringLaneConsumer) -> list[tuple[str, dict]]:
+        claimed = []
+        while (result := consumer.claim()) is not None:
+            lane, message = result
+            self.queue.ack(message)
+            claimed.append((lane, json.loads(message.payload)))
+        return claimed
+
+    def test_users_of_a_lane_are_served_round_robin(self):
+        self.redis.rpush("scores", *[_message(f"bulk-{i}", "heavy") for i in range(4)], _message("light-1", "light"))
+
+        claimed = self._drain(self._consumer())
+
+        self.assertEqual(
+            [payload["job_id"] for _, payload in claimed], ["bulk-0", "light-1", "bulk-1", "bulk-2", "bulk-3"]
+        )
+
+    def test_lanes_are_served_by_weight(self):
+        self.redis.rpush("scores:bulk_rescore", *[_message(f"b{i}", "u") for i in range(3)])
+        self.redis.rpush("scores:interactive", *[_message(f"i{i}", "u") for i in range(3)])
+
+        claimed = self._drain(self._consumer(weights={INTERACTIVE_LANE: 2, NEW_JOB_LANE: 1, BULK_RESCORE_LANE: 1}))
+
+        first_lanes = [lane for lane, _ in claimed[:3]]
+        self.assertEqual(first_lanes[0], INTERACTIVE_LANE)
+        self.assertEqual(first_lanes.count(INTERACTIVE_LANE), 2)
+        self.assertEqual(len(claimed), 6)
+
+    def test_claim_moves_message_to_processing_list(self):
+        self.redis.rpush("scores:interactive", _message("1", "u"))
+
+        lane, message = self._consumer().claim()
+
+        self.assertEqual(lane, INTERACTIVE_LANE)
+        self.assertEqual(message.delivery_count, 1)
+        self.assertEqual(self.redis.lrange(self.queue.processing_key, 0, -1), [message.entry])
+        self.assertEqual(json.loads(message.payload)["job_id"], "1")
+
+    def test_lane_depths_count_inbox_and_routed_messages(self):
+        self.redis.rpush("scores", _message("1", "u"), _message("2", "v"))
+        self.redis.rpush("scores:bulk_rescore", _message("3", "u"))
+        self._consumer().claim()
+
+        self.assertEqual(lane_depths(self.redis, "scores"), {INTERACTIVE_LANE: 0, NEW_JOB_LANE: 1, BULK_RESCORE_LANE: 1})
+
+    def test_reclaimed_messages_return_to_new_job_lane(self):
+        self.redis.rpush("scores:interactive", _message("1", "u"), _message("2", "u"))
+        crashed = ReliableQueue(self.redis, "scores", consumer_id="b")
+        crashed_consumer = ScoringLaneConsumer(self.redis, crashed, idle_wait_seconds=0)
+        crashed_consumer.claim()
+        crashed_consumer.claim()
+        crashed.close()
+        self.redis.delete(crashed.lease_key)
+
+        lane, message = self._consumer().claim()
+
+        self.assertEqual(lane, NEW_JOB_LANE)
+        self.assertEqual(message.delivery_count, 2)
+        self.assertEqual(json.loads(message.payload)["job_id"], "1")
+        # Enveloped redeliveries are still routed to their user's list.
+        self.assertEqual(self.redis.llen("scores:lane:new_job:user:u"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+import unittest
+from unittest.mock import patch
+
+from src.python.web_crawler.config import CrawlerConfig
+from src.python.web_crawler.snapshot_cache import SourceSnapshotCache, build_snapshot_cache
+
+
+class FakeRedis:
+    def __init__(self, values=None, error: Exception | None = None):
+        self.values: dict[str, str] = dict(values or {})
+        self.expirations: dict[str, int] = {}
+        self.error = error
+
+    def _check(self):
+        if self.error is not None:
+            raise self.error
+
+    def get(self, key):
+        self._check()
+        return self.values.get(key)
+
+    def set(self, key, value, nx=False, ex=None):
+        self._check()
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        if ex is not None:
+            self.expirations[key] = ex
+        return True
+
+    def delete(self, key):
+        self._check()
+        return 1 if self.values.pop(key, None) is not None else 0
+
+    def exists(self, key):
+        self._check()
+        return int(key in self.values)
+
+
+def _make_cache(redis_client, **kwargs) -> SourceSnapshotCache:
+    options = {"ttl_seconds": 600, "lock_ttl_seconds": 60, "wait_seconds": 5, "key_prefix": "snap"}
+    options.update(kwargs)
+    return SourceSnapshotCache(redis_client, **options)
+
+
+class SourceSnapshotCacheTests(unittest.TestCase):
+    def test_first_call_fetches_and_stores_then_later_calls_reuse_snapshot(self):
+        redis_client = FakeRedis()
+        cache = _make_cache(redis_client)
+        fetches = []
+
+        def fetch():
+            fetches.append(1)
+            return [{"id": 1}]
+
+        self.assertEqual(cache.get_or_fetch("4dayweek", fetch), [{"id": 1}])
+        self.assertEqual(cache.get_or_fetch("4dayweek", fetch), [{"id": 1}])
+
+        self.assertEqual(len(fetches), 1)
+        self.assertEqual(json.loads(redis_client.values["snap:4dayweek"]), [{"id": 1}])
+        self.assertEqual(redis_client.expirations["snap:4dayweek"], 600)
+        self.assertNotIn("snap:4dayweek:lock", redis_client.values)
+
+    def test_waits_for_snapshot_while_another_worker_holds_the_lock(self):
+        redis_client = FakeRedis({"snap:hn:lock": "other-worker"})
+        cache = _make_cache(redis_client)
+
+        def other_worker_finishes(_seconds):
+            redis_client.values["snap:hn"] = json.dumps([{"story_id": "1"}])
+            redis_client.values.pop("snap:hn:lock", None)
+
+        with patch("src.python.web_crawler.snapshot_cache.time.sleep", side_effect=other_worker_finishes):
+            records = cache.get_or_fetch("hn", lambda: self.fail("must not fetch while snapshot is being filled"))
+
+        self.assertEqual(records, [{"story_id": "1"}])
+
+    def test_fetches_directly_when_lock_holder_gives_up(self):
+        redis_client = FakeRedis({"snap:hn:lock": "other-worker"})
+        cache = _make_cache(redis_client)
+
+        with patch(
+            "src.python.web_crawler.snapshot_cache.time.sleep",
+            side_effect=lambda _seconds: redis_client.values.pop("snap:hn:lock", None),
+        ):
+            records = cache.get_or_fetch("hn", lambda: [{"story_id": "fresh"}])
+
+        self.assertEqual(records, [{"story_id": "fresh"}])
+
+    def test_redis_errors_fall_back_to_direct_fetch(self):
+        cache = _make_cache(FakeRedis(error=ConnectionError("redis down")))
+
+        with patch("src.python.web_crawler.snapshot_cache.time.sleep") as sleep:
+            self.assertEqual(cache.get_or_fetch("4dayweek", lambda: [{"id": 2}]), [{"id": 2}])
+
+        sleep.assert_not_called()
+
+    def test_fetch_failure_releases_lock_and_stores_nothing(self):
+        redis_client = FakeRedis()
+        cache = _make_cache(redis_client)
+
+        def fetch():
+            raise RuntimeError("upstream down")
+
+        with self.assertRaises(RuntimeError):
+            cache.get_or_fetch("4dayweek", fetch)
+
+        self.assertEqual(redis_client.values, {})
+
+    def test_build_snapshot_cache_disabled_without_redis_or_ttl(self):
+        config = CrawlerConfig(mongo_host="mongodb://localhost:27017/", db_name="test")
+
+        self.assertIsNone(build_snapshot_cache(None, config))
+        config.source_snapshot_ttl_seconds = 0
+        self.assertIsNone(build_snapshot_cache(FakeRedis(), config))
+
+
+if __name__ == "__main__":
+    unittest.main()
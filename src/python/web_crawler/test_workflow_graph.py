@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import unittest
+
+from src.python.web_crawler.config import CrawlerConfig
+from src.python.web_crawler.workflow_graph import WORKFLOW_GRAPH, trigger_workflows
+
+
+class WorkflowGraphTests(unittest.TestCase):
+    def test_trigger_workflows_resolve_to_configured_queues(self):
+        config = CrawlerConfig(mongo_host="mongodb://localhost:27017/", db_name="test")
+
+        queues = {node.workflow_id: node.queue_name(config) for node in trigger_workflows()}
+
+        self.assertNotIn("enrichment_ats_enrichment", queues)
+        self.assertEqual(queues["crawler_ats_job_extraction"], config.crawler_ats_job_extraction_queue_name)
+        self.assertEqual(queues["crawler_4dayweek"], config.crawler_4dayweek_queue_name)
+        self.assertEqual(len(queues), len([node for node in WORKFLOW_GRAPH if node.on_trigger]))
+
+    def test_every_workflow_has_a_configured_queue(self):
+        config = CrawlerConfig(mongo_host="mongodb://localhost:27017/", db_name="test")
+
+        self.assertTrue(all(node.queue_name(config) for node in WORKFLOW_GRAPH))
+        self.assertEqual(len({node.workflow_id for node in WORKFLOW_GRAPH}), len(WORKFLOW_GRAPH))
+
+
+if __name__ == "__main__":
+    unittest.main()
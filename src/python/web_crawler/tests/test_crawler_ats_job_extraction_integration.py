@@ -62,7 +62,7 @@ class CrawlerAtsJobExtractionIntegrationTests(unittest.TestCase):
                 self.skipTest("Mongo integration tests require authenticated write access")
             raise
 
-    def _fake_fetch_jobs(self, provider, slug, config, session):
+    def _fake_fetch_jobs(self, provider, slug, config, session, role_matcher=None, validator_cache=None):
         return [
             common_pb2.Job(
                 title="Integration Test Role",
@@ -123,7 +123,7 @@ class CrawlerAtsJobExtractionIntegrationTests(unittest.TestCase):
         self.assertEqual(result.inserted_count, 1)
 
     def test_run_crawler_ats_job_extraction_skips_non_matching_jobs_for_identity_roles(self):
-        def fake_fetch_jobs(provider, slug, config, session):
+        def fake_fetch_jobs(provider, slug, config, session, role_matcher=None, validator_cache=None):
             return [
                 common_pb2.Job(
                     title="Data Scientist",
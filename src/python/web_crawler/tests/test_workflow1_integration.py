@@ -62,7 +62,7 @@ class Workflow1IntegrationTests(unittest.TestCase):
                 self.skipTest("Mongo integration tests require authenticated write access")
             raise
 
-    def _fake_fetch_jobs(self, provider, slug, config, session):
+    def _fake_fetch_jobs(self, provider, slug, config, session, role_matcher=None, validator_cache=None):
         return [
             common_pb2.Job(
                 title="Workflow1 Engineer Role",
@@ -0,0 +1,53 @@
+"""Registry of the workflows a single crawl trigger starts.
+
+``WORKFLOW_GRAPH`` lists every workflow with its queue and whether the
+dispatcher starts it for each crawl trigger. It is only a registry: it does
+not schedule or order anything. Dependencies between workflows are carried by
+per-company events that the workflows emit themselves:
+
+- discovery crawlers and the dispatcher's backlog fan-out emit one
+  ``CompanyDiscoveryEvent`` per company that still needs an ATS slug
+  (``workflow_utils.emit_enrichment_events``);
+- ``enrichment_ats_enrichment`` consumes those events and, for every company it
+  enriches, dispatches ``crawler_ats_job_extraction`` for that company alone.
+
+The trigger-time ``crawler_ats_job_extraction`` run does not depend on the
+discovery crawlers: it crawls the companies that are already enriched, so it
+starts together with them.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from src.python.web_crawler.config import CrawlerConfig
+
+DISPATCHER_WORKFLOW_ID = "dispatcher"
+
+
+@dataclass(frozen=True, slots=True)
+class WorkflowNode:
+    workflow_id: str
+    queue_config_field: str
+    # Dispatched by the dispatcher for every crawl trigger.
+    on_trigger: bool = False
+
+    def queue_name(self, config: CrawlerConfig) -> str:
+        return getattr(config, self.queue_config_field)
+
+
+WORKFLOW_GRAPH: tuple[WorkflowNode, ...] = (
+    WorkflowNode("crawler_ycombinator", "crawler_ycombinator_queue_name", on_trigger=True),
+    WorkflowNode("crawler_hackernews", "crawler_hackernews_queue_name", on_trigger=True),
+    WorkflowNode("crawler_levelsfyi", "crawler_levelsfyi_queue_name", on_trigger=True),
+    WorkflowNode("crawler_4dayweek", "crawler_4dayweek_queue_name", on_trigger=True),
+    # Started per company by company-discovery events.
+    WorkflowNode("enrichment_ats_enrichment", "crawler_enrichment_ats_enrichment_queue_name"),
+    # On trigger it crawls the companies that are already enriched; companies
+    # enriched during the run follow with one dispatch each from enrichment.
+    WorkflowNode("crawler_ats_job_extraction", "crawler_ats_job_extraction_queue_name", on_trigger=True),
+)
+
+
+def trigger_workflows(graph: tuple[WorkflowNode, ...] = WORKFLOW_GRAPH) -> list[WorkflowNode]:
+    return [node for node in graph if node.on_trigger]
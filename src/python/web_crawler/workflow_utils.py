@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import TypeVar
 
 import redis
 from bson import ObjectId
@@ -8,10 +11,13 @@ from bson import ObjectId
 from src.python.ai_querier import common_pb2
 from src.python.web_crawler.config import CrawlerConfig
 from src.python.web_crawler.progress import utc_timestamp
+from src.python.web_crawler.queue_emitter import build_emitter
 from src.python.web_crawler.workflow_messages import company_discovery_event_to_json
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 def load_identity_seed(identities_collection, identity_id: str) -> common_pb2.Identity:
     if not identity_id:
         raise ValueError("identity_id is required")
@@ -37,6 +43,12 @@ def load_identity_seed(identities_collection, identity_id: str) -> common_pb2.Id
         seed.field_id = field_id
     return seed
 
+def iter_batches(items: Iterable[_T], size: int) -> Iterator[list[_T]]:
+    """Group ``items`` into lists of at most ``size``, consuming the iterable lazily."""
+    iterator = iter(items)
+    while batch := list(islice(iterator, max(1, size))):
+        yield batch
+
 def find_companies_missing_slug(collection, company_ids: list[str]) -> list[str]:
     """Return a subset of company_ids whose documents have no ats_slug set."""
     if not company_ids:
@@ -66,27 +78,27 @@ def emit_enrichment_events(
     workflow_id: str,
     identity_id: str,
     company_ids: list[str],
-) -> None:
-    """Push one CompanyDiscoveryEvent per company into the enrichment queue."""
-    for company_id in company_ids:
-        try:
+    reason: str = "no_ats_slug",
+    user_id: str = "",
+) -> int:
+    """Push one CompanyDiscoveryEvent per company into the enrichment queue.
+
+    Events are batched through a Redis pipeline; returns how many were delivered.
+    """
+    queue_name = config.crawler_enrichment_ats_enrichment_queue_name
+    with build_emitter(redis_client, config) as emitter:
+        for company_id in company_ids:
             event = common_pb2.CompanyDiscoveryEvent(
                 run_id=run_id,
                 workflow_run_id=workflow_run_id,
                 workflow_id=workflow_id,
                 identity_id=identity_id,
                 company_id=company_id,
-                reason="no_ats_slug",
+                reason=reason,
+                user_id=user_id,
             )
             event.emitted_at.CopyFrom(utc_timestamp())
-            redis_client.rpush(
-                config.crawler_enrichment_ats_enrichment_queue_name,
-                company_discovery_event_to_json(event),
-            )
-            logger.debug("emitted CompanyDiscoveryEvent for company %s", company_id)
-        except Exception as exc:
-            logger.warning(
-                "failed to emit CompanyDiscoveryEvent for company %s: %s",
-                company_id,
-                exc,
-            )
+            emitter.push(queue_name, company_discovery_event_to_json(event))
+    emitted = emitter.sent_counts[queue_name]
+    logger.debug("%s: emitted %d/%d CompanyDiscoveryEvents", workflow_id, emitted, len(company_ids))
+    return emitted